@@ -1,3 +1,8 @@
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete
+)
 from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.common.apps import MayanAppConfig
@@ -11,6 +16,14 @@ from mayan.apps.views.html_widgets import ObjectLinkWidget
 
 from .classes import ModelPermission
 from .events import event_acl_deleted, event_acl_edited
+from .handlers import (
+    handler_acl_grants_acl_permissions_changed,
+    handler_acl_grants_acl_post_save,
+    handler_acl_grants_group_post_delete,
+    handler_acl_grants_group_pre_delete,
+    handler_acl_grants_role_groups_changed,
+    handler_acl_grants_user_groups_changed
+)
 from .links import (
     link_acl_create, link_acl_delete, link_acl_permissions,
     link_global_acl_list
@@ -83,3 +96,39 @@ class ACLsApp(MayanAppConfig):
         menu_setup.bind_links(
             links=(link_global_acl_list,)
         )
+
+        # Keep the materialized access grants current.
+        Group = apps.get_model(app_label='auth', model_name='Group')
+        Role = apps.get_model(app_label='permissions', model_name='Role')
+        User = get_user_model()
+
+        post_save.connect(
+            dispatch_uid='acls_handler_acl_grants_acl_post_save',
+            receiver=handler_acl_grants_acl_post_save,
+            sender=AccessControlList
+        )
+        m2m_changed.connect(
+            dispatch_uid='acls_handler_acl_grants_acl_permissions_changed',
+            receiver=handler_acl_grants_acl_permissions_changed,
+            sender=AccessControlList.permissions.through
+        )
+        m2m_changed.connect(
+            dispatch_uid='acls_handler_acl_grants_role_groups_changed',
+            receiver=handler_acl_grants_role_groups_changed,
+            sender=Role.groups.through
+        )
+        m2m_changed.connect(
+            dispatch_uid='acls_handler_acl_grants_user_groups_changed',
+            receiver=handler_acl_grants_user_groups_changed,
+            sender=User.groups.through
+        )
+        pre_delete.connect(
+            dispatch_uid='acls_handler_acl_grants_group_pre_delete',
+            receiver=handler_acl_grants_group_pre_delete,
+            sender=Group
+        )
+        post_delete.connect(
+            dispatch_uid='acls_handler_acl_grants_group_post_delete',
+            receiver=handler_acl_grants_group_post_delete,
+            sender=Group
+        )
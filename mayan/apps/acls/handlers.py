@@ -0,0 +1,127 @@
+from django.apps import apps
+
+
+def _get_acl_queryset():
+    return apps.get_model(
+        app_label='acls', model_name='AccessControlList'
+    ).objects.all()
+
+
+def _rebuild_grants(acl_id_list):
+    AccessControlListGrant = apps.get_model(
+        app_label='acls', model_name='AccessControlListGrant'
+    )
+
+    AccessControlListGrant.objects.rebuild(acl_id_list=list(acl_id_list))
+
+
+def _handle_m2m_changed(get_acl_id_list, instance, action, reverse, pk_set):
+    """
+    Clear actions provide no primary keys, the affected access control
+    lists are collected before the relationship is cleared.
+    """
+    if action == 'pre_clear':
+        instance._acl_grant_acl_id_list = list(
+            get_acl_id_list(instance=instance, reverse=reverse, pk_set=None)
+        )
+    elif action == 'post_clear':
+        _rebuild_grants(
+            acl_id_list=instance.__dict__.pop('_acl_grant_acl_id_list', ())
+        )
+    elif action in ('post_add', 'post_remove'):
+        _rebuild_grants(
+            acl_id_list=get_acl_id_list(
+                instance=instance, reverse=reverse, pk_set=pk_set
+            )
+        )
+
+
+def _get_acl_permissions_acl_id_list(instance, reverse, pk_set):
+    if reverse:
+        # Instance is a stored permission, primary keys are ACLs.
+        if pk_set is None:
+            return instance.acls.values_list('pk', flat=True)
+        else:
+            return pk_set
+    else:
+        return (instance.pk,)
+
+
+def _get_role_groups_acl_id_list(instance, reverse, pk_set):
+    queryset = _get_acl_queryset()
+
+    if reverse:
+        # Instance is a group, primary keys are roles.
+        if pk_set is None:
+            queryset = queryset.filter(role__groups=instance)
+        else:
+            queryset = queryset.filter(role__in=pk_set)
+    else:
+        queryset = queryset.filter(role=instance)
+
+    return queryset.values_list('pk', flat=True)
+
+
+def _get_user_groups_acl_id_list(instance, reverse, pk_set):
+    queryset = _get_acl_queryset()
+
+    if reverse:
+        # Instance is a group, primary keys are users.
+        queryset = queryset.filter(role__groups=instance)
+    else:
+        if pk_set is None:
+            queryset = queryset.filter(role__groups__user=instance)
+        else:
+            queryset = queryset.filter(role__groups__in=pk_set)
+
+    return queryset.values_list('pk', flat=True).distinct()
+
+
+def handler_acl_grants_acl_post_save(sender, instance, created, **kwargs):
+    # A new access control list has no permissions and produces no grants
+    # until the permissions are added.
+    if not created:
+        _rebuild_grants(acl_id_list=(instance.pk,))
+
+
+def handler_acl_grants_acl_permissions_changed(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    _handle_m2m_changed(
+        action=action, get_acl_id_list=_get_acl_permissions_acl_id_list,
+        instance=instance, pk_set=pk_set, reverse=reverse
+    )
+
+
+def handler_acl_grants_role_groups_changed(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    _handle_m2m_changed(
+        action=action, get_acl_id_list=_get_role_groups_acl_id_list,
+        instance=instance, pk_set=pk_set, reverse=reverse
+    )
+
+
+def handler_acl_grants_user_groups_changed(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    _handle_m2m_changed(
+        action=action, get_acl_id_list=_get_user_groups_acl_id_list,
+        instance=instance, pk_set=pk_set, reverse=reverse
+    )
+
+
+def handler_acl_grants_group_pre_delete(sender, instance, **kwargs):
+    # Deleting a group removes its role and user relationships without
+    # sending m2m_changed signals.
+    instance._acl_grant_acl_id_list = list(
+        _get_acl_queryset().filter(
+            role__groups=instance
+        ).values_list('pk', flat=True).distinct()
+    )
+
+
+def handler_acl_grants_group_post_delete(sender, instance, **kwargs):
+    _rebuild_grants(
+        acl_id_list=instance.__dict__.pop('_acl_grant_acl_id_list', ())
+    )
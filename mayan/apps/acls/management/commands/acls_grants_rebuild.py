@@ -0,0 +1,33 @@
+from django.core import management
+from django.utils.translation import ugettext_lazy as _
+
+from ...models import AccessControlListGrant
+
+
+class Command(management.BaseCommand):
+    help = 'Rebuild or verify the access control list grant table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify', action='store_true', dest='verify',
+            help=_(
+                'Only report the missing and stale grant entries. Exits '
+                'with an error if any is found.'
+            )
+        )
+
+    def handle(self, *args, **options):
+        if options['verify']:
+            missing, stale = AccessControlListGrant.objects.verify()
+
+            if missing or stale:
+                raise management.CommandError(
+                    'Grant entries missing: {}; stale: {}'.format(
+                        len(missing), len(stale)
+                    )
+                )
+            else:
+                self.stdout.write('Grant entries consistent.')
+        else:
+            count = AccessControlListGrant.objects.rebuild()
+            self.stdout.write('Grant entries created: {}'.format(count))
@@ -1,13 +1,15 @@
 from functools import reduce
+import itertools
 import logging
 import operator
 
+from django.apps import apps
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import PermissionDenied
-from django.db import models
-from django.db.models import CharField, Q, Value
-from django.db.models.functions import Cast, Concat
+from django.db import models, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.db.models.functions import Cast
 from django.utils.encoding import force_text
 from django.utils.translation import ugettext
 
@@ -22,6 +24,89 @@ from .classes import ModelPermission
 
 logger = logging.getLogger(name=__name__)
 
+ACL_GRANT_BULK_CREATE_BATCH_SIZE = 1000
+
+
+class AccessControlListGrantManager(models.Manager):
+    def _get_grant_rows(self, acl_queryset):
+        """
+        Return the grant entries the access control lists produce as
+        (acl, content type, object, permission, user) ID tuples.
+        """
+        return acl_queryset.filter(
+            permissions__isnull=False, role__groups__user__isnull=False
+        ).order_by().values_list(
+            'pk', 'content_type_id', 'object_id', 'permissions',
+            'role__groups__user'
+        ).distinct()
+
+    def rebuild(self, acl_id_list=None):
+        """
+        Replace the grant entries of the access control lists in
+        acl_id_list. Rebuilds the entire table from scratch when no list
+        is provided.
+        """
+        AccessControlList = apps.get_model(
+            app_label='acls', model_name='AccessControlList'
+        )
+
+        acl_queryset = AccessControlList.objects.all()
+        grant_queryset = self.all()
+
+        if acl_id_list is not None:
+            acl_queryset = acl_queryset.filter(pk__in=acl_id_list)
+            grant_queryset = grant_queryset.filter(acl_id__in=acl_id_list)
+
+        rows = self._get_grant_rows(acl_queryset=acl_queryset)
+
+        count = 0
+        iterator = rows.iterator(chunk_size=ACL_GRANT_BULK_CREATE_BATCH_SIZE)
+
+        with transaction.atomic():
+            grant_queryset.delete()
+
+            while True:
+                grants = [
+                    self.model(
+                        acl_id=row[0], content_type_id=row[1],
+                        object_id=row[2], permission_id=row[3],
+                        user_id=row[4]
+                    ) for row in itertools.islice(
+                        iterator, ACL_GRANT_BULK_CREATE_BATCH_SIZE
+                    )
+                ]
+                if not grants:
+                    break
+
+                self.bulk_create(objs=grants)
+                count += len(grants)
+
+        return count
+
+    def verify(self):
+        """
+        Compare the grant table with the entries the access control lists
+        produce. Returns the missing and the stale entries as two sets of
+        (acl, content type, object, permission, user) ID tuples.
+        """
+        AccessControlList = apps.get_model(
+            app_label='acls', model_name='AccessControlList'
+        )
+
+        expected = set(
+            self._get_grant_rows(
+                acl_queryset=AccessControlList.objects.all()
+            ).iterator(chunk_size=ACL_GRANT_BULK_CREATE_BATCH_SIZE)
+        )
+        existing = set(
+            self.order_by().values_list(
+                'acl_id', 'content_type_id', 'object_id', 'permission_id',
+                'user_id'
+            ).iterator(chunk_size=ACL_GRANT_BULK_CREATE_BATCH_SIZE)
+        )
+
+        return expected - existing, existing - expected
+
 
 class AccessControlListManager(models.Manager):
     """
@@ -71,40 +156,50 @@ class AccessControlListManager(models.Manager):
                 if recursive_related_reference:
                     recursive_related_reference = '{}__'.format(recursive_related_reference)
 
-                content_type_object_id_queryset = queryset.annotate(
-                    ct_fk_combination=Concat(
-                        '{}{}'.format(
-                            recursive_related_reference, related_field.ct_field
-                        ), Value('-'),
-                        '{}{}'.format(
-                            recursive_related_reference, related_field.fk_field
-                        ), output_field=CharField()
-                    )
-                ).values('ct_fk_combination')
-
-                acl_filter = self.annotate(
-                    ct_fk_combination=Concat(
-                        'content_type', Value('-'), 'object_id',
-                        output_field=CharField()
-                    )
-                ).filter(
-                    permissions=stored_permission, role__groups__user=user,
-                    ct_fk_combination__in=content_type_object_id_queryset
+                # Correlated indexed semi-join with the grants on the
+                # content type and object id pair instead of matching a
+                # content type and object id concatenation. Kept as a
+                # subquery to avoid an extra query per access check.
+                grant_queryset = self._get_grant_queryset(
+                    stored_permission=stored_permission, user=user
                 )
 
                 if fk_field_cast:
-                    clean_acl_filter = acl_filter.annotate(
+                    grant_queryset = grant_queryset.annotate(
                         clean_object_id=Cast(
                             'object_id', output_field=fk_field_cast()
                         )
-                    ).values_list('clean_object_id')
+                    )
+                    object_id_lookup = 'clean_object_id'
                 else:
-                    clean_acl_filter = acl_filter.values('object_id')
+                    object_id_lookup = 'object_id'
+
+                grant_exists = Exists(
+                    grant_queryset.filter(
+                        **{
+                            'content_type': OuterRef(
+                                '{}{}'.format(
+                                    recursive_related_reference,
+                                    related_field.ct_field
+                                )
+                            ),
+                            object_id_lookup: OuterRef(
+                                '{}{}'.format(
+                                    recursive_related_reference,
+                                    related_field.fk_field
+                                )
+                            )
+                        }
+                    )
+                )
 
-                field_lookup = '{}{}__in'.format(
-                    recursive_related_reference, related_field.fk_field
+                result.append(
+                    Q(
+                        pk__in=queryset.model._base_manager.filter(
+                            grant_exists
+                        ).values('pk')
+                    )
                 )
-                result.append(Q(**{field_lookup: clean_acl_filter}))
             else:
                 # Case 2: Related field of a single type, single ContentType,
                 # multiple object id.
@@ -112,9 +207,9 @@ class AccessControlListManager(models.Manager):
                     model=related_field.related_model
                 )
                 field_lookup = '{}_id__in'.format(related_field_name)
-                acl_filter = self.filter(
-                    content_type=content_type, permissions=stored_permission,
-                    role__groups__user=user
+                acl_filter = self._get_grant_queryset(
+                    content_type=content_type,
+                    stored_permission=stored_permission, user=user
                 ).values('object_id')
                 # Don't add empty filters otherwise the default AND operator
                 # of the Q object will return an empty queryset when reduced
@@ -159,9 +254,9 @@ class AccessControlListManager(models.Manager):
                 model=queryset.model
             )
             field_lookup = 'id__in'
-            acl_filter = self.filter(
-                content_type=content_type, permissions=stored_permission,
-                role__groups__user=user
+            acl_filter = self._get_grant_queryset(
+                content_type=content_type,
+                stored_permission=stored_permission, user=user
             ).values('object_id')
             result.append(Q(**{field_lookup: acl_filter}))
 
@@ -207,9 +302,9 @@ class AccessControlListManager(models.Manager):
                 content_type = ContentType.objects.get_for_model(
                     model=queryset.model
                 )
-                acl_filter = self.filter(
-                    content_type=content_type, permissions=stored_permission,
-                    role__groups__user=user
+                acl_filter = self._get_grant_queryset(
+                    content_type=content_type,
+                    stored_permission=stored_permission, user=user
                 ).values('object_id')
 
                 # Obtain a queryset of filtered, authorized model instances.
@@ -230,6 +325,22 @@ class AccessControlListManager(models.Manager):
 
         return result
 
+    def _get_grant_queryset(
+        self, stored_permission, user, content_type=None
+    ):
+        AccessControlListGrant = apps.get_model(
+            app_label='acls', model_name='AccessControlListGrant'
+        )
+
+        queryset = AccessControlListGrant.objects.filter(
+            permission=stored_permission, user=user
+        )
+
+        if content_type:
+            queryset = queryset.filter(content_type=content_type)
+
+        return queryset
+
     def check_access(self, obj, permissions, user):
         # Allow specific managers for models that have more than one
         # for example the Document model when checking for access for a trashed
@@ -247,23 +358,36 @@ class AccessControlListManager(models.Manager):
             return True
         else:
             manager = ModelPermission.get_manager(model=obj._meta.model)
-            source_queryset = manager.all()
+            # Restrict only the object being checked instead of the entire
+            # table.
+            source_queryset = manager.filter(pk=obj.pk)
 
-        restricted_queryset = manager.none()
         for permission in permissions:
             # Default relationship betweens permissions is OR.
-            restricted_queryset = restricted_queryset | self.restrict_queryset(
-                permission=permission, queryset=source_queryset, user=user
-            )
+            if self.restrict_queryset(permission=permission, queryset=source_queryset, user=user).exists():
+                return True
 
-        if restricted_queryset.filter(pk=obj.pk).exists():
-            return True
-        else:
-            raise PermissionDenied(
-                ugettext(message='Insufficient access for: %s') % force_text(
-                    s=obj
-                )
+        raise PermissionDenied(
+            ugettext(message='Insufficient access for: %s') % force_text(
+                s=obj
             )
+        )
+
+    def get_allowed_pk_set(self, model, permission, pk_list, user):
+        """
+        Batch version of `check_access`. Return the subset of the primary
+        keys of `model` for which the user has the permission, using a
+        single query.
+        """
+        manager = ModelPermission.get_manager(model=model)
+
+        return set(
+            self.restrict_queryset(
+                permission=permission, queryset=manager.filter(
+                    pk__in=pk_list
+                ), user=user
+            ).values_list('pk', flat=True)
+        )
 
     def restrict_queryset(self, permission, queryset, user):
         if not user.is_authenticated:
@@ -0,0 +1,99 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def code_access_control_list_grants_build(apps, schema_editor):
+    AccessControlList = apps.get_model(
+        app_label='acls', model_name='AccessControlList'
+    )
+    AccessControlListGrant = apps.get_model(
+        app_label='acls', model_name='AccessControlListGrant'
+    )
+
+    rows = AccessControlList.objects.using(
+        alias=schema_editor.connection.alias
+    ).filter(
+        permissions__isnull=False, role__groups__user__isnull=False
+    ).order_by().values_list(
+        'pk', 'content_type_id', 'object_id', 'permissions',
+        'role__groups__user'
+    ).distinct()
+
+    AccessControlListGrant.objects.using(
+        alias=schema_editor.connection.alias
+    ).bulk_create(
+        batch_size=1000, objs=[
+            AccessControlListGrant(
+                acl_id=acl_id, content_type_id=content_type_id,
+                object_id=object_id, permission_id=permission_id,
+                user_id=user_id
+            ) for acl_id, content_type_id, object_id, permission_id, user_id in rows
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('permissions', '0004_auto_20191213_0044'),
+        ('acls', '0004_auto_20210130_0322'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccessControlListGrant',
+            fields=[
+                (
+                    'id', models.AutoField(
+                        auto_created=True, primary_key=True,
+                        serialize=False, verbose_name='ID'
+                    )
+                ),
+                ('object_id', models.PositiveIntegerField()),
+                (
+                    'acl', models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='grants', to='acls.accesscontrollist',
+                        verbose_name='Access entry'
+                    )
+                ),
+                (
+                    'content_type', models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='+', to='contenttypes.contenttype'
+                    )
+                ),
+                (
+                    'permission', models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='+', to='permissions.storedpermission',
+                        verbose_name='Permission'
+                    )
+                ),
+                (
+                    'user', models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='+', to=settings.AUTH_USER_MODEL,
+                        verbose_name='User'
+                    )
+                ),
+            ],
+            options={
+                'verbose_name': 'Access grant',
+                'verbose_name_plural': 'Access grants',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='accesscontrollistgrant',
+            index=models.Index(
+                fields=['user', 'permission', 'content_type', 'object_id'],
+                name='acls_access_user_id_15c3a8_idx'
+            ),
+        ),
+        migrations.RunPython(
+            code=code_access_control_list_grants_build,
+            reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -1,5 +1,6 @@
 import logging
 
+from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
@@ -14,7 +15,9 @@ from mayan.apps.events.decorators import method_event
 from mayan.apps.permissions.models import Role, StoredPermission
 
 from .events import event_acl_created, event_acl_deleted, event_acl_edited
-from .managers import AccessControlListManager
+from .managers import (
+    AccessControlListGrantManager, AccessControlListManager
+)
 
 logger = logging.getLogger(name=__name__)
 
@@ -118,3 +121,41 @@ class AccessControlList(ExtraDataModelMixin, models.Model):
 class GlobalAccessControlListProxy(AccessControlList):
     class Meta:
         proxy = True
+
+
+class AccessControlListGrant(models.Model):
+    """
+    Materialized expansion of the access control lists. Holds one entry
+    per user, permission, and object granted by an access control list
+    through the roles of the groups of the user. Used to resolve access
+    with a single indexed lookup instead of joining the access control
+    lists with the roles, groups, and users on each query. Entries are
+    updated by the signal handlers when any of these relationships change.
+    """
+    acl = models.ForeignKey(
+        on_delete=models.CASCADE, related_name='grants',
+        to=AccessControlList, verbose_name=_('Access entry')
+    )
+    content_type = models.ForeignKey(
+        on_delete=models.CASCADE, related_name='+', to=ContentType
+    )
+    object_id = models.PositiveIntegerField()
+    permission = models.ForeignKey(
+        on_delete=models.CASCADE, related_name='+', to=StoredPermission,
+        verbose_name=_('Permission')
+    )
+    user = models.ForeignKey(
+        on_delete=models.CASCADE, related_name='+',
+        to=settings.AUTH_USER_MODEL, verbose_name=_('User')
+    )
+
+    objects = AccessControlListGrantManager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=('user', 'permission', 'content_type', 'object_id')
+            )
+        ]
+        verbose_name = _('Access grant')
+        verbose_name_plural = _('Access grants')
@@ -0,0 +1,50 @@
+from io import StringIO
+
+from django.core import management
+
+from mayan.apps.testing.tests.base import BaseTestCase
+
+from ..models import AccessControlListGrant
+
+from .mixins import ACLTestMixin
+
+
+class ACLGrantsRebuildManagementCommandTestCase(ACLTestMixin, BaseTestCase):
+    auto_create_acl_test_object = True
+
+    def setUp(self):
+        super().setUp()
+        self.grant_access(
+            obj=self._test_object, permission=self._test_permission
+        )
+
+    def _call_command(self, **kwargs):
+        management.call_command(
+            command_name='acls_grants_rebuild', stdout=StringIO(), **kwargs
+        )
+
+    def test_grants_rebuild(self):
+        AccessControlListGrant.objects.all().delete()
+
+        self._call_command()
+
+        self.assertEqual(AccessControlListGrant.objects.count(), 1)
+
+    def test_grants_verify(self):
+        self._call_command(verify=True)
+
+    def test_grants_verify_missing(self):
+        AccessControlListGrant.objects.all().delete()
+
+        with self.assertRaises(expected_exception=management.CommandError):
+            self._call_command(verify=True)
+
+    def test_grants_verify_stale(self):
+        AccessControlListGrant.objects.update(object_id=0)
+
+        with self.assertRaises(expected_exception=management.CommandError):
+            self._call_command(verify=True)
+
+        self._call_command()
+
+        self._call_command(verify=True)
@@ -7,7 +7,7 @@ from mayan.apps.events.classes import EventModelRegistry
 from mayan.apps.testing.tests.base import BaseTestCase
 
 from ..classes import ModelPermission
-from ..models import AccessControlList
+from ..models import AccessControlList, AccessControlListGrant
 
 from .mixins import ACLTestMixin
 
@@ -626,3 +626,80 @@ class ProxyModelPermissionTestCase(ACLTestMixin, BaseTestCase):
                 user=self._test_case_user
             )
         )
+
+
+class AccessControlListGrantTestCase(ACLTestMixin, BaseTestCase):
+    auto_create_acl_test_object = True
+
+    def _get_test_grant_queryset(self):
+        return AccessControlListGrant.objects.filter(
+            object_id=self._test_object.pk,
+            permission=self._test_permission.stored_permission,
+            user=self._test_case_user
+        )
+
+    def test_grant_creation(self):
+        self.grant_access(
+            obj=self._test_object, permission=self._test_permission
+        )
+
+        self.assertEqual(self._get_test_grant_queryset().count(), 1)
+
+    def test_grant_acl_role_change(self):
+        self.grant_access(
+            obj=self._test_object, permission=self._test_permission
+        )
+        test_acl = AccessControlList.objects.get(
+            content_type=ContentType.objects.get_for_model(
+                model=self._test_object
+            ), object_id=self._test_object.pk, role=self._test_case_role
+        )
+
+        test_acl.role = self._test_role
+        test_acl.save()
+
+        self.assertEqual(self._get_test_grant_queryset().count(), 0)
+
+    def test_grant_revoke(self):
+        self.grant_access(
+            obj=self._test_object, permission=self._test_permission
+        )
+        self.revoke_access(
+            obj=self._test_object, permission=self._test_permission
+        )
+
+        self.assertEqual(self._get_test_grant_queryset().count(), 0)
+
+    def test_grant_group_user_remove(self):
+        self.grant_access(
+            obj=self._test_object, permission=self._test_permission
+        )
+        self._test_case_group.user_set.remove(self._test_case_user)
+
+        self.assertEqual(self._get_test_grant_queryset().count(), 0)
+
+    def test_grant_role_group_clear(self):
+        self.grant_access(
+            obj=self._test_object, permission=self._test_permission
+        )
+        self._test_case_role.groups.clear()
+
+        self.assertEqual(self._get_test_grant_queryset().count(), 0)
+
+    def test_grant_group_delete(self):
+        self.grant_access(
+            obj=self._test_object, permission=self._test_permission
+        )
+        self._test_case_group.delete()
+
+        self.assertEqual(self._get_test_grant_queryset().count(), 0)
+
+    def test_grant_rebuild(self):
+        self.grant_access(
+            obj=self._test_object, permission=self._test_permission
+        )
+        AccessControlListGrant.objects.all().delete()
+
+        AccessControlListGrant.objects.rebuild()
+
+        self.assertEqual(self._get_test_grant_queryset().count(), 1)
@@ -0,0 +1,436 @@
+"""Set-based daily analytics aggregation.
+
+Each rollup is computed for a whole date range with grouped queries and
+written with bulk upserts, instead of one `update_or_create` per row. The
+same functions serve the nightly tasks (a single day) and backfills (any
+date range).
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+import itertools
+from typing import Iterable, Optional, Sequence, Tuple
+
+import django
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .literals import ANALYTICS_AGGREGATION_BATCH_SIZE, SEARCH_TOP_QUERIES_LIMIT
+from .models import (
+    AssetDailyMetrics, AssetEvent, CampaignDailyMetrics,
+    CampaignEngagementEvent, CDNDailyCost, CDNRate, SearchDailyMetrics,
+    SearchQuery, SearchSession, UserDailyMetrics
+)
+
+
+def get_date_range(
+    *,
+    date_iso: str = '',
+    date_from_iso: str = '',
+    date_to_iso: str = ''
+) -> Tuple[date, date]:
+    """Resolve the task date arguments into an inclusive date range.
+
+    Args:
+        date_iso: Single ISO date (YYYY-MM-DD).
+        date_from_iso: First ISO date of a backfill range.
+        date_to_iso: Last ISO date of a backfill range. Defaults to
+            `date_from_iso`.
+
+    Returns:
+        Tuple of (date_from, date_to). Defaults to yesterday.
+    """
+    if date_from_iso or date_to_iso:
+        date_from = date.fromisoformat(date_from_iso or date_to_iso)
+        date_to = date.fromisoformat(date_to_iso or date_from_iso)
+    elif date_iso:
+        date_from = date_to = date.fromisoformat(date_iso)
+    else:
+        date_from = date_to = timezone.localdate() - timedelta(days=1)
+
+    if date_from > date_to:
+        raise ValueError(
+            f'Start date {date_from} is after end date {date_to}.'
+        )
+
+    return date_from, date_to
+
+
+def get_datetime_range_filter(
+    *, field_name: str, date_from: date, date_to: date
+) -> Q:
+    """Filter a datetime field to the days of the range.
+
+    Uses plain comparisons against the day boundaries of the current
+    timezone, which unlike the `__date` lookup can use the field index.
+    """
+    start = datetime.combine(date_from, time.min)
+    end = datetime.combine(date_to + timedelta(days=1), time.min)
+
+    if settings.USE_TZ:
+        start = timezone.make_aware(start)
+        end = timezone.make_aware(end)
+
+    return Q(**{f'{field_name}__gte': start, f'{field_name}__lt': end})
+
+
+def bulk_upsert(
+    *,
+    model,
+    objs: Iterable,
+    unique_fields: Sequence[str],
+    update_fields: Sequence[str],
+    batch_size: int = ANALYTICS_AGGREGATION_BATCH_SIZE
+) -> int:
+    """Insert or update model instances in batches.
+
+    Uses `bulk_create(update_conflicts=True)` where available. Otherwise
+    each batch costs one query to find the existing rows by their unique
+    fields, one `bulk_update`, and one `bulk_create`.
+
+    Args:
+        model: Model class of the instances.
+        objs: Iterable of unsaved instances. Consumed lazily.
+        unique_fields: Field names identifying a row.
+        update_fields: Field names to overwrite on existing rows.
+        batch_size: Number of instances per batch.
+
+    Returns:
+        Number of rows written.
+    """
+    manager = model._default_manager
+    unique_attnames = [
+        model._meta.get_field(field_name).attname
+        for field_name in unique_fields
+    ]
+
+    def get_key(instance):
+        return tuple(
+            getattr(instance, attname) for attname in unique_attnames
+        )
+
+    count = 0
+    iterator = iter(objs)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            break
+
+        if django.VERSION >= (4, 1):
+            manager.bulk_create(
+                objs=batch, unique_fields=unique_fields,
+                update_conflicts=True, update_fields=update_fields
+            )
+        else:
+            with transaction.atomic():
+                existing_filter = {
+                    f'{attname}__in': {
+                        getattr(instance, attname) for instance in batch
+                    } for attname in unique_attnames
+                }
+                existing_pks = {
+                    tuple(row[:-1]): row[-1] for row in manager.filter(
+                        **existing_filter
+                    ).values_list(*unique_attnames, 'pk')
+                }
+
+                objs_create = []
+                objs_update = []
+                for instance in batch:
+                    pk = existing_pks.get(get_key(instance=instance))
+                    if pk is None:
+                        objs_create.append(instance)
+                    else:
+                        instance.pk = pk
+                        objs_update.append(instance)
+
+                if objs_update:
+                    manager.bulk_update(
+                        objs=objs_update, fields=update_fields
+                    )
+                if objs_create:
+                    manager.bulk_create(objs=objs_create)
+
+        count += len(batch)
+
+    return count
+
+
+def _iterate_top_by_key(rows, limit: int):
+    """Group rows of (key, value) sorted by key into lists of values."""
+    for key, group in itertools.groupby(rows, key=lambda row: row[0]):
+        yield key, [row[1] for row in itertools.islice(group, limit)]
+
+
+def aggregate_asset_daily_metrics(*, date_from: date, date_to: date) -> int:
+    """Roll AssetEvent rows up into AssetDailyMetrics.
+
+    The counters and the top channel are read with two grouped queries
+    sorted by the same key and merged in a single pass, computing the
+    performance score along the way.
+
+    Returns:
+        Number of rows upserted.
+    """
+    queryset = AssetEvent.objects.filter(
+        get_datetime_range_filter(
+            field_name='timestamp', date_from=date_from, date_to=date_to
+        )
+    ).annotate(day=TruncDate('timestamp'))
+
+    metric_rows = queryset.values('day', 'document_id').annotate(
+        downloads=Count('pk', filter=Q(event_type=AssetEvent.EVENT_TYPE_DOWNLOAD)),
+        views=Count('pk', filter=Q(event_type=AssetEvent.EVENT_TYPE_VIEW)),
+        shares=Count('pk', filter=Q(event_type=AssetEvent.EVENT_TYPE_SHARE)),
+        bandwidth_bytes=Sum('bandwidth_bytes', filter=Q(event_type=AssetEvent.EVENT_TYPE_DELIVER)),
+    ).order_by('day', 'document_id').iterator(
+        chunk_size=ANALYTICS_AGGREGATION_BATCH_SIZE
+    )
+
+    channel_rows = queryset.exclude(channel='').values(
+        'day', 'document_id', 'channel'
+    ).annotate(count=Count('pk')).order_by(
+        'day', 'document_id', '-count', 'channel'
+    ).values_list('day', 'document_id', 'channel', 'count').iterator(
+        chunk_size=ANALYTICS_AGGREGATION_BATCH_SIZE
+    )
+
+    def get_metrics():
+        channel_row = next(channel_rows, None)
+
+        for row in metric_rows:
+            key = (row['day'], row['document_id'])
+
+            top_channel = ''
+            while channel_row is not None and channel_row[:2] <= key:
+                if channel_row[:2] == key and not top_channel:
+                    top_channel = channel_row[2]
+                channel_row = next(channel_rows, None)
+
+            bandwidth_bytes = row['bandwidth_bytes'] or 0
+            metrics = AssetDailyMetrics(
+                cdn_bandwidth_gb=round(bandwidth_bytes / (1024 ** 3), 6) if bandwidth_bytes else 0.0,
+                date=row['day'], document_id=row['document_id'],
+                downloads=row['downloads'] or 0, shares=row['shares'] or 0,
+                top_channel=top_channel, views=row['views'] or 0
+            )
+            metrics.performance_score = metrics.calculate_performance_score()
+            yield metrics
+
+    return bulk_upsert(
+        model=AssetDailyMetrics, objs=get_metrics(),
+        unique_fields=('document', 'date'), update_fields=(
+            'cdn_bandwidth_gb', 'downloads', 'performance_score', 'shares',
+            'top_channel', 'views'
+        )
+    )
+
+
+def aggregate_search_daily_metrics(*, date_from: date, date_to: date) -> int:
+    """Roll SearchQuery rows up into SearchDailyMetrics.
+
+    Every date of the range gets a row, days without searches are
+    written with zero totals.
+
+    Returns:
+        Number of rows upserted.
+    """
+    queryset = SearchQuery.objects.filter(
+        get_datetime_range_filter(
+            field_name='timestamp', date_from=date_from, date_to=date_to
+        )
+    ).annotate(day=TruncDate('timestamp'))
+
+    totals = {
+        row['day']: row for row in queryset.values('day').annotate(
+            total_searches=Count('pk'),
+            # Success definition (enterprise DAM): success if user clicked
+            # or downloaded after search.
+            successful_searches=Count(
+                'pk', filter=Q(was_downloaded=True) | Q(
+                    was_clicked_result_document_id__isnull=False
+                )
+            ),
+            null_searches=Count('pk', filter=Q(results_count=0)),
+            click_count=Count(
+                'pk', filter=Q(was_clicked_result_document_id__isnull=False)
+            ),
+            avg_response_time_ms=Avg('response_time_ms')
+        ).order_by()
+    }
+
+    def get_top_queries(queryset):
+        rows = queryset.values('day', 'query_text').annotate(
+            count=Count('pk')
+        ).order_by('day', '-count', 'query_text').values_list(
+            'day', 'query_text', 'count'
+        ).iterator(chunk_size=ANALYTICS_AGGREGATION_BATCH_SIZE)
+
+        return {
+            day: [
+                {'query_text': query_text, 'count': count}
+                for query_text, count in values
+            ] for day, values in _iterate_top_by_key(
+                rows=((row[0], row[1:]) for row in rows),
+                limit=SEARCH_TOP_QUERIES_LIMIT
+            )
+        }
+
+    null_queries = get_top_queries(
+        queryset=queryset.filter(results_count=0)
+    )
+    top_queries = get_top_queries(queryset=queryset)
+
+    def get_metrics():
+        day = date_from
+        while day <= date_to:
+            row = totals.get(day)
+            if row:
+                avg_response_time_ms = row['avg_response_time_ms']
+                yield SearchDailyMetrics(
+                    avg_response_time_ms=int(avg_response_time_ms) if avg_response_time_ms is not None else None,
+                    ctr=round((row['click_count'] / row['total_searches']) * 100, 2),
+                    date=day, null_queries=null_queries.get(day, []),
+                    null_searches=row['null_searches'],
+                    successful_searches=row['successful_searches'],
+                    top_queries=top_queries.get(day, []),
+                    total_searches=row['total_searches']
+                )
+            else:
+                yield SearchDailyMetrics(
+                    avg_response_time_ms=None, ctr=None, date=day,
+                    null_queries=[], null_searches=0,
+                    successful_searches=0, top_queries=[], total_searches=0
+                )
+
+            day += timedelta(days=1)
+
+    return bulk_upsert(
+        model=SearchDailyMetrics, objs=get_metrics(),
+        unique_fields=('date',), update_fields=(
+            'avg_response_time_ms', 'ctr', 'null_queries', 'null_searches',
+            'successful_searches', 'top_queries', 'total_searches'
+        )
+    )
+
+
+def aggregate_user_daily_metrics(*, date_from: date, date_to: date) -> int:
+    """Roll SearchSession rows up into the average search-to-find time of
+    UserDailyMetrics.
+
+    Returns:
+        Number of rows upserted.
+    """
+    rows = SearchSession.objects.filter(
+        get_datetime_range_filter(
+            field_name='started_at', date_from=date_from, date_to=date_to
+        ), time_to_find_seconds__isnull=False
+    ).annotate(day=TruncDate('started_at')).values('day', 'user_id').annotate(
+        avg_seconds=Avg('time_to_find_seconds')
+    ).order_by().iterator(chunk_size=ANALYTICS_AGGREGATION_BATCH_SIZE)
+
+    return bulk_upsert(
+        model=UserDailyMetrics, objs=(
+            UserDailyMetrics(
+                avg_search_to_find_minutes=int((row['avg_seconds'] or 0) / 60),
+                date=row['day'], user_id=row['user_id']
+            ) for row in rows
+        ), unique_fields=('user', 'date'),
+        update_fields=('avg_search_to_find_minutes',)
+    )
+
+
+def aggregate_campaign_engagement_daily_metrics(
+    *, date_from: date, date_to: date
+) -> int:
+    """Roll CampaignEngagementEvent rows up into the average engagement of
+    CampaignDailyMetrics.
+
+    Returns:
+        Number of rows upserted.
+    """
+    rows = CampaignEngagementEvent.objects.filter(
+        get_datetime_range_filter(
+            field_name='started_at', date_from=date_from, date_to=date_to
+        )
+    ).annotate(day=TruncDate('started_at')).values(
+        'day', 'campaign_id'
+    ).annotate(avg_seconds=Avg('duration_seconds')).order_by().iterator(
+        chunk_size=ANALYTICS_AGGREGATION_BATCH_SIZE
+    )
+
+    return bulk_upsert(
+        model=CampaignDailyMetrics, objs=(
+            CampaignDailyMetrics(
+                avg_engagement_minutes=round(float(row['avg_seconds']) / 60.0, 3) if row['avg_seconds'] is not None else None,
+                campaign_id=row['campaign_id'], date=row['day']
+            ) for row in rows
+        ), unique_fields=('campaign', 'date'),
+        update_fields=('avg_engagement_minutes',)
+    )
+
+
+def calculate_cdn_daily_costs(*, date_from: date, date_to: date) -> int:
+    """Compute CDNDailyCost rows from the bandwidth of AssetDailyMetrics.
+
+    Channels are derived from `AssetDailyMetrics.top_channel` (or
+    'default' if empty) and priced with the rate in effect on each date.
+
+    Returns:
+        Number of rows upserted.
+    """
+    rates = list(
+        CDNRate.objects.filter(effective_from__lte=date_to).filter(
+            Q(effective_to__isnull=True) | Q(effective_to__gte=date_from)
+        )
+    )
+
+    def pick_rate(channel: str, day: date) -> Optional[CDNRate]:
+        rates_in_effect = [
+            rate for rate in rates if rate.effective_from <= day and (
+                rate.effective_to is None or rate.effective_to >= day
+            )
+        ]
+        for rate in rates_in_effect:
+            if rate.channel == channel:
+                return rate
+        for rate in rates_in_effect:
+            if rate.channel == 'default':
+                return rate
+        return None
+
+    bandwidth = {}
+    for day, top_channel, total_gb in AssetDailyMetrics.objects.filter(
+        date__gte=date_from, date__lte=date_to
+    ).values('date', 'top_channel').annotate(
+        total_gb=Sum('cdn_bandwidth_gb')
+    ).order_by().values_list('date', 'top_channel', 'total_gb'):
+        key = (day, (top_channel or '').strip() or 'default')
+        bandwidth[key] = bandwidth.get(key, 0.0) + float(total_gb or 0.0)
+
+    costs = {}
+    for (day, channel), total_gb in sorted(bandwidth.items()):
+        if total_gb <= 0:
+            continue
+
+        rate = pick_rate(channel=channel, day=day)
+        if not rate:
+            continue
+
+        costs[(day, rate.region, channel)] = CDNDailyCost(
+            bandwidth_gb=total_gb, channel=channel,
+            cost_usd=(
+                Decimal(str(total_gb)) * rate.cost_per_gb_usd
+            ).quantize(Decimal('0.01')), date=day, region=rate.region
+        )
+
+    return bulk_upsert(
+        model=CDNDailyCost, objs=costs.values(),
+        unique_fields=('date', 'region', 'channel'),
+        update_fields=('bandwidth_gb', 'cost_usd')
+    )
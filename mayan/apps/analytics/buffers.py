@@ -0,0 +1,258 @@
+"""Buffered analytics event ingestion.
+
+Analytics rows are appended to a bounded in-process queue and written with
+`bulk_create` by a background flusher thread, so request latency does not
+depend on the analytics write volume.
+"""
+
+from __future__ import annotations
+
+import atexit
+from collections import deque
+from functools import partial
+import logging
+import os
+import threading
+from typing import Optional
+
+from django.db import close_old_connections, models, transaction
+
+from .settings import (
+    setting_event_buffer_batch_size, setting_event_buffer_block_timeout,
+    setting_event_buffer_enabled, setting_event_buffer_flush_interval,
+    setting_event_buffer_maximum_size
+)
+
+logger = logging.getLogger(name=__name__)
+
+
+class EventBuffer:
+    """Bounded queue of unsaved model instances flushed in batches.
+
+    Producers never touch the database. When the queue is full the
+    producer waits up to `block_timeout` seconds for the flusher to make
+    room (backpressure); if there is still no room the event is dropped
+    and counted in `dropped_count`. The flusher thread is started with the
+    first event unless `autostart` is disabled, in which case `flush` must
+    be called explicitly.
+    """
+
+    def __init__(
+        self,
+        *,
+        autostart: bool = True,
+        batch_size: int,
+        block_timeout: float,
+        flush_interval: float,
+        maximum_size: int
+    ):
+        self.autostart = autostart
+        self.batch_size = max(1, int(batch_size))
+        self.block_timeout = max(0, float(block_timeout))
+        self.flush_interval = max(0.1, float(flush_interval))
+        self.maximum_size = max(1, int(maximum_size))
+
+        self.dropped_count = 0
+        self.written_count = 0
+
+        self._condition = threading.Condition()
+        self._dropped_count_reported = 0
+        self._pid = None
+        self._queue = deque()
+        self._stopped = False
+        self._thread = None
+
+    def __len__(self):
+        return len(self._queue)
+
+    def _reset_after_fork(self):
+        # Threads do not survive a fork. Events queued in the parent are
+        # flushed by the parent, the child starts empty.
+        self._condition = threading.Condition()
+        self._queue = deque()
+        self._stopped = False
+        self._thread = None
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    predicate=lambda: self._stopped or len(self._queue) >= self.batch_size,
+                    timeout=self.flush_interval
+                )
+                stopped = self._stopped
+
+            close_old_connections()
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+            if stopped:
+                break
+
+    def _start(self):
+        with self._condition:
+            if self._pid != os.getpid():
+                if self._pid is not None:
+                    self._reset_after_fork()
+                self._pid = os.getpid()
+
+            if self._thread is None and not self._stopped:
+                self._thread = threading.Thread(
+                    daemon=True, name='analytics-event-buffer',
+                    target=self._run
+                )
+                self._thread.start()
+
+    def _write(self, batch: list) -> int:
+        batches_by_model = {}
+        for instance in batch:
+            batches_by_model.setdefault(type(instance), []).append(instance)
+
+        count = 0
+        for model, instances in batches_by_model.items():
+            try:
+                model._default_manager.bulk_create(objs=instances)
+            except Exception as exception:
+                # A single invalid row (e.g. a document deleted in the
+                # meantime) must not discard the whole batch.
+                logger.warning(
+                    'Bulk insert of %d %s analytics events failed; %s. '
+                    'Retrying individually.', len(instances),
+                    model._meta.label, exception
+                )
+                for instance in instances:
+                    try:
+                        instance.save(force_insert=True)
+                    except Exception:
+                        with self._condition:
+                            self.dropped_count += 1
+                    else:
+                        count += 1
+            else:
+                count += len(instances)
+
+        return count
+
+    def enqueue(self, instance: models.Model) -> bool:
+        """Queue an unsaved model instance for writing.
+
+        Args:
+            instance: Unsaved model instance.
+
+        Returns:
+            False if the buffer was full and the event was dropped.
+        """
+        if self.autostart:
+            self._start()
+
+        with self._condition:
+            if len(self._queue) >= self.maximum_size:
+                self._condition.notify_all()
+                self._condition.wait_for(
+                    predicate=lambda: len(self._queue) < self.maximum_size,
+                    timeout=self.block_timeout
+                )
+                if len(self._queue) >= self.maximum_size:
+                    self.dropped_count += 1
+                    return False
+
+            self._queue.append(instance)
+            if len(self._queue) >= self.batch_size:
+                self._condition.notify_all()
+
+        return True
+
+    def flush(self) -> int:
+        """Write all queued events to the database.
+
+        Returns:
+            Number of events written.
+        """
+        count = 0
+        while True:
+            with self._condition:
+                batch = [
+                    self._queue.popleft() for index in range(
+                        min(self.batch_size, len(self._queue))
+                    )
+                ]
+                # Wake up producers waiting for space.
+                self._condition.notify_all()
+
+            if not batch:
+                break
+
+            count += self._write(batch=batch)
+
+        with self._condition:
+            self.written_count += count
+            dropped_count = self.dropped_count - self._dropped_count_reported
+            self._dropped_count_reported = self.dropped_count
+
+        if dropped_count:
+            logger.warning(
+                'Analytics event buffer dropped %d events; %d dropped '
+                'since start.', dropped_count, self.dropped_count
+            )
+
+        return count
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the flusher thread and write the remaining events."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+            thread = self._thread
+
+        if thread and thread.is_alive() and self._pid == os.getpid():
+            thread.join(timeout=timeout)
+
+        self.flush()
+
+
+_event_buffer = None
+_event_buffer_lock = threading.Lock()
+
+
+def get_event_buffer() -> EventBuffer:
+    global _event_buffer
+
+    if _event_buffer is None:
+        with _event_buffer_lock:
+            if _event_buffer is None:
+                event_buffer = EventBuffer(
+                    batch_size=setting_event_buffer_batch_size.value,
+                    block_timeout=setting_event_buffer_block_timeout.value,
+                    flush_interval=setting_event_buffer_flush_interval.value,
+                    maximum_size=setting_event_buffer_maximum_size.value
+                )
+                atexit.register(event_buffer.stop)
+                _event_buffer = event_buffer
+
+    return _event_buffer
+
+
+def record_event(instance: models.Model) -> models.Model:
+    """Persist an analytics model instance without blocking the caller.
+
+    The instance is queued once the current transaction commits, so rows
+    referencing objects created in the same transaction are never written
+    ahead of them and events of rolled back transactions are discarded.
+    When buffering is disabled the instance is saved immediately.
+
+    Args:
+        instance: Unsaved model instance.
+
+    Returns:
+        The same instance. It has no primary key when buffered.
+    """
+    if setting_event_buffer_enabled.value:
+        transaction.on_commit(
+            func=partial(get_event_buffer().enqueue, instance=instance)
+        )
+    else:
+        instance.save()
+
+    return instance
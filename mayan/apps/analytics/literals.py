@@ -0,0 +1,8 @@
+DEFAULT_ANALYTICS_EVENT_BUFFER_BATCH_SIZE = 500
+DEFAULT_ANALYTICS_EVENT_BUFFER_BLOCK_TIMEOUT = 0.05
+DEFAULT_ANALYTICS_EVENT_BUFFER_ENABLED = True
+DEFAULT_ANALYTICS_EVENT_BUFFER_FLUSH_INTERVAL = 2
+DEFAULT_ANALYTICS_EVENT_BUFFER_MAXIMUM_SIZE = 10000
+
+ANALYTICS_AGGREGATION_BATCH_SIZE = 1000
+SEARCH_TOP_QUERIES_LIMIT = 20
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from mayan.apps.analytics import aggregation
+
+
+class Command(BaseCommand):
+    """Compute the daily analytics rollups for a date range in one run.
+
+    Asset metrics are aggregated before the CDN costs, which are derived
+    from them.
+    """
+
+    help = 'Aggregate (or backfill) daily analytics metrics for a date range.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date-from', default='', help='First ISO date (YYYY-MM-DD). Defaults to yesterday.')
+        parser.add_argument('--date-to', default='', help='Last ISO date (YYYY-MM-DD). Defaults to --date-from.')
+
+    def handle(self, *args, **options):
+        try:
+            date_from, date_to = aggregation.get_date_range(
+                date_from_iso=options['date_from'], date_to_iso=options['date_to']
+            )
+        except ValueError as exception:
+            raise CommandError(str(exception))
+
+        steps = (
+            ('asset', aggregation.aggregate_asset_daily_metrics),
+            ('search', aggregation.aggregate_search_daily_metrics),
+            ('user', aggregation.aggregate_user_daily_metrics),
+            ('campaign engagement', aggregation.aggregate_campaign_engagement_daily_metrics),
+            ('CDN cost', aggregation.calculate_cdn_daily_costs),
+        )
+
+        for label, function in steps:
+            count = function(date_from=date_from, date_to=date_to)
+            self.stdout.write(
+                f'{label}: {count} rows upserted for {date_from} - {date_to}.'
+            )
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('analytics', '0008_distribution_events'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='assetevent',
+            name='timestamp',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False, verbose_name='Timestamp'),
+        ),
+        migrations.AlterField(
+            model_name='featureusage',
+            name='timestamp',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False, verbose_name='Timestamp'),
+        ),
+    ]
@@ -3,6 +3,7 @@ import math
 
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
 
@@ -62,8 +63,11 @@ class AssetEvent(models.Model):
     latency_seconds = models.IntegerField(
         blank=True, null=True, verbose_name=_('Latency (seconds)')
     )
+    # Set at creation rather than at insertion, events are written in
+    # batches after the fact by the event buffer.
     timestamp = models.DateTimeField(
-        auto_now_add=True, db_index=True, verbose_name=_('Timestamp')
+        db_index=True, default=timezone.now, editable=False,
+        verbose_name=_('Timestamp')
     )
     metadata = models.JSONField(
         blank=True, default=dict, verbose_name=_('Metadata')
@@ -659,7 +663,7 @@ class FeatureUsage(models.Model):
         verbose_name=_('User')
     )
     feature_name = models.CharField(max_length=100, db_index=True, verbose_name=_('Feature name'))
-    timestamp = models.DateTimeField(auto_now_add=True, db_index=True, verbose_name=_('Timestamp'))
+    timestamp = models.DateTimeField(db_index=True, default=timezone.now, editable=False, verbose_name=_('Timestamp'))
     was_successful = models.BooleanField(default=True, verbose_name=_('Was successful'))
     metadata = models.JSONField(blank=True, default=dict, verbose_name=_('Metadata'))
 
@@ -11,6 +11,7 @@ from typing import Optional
 
 from django.utils import timezone
 
+from .buffers import record_event
 from .models import AssetEvent, FeatureUsage, SearchQuery, SearchSession
 
 
@@ -106,7 +107,7 @@ def track_feature_usage(
         metadata: Optional JSON metadata.
 
     Returns:
-        FeatureUsage row or None on failure.
+        Buffered FeatureUsage instance or None on failure.
     """
     if not user or getattr(user, 'is_authenticated', False) is False:
         return None
@@ -116,11 +117,13 @@ def track_feature_usage(
         return None
 
     try:
-        return FeatureUsage.objects.create(
-            user=user,
-            feature_name=feature_name[:100],
-            was_successful=bool(was_successful),
-            metadata=metadata or {}
+        return record_event(
+            instance=FeatureUsage(
+                user=user,
+                feature_name=feature_name[:100],
+                was_successful=bool(was_successful),
+                metadata=metadata or {}
+            )
         )
     except Exception:
         return None
@@ -0,0 +1,55 @@
+from django.utils.translation import ugettext_lazy as _
+
+from mayan.apps.smart_settings.classes import SettingNamespace
+
+from .literals import (
+    DEFAULT_ANALYTICS_EVENT_BUFFER_BATCH_SIZE,
+    DEFAULT_ANALYTICS_EVENT_BUFFER_BLOCK_TIMEOUT,
+    DEFAULT_ANALYTICS_EVENT_BUFFER_ENABLED,
+    DEFAULT_ANALYTICS_EVENT_BUFFER_FLUSH_INTERVAL,
+    DEFAULT_ANALYTICS_EVENT_BUFFER_MAXIMUM_SIZE
+)
+
+namespace = SettingNamespace(label=_('Analytics'), name='analytics')
+
+setting_event_buffer_batch_size = namespace.add_setting(
+    default=DEFAULT_ANALYTICS_EVENT_BUFFER_BATCH_SIZE,
+    global_name='ANALYTICS_EVENT_BUFFER_BATCH_SIZE',
+    help_text=_(
+        'Maximum number of analytics events written to the database in '
+        'a single bulk insert.'
+    )
+)
+setting_event_buffer_block_timeout = namespace.add_setting(
+    default=DEFAULT_ANALYTICS_EVENT_BUFFER_BLOCK_TIMEOUT,
+    global_name='ANALYTICS_EVENT_BUFFER_BLOCK_TIMEOUT',
+    help_text=_(
+        'Time in seconds a request will wait for space when the analytics '
+        'event buffer is full before the event is dropped.'
+    )
+)
+setting_event_buffer_enabled = namespace.add_setting(
+    default=DEFAULT_ANALYTICS_EVENT_BUFFER_ENABLED,
+    global_name='ANALYTICS_EVENT_BUFFER_ENABLED',
+    help_text=_(
+        'Queue analytics events in memory and write them in batches from '
+        'a background thread. When disabled, events are written during '
+        'the request.'
+    )
+)
+setting_event_buffer_flush_interval = namespace.add_setting(
+    default=DEFAULT_ANALYTICS_EVENT_BUFFER_FLUSH_INTERVAL,
+    global_name='ANALYTICS_EVENT_BUFFER_FLUSH_INTERVAL',
+    help_text=_(
+        'Maximum time in seconds analytics events are kept in the buffer '
+        'before being written to the database.'
+    )
+)
+setting_event_buffer_maximum_size = namespace.add_setting(
+    default=DEFAULT_ANALYTICS_EVENT_BUFFER_MAXIMUM_SIZE,
+    global_name='ANALYTICS_EVENT_BUFFER_MAXIMUM_SIZE',
+    help_text=_(
+        'Maximum number of analytics events held in memory per process. '
+        'Events received while the buffer is full are dropped and counted.'
+    )
+)
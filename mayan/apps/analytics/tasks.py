@@ -1,20 +1,19 @@
 import logging
 from datetime import timedelta
-from decimal import Decimal
 
 from celery import shared_task
 from django.apps import apps as django_apps
 from django.conf import settings
-from django.db.models import Avg, Count, Q, Sum
+from django.db.models import Sum
 from django.utils import timezone
-from typing import Optional
 
 from mayan.apps.documents.models import Document
 
+from . import aggregation
+from .aggregation import get_date_range
 from .models import (
     ApprovalWorkflowEvent, AnalyticsAlert, AssetDailyMetrics, AssetEvent,
-    CampaignDailyMetrics, CDNDailyCost, CDNRate, SearchDailyMetrics, SearchQuery,
-    SearchSession, UserDailyMetrics, CampaignEngagementEvent
+    SearchDailyMetrics, SearchQuery, SearchSession, UserDailyMetrics
 )
 from .realtime import notify_analytics_refresh
 
@@ -22,63 +21,26 @@ logger = logging.getLogger(name=__name__)
 
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=60, queue='documents')
-def aggregate_daily_metrics(self, date_iso: str = '') -> int:
+def aggregate_daily_metrics(
+    self, date_iso: str = '', date_from_iso: str = '', date_to_iso: str = ''
+) -> int:
     """Aggregate raw AssetEvent rows into AssetDailyMetrics.
 
     Args:
         date_iso: Optional ISO date (YYYY-MM-DD). If omitted, aggregates for yesterday.
+        date_from_iso: Optional first ISO date of a range to backfill.
+        date_to_iso: Optional last ISO date of a range to backfill.
 
     Returns:
-        Number of documents aggregated (rows upserted).
+        Number of document days aggregated (rows upserted).
     """
-    if date_iso:
-        target_date = timezone.datetime.fromisoformat(date_iso).date()
-    else:
-        target_date = timezone.now().date() - timedelta(days=1)
-
-    rows = (
-        AssetEvent.objects.filter(timestamp__date=target_date)
-        .values('document_id')
-        .annotate(
-            downloads=Count('id', filter=Q(event_type=AssetEvent.EVENT_TYPE_DOWNLOAD)),
-            views=Count('id', filter=Q(event_type=AssetEvent.EVENT_TYPE_VIEW)),
-            shares=Count('id', filter=Q(event_type=AssetEvent.EVENT_TYPE_SHARE)),
-            bandwidth_bytes=Sum('bandwidth_bytes', filter=Q(event_type=AssetEvent.EVENT_TYPE_DELIVER)),
-        )
+    date_from, date_to = get_date_range(
+        date_iso=date_iso, date_from_iso=date_from_iso, date_to_iso=date_to_iso
     )
 
-    # Precompute top channel per document for the date (best-effort).
-    top_channel_map = {}
-    for row in (
-        AssetEvent.objects.filter(timestamp__date=target_date)
-        .exclude(channel='')
-        .values('document_id', 'channel')
-        .annotate(count=Count('id'))
-        .order_by('document_id', '-count')
-    ):
-        document_id = row['document_id']
-        if document_id not in top_channel_map:
-            top_channel_map[document_id] = row.get('channel') or ''
-
-    upserts = 0
-    for row in rows:
-        bandwidth_bytes = row.get('bandwidth_bytes') or 0
-        metrics, _ = AssetDailyMetrics.objects.update_or_create(
-            document_id=row['document_id'],
-            date=target_date,
-            defaults={
-                'downloads': row.get('downloads') or 0,
-                'views': row.get('views') or 0,
-                'shares': row.get('shares') or 0,
-                'cdn_bandwidth_gb': round(bandwidth_bytes / (1024 ** 3), 6) if bandwidth_bytes else 0.0,
-            }
-        )
-
-        # Compute derived fields.
-        metrics.performance_score = metrics.calculate_performance_score()
-        metrics.top_channel = top_channel_map.get(metrics.document_id, '') or ''
-        metrics.save(update_fields=('performance_score', 'top_channel'))
-        upserts += 1
+    upserts = aggregation.aggregate_asset_daily_metrics(
+        date_from=date_from, date_to=date_to
+    )
 
     try:
         notify_analytics_refresh(reason='aggregate_daily_metrics')
@@ -89,77 +51,25 @@ def aggregate_daily_metrics(self, date_iso: str = '') -> int:
 
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=60, queue='documents')
-def aggregate_search_daily_metrics(self, date_iso: str = '') -> int:
+def aggregate_search_daily_metrics(
+    self, date_iso: str = '', date_from_iso: str = '', date_to_iso: str = ''
+) -> int:
     """Aggregate raw SearchQuery rows into SearchDailyMetrics.
 
     Args:
         date_iso: Optional ISO date (YYYY-MM-DD). If omitted, aggregates for yesterday.
+        date_from_iso: Optional first ISO date of a range to backfill.
+        date_to_iso: Optional last ISO date of a range to backfill.
 
     Returns:
-        1 if aggregated for the date (row upserted), otherwise 0.
+        Number of days aggregated (rows upserted).
     """
-    if date_iso:
-        target_date = timezone.datetime.fromisoformat(date_iso).date()
-    else:
-        target_date = timezone.now().date() - timedelta(days=1)
-
-    qs = SearchQuery.objects.filter(timestamp__date=target_date)
-
-    total_searches = qs.count()
-    if not total_searches:
-        SearchDailyMetrics.objects.update_or_create(
-            date=target_date,
-            defaults={
-                'total_searches': 0,
-                'successful_searches': 0,
-                'null_searches': 0,
-                'ctr': None,
-                'avg_response_time_ms': None,
-                'top_queries': [],
-                'null_queries': [],
-            }
-        )
-        try:
-            notify_analytics_refresh(reason='aggregate_search_daily_metrics')
-        except Exception:
-            pass
-        return 1
-
-    # Success definition (enterprise DAM): success if user clicked or downloaded after search.
-    successful_searches = qs.filter(
-        Q(was_downloaded=True) | Q(was_clicked_result_document_id__isnull=False)
-    ).count()
-    null_searches = qs.filter(results_count=0).count()
-
-    click_count = qs.filter(was_clicked_result_document_id__isnull=False).count()
-    ctr = None
-    if total_searches:
-        ctr = round((click_count / total_searches) * 100, 2)
-
-    avg_response_time_ms = qs.aggregate(
-        avg=Avg('response_time_ms')
-    )['avg']
-    if avg_response_time_ms is not None:
-        avg_response_time_ms = int(avg_response_time_ms)
-
-    top_queries = list(
-        qs.values('query_text').annotate(count=Count('id')).order_by('-count')[:20]
-    )
-    null_queries = list(
-        qs.filter(results_count=0).values('query_text').annotate(count=Count('id')).order_by('-count')[:20]
+    date_from, date_to = get_date_range(
+        date_iso=date_iso, date_from_iso=date_from_iso, date_to_iso=date_to_iso
     )
 
-    SearchDailyMetrics.objects.update_or_create(
-        date=target_date,
-        defaults={
-            'total_searches': total_searches,
-            'successful_searches': successful_searches,
-            'null_searches': null_searches,
-            'ctr': ctr,
-            'avg_response_time_ms': avg_response_time_ms,
-            'top_queries': top_queries,
-            'null_queries': null_queries,
-        }
+    upserts = aggregation.aggregate_search_daily_metrics(
+        date_from=date_from, date_to=date_to
     )
 
     try:
@@ -167,7 +77,7 @@ def aggregate_search_daily_metrics(self, date_iso: str = '') -> int:
     except Exception:
         pass
 
-    return 1
+    return upserts
 
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=60, queue='documents')
@@ -396,41 +306,26 @@ def generate_analytics_alerts(self, days: int = 90) -> dict:
 
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=60, queue='documents')
-def aggregate_user_daily_metrics(self, date_iso: str = '') -> int:
+def aggregate_user_daily_metrics(
+    self, date_iso: str = '', date_from_iso: str = '', date_to_iso: str = ''
+) -> int:
     """Aggregate user-level metrics, including Avg Search-to-Find Time.
 
     Args:
         date_iso: Optional ISO date (YYYY-MM-DD). If omitted, aggregates for yesterday.
+        date_from_iso: Optional first ISO date of a range to backfill.
+        date_to_iso: Optional last ISO date of a range to backfill.
 
     Returns:
-        Number of users aggregated (rows upserted).
+        Number of user days aggregated (rows upserted).
     """
-    if date_iso:
-        target_date = timezone.datetime.fromisoformat(date_iso).date()
-    else:
-        target_date = timezone.now().date() - timedelta(days=1)
-
-    sessions_qs = SearchSession.objects.filter(
-        started_at__date=target_date,
-        time_to_find_seconds__isnull=False
+    date_from, date_to = get_date_range(
+        date_iso=date_iso, date_from_iso=date_from_iso, date_to_iso=date_to_iso
     )
 
-    user_ids = list(sessions_qs.values_list('user_id', flat=True).distinct())
-    upserts = 0
-    for user_id in user_ids:
-        avg_seconds = sessions_qs.filter(user_id=user_id).aggregate(
-            avg=Avg('time_to_find_seconds')
-        )['avg']
-        avg_minutes = int((avg_seconds or 0) / 60) if avg_seconds is not None else None
-
-        UserDailyMetrics.objects.update_or_create(
-            user_id=user_id,
-            date=target_date,
-            defaults={
-                'avg_search_to_find_minutes': avg_minutes
-            }
-        )
-        upserts += 1
+    upserts = aggregation.aggregate_user_daily_metrics(
+        date_from=date_from, date_to=date_to
+    )
 
     try:
         notify_analytics_refresh(reason='aggregate_user_daily_metrics')
@@ -441,7 +336,9 @@ def aggregate_user_daily_metrics(self, date_iso: str = '') -> int:
 
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=60, queue='documents')
-def calculate_cdn_daily_costs(self, date_iso: str = '') -> int:
+def calculate_cdn_daily_costs(
+    self, date_iso: str = '', date_from_iso: str = '', date_to_iso: str = ''
+) -> int:
     """Calculate daily CDN cost rollups based on bandwidth and configured rates.
 
     Notes:
@@ -450,57 +347,20 @@ def calculate_cdn_daily_costs(self, date_iso: str = '') -> int:
 
     Args:
         date_iso: Optional ISO date (YYYY-MM-DD). If omitted, calculates for yesterday.
+        date_from_iso: Optional first ISO date of a range to backfill.
+        date_to_iso: Optional last ISO date of a range to backfill.
 
     Returns:
         Number of rows upserted in CDNDailyCost.
     """
-    if date_iso:
-        target_date = timezone.datetime.fromisoformat(date_iso).date()
-    else:
-        target_date = timezone.now().date() - timedelta(days=1)
-
-    rates = list(
-        CDNRate.objects.filter(effective_from__lte=target_date).filter(
-            Q(effective_to__isnull=True) | Q(effective_to__gte=target_date)
-        )
+    date_from, date_to = get_date_range(
+        date_iso=date_iso, date_from_iso=date_from_iso, date_to_iso=date_to_iso
     )
 
-    def pick_rate(channel: str) -> Optional[CDNRate]:
-        for rate in rates:
-            if rate.channel == channel:
-                return rate
-        for rate in rates:
-            if rate.channel == 'default':
-                return rate
-        return None
-
-    rows = (
-        AssetDailyMetrics.objects.filter(date=target_date)
-        .values('top_channel')
-        .annotate(total_gb=Sum('cdn_bandwidth_gb'))
+    upserts = aggregation.calculate_cdn_daily_costs(
+        date_from=date_from, date_to=date_to
     )
 
-    upserts = 0
-    for row in rows:
-        channel = (row.get('top_channel') or '').strip() or 'default'
-        total_gb = float(row.get('total_gb') or 0.0)
-        if total_gb <= 0:
-            continue
-
-        rate = pick_rate(channel=channel)
-        if not rate:
-            continue
-
-        cost = (Decimal(str(total_gb)) * rate.cost_per_gb_usd).quantize(Decimal('0.01'))
-
-        CDNDailyCost.objects.update_or_create(
-            date=target_date,
-            region=rate.region,
-            channel=channel,
-            defaults={'bandwidth_gb': total_gb, 'cost_usd': cost}
-        )
-        upserts += 1
-
     try:
         notify_analytics_refresh(reason='calculate_cdn_daily_costs')
     except Exception:
@@ -510,29 +370,17 @@ def calculate_cdn_daily_costs(self, date_iso: str = '') -> int:
 
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=60, queue='documents')
-def aggregate_campaign_engagement_daily_metrics(self, date_iso: str = '') -> int:
+def aggregate_campaign_engagement_daily_metrics(
+    self, date_iso: str = '', date_from_iso: str = '', date_to_iso: str = ''
+) -> int:
     """Aggregate campaign/collection engagement (avg minutes) per day."""
-    if date_iso:
-        target_date = timezone.datetime.fromisoformat(date_iso).date()
-    else:
-        target_date = timezone.now().date() - timedelta(days=1)
-
-    qs = CampaignEngagementEvent.objects.filter(started_at__date=target_date)
-    rows = qs.values('campaign_id').annotate(avg_seconds=Avg('duration_seconds'))
-
-    upserts = 0
-    for row in rows:
-        avg_seconds = row.get('avg_seconds')
-        avg_minutes = None
-        if avg_seconds is not None:
-            avg_minutes = round(float(avg_seconds) / 60.0, 3)
-
-        CampaignDailyMetrics.objects.update_or_create(
-            campaign_id=row['campaign_id'],
-            date=target_date,
-            defaults={'avg_engagement_minutes': avg_minutes}
-        )
-        upserts += 1
+    date_from, date_to = get_date_range(
+        date_iso=date_iso, date_from_iso=date_from_iso, date_to_iso=date_to_iso
+    )
+
+    upserts = aggregation.aggregate_campaign_engagement_daily_metrics(
+        date_from=date_from, date_to=date_to
+    )
 
     try:
         notify_analytics_refresh(reason='aggregate_campaign_engagement_daily_metrics')
@@ -0,0 +1,98 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from mayan.apps.documents.models import Document, DocumentType
+
+from mayan.apps.analytics.aggregation import (
+    aggregate_asset_daily_metrics, aggregate_search_daily_metrics,
+    get_date_range
+)
+from mayan.apps.analytics.models import (
+    AssetDailyMetrics, AssetEvent, SearchDailyMetrics, SearchQuery
+)
+
+
+User = get_user_model()
+
+
+class AggregationTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='u1', password='test')
+        self.document_type = DocumentType.objects.create(label='T1')
+        self.document = Document.objects.create(document_type=self.document_type, label='D1')
+        self.today = timezone.localdate()
+        self.yesterday = self.today - timedelta(days=1)
+
+    def _create_asset_event(self, event_type, channel='', days_ago=0):
+        return AssetEvent.objects.create(
+            document=self.document, event_type=event_type, user=self.user,
+            channel=channel,
+            timestamp=timezone.now() - timedelta(days=days_ago)
+        )
+
+    def test_get_date_range(self):
+        self.assertEqual(
+            get_date_range(), (self.yesterday, self.yesterday)
+        )
+        self.assertEqual(
+            get_date_range(date_from_iso='2025-01-01', date_to_iso='2025-01-03'),
+            (timezone.datetime(2025, 1, 1).date(), timezone.datetime(2025, 1, 3).date())
+        )
+        with self.assertRaises(ValueError):
+            get_date_range(date_from_iso='2025-01-03', date_to_iso='2025-01-01')
+
+    def test_asset_daily_metrics_backfill(self):
+        self._create_asset_event(event_type=AssetEvent.EVENT_TYPE_DOWNLOAD, channel='api', days_ago=1)
+        self._create_asset_event(event_type=AssetEvent.EVENT_TYPE_VIEW, channel='portal', days_ago=1)
+        self._create_asset_event(event_type=AssetEvent.EVENT_TYPE_VIEW, channel='portal', days_ago=1)
+        self._create_asset_event(event_type=AssetEvent.EVENT_TYPE_VIEW, channel='api')
+
+        count = aggregate_asset_daily_metrics(date_from=self.yesterday, date_to=self.today)
+
+        self.assertEqual(count, 2)
+
+        metrics = AssetDailyMetrics.objects.get(document=self.document, date=self.yesterday)
+        self.assertEqual(metrics.downloads, 1)
+        self.assertEqual(metrics.views, 2)
+        self.assertEqual(metrics.top_channel, 'portal')
+        self.assertEqual(metrics.performance_score, metrics.calculate_performance_score())
+
+        metrics = AssetDailyMetrics.objects.get(document=self.document, date=self.today)
+        self.assertEqual(metrics.views, 1)
+        self.assertEqual(metrics.top_channel, 'api')
+
+    def test_asset_daily_metrics_update_existing(self):
+        self._create_asset_event(event_type=AssetEvent.EVENT_TYPE_VIEW, days_ago=1)
+        aggregate_asset_daily_metrics(date_from=self.yesterday, date_to=self.yesterday)
+
+        self._create_asset_event(event_type=AssetEvent.EVENT_TYPE_VIEW, days_ago=1)
+        aggregate_asset_daily_metrics(date_from=self.yesterday, date_to=self.yesterday)
+
+        self.assertEqual(AssetDailyMetrics.objects.count(), 1)
+        self.assertEqual(AssetDailyMetrics.objects.get().views, 2)
+
+    def test_search_daily_metrics_empty_days(self):
+        query = SearchQuery.objects.create(
+            user=self.user, query_text='test',
+            search_type=SearchQuery.SEARCH_TYPE_KEYWORD, results_count=0,
+            response_time_ms=100, filters_applied={}, user_department=''
+        )
+        SearchQuery.objects.filter(pk=query.pk).update(timestamp=timezone.now() - timedelta(days=1))
+
+        count = aggregate_search_daily_metrics(
+            date_from=self.yesterday - timedelta(days=1), date_to=self.yesterday
+        )
+
+        self.assertEqual(count, 2)
+
+        metrics = SearchDailyMetrics.objects.get(date=self.yesterday)
+        self.assertEqual(metrics.total_searches, 1)
+        self.assertEqual(metrics.null_searches, 1)
+        self.assertEqual(metrics.null_queries, [{'query_text': 'test', 'count': 1}])
+
+        metrics = SearchDailyMetrics.objects.get(date=self.yesterday - timedelta(days=1))
+        self.assertEqual(metrics.total_searches, 0)
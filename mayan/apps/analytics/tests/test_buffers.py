@@ -0,0 +1,80 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from mayan.apps.documents.models import Document, DocumentType
+
+from mayan.apps.analytics.buffers import EventBuffer
+from mayan.apps.analytics.models import AssetEvent, FeatureUsage
+
+
+User = get_user_model()
+
+
+class EventBufferTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='u1', password='test')
+        self.document_type = DocumentType.objects.create(label='T1')
+        self.document = Document.objects.create(document_type=self.document_type, label='D1')
+
+    def _create_event_buffer(self, **kwargs):
+        options = {
+            'autostart': False, 'batch_size': 2, 'block_timeout': 0,
+            'flush_interval': 1, 'maximum_size': 10
+        }
+        options.update(kwargs)
+        return EventBuffer(**options)
+
+    def _get_test_asset_event(self):
+        return AssetEvent(
+            document=self.document,
+            event_type=AssetEvent.EVENT_TYPE_VIEW,
+            user=self.user,
+            channel='public_link'
+        )
+
+    def test_flush_writes_in_batches(self):
+        event_buffer = self._create_event_buffer()
+
+        for index in range(5):
+            self.assertTrue(event_buffer.enqueue(instance=self._get_test_asset_event()))
+        event_buffer.enqueue(instance=FeatureUsage(user=self.user, feature_name='test'))
+
+        self.assertEqual(AssetEvent.objects.count(), 0)
+
+        self.assertEqual(event_buffer.flush(), 6)
+        self.assertEqual(len(event_buffer), 0)
+        self.assertEqual(AssetEvent.objects.count(), 5)
+        self.assertEqual(FeatureUsage.objects.count(), 1)
+
+    def test_overflow_drops_and_counts(self):
+        event_buffer = self._create_event_buffer(maximum_size=3)
+
+        results = [
+            event_buffer.enqueue(instance=self._get_test_asset_event())
+            for index in range(5)
+        ]
+
+        self.assertEqual(results, [True, True, True, False, False])
+        self.assertEqual(event_buffer.dropped_count, 2)
+
+        event_buffer.flush()
+        self.assertEqual(AssetEvent.objects.count(), 3)
+
+    def test_timestamp_is_capture_time(self):
+        event_buffer = self._create_event_buffer()
+        event = self._get_test_asset_event()
+        timestamp = event.timestamp
+
+        event_buffer.enqueue(instance=event)
+        event_buffer.flush()
+
+        self.assertEqual(AssetEvent.objects.get().timestamp, timestamp)
+
+    def test_stop_flushes_pending_events(self):
+        event_buffer = self._create_event_buffer()
+        event_buffer.enqueue(instance=self._get_test_asset_event())
+
+        event_buffer.stop()
+
+        self.assertEqual(AssetEvent.objects.count(), 1)
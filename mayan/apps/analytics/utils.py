@@ -2,6 +2,7 @@ from typing import Any, Dict, Optional
 
 from django.contrib.auth import get_user_model
 
+from .buffers import record_event
 from .models import AssetEvent
 
 
@@ -17,10 +18,14 @@ def track_asset_event(
     intended_use: str = '',
     bandwidth_bytes: Optional[int] = None,
     latency_seconds: Optional[int] = None,
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[Dict[str, Any]] = None,
+    immediate: bool = False
 ) -> AssetEvent:
     """Create a raw asset analytics event (Level 1).
 
+    The event is queued in the analytics event buffer and written in the
+    background unless `immediate` is set.
+
     Args:
         document: Instance of `documents.Document`.
         event_type: One of the AssetEvent.EVENT_TYPE_* constants.
@@ -30,16 +35,18 @@ def track_asset_event(
         bandwidth_bytes: Optional bandwidth used for delivery events.
         latency_seconds: Optional latency metric for search-to-download.
         metadata: Arbitrary JSON-serializable metadata.
+        immediate: Write the event before returning. Required when the
+            caller needs the primary key of the event.
 
     Returns:
-        Created AssetEvent instance.
+        AssetEvent instance, without a primary key when buffered.
     """
     user_department = ''
     if user:
         # Department might not exist on all deployments; keep best-effort.
         user_department = getattr(user, 'department', '') or ''
 
-    return AssetEvent.objects.create(
+    event = AssetEvent(
         document=document,
         event_type=event_type,
         user=user,
@@ -51,6 +58,12 @@ def track_asset_event(
         metadata=metadata or {}
     )
 
+    if immediate:
+        event.save()
+        return event
+
+    return record_event(instance=event)
+
 
 def track_cdn_delivery(
     *,
@@ -74,7 +87,7 @@ def track_cdn_delivery(
         metadata: Arbitrary JSON-serializable metadata.
 
     Returns:
-        Created AssetEvent instance.
+        AssetEvent instance, without a primary key when buffered.
     """
     return track_asset_event(
         document=document,
@@ -1,6 +1,6 @@
-from django.apps import apps
 from django.core.exceptions import PermissionDenied
 
+from mayan.apps.navigation.classes import PermissionResolver
 from mayan.apps.navigation.html_widgets import SourceColumnWidget
 
 from .permissions import permission_cabinet_view
@@ -13,15 +13,11 @@ class DocumentCabinetWidget(SourceColumnWidget):
     template_name = 'cabinets/document_cabinets_widget.html'
 
     def get_extra_context(self):
-        AccessControlList = apps.get_model(
-            app_label='acls', model_name='AccessControlList'
-        )
-
         try:
-            AccessControlList.objects.check_access(
-                obj=self.value,
-                permissions=(permission_cabinet_view,),
-                user=self.request.user
+            PermissionResolver.get_for_request(
+                request=self.request
+            ).check_access(
+                obj=self.value, permissions=(permission_cabinet_view,)
             )
         except PermissionDenied:
             queryset = self.value.cabinets.none()
@@ -1,25 +1,161 @@
+import hashlib
+import logging
+import time
+
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.core.files.base import File
-from django.http import StreamingHttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
 from django.views.decorators.cache import patch_cache_control
 
+from mayan.apps.file_caching.models import CachePartitionFile
+from mayan.apps.lock_manager.backends.base import LockingBackend
+from mayan.apps.lock_manager.exceptions import LockError
 from mayan.apps.mime_types.classes import MIMETypeBackend
 
+from .literals import IMAGE_REQUEST_POLL_INTERVAL
 from .settings import (
-    setting_image_cache_time, setting_image_generation_timeout
+    setting_image_cache_time, setting_image_generation_timeout,
+    setting_image_offload_header, setting_image_offload_prefix
 )
 from .tasks import task_content_object_image_generate
 from .utils import IndexedDictionary
 
+logger = logging.getLogger(name=__name__)
+
 
 class APIImageViewMixin:
     """
     get: Returns an image representation of the selected object.
     """
+    def get_cache_file(self, cache_filename):
+        try:
+            return self.obj.cache_partition.get_file(filename=cache_filename)
+        except CachePartitionFile.DoesNotExist:
+            return None
+
+    def get_cache_filename(
+        self, maximum_layer_order, transformation_dictionary_list, user
+    ):
+        """
+        Resolve the cache filename of the requested image in process.
+        Returns None for objects whose cache filename is only known after
+        generating the image.
+        """
+        if not hasattr(self.obj, 'get_combined_cache_filename'):
+            return None
+
+        try:
+            transformation_instance_list = IndexedDictionary.from_dictionary_list(
+                dictionary_list=transformation_dictionary_list or ()
+            ).as_instance_list()
+
+            return self.obj.get_combined_cache_filename(
+                maximum_layer_order=maximum_layer_order,
+                transformation_instance_list=transformation_instance_list,
+                user=user
+            )
+        except Exception as exception:
+            logger.debug(
+                'Unable to resolve the image cache filename of %s; %s',
+                self.obj, exception
+            )
+            return None
+
     def get_content_type(self):
         return ContentType.objects.get_for_model(model=self.obj)
 
+    def get_etag(self):
+        # The cache file content never changes, a new file is created if
+        # the image is purged and generated again.
+        return '"{}"'.format(
+            hashlib.sha256(
+                '{}-{}-{}'.format(
+                    self.cache_file.pk, self.cache_file.full_filename,
+                    self.cache_file.datetime.isoformat()
+                ).encode('utf-8')
+            ).hexdigest()
+        )
+
+    def get_generated_cache_file(
+        self, cache_filename, maximum_layer_order,
+        transformation_dictionary_list
+    ):
+        """
+        Generate the image using the task queue. Concurrent requests for
+        the same image wait for the first one instead of queueing another
+        task.
+        """
+        if cache_filename is None:
+            return self.get_task_cache_file(
+                maximum_layer_order=maximum_layer_order,
+                transformation_dictionary_list=transformation_dictionary_list
+            )
+
+        lock_name = 'converter_image_request-{}'.format(
+            hashlib.sha256(
+                '{}-{}'.format(
+                    self.obj.cache_partition.pk, cache_filename
+                ).encode('utf-8')
+            ).hexdigest()
+        )
+        timeout = setting_image_generation_timeout.value
+
+        try:
+            lock = LockingBackend.get_backend().acquire_lock(
+                name=lock_name, timeout=timeout
+            )
+        except LockError:
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                time.sleep(IMAGE_REQUEST_POLL_INTERVAL)
+
+                cache_file = self.get_cache_file(
+                    cache_filename=cache_filename
+                )
+                if cache_file:
+                    return cache_file
+
+            return self.get_task_cache_file(
+                maximum_layer_order=maximum_layer_order,
+                transformation_dictionary_list=transformation_dictionary_list
+            )
+        else:
+            try:
+                return self.get_task_cache_file(
+                    maximum_layer_order=maximum_layer_order,
+                    transformation_dictionary_list=transformation_dictionary_list
+                )
+            finally:
+                lock.release()
+
+    def get_response(self):
+        offload_header = setting_image_offload_header.value
+
+        if offload_header:
+            response = HttpResponse(content_type=self.get_stream_mime_type())
+            response[offload_header] = '{}{}'.format(
+                setting_image_offload_prefix.value,
+                self.cache_file.full_filename
+            )
+            return response
+
+        def file_generator():
+            with self.cache_file.open(update_access=False) as file_object:
+                while True:
+                    chunk = file_object.read(File.DEFAULT_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    else:
+                        yield chunk
+
+        response = StreamingHttpResponse(
+            content_type=self.get_stream_mime_type(),
+            streaming_content=file_generator()
+        )
+        return response
+
     def get_serializer(self, *args, **kwargs):
         return None
 
@@ -28,33 +164,22 @@ class APIImageViewMixin:
 
     def get_stream_mime_type(self):
         mime_type_backend = MIMETypeBackend.get_backend_instance()
-        with self.cache_file.open() as file_object:
+        with self.cache_file.open(update_access=False) as file_object:
             mime_type, mime_encoding = mime_type_backend.get_mime_type(
                 file_object=file_object, mime_type_only=True
             )
             return mime_type
 
-    def retrieve(self, request, **kwargs):
-        self.set_object()
-        query_dict = request.GET
-
-        transformation_dictionary_list = IndexedDictionary(
-            dictionary=query_dict
-        ).as_dictionary_list()
-
-        # An empty string is not a valid value for maximum_layer_order.
-        # Fallback to None in case of a empty string.
-        maximum_layer_order = request.GET.get('maximum_layer_order') or None
-        if maximum_layer_order:
-            maximum_layer_order = int(maximum_layer_order)
-
+    def get_task_cache_file(
+        self, maximum_layer_order, transformation_dictionary_list
+    ):
         task = task_content_object_image_generate.apply_async(
             kwargs={
                 'content_type_id': self.get_content_type().pk,
                 'object_id': self.obj.pk,
                 'maximum_layer_order': maximum_layer_order,
                 'transformation_dictionary_list': transformation_dictionary_list,
-                'user_id': request.user.pk
+                'user_id': self.request.user.pk
             }
         )
 
@@ -67,22 +192,60 @@ class APIImageViewMixin:
 
         cache_filename = task.get(**kwargs)
 
-        self.cache_file = self.obj.cache_partition.get_file(filename=cache_filename)
+        return self.obj.cache_partition.get_file(filename=cache_filename)
 
-        def file_generator():
-            with self.cache_file.open() as file_object:
-                while True:
-                    chunk = file_object.read(File.DEFAULT_CHUNK_SIZE)
-                    if not chunk:
-                        break
-                    else:
-                        yield chunk
+    def retrieve(self, request, **kwargs):
+        self.set_object()
+        query_dict = request.GET
 
-        response = StreamingHttpResponse(
-            content_type=self.get_stream_mime_type(),
-            streaming_content=file_generator()
+        transformation_dictionary_list = IndexedDictionary(
+            dictionary=query_dict
+        ).as_dictionary_list()
+
+        # An empty string is not a valid value for maximum_layer_order.
+        # Fallback to None in case of a empty string.
+        maximum_layer_order = request.GET.get('maximum_layer_order') or None
+        if maximum_layer_order:
+            maximum_layer_order = int(maximum_layer_order)
+
+        if request.user.is_authenticated:
+            user = request.user
+        else:
+            user = None
+
+        # Serve existing images directly, the task queue is only used to
+        # generate missing images.
+        cache_filename = self.get_cache_filename(
+            maximum_layer_order=maximum_layer_order,
+            transformation_dictionary_list=transformation_dictionary_list,
+            user=user
         )
 
+        self.cache_file = None
+        if cache_filename is not None:
+            self.cache_file = self.get_cache_file(
+                cache_filename=cache_filename
+            )
+
+        if self.cache_file is None:
+            self.cache_file = self.get_generated_cache_file(
+                cache_filename=cache_filename,
+                maximum_layer_order=maximum_layer_order,
+                transformation_dictionary_list=transformation_dictionary_list
+            )
+
+        # Record the access once per request, whether the file is streamed,
+        # offloaded to the web server or answered with a 304.
+        self.cache_file.access_update()
+
+        etag = self.get_etag()
+
+        response = get_conditional_response(request=request, etag=etag)
+        if response is None:
+            response = self.get_response()
+
+        response['ETag'] = etag
+
         if '_hash' in request.GET:
             patch_cache_control(
                 max_age=setting_image_cache_time.value,
@@ -1,5 +1,6 @@
 import io
 import logging
+import os
 import shutil
 import struct
 
@@ -10,7 +11,7 @@ import sh
 from django.utils.encoding import force_text
 from django.utils.translation import ugettext_lazy as _
 
-from mayan.apps.storage.utils import NamedTemporaryFile
+from mayan.apps.storage.utils import NamedTemporaryFile, TemporaryDirectory
 
 from ..classes import ConverterBase
 from ..exceptions import PageCountError
@@ -80,6 +81,55 @@ class Python(ConverterBase):
                 image_buffer.seek(0)
                 return Image.open(fp=image_buffer)
 
+    def get_pages(
+        self, page_number_first=0, page_number_last=None, output_format=None
+    ):
+        if self.mime_type != 'application/pdf' or not pdftoppm:
+            yield from super().get_pages(
+                page_number_first=page_number_first,
+                page_number_last=page_number_last,
+                output_format=output_format
+            )
+            return
+
+        if page_number_last is None:
+            page_number_last = self.get_page_count() - 1
+
+        # Materialize the source file once and rasterize the whole range
+        # with a single pdftoppm process instead of one copy and one
+        # process per page.
+        with NamedTemporaryFile() as new_file_object:
+            self.file_object.seek(0)
+            shutil.copyfileobj(fsrc=self.file_object, fdst=new_file_object)
+            self.file_object.seek(0)
+            new_file_object.flush()
+
+            with TemporaryDirectory() as temporary_directory:
+                pdftoppm(
+                    new_file_object.name,
+                    os.path.join(temporary_directory, 'page'),
+                    f=page_number_first + 1, l=page_number_last + 1
+                )
+
+                # pdftoppm names the output files "page-<number>.<ext>"
+                # and zero pads the number according to the page count.
+                page_files = sorted(
+                    (
+                        int(os.path.splitext(filename)[0].rsplit('-', 1)[1]) - 1,
+                        filename
+                    ) for filename in os.listdir(temporary_directory)
+                )
+
+                for page_number, filename in page_files:
+                    with open(os.path.join(temporary_directory, filename), mode='rb') as file_object:
+                        self.image = Image.open(fp=file_object)
+                        self.image.load()
+
+                    self.page_number = page_number
+                    yield page_number, self.get_page(
+                        output_format=output_format
+                    )
+
     def get_page_count(self):
         super().get_page_count()
 
@@ -123,6 +123,22 @@ class ConverterBase:
         except InvalidOfficeFormat as exception:
             logger.debug('Is not an office format document; %s', exception)
 
+    def get_pages(
+        self, page_number_first=0, page_number_last=None, output_format=None
+    ):
+        """
+        Generator of (page_number, image_buffer) tuples for a range of
+        pages. Page numbers start at #0 and page_number_last is inclusive.
+        Backends that can render several pages in a single pass should
+        override this method; the default seeks every page individually.
+        """
+        if page_number_last is None:
+            page_number_last = self.get_page_count() - 1
+
+        for page_number in range(page_number_first, page_number_last + 1):
+            self.seek_page(page_number=page_number)
+            yield page_number, self.get_page(output_format=output_format)
+
     def seek_page(self, page_number):
         """
         Seek the specified page number from the source file object.
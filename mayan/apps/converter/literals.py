@@ -73,6 +73,8 @@ DEFAULT_CONVERTER_GRAPHICS_BACKEND = 'mayan.apps.converter.backends.python.Pytho
 DEFAULT_CONVERTER_IMAGE_CACHE_TIME = '31556926'
 DEFAULT_CONVERTER_IMAGE_GENERATION_MAX_RETRIES = 7
 DEFAULT_CONVERTER_IMAGE_GENERATION_TIMEOUT = 120  # seconds
+DEFAULT_CONVERTER_IMAGE_OFFLOAD_HEADER = None
+DEFAULT_CONVERTER_IMAGE_OFFLOAD_PREFIX = ''
 
 DEFAULT_PAGE_NUMBER = 1
 DEFAULT_PDFTOPPM_DPI = 300
@@ -82,6 +84,9 @@ DEFAULT_PILLOW_MAXIMUM_IMAGE_PIXELS = 89478485  # Upstream default as of v6.2.1
 DEFAULT_ROTATION = 0
 DEFAULT_ZOOM_LEVEL = 100
 
+# Seconds between checks for an image being generated by another request.
+IMAGE_REQUEST_POLL_INTERVAL = 0.25
+
 DEFAULT_CONVERTER_GRAPHICS_BACKEND_ARGUMENTS = {
     'libreoffice_path': DEFAULT_LIBREOFFICE_PATH,
     'pdftoppm_dpi': DEFAULT_PDFTOPPM_DPI,
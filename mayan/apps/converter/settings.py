@@ -12,7 +12,9 @@ from .literals import (
     DEFAULT_CONVERTER_GRAPHICS_BACKEND_ARGUMENTS,
     DEFAULT_CONVERTER_IMAGE_CACHE_TIME,
     DEFAULT_CONVERTER_IMAGE_GENERATION_MAX_RETRIES,
-    DEFAULT_CONVERTER_IMAGE_GENERATION_TIMEOUT
+    DEFAULT_CONVERTER_IMAGE_GENERATION_TIMEOUT,
+    DEFAULT_CONVERTER_IMAGE_OFFLOAD_HEADER,
+    DEFAULT_CONVERTER_IMAGE_OFFLOAD_PREFIX
 )
 from .setting_callbacks import callback_update_asset_cache_size
 from .setting_migrations import ConvertSettingMigration
@@ -93,3 +95,24 @@ setting_image_generation_timeout = namespace.add_setting(
         'running and raise an error.'
     )
 )
+setting_image_offload_header = namespace.add_setting(
+    default=DEFAULT_CONVERTER_IMAGE_OFFLOAD_HEADER,
+    global_name='CONVERTER_IMAGE_OFFLOAD_HEADER',
+    help_text=_(
+        'Name of the response header used to let the web server send the '
+        'cached image files, for example "X-Accel-Redirect" for NGINX or '
+        '"X-Sendfile" for Apache. The cache storage must keep the files '
+        'unmodified in a location the web server can access. Leave empty '
+        'to send the files from the application.'
+    )
+)
+setting_image_offload_prefix = namespace.add_setting(
+    default=DEFAULT_CONVERTER_IMAGE_OFFLOAD_PREFIX,
+    global_name='CONVERTER_IMAGE_OFFLOAD_PREFIX',
+    help_text=_(
+        'Text prepended to the name of the cached image file in the '
+        'CONVERTER_IMAGE_OFFLOAD_HEADER header. Use the internal location '
+        'path for "X-Accel-Redirect" or the cache storage directory for '
+        '"X-Sendfile".'
+    )
+)
@@ -122,13 +122,14 @@ class BaseMediaConverter:
         except Exception as e:
             logger.warning(f"Failed to cleanup temp file {file_path}: {e}")
 
-    def execute_command(self, command, timeout=None, **kwargs):
+    def execute_command(self, command, timeout=None, binary_output=False, **kwargs):
         """
         Выполнить системную команду с таймаутом.
 
         Args:
             command (list): Команда для выполнения
             timeout (int): Таймаут в секундах
+            binary_output (bool): Вернуть stdout как bytes без декодирования
             **kwargs: Дополнительные аргументы для subprocess
 
         Returns:
@@ -154,7 +155,10 @@ class BaseMediaConverter:
                 **kwargs
             )
 
-            stdout = result.stdout.decode('utf-8', errors='ignore')
+            if binary_output:
+                stdout = result.stdout
+            else:
+                stdout = result.stdout.decode('utf-8', errors='ignore')
             stderr = result.stderr.decode('utf-8', errors='ignore')
 
             return stdout, stderr, result.returncode
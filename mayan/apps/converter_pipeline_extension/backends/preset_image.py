@@ -68,7 +68,38 @@ class PresetImageConverter(BaseMediaConverter):
         """Конвертировать изображение согласно настройкам пресета."""
         self.validate_file()
 
-        image = self._open_image()
+        return self.render(
+            image=self._open_image(), width=width, height=height,
+            format=format, quality=quality, crop=crop, dpi=dpi,
+            filters=filters, brightness=brightness, contrast=contrast,
+            color=color, sharpness=sharpness, watermark=watermark
+        )
+
+    @classmethod
+    def render(
+        cls,
+        *,
+        image,
+        width=None,
+        height=None,
+        format='jpeg',
+        quality=85,
+        crop=True,
+        dpi=None,
+        filters=None,
+        brightness=None,
+        contrast=None,
+        color=None,
+        sharpness=None,
+        watermark=None
+    ):
+        """
+        Применить настройки пресета к уже декодированному изображению.
+
+        Исходное изображение не изменяется, поэтому одно декодирование
+        может использоваться для нескольких пресетов.
+        """
+        source_image = image
 
         target_format = (format or 'jpeg').upper()
         if target_format == 'JPG':
@@ -82,9 +113,12 @@ class PresetImageConverter(BaseMediaConverter):
                 centering=(0.5, 0.5)
             )
         else:
-            image = self._resize_without_crop(image, width=width, height=height)
+            image = cls._resize_without_crop(image, width=width, height=height)
 
-        image = self._apply_adjustments(
+        if image is source_image:
+            image = image.copy()
+
+        image = cls._apply_adjustments(
             image=image,
             target_format=target_format,
             dpi=dpi,
@@ -97,7 +131,7 @@ class PresetImageConverter(BaseMediaConverter):
         )
 
         output = io.BytesIO()
-        save_kwargs = self._build_save_kwargs(target_format, quality)
+        save_kwargs = cls._build_save_kwargs(target_format, quality)
         image.save(output, format=target_format, **save_kwargs)
         output.seek(0)
         return output
@@ -182,8 +216,9 @@ class PresetImageConverter(BaseMediaConverter):
         suffix = (fmt or 'jpeg').lower().replace('jpg', 'jpeg')
         return f'preview.{suffix}'
 
+    @classmethod
     def _apply_adjustments(
-        self,
+        cls,
         *,
         image,
         target_format,
@@ -195,7 +230,7 @@ class PresetImageConverter(BaseMediaConverter):
         sharpness,
         watermark
     ):
-        image = self._ensure_mode(image, target_format)
+        image = cls._ensure_mode(image, target_format)
 
         if dpi and isinstance(dpi, (list, tuple)) and len(dpi) == 2:
             image.info['dpi'] = (int(dpi[0]), int(dpi[1]))
@@ -215,13 +250,13 @@ class PresetImageConverter(BaseMediaConverter):
         if filters:
             for filter_name in filters:
                 try:
-                    image = self._apply_filter(image=image, filter_name=filter_name)
+                    image = cls._apply_filter(image=image, filter_name=filter_name)
                 except Exception as exc:
                     logger.warning('Filter %s failed: %s', filter_name, exc)
 
         if watermark:
             try:
-                image = self._apply_watermark(image=image, watermark=watermark)
+                image = cls._apply_watermark(image=image, watermark=watermark)
             except Exception as exc:
                 logger.warning('Watermark application failed: %s', exc)
 
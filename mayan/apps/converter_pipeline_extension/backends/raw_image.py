@@ -1,3 +1,4 @@
+import io
 import logging
 from pathlib import Path
 
@@ -119,6 +120,53 @@ class RawImageConverter(BaseMediaConverter):
             if temp_output:
                 self.cleanup_temp_file(temp_output)
 
+    def open_image(self):
+        """
+        Декодировать RAW файл один раз в изображение PIL.
+
+        Используется для генерации нескольких рендишенов из одного
+        декодирования.
+
+        Returns:
+            PIL.Image.Image: Изображение в режиме RGB или L
+        """
+        self.validate_file()
+
+        temp_input = self.create_temp_file(suffix='.raw')
+
+        try:
+            errors = []
+            for executable in ('dcraw', 'dcraw_emu'):
+                command = [
+                    executable, '-c', '-q', '3', '-w', '-H', '2', '-o', '1',
+                    '-T', temp_input
+                ]
+                try:
+                    stdout, stderr, return_code = self.execute_command(
+                        command, binary_output=True
+                    )
+                except Exception as exception:
+                    errors.append(f'{executable}: {exception}')
+                    continue
+
+                if return_code != 0 or not stdout:
+                    errors.append(f'{executable}: {stderr}')
+                    continue
+
+                image = Image.open(io.BytesIO(stdout))
+                image.load()
+
+                if image.mode in ('I', 'I;16'):
+                    image = image.point(lambda x: x * (255 / 65535)).convert('L')
+                elif image.mode not in ('RGB', 'L'):
+                    image = image.convert('RGB')
+
+                return image
+
+            raise RuntimeError(f"RAW decoding failed: {'; '.join(errors)}")
+        finally:
+            self.cleanup_temp_file(temp_input)
+
     def _convert_with_dcraw(self, input_path, output_path):
         """
         Конвертировать RAW файл с помощью dcraw.
@@ -0,0 +1,32 @@
+"""
+Tests for rendering presets from a shared decoded image
+"""
+
+from django.test import SimpleTestCase
+
+from PIL import Image
+
+from ..backends import PresetImageConverter
+
+
+class PresetImageConverterRenderTestCase(SimpleTestCase):
+    def setUp(self):
+        self.image = Image.new('RGB', (800, 600), (200, 20, 30))
+
+    def test_render_crop(self):
+        output = PresetImageConverter.render(
+            image=self.image, width=200, height=100, format='jpeg',
+            crop=True
+        )
+
+        self.assertEqual(Image.open(output).size, (200, 100))
+
+    def test_render_keeps_source_image(self):
+        PresetImageConverter.render(
+            image=self.image, format='png', brightness=1.5,
+            filters=['invert'], dpi=(300, 300)
+        )
+
+        self.assertEqual(self.image.size, (800, 600))
+        self.assertEqual(self.image.getpixel((0, 0)), (200, 20, 30))
+        self.assertNotIn('dpi', self.image.info)
@@ -2,6 +2,7 @@ import uuid
 from django.contrib.auth import get_user_model
 from django.contrib.auth.hashers import make_password, check_password
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.storage.classes import DefinedStorageLazy
@@ -300,9 +301,10 @@ class Publication(models.Model):
         """
         Запускает генерацию всех rendition'ов для всех items публикации.
         """
+        presets = list(self.presets.all())
+
         for item in self.items.all():
-            for preset in self.presets.all():
-                preset.generate_rendition(item)
+            item.generate_renditions(presets=presets)
 
 
 class PublicationItem(models.Model):
@@ -331,6 +333,35 @@ class PublicationItem(models.Model):
     def __str__(self):
         return f"{self.publication.title} → {self.document_file}"
 
+    def generate_renditions(self, presets):
+        """
+        Создает rendition'ы для всех пресетов и запускает одну задачу,
+        которая декодирует исходный файл один раз для всех пресетов.
+        """
+        from .tasks import generate_publication_item_renditions_task
+
+        renditions = []
+        generated_rendition_id_list = []
+
+        for preset in presets:
+            rendition, created = GeneratedRendition.objects.get_or_create(
+                publication_item=self,
+                preset=preset,
+                defaults={'status': 'pending'}
+            )
+            renditions.append(rendition)
+
+            if created or rendition.status in ['pending', 'failed']:
+                generated_rendition_id_list.append(rendition.pk)
+
+        if generated_rendition_id_list:
+            generate_publication_item_renditions_task.delay(
+                publication_item_id=self.pk,
+                generated_rendition_id_list=generated_rendition_id_list
+            )
+
+        return renditions
+
 
 class ShareLink(models.Model):
     """
@@ -455,7 +486,6 @@ class ShareLink(models.Model):
         """
         Record access to this share link.
         """
-        from django.utils import timezone
         from mayan.apps.distribution.models import AccessLog
 
         # Increment views count
@@ -463,13 +493,18 @@ class ShareLink(models.Model):
         self.last_accessed = timezone.now()
         self.save(update_fields=['views_count', 'last_accessed'])
 
-        # Create access log
-        AccessLog.objects.create(
-            share_link=self,
-            event='view',
-            ip_address=self._get_client_ip(request),
-            user_agent=request.META.get('HTTP_USER_AGENT', ''),
-            timestamp=timezone.now()
+        # Create access log, written in the background by the analytics
+        # event buffer.
+        from mayan.apps.analytics.buffers import record_event
+
+        record_event(
+            instance=AccessLog(
+                share_link=self,
+                event='view',
+                ip_address=self._get_client_ip(request),
+                user_agent=request.META.get('HTTP_USER_AGENT', ''),
+                timestamp=self.last_accessed
+            )
         )
 
         # Analytics (Level 1): track view via share link as a "view" event.
@@ -510,7 +545,6 @@ class ShareLink(models.Model):
         """
         Record download from this share link.
         """
-        from django.utils import timezone
         from mayan.apps.distribution.models import AccessLog
 
         # Increment download count
@@ -518,14 +552,19 @@ class ShareLink(models.Model):
         self.last_accessed = timezone.now()
         self.save(update_fields=['downloads_count', 'last_accessed'])
 
-        # Create access log entry
-        AccessLog.objects.create(
-            share_link=self,
-            rendition=rendition,
-            event='download',
-            ip_address=self._get_client_ip(request),
-            user_agent=request.META.get('HTTP_USER_AGENT', ''),
-            timestamp=timezone.now()
+        # Create access log entry, written in the background by the
+        # analytics event buffer.
+        from mayan.apps.analytics.buffers import record_event
+
+        record_event(
+            instance=AccessLog(
+                share_link=self,
+                rendition=rendition,
+                event='download',
+                ip_address=self._get_client_ip(request),
+                user_agent=request.META.get('HTTP_USER_AGENT', ''),
+                timestamp=self.last_accessed
+            )
         )
 
         # Analytics (Level 1): track download via share link as a "download" event.
@@ -693,7 +732,8 @@ class AccessLog(models.Model):
         help_text=_('User agent string')
     )
     timestamp = models.DateTimeField(
-        auto_now_add=True,
+        default=timezone.now,
+        editable=False,
         help_text=_('When the access occurred')
     )
 
@@ -16,3 +16,8 @@ queue_distribution.add_task_type(
     name='generate_rendition_task'
 )
 
+queue_distribution.add_task_type(
+    dotted_path='mayan.apps.distribution.tasks.generate_publication_item_renditions_task',
+    label=_('Generate distribution renditions of a publication item'),
+    name='generate_publication_item_renditions_task'
+)
@@ -1,15 +1,20 @@
 import logging
+import math
 import os
 from io import BytesIO
 
 from django.conf import settings
 from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
 
 from PIL import Image, ImageEnhance, ImageOps, ImageDraw, ImageFont
 
 from mayan.celery import app
 from mayan.apps.documents.models import DocumentFile
-from mayan.apps.converter_pipeline_extension.backends import RawImageConverter
+from mayan.apps.converter_pipeline_extension.backends import (
+    PresetImageConverter, RawImageConverter
+)
 from mayan.apps.converter_pipeline_extension.utils import (
     get_converter_for_mime_type, get_converter_class_for_info
 )
@@ -17,57 +22,99 @@ from mayan.apps.converter_pipeline_extension.utils import (
 logger = logging.getLogger(name=__name__)
 
 
-@app.task(bind=True, ignore_result=True, queue='converter')
-def generate_rendition_task(self, generated_rendition_id):
-    logger.debug('generate_rendition_task queued with id %s', generated_rendition_id)
+class ImagePyramid:
     """
-    Celery задача для генерации rendition'а.
+    Уменьшенные копии одного декодированного изображения.
+
+    Каждый уровень получается целочисленным уменьшением (Image.reduce)
+    ближайшего большего уровня, на который делится его коэффициент, и
+    сохраняет не менее чем двукратный запас разрешения для итогового
+    масштабирования LANCZOS.
     """
-    from .models import GeneratedRendition, RenditionPreset
+    REDUCING_GAP = 2
+
+    def __init__(self, image):
+        self.levels = {1: image}
+
+    def get_level(self, scale):
+        """
+        Возвращает наименьший уровень, достаточный для масштаба scale
+        относительно исходного изображения.
+        """
+        factor = max(1, int(1 / (scale * self.REDUCING_GAP)))
+
+        if factor not in self.levels:
+            source_factor = max(
+                level_factor for level_factor in self.levels
+                if factor % level_factor == 0
+            )
+            try:
+                self.levels[factor] = self.levels[source_factor].reduce(
+                    factor // source_factor
+                )
+            except ValueError:
+                # Режим изображения не поддерживает reduce.
+                return self.levels[1]
 
-    try:
-        rendition = GeneratedRendition.objects.get(id=generated_rendition_id)
-        rendition.status = 'processing'
-        rendition.save(update_fields=['status'])
+        return self.levels[factor]
 
-        logger.info(f"Starting rendition generation for {rendition}")
 
-        # Получаем данные для конвертации
-        publication_item = rendition.publication_item
-        preset = rendition.preset
-        document_file = publication_item.document_file
+@app.task(bind=True, ignore_result=True, queue='converter')
+def generate_publication_item_renditions_task(
+    self, publication_item_id, generated_rendition_id_list=None
+):
+    """
+    Генерирует все ожидающие rendition'ы элемента публикации из одного
+    декодирования исходного файла.
+    """
+    from .models import GeneratedRendition
 
-        # Генерируем файл с помощью converter_pipeline_extension
-        converted_file = _convert_file_with_preset(document_file, preset)
+    queryset = GeneratedRendition.objects.filter(
+        publication_item_id=publication_item_id
+    )
+    if generated_rendition_id_list is None:
+        queryset = queryset.filter(status__in=('pending', 'failed'))
+    else:
+        queryset = queryset.filter(pk__in=generated_rendition_id_list)
 
-        if converted_file:
-            # Сохраняем файл через Django FileField
-            filename = _generate_rendition_filename(document_file, preset)
-            file_content = ContentFile(converted_file.getvalue(), name=filename)
+    generated_rendition_id_list = list(
+        queryset.values_list('pk', flat=True)
+    )
 
-            rendition.status = 'completed'
-            rendition.file.save(filename, file_content, save=False)
-            rendition.file_size = len(converted_file.getvalue())
-            rendition.checksum = _calculate_checksum(converted_file)
-            rendition.error_message = ''
-            rendition.save(update_fields=['status', 'file', 'file_size', 'checksum', 'error_message', 'modified'])
+    try:
+        _generate_renditions(
+            renditions=GeneratedRendition.objects.filter(
+                pk__in=generated_rendition_id_list
+            ).select_related('preset', 'publication_item__document_file')
+        )
+    except Exception as e:
+        logger.exception(
+            f"Error generating renditions for publication item {publication_item_id}: {e}"
+        )
+        GeneratedRendition.objects.filter(
+            pk__in=generated_rendition_id_list
+        ).update(status='failed', error_message=str(e))
 
-            logger.info(f"Successfully generated rendition: {rendition}")
-        else:
-            rendition.status = 'failed'
-            rendition.error_message = 'Failed to convert file'
-            rendition.save(update_fields=['status', 'error_message', 'modified'])
-            logger.error(f"Failed to generate rendition: {rendition}")
 
+@app.task(bind=True, ignore_result=True, queue='converter')
+def generate_rendition_task(self, generated_rendition_id):
+    logger.debug('generate_rendition_task queued with id %s', generated_rendition_id)
+    """
+    Celery задача для генерации rendition'а.
+    """
+    from .models import GeneratedRendition
+
+    try:
+        _generate_renditions(
+            renditions=GeneratedRendition.objects.filter(
+                id=generated_rendition_id
+            ).select_related('preset', 'publication_item__document_file')
+        )
     except Exception as e:
         logger.exception(f"Error generating rendition {generated_rendition_id}: {e}")
-        try:
-            rendition = GeneratedRendition.objects.get(id=generated_rendition_id)
-            rendition.status = 'failed'
-            rendition.error_message = str(e)
-            rendition.save(update_fields=['status', 'error_message', 'modified'])
-        except Exception:
-            pass
+        GeneratedRendition.objects.filter(id=generated_rendition_id).update(
+            status='failed', error_message=str(e)
+        )
 
 
 def _convert_file_with_preset(document_file, preset):
@@ -83,12 +130,7 @@ def _convert_file_with_preset(document_file, preset):
         input_buffer = BytesIO(file_content)
 
         # Определяем тип файла по MIME типу
-        mime_type = document_file.mimetype
-        filename = document_file.filename or ''
-
-        # Исправляем MIME тип для DNG файлов
-        if filename.lower().endswith('.dng'):
-            mime_type = 'image/x-adobe-dng'
+        mime_type = _get_source_mime_type(document_file=document_file)
 
         if not mime_type:
             logger.warning('DocumentFile %s has no mimetype; skipping conversion.', document_file.pk)
@@ -104,24 +146,7 @@ def _convert_file_with_preset(document_file, preset):
                     with storage_file.storage.open(name=storage_file.name, mode='rb') as source_stream:
                         converter = converter_class(file_stream=source_stream, mime_type=mime_type)
 
-                    filters_value = preset.filters or []
-                    if isinstance(filters_value, str):
-                        filters_value = [filters_value]
-
-                    convert_kwargs = {
-                        'width': preset.width,
-                        'height': preset.height,
-                        'format': target_format,
-                        'quality': preset.quality or 85,
-                        'crop': bool(preset.crop and preset.width and preset.height),
-                        'dpi': (preset.dpi_x, preset.dpi_y) if preset.dpi_x and preset.dpi_y else None,
-                        'filters': filters_value or None,
-                        'brightness': preset.adjust_brightness,
-                        'contrast': preset.adjust_contrast,
-                        'color': preset.adjust_color,
-                        'sharpness': preset.adjust_sharpness,
-                        'watermark': preset.watermark or None,
-                    }
+                    convert_kwargs = _get_preset_convert_kwargs(preset=preset)
 
                     if hasattr(converter, 'convert'):
                         output_buffer = converter.convert(**convert_kwargs)
@@ -242,6 +267,234 @@ def _convert_file_with_preset(document_file, preset):
         return None
 
 
+def _generate_renditions(renditions):
+    """
+    Декодирует исходный файл один раз в разрешении, достаточном для самого
+    большого пресета, строит из него все rendition'ы и сохраняет их записи
+    в одной транзакции. Файлы, которые невозможно декодировать как
+    изображение (видео и т.п.), конвертируются отдельно для каждого
+    пресета.
+    """
+    from .models import GeneratedRendition
+
+    renditions = list(renditions)
+    if not renditions:
+        return
+
+    GeneratedRendition.objects.filter(
+        pk__in=[rendition.pk for rendition in renditions]
+    ).update(status='processing')
+
+    document_file = renditions[0].publication_item.document_file
+    presets = [rendition.preset for rendition in renditions]
+
+    logger.info(
+        'Starting generation of %d renditions for document file %s',
+        len(renditions), document_file.pk
+    )
+
+    image = None
+    try:
+        image = _open_source_image(
+            document_file=document_file, presets=presets
+        )
+    except Exception as exception:
+        logger.warning(
+            'Unable to decode document file %s for all presets; %s',
+            document_file.pk, exception
+        )
+
+    results = []
+    if image is None:
+        for rendition in renditions:
+            results.append(
+                (
+                    rendition, _convert_file_with_preset(
+                        document_file, rendition.preset
+                    ), 'Failed to convert file'
+                )
+            )
+    else:
+        pyramid = ImagePyramid(image=image)
+        scales = {
+            rendition.pk: _get_preset_scale(
+                preset=rendition.preset, size=image.size
+            ) for rendition in renditions
+        }
+
+        # Самые большие пресеты первыми, чтобы меньшие уровни пирамиды
+        # строились из уже уменьшенных.
+        for rendition in sorted(
+            renditions, key=lambda rendition: scales[rendition.pk],
+            reverse=True
+        ):
+            try:
+                buffer = PresetImageConverter.render(
+                    image=pyramid.get_level(scale=scales[rendition.pk]),
+                    **_get_preset_convert_kwargs(preset=rendition.preset)
+                )
+            except Exception as exception:
+                logger.error(
+                    'Error rendering preset %s for document file %s: %s',
+                    rendition.preset.pk, document_file.pk, exception
+                )
+                results.append((rendition, None, str(exception)))
+            else:
+                results.append((rendition, buffer, ''))
+
+    _save_renditions(document_file=document_file, results=results)
+
+
+def _save_renditions(document_file, results):
+    """
+    Записывает файлы rendition'ов в хранилище и обновляет все записи
+    в одной транзакции.
+    """
+    from .models import GeneratedRendition
+
+    modified = timezone.now()
+
+    for rendition, buffer, error_message in results:
+        if buffer:
+            try:
+                filename = _generate_rendition_filename(
+                    document_file, rendition.preset
+                )
+                content = buffer.getvalue()
+                rendition.file.save(
+                    filename, ContentFile(content, name=filename), save=False
+                )
+            except Exception as exception:
+                logger.exception(
+                    'Error storing rendition %s: %s', rendition.pk, exception
+                )
+                buffer = None
+                error_message = str(exception)
+            else:
+                rendition.status = 'completed'
+                rendition.file_size = len(content)
+                rendition.checksum = _calculate_checksum(buffer)
+                rendition.error_message = ''
+
+        if not buffer:
+            rendition.status = 'failed'
+            rendition.error_message = error_message or 'Failed to convert file'
+
+        rendition.modified = modified
+
+    with transaction.atomic():
+        GeneratedRendition.objects.bulk_update(
+            objs=[rendition for rendition, buffer, error_message in results],
+            fields=(
+                'checksum', 'error_message', 'file', 'file_size', 'modified',
+                'status'
+            )
+        )
+
+    for rendition, buffer, error_message in results:
+        if rendition.status == 'completed':
+            logger.info(f"Successfully generated rendition: {rendition}")
+        else:
+            logger.error(f"Failed to generate rendition: {rendition}")
+
+
+def _get_preset_convert_kwargs(preset):
+    """
+    Параметры конвертера для пресета.
+    """
+    filters_value = preset.filters or []
+    if isinstance(filters_value, str):
+        filters_value = [filters_value]
+
+    return {
+        'width': preset.width,
+        'height': preset.height,
+        'format': (preset.format or 'jpeg').lower(),
+        'quality': preset.quality or 85,
+        'crop': bool(preset.crop and preset.width and preset.height),
+        'dpi': (preset.dpi_x, preset.dpi_y) if preset.dpi_x and preset.dpi_y else None,
+        'filters': filters_value or None,
+        'brightness': preset.adjust_brightness,
+        'contrast': preset.adjust_contrast,
+        'color': preset.adjust_color,
+        'sharpness': preset.adjust_sharpness,
+        'watermark': preset.watermark or None,
+    }
+
+
+def _get_preset_scale(preset, size):
+    """
+    Минимальный масштаб (не больше 1) исходного изображения размера size,
+    из которого пресет строится без потери качества.
+    """
+    width, height = size
+
+    if preset.width and preset.height:
+        scale = max(preset.width / width, preset.height / height)
+    elif preset.width:
+        scale = preset.width / width
+    elif preset.height:
+        scale = preset.height / height
+    else:
+        scale = 1.0
+
+    return min(1.0, scale)
+
+
+def _get_source_mime_type(document_file):
+    mime_type = document_file.mimetype
+    filename = document_file.filename or ''
+
+    # Исправляем MIME тип для DNG файлов
+    if filename.lower().endswith('.dng'):
+        mime_type = 'image/x-adobe-dng'
+
+    return mime_type
+
+
+def _open_source_image(document_file, presets):
+    """
+    Декодирует исходный файл в изображение PIL или возвращает None, если
+    файл не является изображением. JPEG файлы декодируются сразу в
+    уменьшенном разрешении, достаточном для самого большого пресета.
+    """
+    mime_type = _get_source_mime_type(document_file=document_file)
+    if not mime_type:
+        return None
+
+    converter_info = get_converter_for_mime_type(mime_type) or {}
+    converter_key = converter_info.get('converter')
+
+    if converter_key == 'raw_image':
+        return RawImageConverter(
+            file_obj=document_file.file, mime_type=mime_type
+        ).open_image()
+
+    if converter_key == 'preset_image' or (
+        not converter_key and mime_type.startswith('image/')
+    ):
+        with document_file.open() as file_object:
+            image = Image.open(file_object)
+
+            scale = max(
+                _get_preset_scale(preset=preset, size=image.size)
+                for preset in presets
+            ) * ImagePyramid.REDUCING_GAP
+            if scale < 1:
+                image.draft(
+                    None, (
+                        max(1, math.ceil(image.width * scale)),
+                        max(1, math.ceil(image.height * scale))
+                    )
+                )
+
+            image.load()
+
+        return image
+
+    return None
+
+
 def _generate_rendition_filename(document_file, preset):
     """
     Генерирует имя файла для rendition'а.
@@ -330,16 +330,9 @@ class AddDocumentsToPublicationView(LoginRequiredMixin, TemplateView):
         if added_count > 0:
             messages.success(request, _('Добавлено {} файлов в публикацию.').format(added_count))
             # Запускаем генерацию rendition'ов для новых элементов
-            from .tasks import generate_rendition_task
+            presets = list(self.publication.presets.all())
             for item in self.publication.items.filter(document_file__document__pk__in=selected_document_ids):
-                for preset in self.publication.presets.all():
-                    generate_rendition_task.delay(
-                        GeneratedRendition.objects.get_or_create(
-                            publication_item=item,
-                            preset=preset,
-                            defaults={'status': 'pending'}
-                        )[0].id
-                    )
+                item.generate_renditions(presets=presets)
 
         return redirect('distribution:publication_detail', pk=self.publication.pk)
 
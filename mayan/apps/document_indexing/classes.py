@@ -0,0 +1,310 @@
+import logging
+
+from django.apps import apps
+from django.db import transaction
+from django.utils.translation import ugettext_lazy as _
+
+from mayan.apps.databases.classes import ModelQueryFields
+from mayan.apps.lock_manager.backends.base import LockingBackend
+from mayan.apps.templating.classes import Template
+
+from .literals import (
+    INDEX_REBUILD_DOCUMENT_BATCH_SIZE, INDEX_REBUILD_LOCK_TIMEOUT,
+    INDEX_REBUILD_WRITE_BATCH_SIZE
+)
+
+logger = logging.getLogger(name=__name__)
+
+
+class IndexRebuildNode:
+    """
+    In memory representation of an index instance node during a rebuild.
+    """
+    __slots__ = (
+        'children', 'document_id_list', 'index_template_node_id', 'level',
+        'lft', 'parent', 'pk', 'rght', 'value'
+    )
+
+    def __init__(self, index_template_node_id=None, parent=None, value=''):
+        self.children = {}
+        self.document_id_list = []
+        self.index_template_node_id = index_template_node_id
+        self.parent = parent
+        self.pk = None
+        self.value = value
+
+    def get_child(self, index_template_node_id, value):
+        key = (index_template_node_id, value)
+
+        try:
+            return self.children[key]
+        except KeyError:
+            child = IndexRebuildNode(
+                index_template_node_id=index_template_node_id, parent=self,
+                value=value
+            )
+            self.children[key] = child
+            return child
+
+
+class IndexRebuilder:
+    """
+    Rebuild all the instance nodes of an index in bulk. Each template node
+    expression is compiled once, documents are evaluated in batches and
+    the resulting tree is built in memory. The old nodes are then replaced
+    in a single transaction using bulk inserts with precalculated MPTT
+    values. Bulk inserts do not send the search signals, the new nodes
+    are indexed with tasks afterwards.
+    """
+    def __init__(
+        self, index_instance,
+        document_batch_size=INDEX_REBUILD_DOCUMENT_BATCH_SIZE,
+        write_batch_size=INDEX_REBUILD_WRITE_BATCH_SIZE
+    ):
+        self.document_batch_size = document_batch_size
+        self.index_instance = index_instance
+        self.write_batch_size = write_batch_size
+
+    def _compile(self):
+        IndexTemplateNode = apps.get_model(
+            app_label='document_indexing', model_name='IndexTemplateNode'
+        )
+
+        index_template_root_node = self.index_instance.index_template_root_node
+
+        self.index_template_node_children = {}
+
+        queryset = IndexTemplateNode.objects.filter(
+            enabled=True, index=self.index_instance
+        ).exclude(pk=index_template_root_node.pk).order_by('tree_id', 'lft')
+
+        for index_template_node in queryset:
+            try:
+                template = Template(
+                    template_string=index_template_node.expression
+                )
+            except Exception as exception:
+                logger.debug(
+                    'Error compiling index template node expression: '
+                    '%s; %s', index_template_node.expression, exception
+                )
+                template = None
+
+            self.index_template_node_children.setdefault(
+                index_template_node.parent_id, []
+            ).append((index_template_node, template))
+
+        return index_template_root_node
+
+    def _evaluate(self, document, index_template_node_id, node):
+        for index_template_node, template in self.index_template_node_children.get(index_template_node_id, ()):
+            if template is None:
+                continue
+
+            try:
+                result = template.render(context={'document': document})
+            except Exception as exception:
+                logger.debug('Evaluating error: %s', exception)
+                error_message = _(
+                    'Error indexing document: %(document)s; expression: '
+                    '%(expression)s; %(exception)s'
+                ) % {
+                    'document': document,
+                    'expression': index_template_node.expression,
+                    'exception': exception
+                }
+                logger.debug(error_message)
+            else:
+                logger.debug('Evaluation result: %s', result)
+
+                if result:
+                    child = node.get_child(
+                        index_template_node_id=index_template_node.pk,
+                        value=result
+                    )
+
+                    if index_template_node.link_documents:
+                        child.document_id_list.append(document.pk)
+
+                    self._evaluate(
+                        document=document,
+                        index_template_node_id=index_template_node.pk,
+                        node=child
+                    )
+
+    def _number(self, node, lft, level):
+        """
+        Calculate the MPTT values of a node and its descendants. Returns
+        the next free `lft` value.
+        """
+        node.level = level
+        node.lft = lft
+        lft += 1
+
+        for key in sorted(node.children):
+            lft = self._number(
+                level=level + 1, lft=lft, node=node.children[key]
+            )
+
+        node.rght = lft
+        return lft + 1
+
+    def _write(self, root_node):
+        Document = apps.get_model(
+            app_label='documents', model_name='Document'
+        )
+        IndexInstanceNode = apps.get_model(
+            app_label='document_indexing', model_name='IndexInstanceNode'
+        )
+        IndexInstanceNodeDocument = IndexInstanceNode.documents.through
+
+        with transaction.atomic():
+            self.index_instance.delete_index_instance_nodes()
+            self.index_instance.initialize_index_instance_root_node_node()
+
+            index_instance_root_node = self.index_instance.index_instance_root_node
+            tree_id = index_instance_root_node.tree_id
+
+            root_node.pk = index_instance_root_node.pk
+            self._number(
+                level=index_instance_root_node.level,
+                lft=index_instance_root_node.lft, node=root_node
+            )
+            IndexInstanceNode.objects.filter(
+                pk=index_instance_root_node.pk
+            ).update(rght=root_node.rght)
+
+            # Insert one level at a time to know the primary keys of the
+            # parents. The `lft` value is unique in the tree and is used to
+            # match the inserted rows back to the nodes.
+            level_node_list = list(root_node.children.values())
+            while level_node_list:
+                IndexInstanceNode.objects.bulk_create(
+                    batch_size=self.write_batch_size, objs=[
+                        IndexInstanceNode(
+                            index_template_node_id=node.index_template_node_id,
+                            level=node.level, lft=node.lft,
+                            parent_id=node.parent.pk, rght=node.rght,
+                            tree_id=tree_id, value=node.value
+                        ) for node in level_node_list
+                    ]
+                )
+
+                pk_dictionary = dict(
+                    IndexInstanceNode.objects.filter(
+                        level=level_node_list[0].level, tree_id=tree_id
+                    ).values_list('lft', 'pk')
+                )
+
+                next_level_node_list = []
+                for node in level_node_list:
+                    node.pk = pk_dictionary[node.lft]
+                    next_level_node_list.extend(node.children.values())
+
+                level_node_list = next_level_node_list
+
+            # Documents deleted or trashed during the evaluation are not
+            # linked.
+            document_id_set = set(
+                Document.valid.filter(
+                    document_type__in=self.index_instance.document_types.all()
+                ).values_list('pk', flat=True)
+            )
+
+            document_skipped = False
+            entry_list = []
+            node_list = [root_node]
+            self.node_id_list = []
+            while node_list:
+                node = node_list.pop()
+                node_list.extend(node.children.values())
+                self.node_id_list.append(node.pk)
+
+                for document_id in node.document_id_list:
+                    if document_id in document_id_set:
+                        entry_list.append(
+                            IndexInstanceNodeDocument(
+                                document_id=document_id,
+                                indexinstancenode_id=node.pk
+                            )
+                        )
+                    else:
+                        document_skipped = True
+
+                if len(entry_list) >= self.write_batch_size:
+                    IndexInstanceNodeDocument.objects.bulk_create(
+                        objs=entry_list
+                    )
+                    entry_list = []
+
+            IndexInstanceNodeDocument.objects.bulk_create(
+                batch_size=self.write_batch_size, objs=entry_list
+            )
+
+        if document_skipped:
+            self.index_instance.delete_empty_nodes(acquire_lock=False)
+
+    def _index_search(self):
+        from mayan.apps.dynamic_search.tasks import task_index_instances
+
+        from .search import search_model_index_instance_node
+
+        for index in range(0, len(self.node_id_list), self.write_batch_size):
+            task_index_instances.apply_async(
+                kwargs={
+                    'id_list': self.node_id_list[
+                        index:index + self.write_batch_size
+                    ], 'search_model_full_name': search_model_index_instance_node.get_full_name()
+                }
+            )
+
+    def execute(self):
+        Document = apps.get_model(
+            app_label='documents', model_name='Document'
+        )
+
+        index_template_root_node = self._compile()
+
+        root_node = IndexRebuildNode()
+
+        # Load the relations the templates commonly use along with each
+        # batch instead of once per document.
+        queryset = ModelQueryFields.get(model=Document).get_queryset(
+            manager_name='valid'
+        ).filter(
+            document_type__in=self.index_instance.document_types.all()
+        ).order_by('pk')
+
+        # Stream the documents using the primary key as the cursor to
+        # avoid loading all of them or using increasingly slow offsets.
+        last_document_id = 0
+        while True:
+            document_list = list(
+                queryset.filter(
+                    pk__gt=last_document_id
+                )[:self.document_batch_size]
+            )
+
+            if not document_list:
+                break
+
+            for document in document_list:
+                logger.debug('Index; Indexing document: %s', document)
+                self._evaluate(
+                    document=document,
+                    index_template_node_id=index_template_root_node.pk,
+                    node=root_node
+                )
+
+            last_document_id = document_list[-1].pk
+
+        lock_index_instance = LockingBackend.get_backend().acquire_lock(
+            name=self.index_instance.get_lock_string(),
+            timeout=INDEX_REBUILD_LOCK_TIMEOUT
+        )
+        try:
+            self._write(root_node=root_node)
+        finally:
+            lock_index_instance.release()
+
+        self._index_search()
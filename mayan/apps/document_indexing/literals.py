@@ -1,5 +1,9 @@
 from django.utils.translation import ugettext_lazy as _
 
+INDEX_REBUILD_DOCUMENT_BATCH_SIZE = 500
+INDEX_REBUILD_LOCK_TIMEOUT = 60 * 10  # 10 minutes
+INDEX_REBUILD_WRITE_BATCH_SIZE = 1000
+
 RELATIONSHIP_NO = 'no'
 RELATIONSHIP_YES = 'yes'
 RELATIONSHIP_CHOICES = (
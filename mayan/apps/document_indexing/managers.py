@@ -15,6 +15,15 @@ class IndexInstanceManager(models.Manager):
         for index in self.filter(document_types=document.document_type):
             index.document_add(document=document)
 
+    def document_add_many(self, documents):
+        documents = list(documents)
+        document_type_id_list = {
+            document.document_type_id for document in documents
+        }
+
+        for index in self.filter(document_types__in=document_type_id_list).distinct():
+            index.document_add_many(documents=documents)
+
     def document_remove(self, document):
         for index_instance in self.filter(index_template_nodes__index_instance_nodes__documents=document):
             index_instance.document_remove(document=document)
@@ -112,6 +112,65 @@ class IndexInstance(IndexTemplate):
                 finally:
                     lock_index_instance.release()
 
+    def document_add_many(self, documents):
+        """
+        Batch version of `document_add`. The index instance lock is acquired
+        and the root node initialized once for the whole list of documents.
+        Documents are expected to be valid, this is not checked again.
+        """
+        if not self.enabled:
+            return
+
+        document_type_id_list = set(
+            self.document_types.values_list('pk', flat=True)
+        )
+        documents = [
+            document for document in documents
+            if document.document_type_id in document_type_id_list
+        ]
+
+        if not documents:
+            return
+
+        try:
+            locking_backend = LockingBackend.get_backend()
+
+            lock_index_instance = locking_backend.acquire_lock(
+                name=self.get_lock_string()
+            )
+        except LockError:
+            raise
+        else:
+            try:
+                self.initialize_index_instance_root_node_node()
+
+                for document in documents:
+                    logger.debug('Index; Indexing document: %s', document)
+
+                    try:
+                        lock_document = locking_backend.acquire_lock(
+                            name=self.get_document_lock_string(
+                                document=document
+                            )
+                        )
+                    except LockError:
+                        raise
+                    else:
+                        try:
+                            index_instance_node_id_list = self._document_add(
+                                document=document,
+                                index_instance_node_parent=self.index_instance_root_node
+                            )
+
+                            self.document_remove(
+                                acquire_lock=False, document=document,
+                                excluded_index_instance_node_id_list=index_instance_node_id_list
+                            )
+                        finally:
+                            lock_document.release()
+            finally:
+                lock_index_instance.release()
+
     def _document_add(self, document, index_instance_node_parent):
         index_instance_node_id_list = []
 
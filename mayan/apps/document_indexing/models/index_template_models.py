@@ -17,6 +17,7 @@ from mayan.apps.events.classes import (
 from mayan.apps.events.decorators import method_event
 from mayan.apps.events.models import StoredEventType
 
+from ..classes import IndexRebuilder
 from ..events import (
     event_index_template_created, event_index_template_edited
 )
@@ -138,18 +139,9 @@ class IndexTemplate(ExtraDataModelMixin, models.Model):
         )
 
         if self.enabled:
-            self.delete_index_instance_nodes()
-
-            # Create the new root index instance node.
-            self.index_template_root_node.index_instance_nodes.create()
-
-            index_instance = IndexInstance.objects.get(pk=self.pk)
-            index_instance.index_instance_root_node
-            # Re-index each document with a type associated with this index.
-            for document in Document.objects.filter(document_type__in=self.document_types.all()):
-                # Evaluate each index template node for each document
-                # associated with this index.
-                index_instance.document_add(document=document)
+            IndexRebuilder(
+                index_instance=IndexInstance.objects.get(pk=self.pk)
+            ).execute()
 
     def reset(self):
         self.delete_index_instance_nodes()
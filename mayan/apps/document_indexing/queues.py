@@ -20,6 +20,10 @@ queue_indexing.add_task_type(
     label=_('Index document'),
     dotted_path='mayan.apps.document_indexing.tasks.task_index_instance_document_add'
 )
+queue_indexing.add_task_type(
+    label=_('Index documents'),
+    dotted_path='mayan.apps.document_indexing.tasks.task_index_instance_document_add_many'
+)
 
 queue_tools.add_task_type(
     label=_('Rebuild index'),
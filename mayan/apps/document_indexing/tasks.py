@@ -50,6 +50,40 @@ def task_index_instance_document_add(self, document_id, index_instance_id=None):
             raise self.retry(exc=exception)
 
 
+@app.task(
+    bind=True, ignore_result=True, max_retries=None, retry_backoff=True,
+    retry_backoff_max=60
+)
+def task_index_instance_document_add_many(self, document_id_list):
+    Document = apps.get_model(
+        app_label='documents', model_name='Document'
+    )
+    IndexInstance = apps.get_model(
+        app_label='document_indexing', model_name='IndexInstance'
+    )
+
+    # Documents deleted or trashed before we could execute are dropped
+    # by the valid manager.
+    queryset = Document.valid.filter(
+        is_stub=False, pk__in=document_id_list
+    ).select_related('document_type')
+
+    try:
+        IndexInstance.objects.document_add_many(documents=queryset)
+    except OperationalError as exception:
+        logger.warning(
+            'Operational error while trying to index documents: '
+            '%s; %s', document_id_list, exception
+        )
+        raise self.retry(exc=exception)
+    except LockError as exception:
+        logger.warning(
+            'Unable to acquire lock for documents %s; %s ',
+            document_id_list, exception
+        )
+        raise self.retry(exc=exception)
+
+
 @app.task(
     bind=True, ignore_result=True, max_retries=None, retry_backoff=True
 )
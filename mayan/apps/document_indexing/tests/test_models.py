@@ -140,6 +140,38 @@ class IndexInstanceTestCase(IndexTemplateTestMixin, GenericDocumentTestCase):
             self._test_document in IndexInstanceNode.objects.last().documents.all()
         )
 
+    def test_document_add_many(self):
+        self._create_test_index_template_node(
+            expression=TEST_INDEX_TEMPLATE_DOCUMENT_LABEL_EXPRESSION
+        )
+        self._create_test_document_stub()
+
+        test_index_instance = IndexInstance.objects.get(
+            pk=self._test_index_template.pk
+        )
+        for test_document in self._test_documents:
+            test_index_instance.document_remove(document=test_document)
+
+        self.assertFalse(
+            IndexInstanceNode.objects.filter(
+                documents__in=self._test_documents
+            ).exists()
+        )
+
+        IndexInstance.objects.document_add_many(
+            documents=self._test_documents
+        )
+
+        self.assertEqual(
+            set(
+                IndexInstanceNode.objects.filter(
+                    documents__in=self._test_documents
+                ).values_list('value', flat=True)
+            ), {
+                test_document.label for test_document in self._test_documents
+            }
+        )
+
     def test_dual_level_dual_document_index(self):
         """
         Test creation of an index instance with two first levels with different
@@ -172,6 +204,50 @@ class IndexInstanceTestCase(IndexTemplateTestMixin, GenericDocumentTestCase):
             }
         )
 
+    def test_rebuild_tree_structure(self):
+        self._create_test_document_stub()
+
+        level_1 = self._test_index_template.index_template_nodes.create(
+            expression='{{ document.uuid }}', link_documents=False,
+            parent=self._test_index_template_root_node
+        )
+
+        self._test_index_template.index_template_nodes.create(
+            expression='{{ document.label }}', link_documents=True,
+            parent=level_1
+        )
+
+        self._test_index_template.rebuild()
+
+        test_index_instance = IndexInstance.objects.get(
+            pk=self._test_index_template.pk
+        )
+        self.assertEqual(
+            test_index_instance.index_instance_root_node.get_descendant_count(),
+            4
+        )
+
+        for test_document in self._test_documents:
+            test_index_instance_node = IndexInstanceNode.objects.get(
+                documents=test_document
+            )
+            self.assertEqual(
+                test_index_instance_node.value, test_document.label
+            )
+            self.assertEqual(
+                [
+                    node.value for node in test_index_instance_node.get_ancestors()
+                ], ['', str(test_document.uuid)]
+            )
+
+        # Incremental updates must keep working on the bulk created tree.
+        self._create_test_document_stub()
+
+        self.assertEqual(
+            test_index_instance.index_instance_root_node.get_descendant_count(),
+            6
+        )
+
     def test_document_description_index(self):
         self._create_test_index_template_node(
             expression=TEST_INDEX_TEMPLATE_DOCUMENT_DESCRIPTION_EXPRESSION
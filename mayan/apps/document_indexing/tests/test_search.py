@@ -0,0 +1,49 @@
+from mayan.apps.documents.tests.base import GenericDocumentTestCase
+from mayan.apps.dynamic_search.tests.mixins import SearchTestMixin
+
+from ..models import IndexInstanceNode
+from ..permissions import permission_index_instance_view
+from ..search import search_model_index_instance_node
+
+from .literals import TEST_INDEX_TEMPLATE_DOCUMENT_LABEL_EXPRESSION
+from .mixins import IndexTemplateTestMixin
+
+
+class IndexInstanceNodeSearchTestCase(
+    IndexTemplateTestMixin, SearchTestMixin, GenericDocumentTestCase
+):
+    _test_index_template_node_expression = TEST_INDEX_TEMPLATE_DOCUMENT_LABEL_EXPRESSION
+    auto_upload_test_document = False
+
+    def _do_test_search(self):
+        return self.search_backend.search(
+            search_model=search_model_index_instance_node, query={
+                'value': self._test_document.label
+            }, user=self._test_case_user
+        )
+
+    def test_search_model_index_instance_node_rebuild_with_access(self):
+        self._create_test_document_stub()
+
+        self.grant_access(
+            obj=self._test_index_template,
+            permission=permission_index_instance_view
+        )
+        self.grant_access(
+            obj=self._test_document,
+            permission=permission_index_instance_view
+        )
+
+        self._test_index_template.rebuild()
+
+        self._clear_events()
+
+        queryset = self._do_test_search()
+        self.assertTrue(
+            IndexInstanceNode.objects.get(
+                value=self._test_document.label
+            ) in queryset
+        )
+
+        events = self._get_test_events()
+        self.assertEqual(events.count(), 0)
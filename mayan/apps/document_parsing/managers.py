@@ -16,6 +16,81 @@ logger = logging.getLogger(name=__name__)
 
 
 class DocumentFilePageContentManager(models.Manager):
+    def bulk_update_or_create(self, document_file_page_content_dictionary):
+        """
+        Store the content of several document file pages using one query
+        to find the existing rows, one bulk update and one bulk insert.
+        """
+        if not document_file_page_content_dictionary:
+            return
+
+        with transaction.atomic():
+            existing_entries = {
+                entry.document_file_page_id: entry for entry in self.filter(
+                    document_file_page__in=document_file_page_content_dictionary.keys()
+                )
+            }
+
+            entries_create = []
+            entries_update = []
+
+            for document_file_page, content in document_file_page_content_dictionary.items():
+                entry = existing_entries.get(document_file_page.pk)
+                if entry:
+                    entry.content = content
+                    entries_update.append(entry)
+                else:
+                    entries_create.append(
+                        self.model(
+                            content=content,
+                            document_file_page=document_file_page
+                        )
+                    )
+
+            if entries_update:
+                self.bulk_update(objs=entries_update, fields=('content',))
+
+            if entries_create:
+                self.bulk_create(objs=entries_create)
+
+        # Bulk writes do not trigger the search indexing signals, index
+        # the pages and the objects containing them with a task instead.
+        from mayan.apps.documents.search import (
+            search_model_document, search_model_document_file,
+            search_model_document_file_page
+        )
+        from mayan.apps.dynamic_search.tasks import task_index_instances
+
+        document_file_page_list = list(
+            document_file_page_content_dictionary.keys()
+        )
+        document_file_id_list = list(
+            {
+                document_file_page.document_file_id for document_file_page in document_file_page_list
+            }
+        )
+        document_id_list = list(
+            {
+                document_file_page.document_file.document_id for document_file_page in document_file_page_list
+            }
+        )
+
+        for search_model, id_list in (
+            (
+                search_model_document_file_page, [
+                    document_file_page.pk for document_file_page in document_file_page_list
+                ]
+            ),
+            (search_model_document_file, document_file_id_list),
+            (search_model_document, document_id_list)
+        ):
+            task_index_instances.apply_async(
+                kwargs={
+                    'id_list': id_list,
+                    'search_model_full_name': search_model.get_full_name()
+                }
+            )
+
     def delete_content_for(self, document_file, user=None):
         with transaction.atomic():
             for document_file_page in document_file.pages.all():
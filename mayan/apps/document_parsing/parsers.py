@@ -60,13 +60,44 @@ class Parser:
                 ).append(parser_class)
 
     def process_document_file(self, document_file):
+        DocumentFilePageContent = apps.get_model(
+            app_label='document_parsing', model_name='DocumentFilePageContent'
+        )
+
         logger.info(
             'Starting parsing for document file: %s', document_file
         )
         logger.debug('document file: %d', document_file.pk)
 
-        for document_file_page in document_file.pages.all():
-            self.process_document_file_page(document_file_page=document_file_page)
+        document_file_pages = tuple(document_file.pages.all())
+        page_number_list = [
+            document_file_page.page_number for document_file_page in document_file_pages
+        ]
+
+        with document_file.open() as file_object:
+            try:
+                page_content_dictionary = self.execute_document_file(
+                    file_object=file_object, page_number_list=page_number_list
+                )
+            except Exception as exception:
+                error_message = _('Exception parsing document file; %s') % exception
+                logger.error(error_message, exc_info=True)
+                raise ParserError(error_message)
+            finally:
+                file_object.close()
+
+        DocumentFilePageContent.objects.bulk_update_or_create(
+            document_file_page_content_dictionary={
+                document_file_page: page_content_dictionary.get(
+                    document_file_page.page_number, ''
+                ) for document_file_page in document_file_pages
+            }
+        )
+
+        logger.info(
+            'Finished processing %d pages of document file: %s',
+            len(document_file_pages), document_file
+        )
 
     def process_document_file_page(self, document_file_page):
         DocumentFilePageContent = apps.get_model(
@@ -108,6 +139,23 @@ class Parser:
             self.__class__.__name__
         )
 
+    def execute_document_file(self, file_object, page_number_list):
+        """
+        Return a dictionary of the content of each page keyed by page
+        number. Subclasses able to extract all the pages in a single pass
+        should override this method. The default calls `execute` once per
+        page.
+        """
+        result = {}
+
+        for page_number in page_number_list:
+            file_object.seek(0)
+            result[page_number] = self.execute(
+                file_object=file_object, page_number=page_number
+            )
+
+        return result
+
 
 class PopplerParser(Parser):
     """
@@ -124,42 +172,106 @@ class PopplerParser(Parser):
 
         logger.debug('self.pdftotext_path: %s', self.pdftotext_path)
 
+    def _clean_output(self, output):
+        if output in (b'', b'\x0c'):
+            logger.debug('Parser didn\'t return any output')
+            return ''
+
+        if output[-1:] == b'\x0c':
+            output = output[:-1]
+
+        if output[-2:] == b'\x0a\x0a':
+            output = output[:-2]
+
+        return force_text(s=output)
+
+    def _execute_pdftotext(self, filename, first_page_number, last_page_number):
+        command = []
+        command.append(self.pdftotext_path)
+        command.append('-f')
+        command.append(str(first_page_number))
+        command.append('-l')
+        command.append(str(last_page_number))
+        command.append(filename)
+        command.append('-')
+
+        proc = subprocess.Popen(
+            command, close_fds=True, stderr=subprocess.PIPE,
+            stdout=subprocess.PIPE
+        )
+        output, error_output = proc.communicate()
+        if proc.returncode != 0:
+            logger.error(error_output)
+
+            raise ParserError
+
+        return output
+
     def execute(self, file_object, page_number):
         logger.debug('Parsing PDF page: %d', page_number)
 
         with NamedTemporaryFile() as temporary_file_object:
             copyfileobj(fsrc=file_object, fdst=temporary_file_object)
-            temporary_file_object.seek(0)
-
-            command = []
-            command.append(self.pdftotext_path)
-            command.append('-f')
-            command.append(str(page_number))
-            command.append('-l')
-            command.append(str(page_number))
-            command.append(temporary_file_object.name)
-            command.append('-')
-
-            proc = subprocess.Popen(
-                command, close_fds=True, stderr=subprocess.PIPE,
-                stdout=subprocess.PIPE
+            temporary_file_object.flush()
+
+            return self._clean_output(
+                output=self._execute_pdftotext(
+                    filename=temporary_file_object.name,
+                    first_page_number=page_number,
+                    last_page_number=page_number
+                )
             )
-            return_code = proc.wait()
-            if return_code != 0:
-                logger.error(proc.stderr.readline())
 
-                raise ParserError
+    def execute_document_file(self, file_object, page_number_list):
+        if not page_number_list:
+            return {}
 
-            output = proc.stdout.read()
+        logger.debug('Parsing PDF pages: %d', len(page_number_list))
 
-            if output == b'\x0c':
-                logger.debug('Parser didn\'t return any output')
-                return ''
+        first_page_number = min(page_number_list)
+        last_page_number = max(page_number_list)
 
-            if output[-3:] == b'\x0a\x0a\x0c':
-                return force_text(s=output[:-3])
+        # Materialize the file once and extract the whole page range in a
+        # single pdftotext call. pdftotext terminates each page with a form
+        # feed.
+        with NamedTemporaryFile() as temporary_file_object:
+            copyfileobj(fsrc=file_object, fdst=temporary_file_object)
+            temporary_file_object.flush()
 
-            return force_text(s=output)
+            output = self._execute_pdftotext(
+                filename=temporary_file_object.name,
+                first_page_number=first_page_number,
+                last_page_number=last_page_number
+            )
+
+            page_output_list = output.split(b'\x0c')
+            if page_output_list[-1] == b'':
+                page_output_list.pop()
+
+            page_count = last_page_number - first_page_number + 1
+            if len(page_output_list) != page_count:
+                # A form feed inside the page text or a page count
+                # mismatch. Fall back to one call per page, reusing the
+                # temporary file.
+                logger.warning(
+                    'pdftotext returned %d pages, expected %d; parsing '
+                    'page by page.', len(page_output_list), page_count
+                )
+                return {
+                    page_number: self._clean_output(
+                        output=self._execute_pdftotext(
+                            filename=temporary_file_object.name,
+                            first_page_number=page_number,
+                            last_page_number=page_number
+                        )
+                    ) for page_number in page_number_list
+                }
+
+        return {
+            page_number: self._clean_output(
+                output=page_output_list[page_number - first_page_number]
+            ) for page_number in page_number_list
+        }
 
 
 class OfficePopplerParser(PopplerParser):
@@ -172,6 +284,16 @@ class OfficePopplerParser(PopplerParser):
                 file_object=pdf_file_object, page_number=page_number
             )
 
+    def execute_document_file(self, file_object, page_number_list):
+        converter = ConverterBase.get_converter_class()(
+            file_object=file_object
+        )
+        with converter.to_pdf() as pdf_file_object:
+            return super().execute_document_file(
+                file_object=pdf_file_object,
+                page_number_list=page_number_list
+            )
+
 
 Parser.register(
     mimetypes=('application/pdf',),
@@ -1 +1,2 @@
 TEST_DOCUMENT_FILE_CONTENT_INDEX_NODE_TEMPLATE = '{{ document.content|join:" " }}'
+TEST_DOCUMENT_FILE_PAGE_CONTENT_UPDATED = 'updated content'
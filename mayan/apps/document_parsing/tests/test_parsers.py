@@ -1,10 +1,11 @@
 from mayan.apps.documents.tests.base import GenericDocumentTestCase
 from mayan.apps.documents.tests.literals import (
     TEST_FILE_HYBRID_PDF_CONTENT, TEST_FILE_HYBRID_PDF_PATH,
-    TEST_FILE_OFFICE_CONTENT, TEST_FILE_OFFICE_PATH,
+    TEST_FILE_OFFICE_CONTENT, TEST_FILE_OFFICE_PATH, TEST_FILE_PDF_PATH,
     TEST_FILE_TEXT_CONTENT, TEST_FILE_TEXT_PATH
 )
 
+from ..models import DocumentFilePageContent
 from ..parsers import OfficePopplerParser, PopplerParser
 
 
@@ -46,3 +47,41 @@ class ParserTestCase(GenericDocumentTestCase):
         self.assertTrue(
             TEST_FILE_HYBRID_PDF_CONTENT in self._test_document_file.pages.first().content.content
         )
+
+    def test_poppler_parser_with_multi_page_pdf(self):
+        self._test_document_path = TEST_FILE_PDF_PATH
+        self._upload_test_document()
+
+        parser = PopplerParser()
+
+        parser.process_document_file(self._test_document_file)
+
+        for document_file_page in self._test_document_file.pages.all():
+            with self._test_document_file.open() as file_object:
+                page_content = parser.execute(
+                    file_object=file_object,
+                    page_number=document_file_page.page_number
+                )
+
+            self.assertEqual(
+                document_file_page.content.content, page_content
+            )
+
+    def test_poppler_parser_reparse(self):
+        self._test_document_path = TEST_FILE_HYBRID_PDF_PATH
+        self._upload_test_document()
+
+        parser = PopplerParser()
+
+        parser.process_document_file(self._test_document_file)
+        DocumentFilePageContent.objects.update(content='')
+
+        parser.process_document_file(self._test_document_file)
+
+        self.assertEqual(
+            DocumentFilePageContent.objects.count(),
+            self._test_document_file.pages.count()
+        )
+        self.assertTrue(
+            TEST_FILE_HYBRID_PDF_CONTENT in self._test_document_file.pages.first().content.content
+        )
@@ -0,0 +1,83 @@
+from mayan.apps.documents.permissions import (
+    permission_document_file_view, permission_document_view
+)
+from mayan.apps.documents.search import (
+    search_model_document, search_model_document_file,
+    search_model_document_file_page
+)
+from mayan.apps.documents.tests.base import GenericDocumentViewTestCase
+from mayan.apps.dynamic_search.tests.mixins import SearchTestMixin
+
+from ..models import DocumentFilePageContent
+
+from .literals import TEST_DOCUMENT_FILE_PAGE_CONTENT_UPDATED
+
+
+class DocumentFilePageContentSearchTestCase(
+    SearchTestMixin, GenericDocumentViewTestCase
+):
+    def _do_test_bulk_update_or_create(self):
+        DocumentFilePageContent.objects.bulk_update_or_create(
+            document_file_page_content_dictionary={
+                self._test_document_file_page: TEST_DOCUMENT_FILE_PAGE_CONTENT_UPDATED
+            }
+        )
+
+    def test_search_model_document_bulk_update_with_access(self):
+        self.grant_access(
+            obj=self._test_document, permission=permission_document_view
+        )
+
+        self._do_test_bulk_update_or_create()
+
+        self._clear_events()
+
+        queryset = self.search_backend.search(
+            search_model=search_model_document, query={
+                'files__file_pages__content__content': TEST_DOCUMENT_FILE_PAGE_CONTENT_UPDATED
+            }, user=self._test_case_user
+        )
+        self.assertTrue(self._test_document in queryset)
+
+        events = self._get_test_events()
+        self.assertEqual(events.count(), 0)
+
+    def test_search_model_document_file_bulk_update_with_access(self):
+        self.grant_access(
+            obj=self._test_document,
+            permission=permission_document_file_view
+        )
+
+        self._do_test_bulk_update_or_create()
+
+        self._clear_events()
+
+        queryset = self.search_backend.search(
+            search_model=search_model_document_file, query={
+                'file_pages__content__content': TEST_DOCUMENT_FILE_PAGE_CONTENT_UPDATED
+            }, user=self._test_case_user
+        )
+        self.assertTrue(self._test_document_file in queryset)
+
+        events = self._get_test_events()
+        self.assertEqual(events.count(), 0)
+
+    def test_search_model_document_file_page_bulk_update_with_access(self):
+        self.grant_access(
+            obj=self._test_document,
+            permission=permission_document_file_view
+        )
+
+        self._do_test_bulk_update_or_create()
+
+        self._clear_events()
+
+        queryset = self.search_backend.search(
+            search_model=search_model_document_file_page, query={
+                'content__content': TEST_DOCUMENT_FILE_PAGE_CONTENT_UPDATED
+            }, user=self._test_case_user
+        )
+        self.assertTrue(self._test_document_file_page in queryset)
+
+        events = self._get_test_events()
+        self.assertEqual(events.count(), 0)
@@ -1,5 +1,7 @@
 from django.apps import apps
-from django.db.models.signals import post_migrate, post_save, pre_delete
+from django.db.models.signals import (
+    post_delete, post_migrate, post_save, pre_delete
+)
 from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.acls.classes import ModelPermission
@@ -30,11 +32,14 @@ from .handlers import (
     handler_create_workflow_image_cache,
     handler_launch_workflow_on_create,
     handler_launch_workflow_on_type_change, handler_trigger_transition,
+    handler_workflow_template_escalation_datetime_update,
     handler_workflow_template_post_edit,
+    handler_workflow_template_state_escalation_datetime_update,
     handler_workflow_template_state_post_edit,
     handler_workflow_template_state_pre_delete,
     handler_workflow_template_transition_post_edit,
-    handler_workflow_template_transition_pre_delete
+    handler_workflow_template_transition_pre_delete,
+    handler_workflow_transition_trigger_index_invalidate
 )
 from .html_widgets import WorkflowLogExtraDataWidget, widget_transition_events
 from .links import (
@@ -691,6 +696,45 @@ class DocumentStatesApp(MayanAppConfig):
             sender=Action
         )
 
+        # Workflow transition trigger index
+
+        for model in (
+            WorkflowState, WorkflowTransition, WorkflowTransitionTriggerEvent
+        ):
+            post_delete.connect(
+                dispatch_uid='workflows_handler_workflow_transition_trigger_index_invalidate_delete_{}'.format(
+                    model._meta.model_name
+                ), receiver=handler_workflow_transition_trigger_index_invalidate,
+                sender=model
+            )
+            post_save.connect(
+                dispatch_uid='workflows_handler_workflow_transition_trigger_index_invalidate_save_{}'.format(
+                    model._meta.model_name
+                ), receiver=handler_workflow_transition_trigger_index_invalidate,
+                sender=model
+            )
+
+        # Escalation schedule
+
+        for model in (WorkflowState, WorkflowTransition):
+            post_save.connect(
+                dispatch_uid='workflows_handler_workflow_template_escalation_datetime_update_{}'.format(
+                    model._meta.model_name
+                ), receiver=handler_workflow_template_escalation_datetime_update,
+                sender=model
+            )
+
+        post_delete.connect(
+            dispatch_uid='workflows_handler_workflow_template_state_escalation_datetime_update_delete',
+            receiver=handler_workflow_template_state_escalation_datetime_update,
+            sender=WorkflowStateEscalation
+        )
+        post_save.connect(
+            dispatch_uid='workflows_handler_workflow_template_state_escalation_datetime_update_save',
+            receiver=handler_workflow_template_state_escalation_datetime_update,
+            sender=WorkflowStateEscalation
+        )
+
         # Indexing, Workflow template
 
         post_save.connect(
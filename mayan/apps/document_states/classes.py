@@ -1,6 +1,13 @@
 import logging
+import threading
+import time
+import uuid
 
 from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
 from django.db.utils import OperationalError, ProgrammingError
 from django.utils.translation import ugettext_lazy as _
 
@@ -8,7 +15,12 @@ from mayan.apps.common.classes import PropertyHelper
 from mayan.apps.databases.classes import BaseBackend
 from mayan.apps.templating.classes import Template
 
+from mayan.apps.events.classes import EventType
+from mayan.apps.events.literals import TEXT_UNKNOWN_EVENT_ID
+
 from .exceptions import WorkflowStateActionError
+from .literals import WORKFLOW_TRIGGER_INDEX_VERSION_CHECK_INTERVAL
+from .settings import setting_workflow_trigger_deferred
 
 __all__ = ('WorkflowAction',)
 logger = logging.getLogger(name=__name__)
@@ -132,3 +144,274 @@ class WorkflowAction(BaseBackend):
         logger.debug('%s template result: %s', field_name, result)
 
         return result
+
+
+class WorkflowTransitionTriggerIndex:
+    """
+    In memory index of the transitions triggered by each event type,
+    keyed by event type name and origin state. The index is rebuilt when
+    a workflow template state, transition or trigger changes. Other
+    processes notice the change through a version stored in the cache.
+    """
+    cache_key_version = 'document_states:workflow_transition_trigger_index_version'
+
+    _index = None
+    _initial_states = None
+    _lock = threading.Lock()
+    _version = None
+    _version_checked = 0
+
+    @classmethod
+    def _build(cls):
+        WorkflowState = apps.get_model(
+            app_label='document_states', model_name='WorkflowState'
+        )
+        WorkflowTransitionTriggerEvent = apps.get_model(
+            app_label='document_states',
+            model_name='WorkflowTransitionTriggerEvent'
+        )
+
+        index = {}
+        workflow_ids = set()
+
+        queryset = WorkflowTransitionTriggerEvent.objects.values_list(
+            'event_type__name', 'transition__origin_state_id',
+            'transition_id', 'transition__workflow_id'
+        ).order_by('transition_id')
+
+        for name, origin_state_id, transition_id, workflow_id in queryset:
+            index.setdefault(name, {}).setdefault(
+                origin_state_id, []
+            ).append(transition_id)
+            workflow_ids.add(workflow_id)
+
+        initial_states = dict(
+            WorkflowState.objects.filter(
+                initial=True, workflow_id__in=workflow_ids
+            ).values_list('workflow_id', 'pk')
+        )
+
+        return index, initial_states
+
+    @classmethod
+    def _get_cache_version(cls):
+        try:
+            return cache.get(key=cls.cache_key_version)
+        except Exception as exception:
+            logger.warning(
+                'Unable to read the workflow transition trigger index '
+                'version from the cache; %s', exception
+            )
+            # Force a rebuild on every check interval.
+            return uuid.uuid4().hex
+
+    @classmethod
+    def get_index(cls):
+        with cls._lock:
+            now = time.monotonic()
+            if now - cls._version_checked > WORKFLOW_TRIGGER_INDEX_VERSION_CHECK_INTERVAL:
+                cls._version_checked = now
+                version = cls._get_cache_version()
+                if version != cls._version:
+                    cls._index = None
+                    cls._version = version
+
+            if cls._index is None:
+                cls._index, cls._initial_states = cls._build()
+
+            return cls._index, cls._initial_states
+
+    @classmethod
+    def get_transition_ids(cls, name):
+        """
+        Return a dictionary of the IDs of the transitions triggered by an
+        event type keyed by their origin state ID.
+        """
+        index, initial_states = cls.get_index()
+        return index.get(name)
+
+    @classmethod
+    def get_initial_state_id(cls, workflow_id):
+        index, initial_states = cls.get_index()
+        return initial_states.get(workflow_id)
+
+    @classmethod
+    def invalidate(cls):
+        with cls._lock:
+            cls._index = None
+            cls._version = uuid.uuid4().hex
+
+            try:
+                cache.set(
+                    key=cls.cache_key_version, value=cls._version,
+                    timeout=None
+                )
+            except Exception as exception:
+                logger.warning(
+                    'Unable to store the workflow transition trigger index '
+                    'version in the cache; %s', exception
+                )
+
+
+class WorkflowTransitionTriggerBatch:
+    """
+    Collect the actions that match a workflow transition trigger and
+    apply the transitions in a single batch when the current transaction
+    commits.
+    """
+    _local = threading.local()
+
+    @staticmethod
+    def get_document_id(action):
+        Document = apps.get_model(
+            app_label='documents', model_name='Document'
+        )
+
+        content_type = ContentType.objects.get_for_model(model=Document)
+
+        if action.target_content_type_id == content_type.pk and action.target_object_id:
+            return int(action.target_object_id)
+        elif action.action_object_content_type_id == content_type.pk and action.action_object_object_id:
+            return int(action.action_object_object_id)
+
+    @classmethod
+    def add(cls, action):
+        """
+        Queue the workflow transitions triggered by an action. Actions
+        whose event type does not trigger any transition are ignored
+        without querying the database.
+        """
+        if not WorkflowTransitionTriggerIndex.get_transition_ids(name=action.verb):
+            return
+
+        document_id = cls.get_document_id(action=action)
+        if document_id is None:
+            return
+
+        entry = (document_id, action.verb)
+
+        if not setting_workflow_trigger_deferred.value:
+            cls.process(entry_list=(entry,))
+            return
+
+        connection = transaction.get_connection()
+
+        if not connection.in_atomic_block:
+            cls.dispatch(entry_list=(entry,))
+            return
+
+        batch = getattr(cls._local, 'batch', None)
+        pending_callbacks = [
+            callback_entry[1] for callback_entry in connection.run_on_commit
+        ]
+
+        # The batch of a rolled back transaction is discarded along with
+        # its on commit callback.
+        if batch is None or batch.dispatch_batch not in pending_callbacks:
+            batch = cls()
+            cls._local.batch = batch
+            transaction.on_commit(func=batch.dispatch_batch)
+
+        batch.entry_list.append(entry)
+
+    @classmethod
+    def dispatch(cls, entry_list):
+        from .tasks import task_workflow_instance_trigger_transitions
+
+        try:
+            task_workflow_instance_trigger_transitions.apply_async(
+                kwargs={'entry_list': list(entry_list)}
+            )
+        except Exception as exception:
+            logger.error(
+                'Unable to queue the workflow trigger task; %s. Applying '
+                'the transitions synchronously.', exception, exc_info=True
+            )
+            cls.process(entry_list=entry_list)
+
+    @classmethod
+    def process(cls, entry_list):
+        """
+        Apply the triggered transitions. `entry_list` is a list of
+        (document ID, event type name) pairs. The workflow instances of
+        all the documents and their current states are resolved with a
+        single query.
+        """
+        WorkflowInstance = apps.get_model(
+            app_label='document_states', model_name='WorkflowInstance'
+        )
+        WorkflowInstanceLogEntry = apps.get_model(
+            app_label='document_states', model_name='WorkflowInstanceLogEntry'
+        )
+        WorkflowTransition = apps.get_model(
+            app_label='document_states', model_name='WorkflowTransition'
+        )
+
+        entry_list = [
+            (document_id, name) for document_id, name in entry_list
+            if WorkflowTransitionTriggerIndex.get_transition_ids(name=name)
+        ]
+        if not entry_list:
+            return
+
+        last_log_entry_queryset = WorkflowInstanceLogEntry.objects.filter(
+            workflow_instance=OuterRef('pk')
+        ).order_by('-datetime', '-pk')
+
+        workflow_instances = {}
+        queryset = WorkflowInstance.objects.filter(
+            document_id__in={document_id for document_id, name in entry_list}
+        ).annotate(
+            last_state_id=Subquery(
+                last_log_entry_queryset.values(
+                    'transition__destination_state_id'
+                )[:1]
+            )
+        ).order_by('pk')
+
+        for workflow_instance in queryset:
+            workflow_instances.setdefault(
+                workflow_instance.document_id, []
+            ).append(workflow_instance)
+
+        for document_id, name in entry_list:
+            transition_ids = WorkflowTransitionTriggerIndex.get_transition_ids(
+                name=name
+            ) or {}
+
+            for workflow_instance in workflow_instances.get(document_id, ()):
+                # Transitions applied by a previous entry of the batch
+                # change the current state.
+                state_id = getattr(
+                    workflow_instance, '_trigger_state_id',
+                    workflow_instance.last_state_id
+                ) or WorkflowTransitionTriggerIndex.get_initial_state_id(
+                    workflow_id=workflow_instance.workflow_id
+                )
+
+                candidate_ids = transition_ids.get(state_id)
+                if not candidate_ids:
+                    continue
+
+                for transition in WorkflowTransition.objects.filter(pk__in=candidate_ids).order_by('pk'):
+                    if not transition.evaluate_condition(workflow_instance=workflow_instance):
+                        continue
+
+                    try:
+                        event_type_label = EventType.get(id=name).label
+                    except KeyError:
+                        event_type_label = TEXT_UNKNOWN_EVENT_ID % name
+
+                    log_entry = workflow_instance.do_transition(
+                        comment=_('Event trigger: %s') % event_type_label,
+                        transition=transition
+                    )
+                    if log_entry:
+                        workflow_instance._trigger_state_id = transition.destination_state_id
+                    break
+
+    def __init__(self):
+        self.entry_list = []
+
+    def dispatch_batch(self):
+        self.__class__.dispatch(entry_list=self.entry_list)
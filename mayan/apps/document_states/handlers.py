@@ -1,13 +1,20 @@
+from functools import partial
+
 from django.apps import apps
-from django.utils.translation import ugettext_lazy as _
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
 
 from mayan.apps.document_indexing.tasks import task_index_instance_document_add
-from mayan.apps.events.classes import EventType
-from mayan.apps.events.literals import TEXT_UNKNOWN_EVENT_ID
 
+from .classes import (
+    WorkflowTransitionTriggerBatch, WorkflowTransitionTriggerIndex
+)
 from .literals import STORAGE_NAME_WORKFLOW_CACHE
 from .settings import setting_workflow_image_cache_maximum_size
-from .tasks import task_launch_all_workflow_for
+from .tasks import (
+    task_launch_all_workflow_for,
+    task_workflow_instance_escalation_datetime_update
+)
 
 
 def handler_create_workflow_image_cache(sender, **kwargs):
@@ -32,55 +39,45 @@ def handler_launch_workflow_on_type_change(sender, instance, **kwargs):
     )
 
 
+def _workflow_instance_escalation_datetime_update(workflow_template_id):
+    transaction.on_commit(
+        func=partial(
+            task_workflow_instance_escalation_datetime_update.apply_async,
+            kwargs={'workflow_template_id': workflow_template_id}
+        )
+    )
+
+
 def handler_trigger_transition(sender, **kwargs):
-    action = kwargs['instance']
+    WorkflowTransitionTriggerBatch.add(action=kwargs['instance'])
 
-    Document = apps.get_model(
-        app_label='documents', model_name='Document'
-    )
-    WorkflowInstance = apps.get_model(
-        app_label='document_states', model_name='WorkflowInstance'
-    )
-    WorkflowTransition = apps.get_model(
-        app_label='document_states', model_name='WorkflowTransition'
-    )
 
-    trigger_transitions = WorkflowTransition.objects.filter(
-        trigger_events__event_type__name=kwargs['instance'].verb
+def handler_workflow_transition_trigger_index_invalidate(sender, **kwargs):
+    WorkflowTransitionTriggerIndex.invalidate()
+
+
+# Escalation schedule
+
+
+def handler_workflow_template_escalation_datetime_update(sender, **kwargs):
+    _workflow_instance_escalation_datetime_update(
+        workflow_template_id=kwargs['instance'].workflow_id
     )
 
-    if isinstance(action.target, Document):
-        workflow_instances = WorkflowInstance.objects.filter(
-            workflow__transitions__in=trigger_transitions,
-            document=action.target
-        ).distinct()
-    elif isinstance(action.action_object, Document):
-        workflow_instances = WorkflowInstance.objects.filter(
-            workflow__transitions__in=trigger_transitions,
-            document=action.action_object
-        ).distinct()
+
+def handler_workflow_template_state_escalation_datetime_update(
+    sender, **kwargs
+):
+    try:
+        workflow_template_id = kwargs['instance'].state.workflow_id
+    except ObjectDoesNotExist:
+        """
+        The state is being deleted along with its escalations.
+        """
     else:
-        workflow_instances = WorkflowInstance.objects.none()
-
-    for workflow_instance in workflow_instances:
-        # Select the first transition that is valid for this workflow state.
-        valid_transitions = list(
-            set(
-                trigger_transitions
-            ) & set(
-                workflow_instance.get_transition_choices()
-            )
+        _workflow_instance_escalation_datetime_update(
+            workflow_template_id=workflow_template_id
         )
-        if valid_transitions:
-            try:
-                event_type_label = EventType.get(id=action.verb).label
-            except KeyError:
-                event_type_label = TEXT_UNKNOWN_EVENT_ID % action.verb
-
-            workflow_instance.do_transition(
-                comment=_('Event trigger: %s') % event_type_label,
-                transition=valid_transitions[0]
-            )
 
 
 # Indexing, workflow template
@@ -21,6 +21,8 @@ DEFAULT_WORKFLOWS_IMAGE_CACHE_STORAGE_BACKEND_ARGUMENTS = {
     'location': os.path.join(settings.MEDIA_ROOT, 'workflows')
 }
 
+DEFAULT_WORKFLOWS_TRIGGER_DEFERRED = True
+DEFAULT_WORKFLOWS_WORKFLOW_STATE_ESCALATION_CHECK_BATCH_SIZE = 100
 DEFAULT_WORKFLOWS_WORKFLOW_STATE_ESCALATION_CHECK_INTERVAL = 60 * 5  # 5 minutes
 
 FIELD_TYPE_CHOICE_CHAR = 1
@@ -52,3 +54,5 @@ WORKFLOW_ACTION_WHEN_CHOICES = (
     (WORKFLOW_ACTION_ON_ENTRY, _('On entry')),
     (WORKFLOW_ACTION_ON_EXIT, _('On exit')),
 )
+
+WORKFLOW_TRIGGER_INDEX_VERSION_CHECK_INTERVAL = 5  # 5 seconds
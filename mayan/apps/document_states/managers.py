@@ -1,4 +1,6 @@
+from django.apps import apps
 from django.db import models
+from django.db.models import OuterRef, Subquery
 
 
 class WorkflowManager(models.Manager):
@@ -8,6 +10,103 @@ class WorkflowManager(models.Manager):
                 workflow_template.launch_for(document=document, user=user)
 
 
+class WorkflowInstanceManager(models.Manager):
+    def update_escalation_datetimes(self, workflow_id):
+        """
+        Recalculate the escalation due date time of all the instances of a
+        workflow template. Used when the escalations, the initial state or
+        the transitions of the template change.
+        """
+        Workflow = apps.get_model(
+            app_label='document_states', model_name='Workflow'
+        )
+        WorkflowInstanceLogEntry = apps.get_model(
+            app_label='document_states',
+            model_name='WorkflowInstanceLogEntry'
+        )
+        WorkflowStateEscalation = apps.get_model(
+            app_label='document_states', model_name='WorkflowStateEscalation'
+        )
+
+        try:
+            workflow = Workflow.objects.get(pk=workflow_id)
+        except Workflow.DoesNotExist:
+            return
+
+        initial_state = workflow.get_initial_state()
+        state_timedeltas = WorkflowStateEscalation.objects.get_state_timedeltas(
+            state__workflow=workflow
+        )
+
+        last_log_entry_queryset = WorkflowInstanceLogEntry.objects.filter(
+            workflow_instance=OuterRef('pk')
+        ).order_by('-datetime', '-pk')
+
+        queryset = self.filter(workflow=workflow).annotate(
+            last_log_entry_datetime=Subquery(
+                last_log_entry_queryset.values('datetime')[:1]
+            ), last_state_id=Subquery(
+                last_log_entry_queryset.values(
+                    'transition__destination_state_id'
+                )[:1]
+            )
+        ).only('datetime', 'escalation_datetime')
+
+        workflow_instance_list = []
+        for workflow_instance in queryset.iterator():
+            if workflow_instance.last_state_id:
+                state_id = workflow_instance.last_state_id
+            else:
+                state_id = initial_state and initial_state.pk
+
+            timedelta = state_timedeltas.get(state_id)
+            if timedelta is None:
+                escalation_datetime = None
+            else:
+                escalation_datetime = (
+                    workflow_instance.last_log_entry_datetime or workflow_instance.datetime
+                ) + timedelta
+
+            if workflow_instance.escalation_datetime != escalation_datetime:
+                workflow_instance.escalation_datetime = escalation_datetime
+                workflow_instance_list.append(workflow_instance)
+
+        self.bulk_update(
+            batch_size=1000, fields=('escalation_datetime',),
+            objs=workflow_instance_list
+        )
+
+
+class WorkflowStateEscalationManager(models.Manager):
+    def get_escalation_datetime(self, start_datetime, state):
+        """
+        Return the date time at which the first escalation of a state is
+        due when the state is entered at `start_datetime`.
+        """
+        if state:
+            timedelta = self.get_state_timedeltas(state=state).get(state.pk)
+
+            if timedelta is not None:
+                return start_datetime + timedelta
+
+    def get_state_timedeltas(self, **kwargs):
+        """
+        Return a dictionary of the shortest enabled escalation time delta
+        of each state, keyed by state ID.
+        """
+        result = {}
+
+        queryset = self.filter(enabled=True, **kwargs).only(
+            'amount', 'state', 'unit'
+        )
+        for escalation in queryset:
+            timedelta = escalation.get_timedelta()
+            if escalation.state_id not in result or timedelta < result[escalation.state_id]:
+                result[escalation.state_id] = timedelta
+
+        return result
+
+
 class ValidWorkflowInstanceManager(models.Manager):
     def get_queryset(self):
         return models.QuerySet(
@@ -0,0 +1,87 @@
+import datetime
+
+from django.db import migrations, models
+
+
+def code_workflow_instance_escalation_datetime_initialize(
+    apps, schema_editor
+):
+    WorkflowInstance = apps.get_model(
+        app_label='document_states', model_name='WorkflowInstance'
+    )
+    WorkflowInstanceLogEntry = apps.get_model(
+        app_label='document_states', model_name='WorkflowInstanceLogEntry'
+    )
+    WorkflowState = apps.get_model(
+        app_label='document_states', model_name='WorkflowState'
+    )
+    WorkflowStateEscalation = apps.get_model(
+        app_label='document_states', model_name='WorkflowStateEscalation'
+    )
+
+    state_timedeltas = {}
+    queryset_escalations = WorkflowStateEscalation.objects.using(
+        alias=schema_editor.connection.alias
+    ).filter(enabled=True)
+
+    for escalation in queryset_escalations:
+        timedelta = datetime.timedelta(
+            **{
+                escalation.unit: escalation.amount
+            }
+        )
+        if escalation.state_id not in state_timedeltas or timedelta < state_timedeltas[escalation.state_id]:
+            state_timedeltas[escalation.state_id] = timedelta
+
+    initial_states = dict(
+        WorkflowState.objects.using(
+            alias=schema_editor.connection.alias
+        ).filter(initial=True).values_list('workflow_id', 'pk')
+    )
+
+    queryset_workflow_instances = WorkflowInstance.objects.using(
+        alias=schema_editor.connection.alias
+    ).filter(
+        workflow__states__escalations__enabled=True
+    ).distinct()
+
+    for workflow_instance in queryset_workflow_instances:
+        last_log_entry = WorkflowInstanceLogEntry.objects.using(
+            alias=schema_editor.connection.alias
+        ).filter(workflow_instance=workflow_instance).order_by(
+            '-datetime', '-pk'
+        ).select_related('transition').first()
+
+        if last_log_entry:
+            start_datetime = last_log_entry.datetime
+            state_id = last_log_entry.transition.destination_state_id
+        else:
+            start_datetime = workflow_instance.datetime
+            state_id = initial_states.get(workflow_instance.workflow_id)
+
+        timedelta = state_timedeltas.get(state_id)
+        if timedelta is not None:
+            workflow_instance.escalation_datetime = start_datetime + timedelta
+            workflow_instance.save(update_fields=('escalation_datetime',))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('document_states', '0028_workflowstateescalation')
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workflowinstance', name='escalation_datetime',
+            field=models.DateTimeField(
+                blank=True, db_index=True, editable=False, help_text='Date '
+                'and time at which the first escalation of the current '
+                'state is due.', null=True,
+                verbose_name='Escalation datetime'
+            )
+        ),
+        migrations.RunPython(
+            code=code_workflow_instance_escalation_datetime_initialize,
+            reverse_code=migrations.RunPython.noop
+        )
+    ]
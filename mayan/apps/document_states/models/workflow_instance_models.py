@@ -1,4 +1,3 @@
-import datetime
 import json
 import logging
 
@@ -18,10 +17,13 @@ from mayan.apps.events.decorators import method_event
 from ..events import (
     event_workflow_instance_created, event_workflow_instance_transitioned
 )
-from ..managers import ValidWorkflowInstanceManager
+from ..managers import (
+    ValidWorkflowInstanceManager, WorkflowInstanceManager
+)
 from ..permissions import permission_workflow_instance_transition
 
 from .workflow_models import Workflow
+from .workflow_state_escalation_models import WorkflowStateEscalation
 from .workflow_transition_models import (
     WorkflowTransition, WorkflowTransitionField
 )
@@ -47,8 +49,14 @@ class WorkflowInstance(ExtraDataModelMixin, models.Model):
     context = models.TextField(
         blank=True, verbose_name=_('Context')
     )
+    escalation_datetime = models.DateTimeField(
+        blank=True, db_index=True, editable=False, help_text=_(
+            'Date and time at which the first escalation of the current '
+            'state is due.'
+        ), null=True, verbose_name=_('Escalation datetime')
+    )
 
-    objects = models.Manager()
+    objects = WorkflowInstanceManager()
     valid = ValidWorkflowInstanceManager()
 
     class Meta:
@@ -64,11 +72,7 @@ class WorkflowInstance(ExtraDataModelMixin, models.Model):
         current_state = self.get_current_state()
 
         for escalation in current_state.escalations.filter(enabled=True):
-            timedelta = datetime.timedelta(
-                **{
-                    escalation.unit: escalation.amount
-                }
-            )
+            timedelta = escalation.get_timedelta()
 
             if now() > self.get_last_log_entry_datetime() + timedelta:
                 condition_context = {'workflow_instance': self}
@@ -209,8 +213,28 @@ class WorkflowInstance(ExtraDataModelMixin, models.Model):
         }
     )
     def save(self, *args, **kwargs):
+        is_new = not self.pk
+
         super().save(*args, **kwargs)
 
+        if is_new:
+            self.update_escalation_datetime(
+                start_datetime=self.datetime,
+                state=self.workflow.get_initial_state()
+            )
+
+    def update_escalation_datetime(self, start_datetime, state):
+        """
+        Schedule the escalations of a state entered at `start_datetime`.
+        The field is updated directly to avoid the side effects of `save`.
+        """
+        self.escalation_datetime = WorkflowStateEscalation.objects.get_escalation_datetime(
+            start_datetime=start_datetime, state=state
+        )
+        WorkflowInstance.objects.filter(pk=self.pk).update(
+            escalation_datetime=self.escalation_datetime
+        )
+
 
 class WorkflowInstanceLogEntry(models.Model):
     """
@@ -280,7 +304,18 @@ class WorkflowInstanceLogEntry(models.Model):
         }
     )
     def save(self, *args, **kwargs):
+        is_new = not self.pk
+
         result = super().save(*args, **kwargs)
+
+        if is_new:
+            # Schedule before the state actions execute, they might
+            # transition the instance again.
+            self.workflow_instance.update_escalation_datetime(
+                start_datetime=self.datetime,
+                state=self.transition.destination_state
+            )
+
         context = self.workflow_instance.get_context()
         context.update(
             {
@@ -1,3 +1,5 @@
+import datetime
+
 from django.conf import settings
 from django.db import models
 from django.utils.translation import ugettext_lazy as _
@@ -14,6 +16,7 @@ from mayan.apps.events.classes import (
 from mayan.apps.events.decorators import method_event
 
 from ..events import event_workflow_template_edited
+from ..managers import WorkflowStateEscalationManager
 
 from .workflow_state_models import WorkflowState
 from .workflow_transition_models import WorkflowTransition
@@ -63,6 +66,8 @@ class WorkflowStateEscalation(
         ), verbose_name=_('Comment')
     )
 
+    objects = WorkflowStateEscalationManager()
+
     class Meta:
         ordering = ('priority',)
         unique_together = ('state', 'transition')
@@ -99,6 +104,13 @@ class WorkflowStateEscalation(
             else:
                 self.error_log.all().delete()
 
+    def get_timedelta(self):
+        return datetime.timedelta(
+            **{
+                self.unit: self.amount
+            }
+        )
+
     def get_comment(self):
         return self.comment or _('Workflow escalation.')
 
@@ -21,10 +21,22 @@ queue_document_states_medium.add_task_type(
     label=_('Launch all workflows for a document'),
     dotted_path='mayan.apps.document_states.tasks.task_launch_all_workflow_for'
 )
+queue_document_states_medium.add_task_type(
+    label=_('Apply the workflow transitions triggered by events'),
+    dotted_path='mayan.apps.document_states.tasks.task_workflow_instance_trigger_transitions'
+)
 queue_document_states_medium.add_task_type(
     label=_('Check a workflow instance for state escalation.'),
     dotted_path='mayan.apps.document_states.tasks.task_workflow_instance_check_escalation'
 )
+queue_document_states_medium.add_task_type(
+    label=_('Check a list of workflow instances for state escalation.'),
+    dotted_path='mayan.apps.document_states.tasks.task_workflow_instance_check_escalation_list'
+)
+queue_document_states_medium.add_task_type(
+    label=_('Update the escalation schedule of workflow instances.'),
+    dotted_path='mayan.apps.document_states.tasks.task_workflow_instance_escalation_datetime_update'
+)
 queue_document_states_medium.add_task_type(
     label=_('Check all workflow instances for state escalation.'),
     dotted_path='mayan.apps.document_states.tasks.task_workflow_instance_check_escalation_all',
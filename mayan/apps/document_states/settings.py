@@ -6,6 +6,8 @@ from .literals import (
     DEFAULT_GRAPHVIZ_DOT_PATH, DEFAULT_WORKFLOWS_IMAGE_CACHE_MAXIMUM_SIZE,
     DEFAULT_WORKFLOWS_IMAGE_CACHE_STORAGE_BACKEND,
     DEFAULT_WORKFLOWS_IMAGE_CACHE_STORAGE_BACKEND_ARGUMENTS,
+    DEFAULT_WORKFLOWS_TRIGGER_DEFERRED,
+    DEFAULT_WORKFLOWS_WORKFLOW_STATE_ESCALATION_CHECK_BATCH_SIZE,
     DEFAULT_WORKFLOWS_WORKFLOW_STATE_ESCALATION_CHECK_INTERVAL
 )
 from .setting_callbacks import callback_update_workflow_image_cache_size
@@ -43,6 +45,14 @@ setting_workflow_image_cache_storage_backend_arguments = namespace.add_setting(
         'Arguments to pass to the WORKFLOWS_IMAGE_CACHE_STORAGE_BACKEND.'
     )
 )
+setting_workflow_state_escalation_check_batch_size = namespace.add_setting(
+    default=DEFAULT_WORKFLOWS_WORKFLOW_STATE_ESCALATION_CHECK_BATCH_SIZE,
+    global_name='WORKFLOWS_WORKFLOW_STATE_ESCALATION_CHECK_BATCH_SIZE',
+    help_text=_(
+        'Maximum number of workflow instances with due escalations to '
+        'check per task.'
+    )
+)
 setting_workflow_state_escalation_check_interval = namespace.add_setting(
     default=DEFAULT_WORKFLOWS_WORKFLOW_STATE_ESCALATION_CHECK_INTERVAL,
     global_name='WORKFLOWS_WORKFLOW_STATE_ESCALATION_CHECK_INTERVAL',
@@ -51,3 +61,11 @@ setting_workflow_state_escalation_check_interval = namespace.add_setting(
         'workflow states will be launched.'
     )
 )
+setting_workflow_trigger_deferred = namespace.add_setting(
+    default=DEFAULT_WORKFLOWS_TRIGGER_DEFERRED,
+    global_name='WORKFLOWS_TRIGGER_DEFERRED', help_text=_(
+        'Apply the transitions triggered by events in a background task '
+        'after the transaction that committed the events, instead of '
+        'during it.'
+    )
+)
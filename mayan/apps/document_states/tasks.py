@@ -1,10 +1,18 @@
+import datetime
 import logging
 
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.utils.timezone import now
 
 from mayan.celery import app
 
+from .classes import WorkflowTransitionTriggerBatch
+from .settings import (
+    setting_workflow_state_escalation_check_batch_size,
+    setting_workflow_state_escalation_check_interval
+)
+
 logger = logging.getLogger(name=__name__)
 
 
@@ -115,21 +123,73 @@ def task_workflow_instance_check_escalation_all():
     WorkflowInstance = apps.get_model(
         app_label='document_states', model_name='WorkflowInstance'
     )
-    WorkflowStateEscalation = apps.get_model(
-        app_label='document_states', model_name='WorkflowStateEscalation'
-    )
 
-    # Filter workflow instances whose workflow template have at least
-    # one state with expiration enabled.
-    queryset_workflow_templates = WorkflowStateEscalation.objects.values(
-        'state__workflow'
+    check_datetime = now()
+
+    # Only the instances whose escalations are due. Instances that have
+    # not reached their deadline are not touched.
+    workflow_instance_id_list = list(
+        WorkflowInstance.valid.filter(
+            escalation_datetime__lte=check_datetime
+        ).order_by('escalation_datetime').values_list('pk', flat=True)
     )
 
-    queryset_workflow_instance = WorkflowInstance.valid.filter(
-        workflow__in=queryset_workflow_templates
+    # Postpone the popped entries until the next check. Instances that
+    # transition get a new due date time, instances whose escalation
+    # conditions are not met yet are checked again on the next run.
+    retry_datetime = check_datetime + datetime.timedelta(
+        seconds=setting_workflow_state_escalation_check_interval.value
     )
+    batch_size = setting_workflow_state_escalation_check_batch_size.value
+
+    for index in range(0, len(workflow_instance_id_list), batch_size):
+        workflow_instance_id_batch = workflow_instance_id_list[
+            index:index + batch_size
+        ]
 
-    for workflow_instance in queryset_workflow_instance:
-        task_workflow_instance_check_escalation.apply_async(
-            kwargs={'workflow_instance_id': workflow_instance.pk}
+        WorkflowInstance.objects.filter(
+            escalation_datetime__lte=check_datetime,
+            pk__in=workflow_instance_id_batch
+        ).update(escalation_datetime=retry_datetime)
+
+        task_workflow_instance_check_escalation_list.apply_async(
+            kwargs={'workflow_instance_id_list': workflow_instance_id_batch}
         )
+
+
+@app.task(ignore_result=True)
+def task_workflow_instance_check_escalation_list(workflow_instance_id_list):
+    WorkflowInstance = apps.get_model(
+        app_label='document_states', model_name='WorkflowInstance'
+    )
+
+    queryset = WorkflowInstance.valid.filter(
+        pk__in=workflow_instance_id_list
+    ).select_related('workflow')
+
+    for workflow_instance in queryset:
+        try:
+            workflow_instance.check_escalation()
+        except Exception as exception:
+            logger.error(
+                'Error checking the escalations of workflow instance: '
+                '%d; %s', workflow_instance.pk, exception, exc_info=True
+            )
+
+
+@app.task(ignore_result=True)
+def task_workflow_instance_escalation_datetime_update(workflow_template_id):
+    WorkflowInstance = apps.get_model(
+        app_label='document_states', model_name='WorkflowInstance'
+    )
+
+    WorkflowInstance.objects.update_escalation_datetimes(
+        workflow_id=workflow_template_id
+    )
+
+
+@app.task(ignore_result=True)
+def task_workflow_instance_trigger_transitions(entry_list):
+    WorkflowTransitionTriggerBatch.process(
+        entry_list=[tuple(entry) for entry in entry_list]
+    )
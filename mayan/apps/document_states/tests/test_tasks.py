@@ -1,3 +1,7 @@
+import datetime
+
+from django.utils.timezone import now
+
 from mayan.apps.documents.models.document_models import Document
 from mayan.apps.documents.tests.base import GenericDocumentTestCase
 
@@ -186,3 +190,37 @@ class WorkflowTemplateStateEscalationTaskTestCase(
         self.assertEqual(
             events[0].verb, event_workflow_instance_transitioned.id
         )
+
+    def test_task_workflow_instance_check_escalation_all_not_due(self):
+        test_workflow_instance = self._test_document.workflows.first()
+        test_workflow_instance_state = test_workflow_instance.get_current_state()
+
+        test_workflow_instance.escalation_datetime = now() + datetime.timedelta(
+            days=1
+        )
+        test_workflow_instance.save()
+
+        self._clear_events()
+
+        self._execute_task_workflow_instance_check_escalation_all()
+
+        self.assertEqual(
+            test_workflow_instance.get_current_state(),
+            test_workflow_instance_state
+        )
+
+        events = self._get_test_events()
+        self.assertEqual(events.count(), 0)
+
+    def test_workflow_instance_escalation_datetime(self):
+        test_workflow_instance = self._test_document.workflows.first()
+
+        self.assertEqual(
+            test_workflow_instance.escalation_datetime,
+            test_workflow_instance.datetime + self._test_workflow_template_state_escalation.get_timedelta()
+        )
+
+        self._execute_task_workflow_instance_check_escalation_all()
+
+        test_workflow_instance.refresh_from_db()
+        self.assertEqual(test_workflow_instance.escalation_datetime, None)
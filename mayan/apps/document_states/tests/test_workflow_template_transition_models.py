@@ -1,4 +1,12 @@
+from django.db import transaction
+
+from mayan.apps.documents.events import (
+    event_document_edited, event_document_viewed
+)
 from mayan.apps.documents.tests.base import GenericDocumentTestCase
+from mayan.apps.events.classes import EventType
+
+from ..classes import WorkflowTransitionTriggerBatch
 
 from .mixins.workflow_template_mixins import WorkflowTemplateTestMixin
 from .mixins.workflow_template_transition_mixins import WorkflowTransitionFieldTestMixin
@@ -33,3 +41,77 @@ class WorkflowTemplateTransitionFieldModelTestCase(
         self._test_document.workflows.first().log_entries.first().get_extra_data()
         self._test_workflow_template_transition_field.delete()
         self._test_document.workflows.first().log_entries.first().get_extra_data()
+
+
+class WorkflowTemplateTransitionTriggerModelTestCase(
+    WorkflowTemplateTestMixin, GenericDocumentTestCase
+):
+    auto_upload_test_document = False
+
+    def setUp(self):
+        super().setUp()
+        self._create_test_document_stub()
+        self._create_test_workflow_template(add_test_document_type=True)
+        self._create_test_workflow_template_state()
+        self._create_test_workflow_template_state()
+        self._create_test_workflow_template_transition()
+
+        EventType.refresh()
+
+        self._test_workflow_template_transition.trigger_events.create(
+            event_type=event_document_edited.get_stored_event_type()
+        )
+        self._test_workflow_template.launch_for(document=self._test_document)
+        self._test_workflow_instance = self._test_document.workflows.first()
+
+    def test_workflow_transition_trigger(self):
+        event_document_edited.commit(target=self._test_document)
+
+        self.assertEqual(
+            self._test_workflow_instance.get_current_state(),
+            self._test_workflow_template_states[1]
+        )
+
+    def test_workflow_transition_trigger_other_event(self):
+        event_document_viewed.commit(target=self._test_document)
+
+        self.assertEqual(
+            self._test_workflow_instance.get_current_state(),
+            self._test_workflow_template_states[0]
+        )
+
+    def test_workflow_transition_trigger_deleted(self):
+        self._test_workflow_template_transition.trigger_events.all().delete()
+
+        event_document_edited.commit(target=self._test_document)
+
+        self.assertEqual(
+            self._test_workflow_instance.get_current_state(),
+            self._test_workflow_template_states[0]
+        )
+
+    def test_workflow_transition_trigger_deferred(self):
+        with self.override_setting(
+            global_name='WORKFLOWS_TRIGGER_DEFERRED', value=True
+        ):
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                with transaction.atomic():
+                    event_document_edited.commit(target=self._test_document)
+                    event_document_edited.commit(target=self._test_document)
+
+                    self.assertEqual(
+                        self._test_workflow_instance.get_current_state(),
+                        self._test_workflow_template_states[0]
+                    )
+
+        trigger_callbacks = [
+            callback for callback in callbacks if isinstance(
+                getattr(callback, '__self__', None),
+                WorkflowTransitionTriggerBatch
+            )
+        ]
+        self.assertEqual(len(trigger_callbacks), 1)
+        self.assertEqual(
+            self._test_workflow_instance.get_current_state(),
+            self._test_workflow_template_states[1]
+        )
@@ -9,8 +9,6 @@ Author: Backend Adaptation Team
 """
 import logging
 
-from django.db.models import Prefetch
-
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import generics, status
@@ -20,11 +18,11 @@ from rest_framework.response import Response
 
 from mayan.apps.acls.models import AccessControlList
 from mayan.apps.documents.models import Document
-from mayan.apps.documents.models.document_file_models import DocumentFile
 from mayan.apps.documents.permissions import permission_document_view
 from mayan.apps.documents.serializers.document_rich_serializers import (
     DocumentRichSerializer, DocumentRichListSerializer
 )
+from mayan.apps.rest_api.api_view_mixins import CursorPaginationAPIViewMixin
 
 logger = logging.getLogger(__name__)
 
@@ -58,14 +56,8 @@ class APIDocumentRichDetailView(generics.RetrieveAPIView):
         Minimizes database queries for rich document view.
         """
         queryset = Document.objects.select_related(
-            'document_type'
+            'document_type', 'latest_file'
         ).prefetch_related(
-            # Prefetch latest file
-            Prefetch(
-                'files',
-                queryset=DocumentFile.objects.order_by('-timestamp'),
-                to_attr='_prefetched_files'
-            ),
             # Prefetch metadata with types
             'metadata__metadata_type',
             # Prefetch tags
@@ -87,12 +79,6 @@ class APIDocumentRichDetailView(generics.RetrieveAPIView):
         """Get document and attach prefetched file for serializer."""
         document = super().get_object()
         
-        # Attach prefetched latest file for serializer efficiency
-        if hasattr(document, '_prefetched_files') and document._prefetched_files:
-            document._prefetched_file_latest = document._prefetched_files[0]
-        else:
-            document._prefetched_file_latest = None
-        
         # Try to prefetch AI analysis
         try:
             _ = document.ai_analysis
@@ -196,7 +182,9 @@ Returns flattened, frontend-friendly JSON structure with:
             )
 
 
-class APIDocumentRichListView(generics.ListAPIView):
+class APIDocumentRichListView(
+    CursorPaginationAPIViewMixin, generics.ListAPIView
+):
     """
     Rich Document List Endpoint.
     
@@ -207,6 +195,8 @@ class APIDocumentRichListView(generics.ListAPIView):
     Query parameters:
     - page: Page number (default: 1)
     - page_size: Items per page (default: 50, max: 100)
+    - cursor: Opaque cursor for keyset pagination, empty for the first page
+    - _count_approximate: Include an estimated total in cursor mode
     - search: Search query
     - document_type: Filter by document type ID
     - ordering: Sort field (e.g., 'datetime_created', '-label')
@@ -218,13 +208,8 @@ class APIDocumentRichListView(generics.ListAPIView):
     def get_queryset(self):
         """Get optimized queryset with prefetching for list view."""
         queryset = Document.valid.select_related(
-            'document_type'
+            'document_type', 'latest_file'
         ).prefetch_related(
-            Prefetch(
-                'files',
-                queryset=DocumentFile.objects.order_by('-timestamp')[:1],
-                to_attr='_prefetched_files'
-            ),
             'metadata__metadata_type',
             'tags'
         )
@@ -266,6 +251,10 @@ class APIDocumentRichListView(generics.ListAPIView):
 List documents with rich metadata, optimized for gallery view.
 
 Returns paginated list with thumbnail URLs and metadata summaries.
+
+Passing the `cursor` parameter (empty for the first page) switches to
+keyset pagination. Follow `next_cursor` to get the next page; the
+total is not counted unless `_count_approximate` is set.
         ''',
         manual_parameters=[
             openapi.Parameter(
@@ -278,6 +267,16 @@ Returns paginated list with thumbnail URLs and metadata summaries.
                 description='Items per page (max 100)',
                 type=openapi.TYPE_INTEGER, default=50
             ),
+            openapi.Parameter(
+                'cursor', openapi.IN_QUERY,
+                description='Keyset pagination cursor (empty for the first page)',
+                type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                '_count_approximate', openapi.IN_QUERY,
+                description='Include an approximate total in cursor mode',
+                type=openapi.TYPE_BOOLEAN
+            ),
             openapi.Parameter(
                 'search', openapi.IN_QUERY,
                 description='Search query',
@@ -316,6 +315,13 @@ Returns paginated list with thumbnail URLs and metadata summaries.
         """List documents with rich metadata."""
         queryset = self.get_queryset()
         
+        if self.is_cursor_pagination():
+            documents = self.paginate_queryset(queryset)
+            serializer = self.get_serializer(documents, many=True)
+            response = self.get_paginated_response(serializer.data)
+            response.data['success'] = True
+            return response
+        
         # Pagination
         page = int(request.query_params.get('page', 1))
         page_size = min(int(request.query_params.get('page_size', 50)), 100)
@@ -326,13 +332,6 @@ Returns paginated list with thumbnail URLs and metadata summaries.
         
         documents = queryset[start:end]
         
-        # Attach prefetched file for each document
-        for doc in documents:
-            if hasattr(doc, '_prefetched_files') and doc._prefetched_files:
-                doc._prefetched_file_latest = doc._prefetched_files[0]
-            else:
-                doc._prefetched_file_latest = None
-        
         serializer = self.get_serializer(documents, many=True)
         
         return Response({
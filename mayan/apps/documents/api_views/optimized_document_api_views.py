@@ -12,7 +12,7 @@ import time
 import uuid
 from datetime import timedelta
 
-from django.db.models import Prefetch, OuterRef, Subquery
+from django.db.models import Count, Prefetch
 from django.apps import apps as django_apps
 from django.utils import timezone
 
@@ -20,11 +20,11 @@ from rest_framework.generics import get_object_or_404
 
 from mayan.apps.acls.models import AccessControlList
 from mayan.apps.rest_api import generics
+from mayan.apps.rest_api.api_view_mixins import CursorPaginationAPIViewMixin
+from mayan.apps.rest_api.literals import DEFAULT_CURSOR_QUERY_PARAMETER
 from mayan.apps.rest_api.pagination import MayanPageNumberPagination
 
 from ..models.document_models import Document
-from ..models.document_file_models import DocumentFile
-from ..models.document_version_models import DocumentVersion
 from ..models.document_type_models import DocumentType
 from ..permissions import (
     permission_document_create, permission_document_properties_edit,
@@ -40,7 +40,9 @@ from ..serializers.optimized_document_serializers import (
 logger = logging.getLogger(name=__name__)
 
 
-class OptimizedAPIDocumentListView(generics.ListCreateAPIView):
+class OptimizedAPIDocumentListView(
+    CursorPaginationAPIViewMixin, generics.ListCreateAPIView
+):
     """
     Optimized document list view with N+1 query fixes.
     
@@ -49,11 +51,12 @@ class OptimizedAPIDocumentListView(generics.ListCreateAPIView):
     
     Optimizations:
     - select_related for document_type (ForeignKey)
-    - Prefetch for file_latest (uses Subquery for latest file)
-    - Prefetch for version_active (active version)
+    - select_related for the latest file and active version (denormalized
+      ForeignKeys on the document)
     - prefetch_related for tags (ManyToMany)
     - prefetch_related for metadata with metadata_type (nested)
     - prefetch_related for ai_analysis (OneToOne from DAM)
+    - keyset pagination when the `cursor` query parameter is present
     
     GET: Returns paginated list of all documents with prefetched data.
     POST: Create a new document.
@@ -72,48 +75,20 @@ class OptimizedAPIDocumentListView(generics.ListCreateAPIView):
         Target: < 5 queries for any page size.
         
         Query breakdown:
-        1. Main documents query with document_type (select_related)
-        2. Files subquery for file_latest
-        3. Versions subquery for version_active  
-        4. Tags prefetch
-        5. Metadata prefetch (with metadata_type)
+        1. Main documents query with document_type, latest file and
+           active version (select_related)
+        2. Active version pages prefetch
+        3. Tags prefetch
+        4. Metadata prefetch (with metadata_type)
         """
-        # Subquery to get the latest file ID for each document
-        latest_file_subquery = DocumentFile.objects.filter(
-            document=OuterRef('pk')
-        ).order_by('-timestamp').values('pk')[:1]
-        
-        # Subquery to get active version ID for each document
-        active_version_subquery = DocumentVersion.objects.filter(
-            document=OuterRef('pk'),
-            active=True
-        ).values('pk')[:1]
-        
         # Build main queryset with optimizations
-        queryset = Document.valid.annotate(
-            latest_file_id=Subquery(latest_file_subquery),
-            active_version_id=Subquery(active_version_subquery)
-        ).select_related(
-            'document_type'  # ForeignKey - single JOIN
+        queryset = Document.valid.select_related(
+            'active_version', 'document_type', 'latest_file'
         ).prefetch_related(
-            # Prefetch latest file with all its fields
-            Prefetch(
-                'files',
-                queryset=DocumentFile.objects.annotate(
-                    is_latest=Subquery(latest_file_subquery)
-                ).filter(pk=Subquery(latest_file_subquery)),
-                to_attr='_prefetched_latest_file_list'
-            ),
-            # Prefetch active version with pages
+            # Prefetch active version pages
             # Note: content_object is a GenericForeignKey, so we can't use select_related
             # The serializer will query it directly when needed
-            Prefetch(
-                'versions',
-                queryset=DocumentVersion.objects.filter(active=True).prefetch_related(
-                    'version_pages'  # Prefetch pages, content_object will be queried in serializer
-                ),
-                to_attr='_prefetched_version_active_list'
-            ),
+            'active_version__version_pages',
             # Prefetch tags (ManyToMany)
             'tags',
             # Prefetch metadata with metadata_type (nested ForeignKey)
@@ -203,7 +178,9 @@ class OptimizedAPIDocumentListView(generics.ListCreateAPIView):
                 try:
                     results_count = None
                     if isinstance(getattr(response, 'data', None), dict):
-                        results_count = response.data.get('count')
+                        results_count = response.data.get(
+                            'count', response.data.get('count_approximate')
+                        )
 
                     user = request.user if request.user.is_authenticated else None
 
@@ -224,6 +201,7 @@ class OptimizedAPIDocumentListView(generics.ListCreateAPIView):
                         search_session_id = session.pk
 
                     filters_applied = request.query_params.dict().copy()
+                    filters_applied.pop(DEFAULT_CURSOR_QUERY_PARAMETER, None)
                     filters_applied.pop('page', None)
                     filters_applied.pop('page_size', None)
                     filters_applied.pop('limit', None)
@@ -311,21 +289,12 @@ class OptimizedAPIDocumentDetailView(generics.RetrieveUpdateDestroyAPIView):
     
     def get_queryset(self):
         """Get optimized queryset for single document."""
-        queryset = Document.valid.select_related(
-            'document_type'
+        queryset = Document.valid.annotate(
+            files_count=Count('files')
+        ).select_related(
+            'active_version', 'document_type', 'latest_file'
         ).prefetch_related(
-            Prefetch(
-                'files',
-                queryset=DocumentFile.objects.order_by('-timestamp'),
-                to_attr='_prefetched_files'
-            ),
-            Prefetch(
-                'versions',
-                queryset=DocumentVersion.objects.filter(active=True).prefetch_related(
-                    'version_pages'  # Prefetch pages for active version
-                ),
-                to_attr='_prefetched_version_active_list'
-            ),
+            'active_version__version_pages',  # Prefetch pages for active version
             'tags',
             'metadata__metadata_type',
         )
@@ -338,24 +307,6 @@ class OptimizedAPIDocumentDetailView(generics.RetrieveUpdateDestroyAPIView):
         
         return queryset
     
-    def get_object(self):
-        """Get document with prefetched data attached."""
-        obj = super().get_object()
-        
-        # Attach prefetched file_latest for serializer
-        if hasattr(obj, '_prefetched_files') and obj._prefetched_files:
-            obj._cached_file_latest = obj._prefetched_files[0]
-        else:
-            obj._cached_file_latest = None
-        
-        # Attach prefetched version_active
-        if hasattr(obj, '_prefetched_version_active_list') and obj._prefetched_version_active_list:
-            obj._cached_version_active = obj._prefetched_version_active_list[0]
-        else:
-            obj._cached_version_active = None
-        
-        return obj
-    
     def get_instance_extra_data(self):
         return {'_event_actor': self.request.user}
 
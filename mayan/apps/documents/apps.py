@@ -84,6 +84,7 @@ from .handlers import (
     handler_create_default_document_type,
     handler_create_document_file_page_image_cache,
     handler_create_document_version_page_image_cache,
+    handler_document_file_page_image_cache_warm_up,
     handler_invalidate_document_thumbnail_cache,
     handler_invalidate_version_thumbnail_cache,
     handler_cleanup_after_document_file_delete
@@ -210,6 +211,7 @@ from .permissions import (
     permission_trashed_document_delete, permission_trashed_document_restore
 )
 
+from .signals import signal_post_document_file_upload
 from .statistics import *  # NOQA
 
 
@@ -1118,6 +1120,12 @@ class DocumentsApp(MayanAppConfig):
         )
         logger.debug('Registered thumbnail cache invalidation handlers (Phase B2.3)')
 
+        signal_post_document_file_upload.connect(
+            dispatch_uid='documents_handler_document_file_page_image_cache_warm_up',
+            receiver=handler_document_file_page_image_cache_warm_up,
+            sender=DocumentFile
+        )
+
         # Авточистка после удаления файла: удаление пустых версий и восстановление активной.
         post_delete.connect(
             dispatch_uid='documents_handler_cleanup_after_document_file_delete',
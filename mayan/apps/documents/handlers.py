@@ -11,6 +11,7 @@ from .literals import (
 )
 from .settings import (
     setting_document_file_page_image_cache_maximum_size,
+    setting_document_file_page_image_cache_warm_up,
     setting_document_version_page_image_cache_maximum_size
 )
 from .signals import signal_post_initial_document_type
@@ -48,6 +49,15 @@ def handler_create_document_version_page_image_cache(sender, **kwargs):
     )
 
 
+def handler_document_file_page_image_cache_warm_up(sender, instance, **kwargs):
+    if setting_document_file_page_image_cache_warm_up.value:
+        from .tasks import task_document_file_page_image_cache_warm_up
+
+        task_document_file_page_image_cache_warm_up.apply_async(
+            kwargs={'document_file_id': instance.pk}
+        )
+
+
 # Document indexing coordination handlers
 
 def handler_coordinate_document_index(sender, instance, created, **kwargs):
@@ -5,6 +5,7 @@ Unified coordinator for document indexing that eliminates duplication between
 Dynamic Search and Document Indexing systems. Provides a single point of entry
 for all document indexing operations.
 """
+import hashlib
 import logging
 import time
 
@@ -545,11 +546,246 @@ class DocumentIndexCoordinator:
         
         return result
     
+    @staticmethod
+    def _get_search_models():
+        """
+        Return the search models that index the Document model.
+
+        Proxy models are registered under the same search model instance,
+        so the list has one entry per search index.
+        """
+        from mayan.apps.dynamic_search.classes import SearchModel
+
+        Document = apps.get_model(app_label='documents', model_name='Document')
+
+        return [
+            search_model for search_model in SearchModel.all()
+            if search_model.base_model == Document
+        ]
+
+    @staticmethod
+    def _validate_document_chunk(document_ids):
+        """
+        Validate a chunk of documents for indexing with a single query.
+
+        Args:
+            document_ids: List of document IDs of the chunk
+
+        Returns:
+            tuple: (valid_ids, skipped) where valid_ids is the list of
+                  unique valid document IDs in input order and skipped is a
+                  dict mapping each invalid document ID to its error type
+                  ('not_found', 'trashed' or 'stub')
+        """
+        Document = apps.get_model(app_label='documents', model_name='Document')
+
+        states = {
+            pk: (in_trash, is_stub) for pk, in_trash, is_stub in Document.objects.filter(
+                pk__in=set(document_ids)
+            ).values_list('pk', 'in_trash', 'is_stub')
+        }
+
+        valid_ids = []
+        skipped = {}
+        for document_id in dict.fromkeys(document_ids):
+            try:
+                in_trash, is_stub = states[document_id]
+            except KeyError:
+                skipped[document_id] = 'not_found'
+            else:
+                if in_trash:
+                    skipped[document_id] = 'trashed'
+                elif is_stub:
+                    skipped[document_id] = 'stub'
+                else:
+                    valid_ids.append(document_id)
+
+        return valid_ids, skipped
+
+    @staticmethod
+    def _acquire_chunk_lock(document_ids):
+        """
+        Acquire the distributed lock protecting the scheduling of a chunk.
+
+        Args:
+            document_ids: List of the valid document IDs of the chunk
+
+        Returns:
+            Lock instance if acquired, None if the lock manager is not
+            available
+
+        Raises:
+            LockError: If the lock is held by another process
+        """
+        # Identify the chunk by its content. Chunks sharing the bounds and
+        # the length must not block each other.
+        lock_name = 'indexing_document_chunk_{}'.format(
+            hashlib.sha256(
+                ','.join(
+                    str(document_id) for document_id in sorted(document_ids)
+                ).encode('ascii')
+            ).hexdigest()
+        )
+        try:
+            from mayan.apps.lock_manager.backends.base import LockingBackend
+            from .settings import setting_indexing_lock_timeout
+        except ImportError:
+            logger.debug('Lock manager not available, proceeding without lock')
+            return None
+
+        return LockingBackend.get_backend().acquire_lock(
+            name=lock_name, timeout=setting_indexing_lock_timeout.value
+        )
+
+    @staticmethod
+    def _create_batch_indexing_chain(document_ids):
+        """
+        Create Celery chain for indexing a chunk of documents.
+
+        The chain contains one `task_index_instances` per search model
+        followed by a single hierarchy indexing task for the whole chunk.
+
+        Args:
+            document_ids: List of valid document IDs to index
+
+        Returns:
+            Celery chain instance
+        """
+        from celery import chain
+        from mayan.apps.document_indexing.tasks import (
+            task_index_instance_document_add_many
+        )
+        from mayan.apps.dynamic_search.tasks import task_index_instances
+
+        signatures = [
+            task_index_instances.si(
+                id_list=document_ids,
+                search_model_full_name=search_model.get_full_name()
+            ).set(queue='search')
+            for search_model in DocumentIndexCoordinator._get_search_models()
+        ]
+        signatures.append(
+            task_index_instance_document_add_many.si(
+                document_id_list=document_ids
+            ).set(queue='indexing')
+        )
+
+        return chain(*signatures)
+
+    @staticmethod
+    def _index_document_chunk(document_ids, result):
+        """
+        Validate and schedule the indexing of a chunk of documents.
+
+        The whole chunk is validated with one query, protected by one lock
+        and scheduled as one chain, instead of one of each per document.
+
+        Args:
+            document_ids: List of document IDs of the chunk
+            result: Batch result dict to update with the chunk statistics
+
+        Returns:
+            bool: False if scheduling of the chunk failed, True otherwise
+        """
+        from mayan.apps.lock_manager.exceptions import LockError
+
+        from .metrics import get_metrics
+
+        metrics = get_metrics()
+        start_time = time.time()
+
+        valid_ids, skipped = DocumentIndexCoordinator._validate_document_chunk(
+            document_ids=document_ids
+        )
+
+        for document_id, error_type in skipped.items():
+            result['skipped_count'] += 1
+            result['error_types'].setdefault(error_type, []).append({
+                'document_id': document_id,
+                'error': 'Document skipped: {}'.format(error_type)
+            })
+
+        if not valid_ids:
+            return True
+
+        valid_count = len(valid_ids)
+
+        try:
+            lock = DocumentIndexCoordinator._acquire_chunk_lock(
+                document_ids=valid_ids
+            )
+        except LockError:
+            logger.debug(
+                'Chunk of %d documents scheduling already in progress '
+                '(lock held), skipping', valid_count
+            )
+            result['skipped_count'] += valid_count
+            result['error_types'].setdefault('locked', []).extend(
+                {
+                    'document_id': document_id,
+                    'error': 'Indexing already in progress'
+                } for document_id in valid_ids
+            )
+            return True
+
+        try:
+            indexing_chain = DocumentIndexCoordinator._create_batch_indexing_chain(
+                document_ids=valid_ids
+            )
+            chain_result = indexing_chain.apply_async()
+
+            if not (chain_result and chain_result.id):
+                raise Exception('Chain apply_async returned invalid result')
+        except Exception as e:
+            result['failed_count'] += valid_count
+            error_msg = f'Failed to schedule indexing chain: {e}'
+            for document_id in valid_ids:
+                result['errors'].append({
+                    'document_id': document_id,
+                    'error': error_msg
+                })
+            result['error_types'].setdefault(type(e).__name__, []).extend(
+                {
+                    'document_id': document_id,
+                    'error': str(e)
+                } for document_id in valid_ids
+            )
+            logger.error(
+                'Error scheduling indexing chain for chunk of %d documents: %s',
+                len(valid_ids), e, exc_info=True
+            )
+            metrics.record_index_failure(
+                valid_ids[0], 'scheduling_error', time.time() - start_time
+            )
+            return False
+        finally:
+            # The lock only serializes the scheduling of identical chunks.
+            # The search and hierarchy tasks take their own locks.
+            if lock:
+                try:
+                    lock.release()
+                except Exception as e:
+                    logger.warning('Error releasing chunk indexing lock: %s', e)
+
+        result['success_count'] += valid_count
+        result.setdefault('chain_task_ids', []).append(chain_result.id)
+        metrics.record_index_success(valid_ids[0], time.time() - start_time)
+        logger.debug(
+            'Scheduled indexing chain for chunk of %d documents (task_id=%s)',
+            len(valid_ids), chain_result.id
+        )
+
+        return True
+
     @staticmethod
     def index_document_batch(document_ids, fail_fast=False, chunk_size=1000):
         """
         Coordinate batch indexing of multiple documents.
         
+        Each chunk is validated with one query, protected by one lock and
+        scheduled as one chain made of a `task_index_instances` per search
+        model followed by one hierarchy indexing task for the whole chunk.
+        
         Args:
             document_ids: List of document IDs to index
             fail_fast: If True, stop batch processing on first error.
@@ -560,19 +796,26 @@ class DocumentIndexCoordinator:
                        Set to 0 to disable chunking.
         
         Returns:
-            dict: Status of batch indexing operations with detailed statistics
+            dict: Status of batch indexing operations with detailed statistics.
+                  Duplicate document IDs are indexed and counted once.
         """
         from .settings import setting_indexing_batch_chunk_size, setting_indexing_batch_max_size
         
+        # Remove the duplicate IDs keeping the order of the first
+        # occurrences so that the counters add up to the total.
+        document_ids = list(dict.fromkeys(document_ids))
+
+        result = {
+            'total': len(document_ids),
+            'success_count': 0,
+            'failed_count': 0,
+            'skipped_count': 0,
+            'errors': [],
+            'error_types': {}
+        }
+
         if not document_ids:
-            return {
-                'total': 0,
-                'success_count': 0,
-                'failed_count': 0,
-                'skipped_count': 0,
-                'errors': [],
-                'error_types': {}
-            }
+            return result
         
         # Check batch size limit
         if len(document_ids) > setting_indexing_batch_max_size.value:
@@ -585,227 +828,44 @@ class DocumentIndexCoordinator:
         # Use default chunk size if not specified
         if chunk_size is None:
             chunk_size = setting_indexing_batch_chunk_size.value
-        
-        result = {
-            'total': len(document_ids),
-            'success_count': 0,
-            'failed_count': 0,
-            'skipped_count': 0,
-            'errors': [],
-            'error_types': {}
-        }
-        
-        # Process in chunks for very large batches to avoid memory issues
-        # Use fully iterative approach without recursion to avoid deep recursion and memory issues
-        if chunk_size > 0 and len(document_ids) > chunk_size:
-            logger.info(
-                'Processing batch of %d documents in chunks of %d',
-                len(document_ids), chunk_size
-            )
-            # Create chunks list using list comprehension (iterative, not recursive)
-            chunks = [
-                document_ids[i:i + chunk_size]
-                for i in range(0, len(document_ids), chunk_size)
-            ]
-            
-            # Process each chunk iteratively without recursion
-            for chunk_idx, chunk_ids in enumerate(chunks):
-                # Process each document in chunk directly without recursive call
-                for document_id in chunk_ids:
-                    try:
-                        index_result = DocumentIndexCoordinator.index_document(
-                            document_id=document_id,
-                            created=False  # Batch operations are typically updates
-                        )
-                        
-                        # Categorize result
-                        error_type = index_result.get('error_type')
-                        if error_type:
-                            # Document was skipped (trashed, stub, not found, etc.)
-                            result['skipped_count'] += 1
-                            error_key = error_type
-                            if error_key not in result['error_types']:
-                                result['error_types'][error_key] = []
-                            result['error_types'][error_key].append({
-                                'document_id': document_id,
-                                'error': index_result.get('error', 'Unknown error')
-                            })
-                        elif index_result.get('search_indexed') or index_result.get('hierarchy_indexed'):
-                            # Successfully scheduled
-                            result['success_count'] += 1
-                        elif index_result.get('errors'):
-                            # Failed with errors
-                            result['failed_count'] += 1
-                            for error in index_result.get('errors', []):
-                                result['errors'].append({
-                                    'document_id': document_id,
-                                    'error': error
-                                })
-                            
-                            # Group errors by type for better diagnostics
-                            error_key = 'scheduling_error'
-                            if error_key not in result['error_types']:
-                                result['error_types'][error_key] = []
-                            result['error_types'][error_key].append({
-                                'document_id': document_id,
-                                'error': '; '.join(index_result.get('errors', []))
-                            })
-                            
-                            # Fail fast if requested
-                            if fail_fast:
-                                logger.warning(
-                                    'Batch indexing stopped early due to fail_fast=True at document %s',
-                                    document_id
-                                )
-                                break
-                        else:
-                            # Unknown state
-                            result['failed_count'] += 1
-                            result['errors'].append({
-                                'document_id': document_id,
-                                'error': 'Unknown indexing state'
-                            })
-                        
-                    except Exception as e:
-                        error_msg = f'Failed to index document {document_id}: {e}'
-                        result['failed_count'] += 1
-                        result['errors'].append({
-                            'document_id': document_id,
-                            'error': error_msg
-                        })
-                        
-                        # Group by exception type
-                        error_key = type(e).__name__
-                        if error_key not in result['error_types']:
-                            result['error_types'][error_key] = []
-                        result['error_types'][error_key].append({
-                            'document_id': document_id,
-                            'error': str(e)
-                        })
-                        
-                        logger.error(
-                            'Error in batch indexing for document %s: %s',
-                            document_id, e, exc_info=True
-                        )
-                        
-                        # Fail fast if requested
-                        if fail_fast:
-                            logger.warning(
-                                'Batch indexing stopped early due to fail_fast=True at document %s. '
-                                'Note: Already scheduled tasks will continue to execute.',
-                                document_id
-                            )
-                            break
-                
-                # Check fail_fast after processing chunk
-                if fail_fast and result['failed_count'] > 0:
-                    logger.warning(
-                        'Batch indexing stopped early due to fail_fast=True at chunk %d (documents %d-%d)',
-                        chunk_idx, chunk_idx * chunk_size, (chunk_idx + 1) * chunk_size
-                    )
-                    break
-            
-            logger.info(
-                'Batch indexing completed: %d/%d successful, %d failed, %d skipped',
-                result['success_count'], result['total'],
-                result['failed_count'], result['skipped_count']
-            )
-            
-            if result['error_types']:
-                logger.debug(
-                    'Batch indexing error breakdown: %s',
-                    result['error_types']
-                )
-            
-            return result
-        
-        # Process documents (either small batch or single chunk)
-        for idx, document_id in enumerate(document_ids):
+
+        if chunk_size <= 0:
+            chunk_size = len(document_ids)
+
+        for chunk_index, offset in enumerate(range(0, len(document_ids), chunk_size)):
+            chunk_ids = document_ids[offset:offset + chunk_size]
+
             try:
-                index_result = DocumentIndexCoordinator.index_document(
-                    document_id=document_id,
-                    created=False  # Batch operations are typically updates
+                scheduled = DocumentIndexCoordinator._index_document_chunk(
+                    document_ids=chunk_ids, result=result
                 )
-                
-                # Categorize result
-                error_type = index_result.get('error_type')
-                if error_type:
-                    # Document was skipped (trashed, stub, not found, etc.)
-                    result['skipped_count'] += 1
-                    error_key = error_type
-                    if error_key not in result['error_types']:
-                        result['error_types'][error_key] = []
-                    result['error_types'][error_key].append({
-                        'document_id': document_id,
-                        'error': index_result.get('error', 'Unknown error')
-                    })
-                elif index_result.get('search_indexed') or index_result.get('hierarchy_indexed'):
-                    # Successfully scheduled
-                    result['success_count'] += 1
-                elif index_result.get('errors'):
-                    # Failed with errors
-                    result['failed_count'] += 1
-                    for error in index_result.get('errors', []):
-                        result['errors'].append({
-                            'document_id': document_id,
-                            'error': error
-                        })
-                    
-                    # Group errors by type for better diagnostics
-                    error_key = 'scheduling_error'
-                    if error_key not in result['error_types']:
-                        result['error_types'][error_key] = []
-                    result['error_types'][error_key].append({
-                        'document_id': document_id,
-                        'error': '; '.join(index_result.get('errors', []))
-                    })
-                    
-                    # Fail fast if requested
-                    if fail_fast:
-                        logger.warning(
-                            'Batch indexing stopped early due to fail_fast=True at document %s',
-                            document_id
-                        )
-                        break
-                else:
-                    # Unknown state
-                    result['failed_count'] += 1
+            except Exception as e:
+                # Validation query failed, the whole chunk is not scheduled.
+                scheduled = False
+                result['failed_count'] += len(chunk_ids)
+                for document_id in chunk_ids:
                     result['errors'].append({
                         'document_id': document_id,
-                        'error': 'Unknown indexing state'
+                        'error': f'Failed to index document {document_id}: {e}'
                     })
-                    
-            except Exception as e:
-                error_msg = f'Failed to index document {document_id}: {e}'
-                result['failed_count'] += 1
-                result['errors'].append({
-                    'document_id': document_id,
-                    'error': error_msg
-                })
-                
-                # Group by exception type
-                error_key = type(e).__name__
-                if error_key not in result['error_types']:
-                    result['error_types'][error_key] = []
-                result['error_types'][error_key].append({
-                    'document_id': document_id,
-                    'error': str(e)
-                })
-                
+                result['error_types'].setdefault(type(e).__name__, []).extend(
+                    {
+                        'document_id': document_id,
+                        'error': str(e)
+                    } for document_id in chunk_ids
+                )
                 logger.error(
-                    'Error in batch indexing for document %s: %s',
-                    document_id, e, exc_info=True
+                    'Error in batch indexing for chunk %d: %s',
+                    chunk_index, e, exc_info=True
                 )
-                
-                # Fail fast if requested
-                # Note: fail_fast stops only planning of new tasks, already scheduled tasks continue
-                if fail_fast:
-                    logger.warning(
-                        'Batch indexing stopped early due to fail_fast=True at document %s. '
-                        'Note: Already scheduled tasks will continue to execute.',
-                        document_id
-                    )
-                    break
+
+            if fail_fast and not scheduled:
+                logger.warning(
+                    'Batch indexing stopped early due to fail_fast=True at chunk %d (documents %d-%d). '
+                    'Note: Already scheduled tasks will continue to execute.',
+                    chunk_index, offset, offset + len(chunk_ids)
+                )
+                break
         
         logger.info(
             'Batch indexing completed: %d/%d successful, %d failed, %d skipped',
@@ -820,4 +880,3 @@ class DocumentIndexCoordinator:
             )
         
         return result
-
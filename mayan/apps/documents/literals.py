@@ -9,6 +9,7 @@ CHECK_DELETE_PERIOD_INTERVAL = 60
 CHECK_TRASH_PERIOD_INTERVAL = 60
 
 DELETE_STALE_STUBS_INTERVAL = 60 * 10  # 10 minutes
+DOCUMENT_FILE_STORAGE_DEDUPLICATE_INTERVAL = 60 * 60 * 24  # 24 hours
 DEFAULT_DELETE_PERIOD = 30
 DEFAULT_DELETE_TIME_UNIT = TIME_DELTA_UNIT_DAYS
 DEFAULT_DOCUMENT_TYPE_LABEL = _('Default')
@@ -23,10 +24,12 @@ DEFAULT_DOCUMENTS_DISPLAY_HEIGHT = ''
 DEFAULT_DOCUMENTS_DISPLAY_WIDTH = '3600'
 DEFAULT_DOCUMENTS_FAVORITE_COUNT = 400
 DEFAULT_DOCUMENTS_FILE_PAGE_IMAGE_CACHE_MAXIMUM_SIZE = 500 * 2 ** 20  # 500 Megabytes
+DEFAULT_DOCUMENTS_FILE_PAGE_IMAGE_CACHE_WARM_UP = True
 DEFAULT_DOCUMENTS_FILE_STORAGE_BACKEND = 'django.core.files.storage.FileSystemStorage'
 DEFAULT_DOCUMENTS_FILE_STORAGE_BACKEND_ARGUMENTS = {
     'location': os.path.join(settings.MEDIA_ROOT, 'document_file_storage')
 }
+DEFAULT_DOCUMENTS_FILE_STORAGE_DEDUPLICATION = True
 DEFAULT_DOCUMENTS_FILE_PAGE_IMAGE_CACHE_STORAGE_BACKEND = 'django.core.files.storage.FileSystemStorage'
 DEFAULT_DOCUMENTS_FILE_PAGE_IMAGE_CACHE_STORAGE_BACKEND_ARGUMENTS = {
     'location': os.path.join(
@@ -74,6 +77,11 @@ DEFAULT_LANGUAGE_CODES = (
 )
 DEFAULT_STUB_EXPIRATION_INTERVAL = 60 * 60 * 24  # 24 hours
 
+DOCUMENT_FILE_STORAGE_LOCK_POLL_INTERVAL = 0.1
+DOCUMENT_FILE_STORAGE_LOCK_TIMEOUT = 60
+
+DOCUMENT_POINTERS_UPDATE_BATCH_SIZE = 1000
+
 DOCUMENT_VERSION_EXPORT_MESSAGE_BODY = _(
     'Document version "%(document_version)s" has been '
     'exported and is available for download using the '
@@ -0,0 +1,41 @@
+from django.core import management
+from django.utils.translation import ugettext_lazy as _
+
+from ...models.document_models import Document
+
+
+class Command(management.BaseCommand):
+    help = 'Backfill and verify the latest file and active version of the documents.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch_size', action='store', dest='batch_size',
+            help=_('Number of documents to update per query.'),
+            type=int
+        )
+        parser.add_argument(
+            '--verify', action='store_true', dest='verify',
+            help=_(
+                'Only report the documents with a mismatched latest file '
+                'or active version. Exits with an error if any is found.'
+            )
+        )
+
+    def handle(self, *args, **options):
+        kwargs = {'verify': options['verify']}
+        if options['batch_size']:
+            kwargs['batch_size'] = options['batch_size']
+
+        document_id_list = Document.objects.pointers_update(**kwargs)
+
+        if options['verify']:
+            if document_id_list:
+                raise management.CommandError(
+                    'Documents with mismatched pointers: {}'.format(
+                        ', '.join(map(str, document_id_list))
+                    )
+                )
+        else:
+            self.stdout.write(
+                'Documents updated: {}'.format(len(document_id_list))
+            )
@@ -4,11 +4,14 @@ import logging
 from django.apps import apps
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery
 from django.utils.encoding import force_text
 from django.utils.timezone import now
 
 from mayan.apps.databases.classes import ModelQueryFields
+from mayan.apps.lock_manager.exceptions import LockError
 
+from .literals import DOCUMENT_POINTERS_UPDATE_BATCH_SIZE
 from .settings import (
     setting_favorite_count, setting_recently_accessed_document_count,
     setting_recently_created_document_count, setting_stub_expiration_interval
@@ -27,11 +30,134 @@ class DocumentManager(models.Manager):
         for stale_stub_document in stale_stub_documents:
             stale_stub_document.delete(to_trash=False)
 
+    def get_active_version_subquery(self):
+        DocumentVersion = apps.get_model(
+            app_label='documents', model_name='DocumentVersion'
+        )
+
+        return Subquery(
+            DocumentVersion.objects.filter(
+                active=True, document=OuterRef('pk')
+            ).order_by('timestamp', 'pk').values('pk')[:1]
+        )
+
     def get_by_natural_key(self, uuid):
         return self.get(uuid=force_text(s=uuid))
 
+    def get_latest_file_subquery(self):
+        DocumentFile = apps.get_model(
+            app_label='documents', model_name='DocumentFile'
+        )
+
+        return Subquery(
+            DocumentFile.objects.filter(
+                document=OuterRef('pk')
+            ).order_by('-timestamp', '-pk').values('pk')[:1]
+        )
+
+    def pointers_update(
+        self, batch_size=DOCUMENT_POINTERS_UPDATE_BATCH_SIZE, verify=False
+    ):
+        """
+        Compare the denormalized latest file and active version of each
+        document with its files and versions. The mismatched documents are
+        updated unless `verify` is True. Returns the list of primary keys
+        of the mismatched documents.
+        """
+        queryset = self.annotate(
+            active_version_pk=self.get_active_version_subquery(),
+            latest_file_pk=self.get_latest_file_subquery()
+        ).order_by('pk').values_list(
+            'pk', 'active_version_id', 'active_version_pk',
+            'latest_file_id', 'latest_file_pk'
+        )
+
+        document_id_list = [
+            pk for pk, active_version_id, active_version_pk, latest_file_id, latest_file_pk in queryset.iterator()
+            if active_version_id != active_version_pk or latest_file_id != latest_file_pk
+        ]
+
+        if not verify:
+            for index in range(0, len(document_id_list), batch_size):
+                self.filter(
+                    pk__in=document_id_list[index:index + batch_size]
+                ).update(
+                    active_version=self.get_active_version_subquery(),
+                    latest_file=self.get_latest_file_subquery()
+                )
+
+        return document_id_list
+
 
 class DocumentFileManager(models.Manager):
+    def deduplicate_storage(self):
+        """
+        Merge the stored files of document files with the same content
+        into a single stored file. Stored files that are locked are
+        skipped and merged in a later run. Returns the number of stored
+        files deleted.
+        """
+        count = 0
+
+        duplicate_queryset = self.values('checksum', 'size').annotate(
+            file_count=Count('file', distinct=True)
+        ).filter(file_count__gt=1).order_by()
+
+        for entry in duplicate_queryset.iterator():
+            name_list = []
+            for name in self.filter(
+                checksum=entry['checksum'], size=entry['size']
+            ).order_by('pk').values_list('file', flat=True):
+                if name not in name_list:
+                    name_list.append(name)
+
+            storage = self.model._meta.get_field(field_name='file').storage
+
+            canonical_name = None
+            for name in name_list:
+                if storage.exists(name=name):
+                    canonical_name = name
+                    break
+
+            if not canonical_name:
+                continue
+
+            try:
+                canonical_lock = self.model.acquire_storage_lock(
+                    name=canonical_name, wait=False
+                )
+            except LockError:
+                continue
+
+            try:
+                for name in name_list:
+                    if name == canonical_name:
+                        continue
+
+                    try:
+                        lock = self.model.acquire_storage_lock(
+                            name=name, wait=False
+                        )
+                    except LockError:
+                        continue
+
+                    try:
+                        self.filter(
+                            checksum=entry['checksum'], file=name
+                        ).update(file=canonical_name)
+
+                        if not self.filter(file=name).exists():
+                            storage.delete(name=name)
+                            count += 1
+                    finally:
+                        lock.release()
+            finally:
+                canonical_lock.release()
+
+        logger.debug('Deleted %d duplicated stored files.', count)
+
+        return count
+
     def get_by_natural_key(self, checksum, document_natural_key):
         Document = apps.get_model(
             app_label='documents', model_name='Document'
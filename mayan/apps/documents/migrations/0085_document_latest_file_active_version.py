@@ -0,0 +1,63 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def code_document_pointers_update(apps, schema_editor):
+    Document = apps.get_model(
+        app_label='documents', model_name='Document'
+    )
+    DocumentFile = apps.get_model(
+        app_label='documents', model_name='DocumentFile'
+    )
+    DocumentVersion = apps.get_model(
+        app_label='documents', model_name='DocumentVersion'
+    )
+
+    Document.objects.update(
+        active_version=Subquery(
+            DocumentVersion.objects.filter(
+                active=True, document=OuterRef('pk')
+            ).order_by('timestamp', 'pk').values('pk')[:1]
+        ),
+        latest_file=Subquery(
+            DocumentFile.objects.filter(
+                document=OuterRef('pk')
+            ).order_by('-timestamp', '-pk').values('pk')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('documents', '0084_document_fulltext_search')
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='active_version',
+            field=models.ForeignKey(
+                blank=True, editable=False, help_text='The active version '
+                'of the document.', null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name='+', to='documents.documentversion',
+                verbose_name='Active version'
+            ),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='latest_file',
+            field=models.ForeignKey(
+                blank=True, editable=False, help_text='The most recent '
+                'file of the document.', null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name='+', to='documents.documentfile',
+                verbose_name='Latest file'
+            ),
+        ),
+        migrations.RunPython(
+            code=code_document_pointers_update,
+            reverse_code=migrations.RunPython.noop
+        )
+    ]
@@ -1,8 +1,11 @@
+from contextlib import contextmanager
 import hashlib
 import logging
 import shutil
+import time
 
 from django.apps import apps
+from django.core.files import File
 from django.db import models, transaction
 from django.urls import reverse
 from django.utils.encoding import force_text
@@ -19,18 +22,25 @@ from mayan.apps.converter.exceptions import (
 from mayan.apps.events.classes import EventManagerMethodAfter
 from mayan.apps.events.decorators import method_event
 from mayan.apps.file_caching.models import CachePartitionFile
+from mayan.apps.lock_manager.backends.base import LockingBackend
+from mayan.apps.lock_manager.exceptions import LockError
 from mayan.apps.mime_types.classes import MIMETypeBackend
 from mayan.apps.storage.classes import DefinedStorageLazy
+from mayan.apps.storage.utils import NamedTemporaryFile
 
 from ..events import (
     event_document_file_created, event_document_file_deleted,
     event_document_file_downloaded, event_document_file_edited
 )
 from ..literals import (
+    DOCUMENT_FILE_STORAGE_LOCK_POLL_INTERVAL,
+    DOCUMENT_FILE_STORAGE_LOCK_TIMEOUT,
     STORAGE_NAME_DOCUMENT_FILE_PAGE_IMAGE_CACHE, STORAGE_NAME_DOCUMENT_FILES
 )
 from ..managers import DocumentFileManager, ValidDocumentFileManager
-from ..settings import setting_hash_block_size
+from ..settings import (
+    setting_document_file_storage_deduplication, setting_hash_block_size
+)
 from ..signals import (
     signal_post_document_created, signal_post_document_file_upload
 )
@@ -132,6 +142,30 @@ class DocumentFile(
     def hash_function():
         return hashlib.sha256()
 
+    @staticmethod
+    def acquire_storage_lock(name, wait=True):
+        """
+        Lock a stored file name. The stored file of a document file can be
+        shared by all the document files with the same content. The lock
+        serializes the linking of new document files to a stored file and
+        the deletion of the stored file when it is no longer referenced.
+        """
+        lock_name = 'document_file_storage-{}'.format(
+            hashlib.sha256(name.encode('utf-8')).hexdigest()
+        )
+        deadline = time.monotonic() + DOCUMENT_FILE_STORAGE_LOCK_TIMEOUT
+
+        while True:
+            try:
+                return LockingBackend.get_backend().acquire_lock(
+                    name=lock_name, timeout=DOCUMENT_FILE_STORAGE_LOCK_TIMEOUT
+                )
+            except LockError:
+                if not wait or time.monotonic() >= deadline:
+                    raise
+
+                time.sleep(DOCUMENT_FILE_STORAGE_LOCK_POLL_INTERVAL)
+
     @classmethod
     def execute_pre_create_hooks(cls, kwargs=None):
         """
@@ -169,6 +203,123 @@ class DocumentFile(
     def __str__(self):
         return self.get_label()
 
+    def _execute_pre_open_hooks(self, file_object):
+        result = DocumentFile._execute_hooks(
+            hook_list=DocumentFile._pre_open_hooks,
+            instance=self, file_object=file_object
+        )
+
+        if result:
+            return result['file_object']
+        else:
+            return file_object
+
+    def _ingest_spool(self, spool_file_object):
+        """
+        Copy the uploaded file to a local spool file calculating the
+        checksum and the size in the same pass. The spool file is then
+        saved to the storage and used for the MIME type and the page count
+        to avoid reading the file back from the storage.
+        """
+        hash_object = DocumentFile.hash_function()
+        size = 0
+
+        for data in self.file.chunks(chunk_size=setting_hash_block_size.value or None):
+            hash_object.update(data)
+            size += len(data)
+            spool_file_object.write(data)
+
+        spool_file_object.flush()
+        spool_file_object.seek(0)
+
+        self.checksum = force_text(s=hash_object.hexdigest())
+        self.size = size
+        self.file = File(file=spool_file_object, name=self.file.name)
+
+    def _ingest_link(self):
+        """
+        Find a stored file with the same content as the spooled upload.
+        Returns the source document file and the lock of its stored file
+        or (None, None). The lock must be held until this document file is
+        saved for the stored file to not be deleted in between.
+        """
+        name_set = set()
+        queryset = DocumentFile.objects.filter(
+            checksum=self.checksum, size=self.size
+        ).exclude(pk=self.pk).order_by('pk')
+
+        for name in queryset.values_list('file', flat=True):
+            if name in name_set:
+                continue
+
+            name_set.add(name)
+
+            try:
+                lock = DocumentFile.acquire_storage_lock(name=name, wait=False)
+            except LockError:
+                continue
+
+            source_document_file = DocumentFile.objects.filter(
+                checksum=self.checksum, file=name
+            ).order_by('pk').first()
+
+            if source_document_file and source_document_file.exists():
+                return source_document_file, lock
+            else:
+                lock.release()
+
+        return None, None
+
+    @contextmanager
+    def _open_spool(self, spool_file_object):
+        spool_file_object.seek(0)
+        file_object = self._execute_pre_open_hooks(
+            file_object=spool_file_object
+        )
+
+        try:
+            yield file_object
+        finally:
+            # The spool file is closed by its owner.
+            if file_object is not spool_file_object:
+                file_object.close()
+
+    def _pages_create(self, page_count):
+        DocumentFilePage = apps.get_model(
+            app_label='documents', model_name='DocumentFilePage'
+        )
+
+        self.pages.all().delete()
+
+        DocumentFilePage.objects.bulk_create(
+            objs=[
+                DocumentFilePage(
+                    document_file=self, page_number=page_number + 1
+                ) for page_number in range(page_count)
+            ]
+        )
+
+        # Bulk created pages do not trigger the search indexing signals,
+        # index them with a single task instead.
+        if page_count:
+            from mayan.apps.dynamic_search.tasks import task_index_instances
+
+            from ..search import search_model_document_file_page
+
+            task_index_instances.apply_async(
+                kwargs={
+                    'id_list': list(
+                        self.file_pages.values_list('pk', flat=True)
+                    ), 'search_model_full_name': search_model_document_file_page.get_full_name()
+                }
+            )
+
+    def _update_mimetype(self, file_object):
+        mimetype_backend = MIMETypeBackend.get_backend_instance()
+        self.mimetype, self.encoding = mimetype_backend.get_mime_type(
+            file_object=file_object
+        )
+
     @cached_property
     def cache(self):
         Cache = apps.get_model(app_label='file_caching', model_name='Cache')
@@ -223,11 +374,23 @@ class DocumentFile(
 
         name = self.file.name
         self.file.close()
-        self.file.storage.delete(name=name)
         self.cache_partition.delete()
 
+        # Update the latest file before deleting so that the post_delete
+        # handlers see the replacement and not the file being deleted.
+        self.document.file_latest_update(exclude_document_file=self)
+
         result = super().delete(*args, **kwargs)
 
+        # The stored file is shared by all the document files with the
+        # same content. Delete it only when it is no longer referenced.
+        lock = DocumentFile.acquire_storage_lock(name=name)
+        try:
+            if not DocumentFile.objects.filter(file=name).exists():
+                self.file.storage.delete(name=name)
+        finally:
+            lock.release()
+
         if self.document.files.count() == 0:
             self.document.is_stub = False
             self.document._event_ignore = True
@@ -349,10 +512,7 @@ class DocumentFile(
         if self.exists():
             try:
                 with self.open() as file_object:
-                    mimetype_backend = MIMETypeBackend.get_backend_instance()
-                    self.mimetype, self.encoding = mimetype_backend.get_mime_type(
-                        file_object=file_object
-                    )
+                    self._update_mimetype(file_object=file_object)
             except Exception:
                 self.mimetype = ''
                 self.encoding = ''
@@ -374,21 +534,20 @@ class DocumentFile(
         if raw:
             return self.file.storage.open(name=name)
         else:
-            file_object = self.file.storage.open(name=name)
-
-            result = DocumentFile._execute_hooks(
-                hook_list=DocumentFile._pre_open_hooks,
-                instance=self, file_object=file_object
+            return self._execute_pre_open_hooks(
+                file_object=self.file.storage.open(name=name)
             )
 
-            if result:
-                return result['file_object']
+    def page_count_update(self, save=True, user=None, _spool_file_object=None):
+        try:
+            if _spool_file_object:
+                file_context = self._open_spool(
+                    spool_file_object=_spool_file_object
+                )
             else:
-                return file_object
+                file_context = self.open()
 
-    def page_count_update(self, save=True, user=None):
-        try:
-            with self.open() as file_object:
+            with file_context as file_object:
                 converter = ConverterBase.get_converter_class()(
                     file_object=file_object, mime_type=self.mimetype
                 )
@@ -396,16 +555,7 @@ class DocumentFile(
         except PageCountError:
             """Converter backend doesn't understand the format."""
         else:
-            DocumentFilePage = apps.get_model(
-                app_label='documents', model_name='DocumentFilePage'
-            )
-
-            self.pages.all().delete()
-
-            for page_number in range(detected_pages):
-                DocumentFilePage.objects.create(
-                    document_file=self, page_number=page_number + 1
-                )
+            self._pages_create(page_count=detected_pages)
 
             if save:
                 self._event_actor = user
@@ -413,6 +563,60 @@ class DocumentFile(
 
             return detected_pages
 
+    def page_image_cache_warm_up(self):
+        """
+        Render the base image of every page not yet cached using a single
+        converter session over the intermediate file instead of one
+        conversion per page.
+        """
+        CachePartitionFile = apps.get_model(
+            app_label='file_caching', model_name='CachePartitionFile'
+        )
+        cache_filename = 'base_image'
+
+        pages = {
+            page.page_number - 1: page for page in self.file_pages.all()
+        }
+        if not pages:
+            return 0
+
+        cached_partition_names = set(
+            CachePartitionFile.objects.filter(
+                filename=cache_filename, partition__cache=self.cache,
+                partition__name__in=[page.uuid for page in pages.values()]
+            ).values_list('partition__name', flat=True)
+        )
+        pending_page_numbers = [
+            page_number for page_number, page in pages.items()
+            if page.uuid not in cached_partition_names
+        ]
+        if not pending_page_numbers:
+            return 0
+
+        count = 0
+        with self.get_intermediate_file() as file_object:
+            converter = ConverterBase.get_converter_class()(
+                file_object=file_object
+            )
+            page_images = converter.get_pages(
+                page_number_first=min(pending_page_numbers),
+                page_number_last=max(pending_page_numbers)
+            )
+            for page_number, page_image in page_images:
+                page = pages.get(page_number)
+                if not page or page.uuid in cached_partition_names:
+                    continue
+
+                with page.cache_partition.create_file(filename=cache_filename) as file_object:
+                    file_object.write(page_image.getvalue())
+
+                count += 1
+
+        logger.debug(
+            'Rendered %d page images for document file: %s', count, self
+        )
+        return count
+
     @property
     def pages(self):
         DocumentFilePage = apps.get_model(
@@ -432,6 +636,9 @@ class DocumentFile(
         """
         user = kwargs.pop('_user', self.__dict__.pop('_event_actor', None))
         new_document_file = not self.pk
+        source_document_file = None
+        spool_file_object = None
+        storage_lock = None
 
         if new_document_file:
             logger.info('Creating new file for document: %s', self.document)
@@ -444,6 +651,17 @@ class DocumentFile(
             )
 
         try:
+            if new_document_file:
+                spool_file_object = NamedTemporaryFile()
+                self._ingest_spool(spool_file_object=spool_file_object)
+
+                if setting_document_file_storage_deduplication.value:
+                    source_document_file, storage_lock = self._ingest_link()
+                    if source_document_file:
+                        # Assigning the name marks the file as committed
+                        # and nothing is written to the storage.
+                        self.file = source_document_file.file.name
+
             self.execute_pre_save_hooks()
 
             signal_mayan_pre_save.send(
@@ -452,6 +670,13 @@ class DocumentFile(
 
             super().save(*args, **kwargs)
 
+            if new_document_file:
+                self.document.file_latest_update()
+
+            if storage_lock:
+                storage_lock.release()
+                storage_lock = None
+
             DocumentFile._execute_hooks(
                 hook_list=DocumentFile._post_save_hooks,
                 instance=self
@@ -495,12 +720,33 @@ class DocumentFile(
                 # #endregion
 
                 with transaction.atomic():
-                    self.checksum_update(save=False)
-                    self.mimetype_update(save=False)
-                    self.size_update(save=False)
-                    self._event_actor = user
-                    self.save()
-                    self.page_count_update(save=False)
+                    if source_document_file:
+                        # Same content as an existing document file, reuse
+                        # its MIME type and page count instead of
+                        # inspecting the file again.
+                        self.encoding = source_document_file.encoding
+                        self.mimetype = source_document_file.mimetype
+
+                        self._event_actor = user
+                        self.save()
+                        self._pages_create(
+                            page_count=source_document_file.file_pages.count()
+                        )
+                    else:
+                        # The checksum and size were calculated while
+                        # spooling the upload.
+                        try:
+                            with self._open_spool(spool_file_object=spool_file_object) as file_object:
+                                self._update_mimetype(file_object=file_object)
+                        except Exception:
+                            self.mimetype = ''
+                            self.encoding = ''
+
+                        self._event_actor = user
+                        self.save()
+                        self.page_count_update(
+                            save=False, _spool_file_object=spool_file_object
+                        )
 
                     logger.info(
                         'New document file "%s" created for document: %s',
@@ -533,6 +779,12 @@ class DocumentFile(
                 event_document_file_edited.commit(
                     actor=user, target=self, action_object=self.document
                 )
+        finally:
+            if storage_lock:
+                storage_lock.release()
+
+            if spool_file_object:
+                spool_file_object.close()
 
     def save_to_file(self, file_object):
         """
@@ -102,6 +102,18 @@ class Document(
             'deferred upload via the API.'
         ), verbose_name=_('Is stub?')
     )
+    active_version = models.ForeignKey(
+        blank=True, editable=False, help_text=_(
+            'The active version of the document.'
+        ), null=True, on_delete=models.SET_NULL, related_name='+',
+        to='documents.DocumentVersion', verbose_name=_('Active version')
+    )
+    latest_file = models.ForeignKey(
+        blank=True, editable=False, help_text=_(
+            'The most recent file of the document.'
+        ), null=True, on_delete=models.SET_NULL, related_name='+',
+        to='documents.DocumentFile', verbose_name=_('Latest file')
+    )
 
     objects = DocumentManager()
     trash = TrashCanManager()
@@ -184,7 +196,23 @@ class Document(
 
     @property
     def file_latest(self):
-        return self.files.order_by('timestamp').last()
+        return self.latest_file
+
+    def file_latest_update(self, exclude_document_file=None):
+        """
+        Update the denormalized latest file of the document. Called by the
+        document file save and delete methods. The delete method passes the
+        file being deleted as `exclude_document_file` to update the pointer
+        before the deletion signals are sent.
+        """
+        queryset = self.files.all()
+        if exclude_document_file:
+            queryset = queryset.exclude(pk=exclude_document_file.pk)
+
+        self.latest_file = queryset.order_by('timestamp', 'pk').last()
+        Document.objects.filter(pk=self.pk).update(
+            latest_file=self.latest_file
+        )
 
     def file_new(
         self, file_object, action=None, comment=None, filename=None,
@@ -327,6 +355,15 @@ class Document(
             sender=Document, instance=self, user=user
         )
 
+        if not new_document and not args and not kwargs.get('force_insert') and not kwargs.get('update_fields'):
+            # The latest file and the active version are updated by the
+            # document file and document version models. Do not overwrite
+            # them with the values loaded by this instance.
+            deferred_fields = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields if not field.primary_key and field.attname not in deferred_fields and field.name not in ('active_version', 'latest_file')
+            ]
+
         super().save(*args, **kwargs)
 
         if new_document:
@@ -335,10 +372,19 @@ class Document(
 
     @property
     def version_active(self):
-        try:
-            return self.versions.filter(active=True).first()
-        except self.versions.model.DoesNotExist:
-            return self.versions.none()
+        return self.active_version
+
+    def version_active_update(self):
+        """
+        Update the denormalized active version of the document. Called by
+        the document version save and delete methods.
+        """
+        self.active_version = self.versions.filter(
+            active=True
+        ).order_by('timestamp', 'pk').first()
+        Document.objects.filter(pk=self.pk).update(
+            active_version=self.active_version
+        )
 
     @property
     def dam_analysis(self):
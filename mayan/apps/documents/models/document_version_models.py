@@ -125,7 +125,11 @@ class DocumentVersion(ExtraDataModelMixin, models.Model):
 
         self.cache_partition.delete()
 
-        return super().delete(*args, **kwargs)
+        result = super().delete(*args, **kwargs)
+
+        self.document.version_active_update()
+
+        return result
 
     def export(self, file_object):
         pages_queryset = self.pages
@@ -375,7 +379,11 @@ class DocumentVersion(ExtraDataModelMixin, models.Model):
             if self.active:
                 self.active_set(save=False)
 
-            return super().save(*args, **kwargs)
+            result = super().save(*args, **kwargs)
+
+            self.document.version_active_update()
+
+            return result
 
     @property
     def uuid(self):
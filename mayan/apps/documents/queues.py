@@ -7,7 +7,8 @@ from mayan.apps.task_manager.workers import worker_b, worker_c
 
 from .literals import (
     CHECK_DELETE_PERIOD_INTERVAL, CHECK_TRASH_PERIOD_INTERVAL,
-    DELETE_STALE_STUBS_INTERVAL, DEFAULT_INDEXING_PERIODIC_REINDEX_INTERVAL
+    DELETE_STALE_STUBS_INTERVAL, DEFAULT_INDEXING_PERIODIC_REINDEX_INTERVAL,
+    DOCUMENT_FILE_STORAGE_DEDUPLICATE_INTERVAL
 )
 from .settings import setting_indexing_periodic_reindex_interval
 
@@ -30,6 +31,10 @@ queue_documents.add_task_type(
     dotted_path='mayan.apps.documents.tasks.task_trashed_document_delete',
     label=_('Delete a document')
 )
+queue_documents.add_task_type(
+    dotted_path='mayan.apps.documents.tasks.task_document_file_page_image_cache_warm_up',
+    label=_('Pre-render the page images of a document file')
+)
 queue_documents.add_task_type(
     dotted_path='mayan.apps.documents.tasks.task_document_version_page_list_append',
     label=_('Append all document file pages to a document version')
@@ -89,6 +94,12 @@ queue_documents_periodic.add_task_type(
     name='task_document_type_document_trash_periods_check',
     schedule=timedelta(seconds=CHECK_TRASH_PERIOD_INTERVAL),
 )
+queue_documents_periodic.add_task_type(
+    dotted_path='mayan.apps.documents.tasks.task_document_file_storage_deduplicate',
+    label=_('Deduplicate document file storage'),
+    name='task_document_file_storage_deduplicate',
+    schedule=timedelta(seconds=DOCUMENT_FILE_STORAGE_DEDUPLICATE_INTERVAL),
+)
 queue_documents_periodic.add_task_type(
     dotted_path='mayan.apps.documents.tasks.task_document_stubs_delete',
     label=_('Delete document stubs'),
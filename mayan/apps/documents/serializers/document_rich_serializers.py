@@ -112,13 +112,8 @@ class DocumentRichSerializer(serializers.Serializer):
     # ==================== File Info Methods ====================
     
     def _get_file_latest(self, obj) -> Optional[Any]:
-        """Get latest file from document (cached or fresh)."""
-        # Try cached prefetch first
-        if hasattr(obj, '_prefetched_file_latest'):
-            return obj._prefetched_file_latest
-        
-        # Fallback to property
-        return obj.file_latest
+        """Get latest file from document (joined by the view)."""
+        return obj.latest_file
     
     def get_file_id(self, obj) -> Optional[int]:
         """Get latest file ID."""
@@ -417,9 +412,7 @@ class DocumentRichListSerializer(serializers.Serializer):
     ai_status = serializers.SerializerMethodField()
     
     def _get_file_latest(self, obj):
-        if hasattr(obj, '_prefetched_file_latest'):
-            return obj._prefetched_file_latest
-        return obj.file_latest
+        return obj.latest_file
     
     def get_filename(self, obj) -> Optional[str]:
         file_obj = self._get_file_latest(obj)
@@ -179,8 +179,7 @@ class OptimizedDocumentListSerializer(
     Phase B2.3: Uses cached thumbnail URLs.
     
     Key optimizations:
-    - Uses _prefetched_file_latest_list instead of file_latest property
-    - Uses _prefetched_version_active_list instead of version_active property
+    - Uses the latest_file and active_version ForeignKeys joined by the view
     - Caches thumbnail/preview URLs
     - Minimal field set for list view performance
     """
@@ -237,36 +236,19 @@ class OptimizedDocumentListSerializer(
         )
     
     def _get_file_latest(self, obj):
-        """Get prefetched file_latest or fallback to property."""
-        if hasattr(obj, '_prefetched_latest_file_list'):
-            files = obj._prefetched_latest_file_list
-            return files[0] if files else None
-        if hasattr(obj, '_prefetched_file_latest_list'):
-            files = obj._prefetched_file_latest_list
-            return files[0] if files else None
-        if hasattr(obj, '_cached_file_latest'):
-            return obj._cached_file_latest
-        # Fallback (triggers query - should not happen with optimized view)
-        return obj.file_latest
+        """Get the latest file joined by the view."""
+        return obj.latest_file
     
     def _get_version_active(self, obj):
-        """Get prefetched version_active or fallback."""
-        if hasattr(obj, '_prefetched_version_active_list'):
-            versions = obj._prefetched_version_active_list
-            return versions[0] if versions else None
-        if hasattr(obj, '_cached_version_active'):
-            return obj._cached_version_active
-        return obj.version_active
+        """Get the active version joined by the view."""
+        return obj.active_version
     
     def get_file_latest_id(self, obj):
-        file = self._get_file_latest(obj)
-        if file:
-            return file.pk
-        return getattr(obj, 'latest_file_id', None)
+        return obj.latest_file_id
 
     def get_file_latest_download_url(self, obj):
         file = self._get_file_latest(obj)
-        file_id = file.pk if file else getattr(obj, 'latest_file_id', None)
+        file_id = obj.latest_file_id
         if file and hasattr(file, 'download_url') and file.download_url:
             url = file.download_url
         elif file_id:
@@ -289,7 +271,7 @@ class OptimizedDocumentListSerializer(
                 if request:
                     return request.build_absolute_uri(url)
             return url
-        return getattr(obj, 'latest_file_id', None)
+        return None
     
     def get_file_latest_filename(self, obj):
         file = self._get_file_latest(obj)
@@ -464,19 +446,10 @@ class OptimizedDocumentSerializer(
         )
     
     def _get_file_latest(self, obj):
-        if hasattr(obj, '_cached_file_latest'):
-            return obj._cached_file_latest
-        if hasattr(obj, '_prefetched_files') and obj._prefetched_files:
-            return obj._prefetched_files[0]
-        return obj.file_latest
+        return obj.latest_file
     
     def _get_version_active(self, obj):
-        if hasattr(obj, '_cached_version_active'):
-            return obj._cached_version_active
-        if hasattr(obj, '_prefetched_version_active_list'):
-            versions = obj._prefetched_version_active_list
-            return versions[0] if versions else None
-        return obj.version_active
+        return obj.active_version
     
     def get_document_type(self, obj):
         return {
@@ -500,8 +473,8 @@ class OptimizedDocumentSerializer(
         return None
     
     def get_files_count(self, obj):
-        if hasattr(obj, '_prefetched_files'):
-            return len(obj._prefetched_files)
+        if hasattr(obj, 'files_count'):
+            return obj.files_count
         return obj.files.count()
     
     def get_version_active(self, obj):
@@ -8,8 +8,10 @@ from .literals import (
     DEFAULT_DOCUMENTS_FILE_PAGE_IMAGE_CACHE_STORAGE_BACKEND,
     DEFAULT_DOCUMENTS_FILE_PAGE_IMAGE_CACHE_STORAGE_BACKEND_ARGUMENTS,
     DEFAULT_DOCUMENTS_FILE_PAGE_IMAGE_CACHE_MAXIMUM_SIZE,
+    DEFAULT_DOCUMENTS_FILE_PAGE_IMAGE_CACHE_WARM_UP,
     DEFAULT_DOCUMENTS_FILE_STORAGE_BACKEND,
     DEFAULT_DOCUMENTS_FILE_STORAGE_BACKEND_ARGUMENTS,
+    DEFAULT_DOCUMENTS_FILE_STORAGE_DEDUPLICATION,
     DEFAULT_DOCUMENTS_HASH_BLOCK_SIZE, DEFAULT_DOCUMENTS_LIST_THUMBNAIL_WIDTH,
     DEFAULT_DOCUMENTS_PREVIEW_HEIGHT, DEFAULT_DOCUMENTS_PREVIEW_WIDTH,
     DEFAULT_DOCUMENTS_PRINT_HEIGHT, DEFAULT_DOCUMENTS_PRINT_WIDTH,
@@ -54,6 +56,13 @@ setting_document_file_page_image_cache_maximum_size = namespace.add_setting(
         'the size in bytes.'
     ), post_edit_function=callback_update_document_file_page_image_cache_size
 )
+setting_document_file_page_image_cache_warm_up = namespace.add_setting(
+    default=DEFAULT_DOCUMENTS_FILE_PAGE_IMAGE_CACHE_WARM_UP,
+    global_name='DOCUMENTS_FILE_PAGE_IMAGE_CACHE_WARM_UP', help_text=_(
+        'Pre-render the images of all pages of new document files in a '
+        'single pass and store them in the document file page image cache.'
+    )
+)
 setting_document_file_storage_backend = namespace.add_setting(
     default=DEFAULT_DOCUMENTS_FILE_STORAGE_BACKEND,
     global_name='DOCUMENTS_FILE_STORAGE_BACKEND', help_text=_(
@@ -67,6 +76,15 @@ setting_document_file_storage_backend_arguments = namespace.add_setting(
         'Arguments to pass to the DOCUMENT_FILE_STORAGE_BACKEND.'
     )
 )
+setting_document_file_storage_deduplication = namespace.add_setting(
+    default=DEFAULT_DOCUMENTS_FILE_STORAGE_DEDUPLICATION,
+    global_name='DOCUMENTS_FILE_STORAGE_DEDUPLICATION', help_text=_(
+        'Store the content of identical document files only once. New '
+        'document files with the same checksum and size as an existing '
+        'one reuse its stored file and its page information instead of '
+        'being stored and processed again.'
+    )
+)
 setting_document_file_page_image_cache_storage_backend = namespace.add_setting(
     default=DEFAULT_DOCUMENTS_FILE_PAGE_IMAGE_CACHE_STORAGE_BACKEND,
     global_name='DOCUMENTS_FILE_PAGE_IMAGE_CACHE_STORAGE_BACKEND', help_text=_(
@@ -45,6 +45,35 @@ def task_document_file_page_count_update(
         raise self.retry(exc=exception)
 
 
+@app.task(
+    bind=True, default_retry_delay=UPDATE_PAGE_COUNT_RETRY_DELAY,
+    ignore_result=True
+)
+def task_document_file_page_image_cache_warm_up(self, document_file_id):
+    DocumentFile = apps.get_model(
+        app_label='documents', model_name='DocumentFile'
+    )
+
+    try:
+        document_file = DocumentFile.objects.get(pk=document_file_id)
+    except DocumentFile.DoesNotExist:
+        logger.debug(
+            'Document file ID %s no longer exists; skipping page image '
+            'cache warm up.', document_file_id
+        )
+        return
+
+    try:
+        document_file.page_image_cache_warm_up()
+    except OperationalError as exception:
+        logger.warning(
+            'Operational error during attempt to warm up the page image '
+            'cache of document file: %s; %s. Retrying.', document_file,
+            exception
+        )
+        raise self.retry(exc=exception)
+
+
 @app.task(
     bind=True, default_retry_delay=UPLOAD_NEW_VERSION_RETRY_DELAY,
     ignore_result=True
@@ -124,6 +153,17 @@ def task_document_file_upload(
                 )
 
 
+@app.task(ignore_result=True)
+def task_document_file_storage_deduplicate():
+    DocumentFile = apps.get_model(
+        app_label='documents', model_name='DocumentFile'
+    )
+
+    logger.info(msg='Executing')
+    DocumentFile.objects.deduplicate_storage()
+    logger.info(msg='Finished')
+
+
 # Document
 
 @app.task(ignore_result=True)
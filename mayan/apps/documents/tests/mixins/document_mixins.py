@@ -65,6 +65,11 @@ class DocumentAPIViewTestMixin:
     def _request_test_document_list_api_view(self):
         return self.get(viewname='rest_api:document-list')
 
+    def _request_test_document_optimized_list_api_view(self, query=None):
+        return self.get(
+            viewname='rest_api:document-optimized-list', query=query
+        )
+
     def _request_test_document_upload_api_view(self):
         pk_list = list(Document.objects.values_list('pk', flat=True))
 
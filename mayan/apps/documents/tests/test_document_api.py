@@ -358,6 +358,60 @@ class DocumentAPIViewTestCase(
         events = self._get_test_events()
         self.assertEqual(events.count(), 0)
 
+    def test_document_optimized_list_api_view_cursor_with_access(self):
+        for index in range(3):
+            self._create_test_document_stub()
+            self.grant_access(
+                obj=self._test_document, permission=permission_document_view
+            )
+
+        self._clear_events()
+
+        document_id_list = []
+        query = {'cursor': '', 'ordering': 'label', 'page_size': 2}
+
+        while True:
+            response = self._request_test_document_optimized_list_api_view(
+                query=query
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+
+            document_id_list.extend(
+                result['id'] for result in response.data['results']
+            )
+
+            if not response.data['next_cursor']:
+                break
+
+            query['cursor'] = response.data['next_cursor']
+
+        self.assertEqual(
+            document_id_list, [
+                document.pk for document in self._test_documents
+            ]
+        )
+
+        events = self._get_test_events()
+        self.assertEqual(events.count(), 0)
+
+    def test_document_optimized_list_api_view_cursor_invalid(self):
+        self._create_test_document_stub()
+
+        self.grant_access(
+            obj=self._test_document, permission=permission_document_view
+        )
+
+        self._clear_events()
+
+        response = self._request_test_document_optimized_list_api_view(
+            query={'cursor': 'invalid'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        events = self._get_test_events()
+        self.assertEqual(events.count(), 0)
+
     def test_trashed_document_list_api_view_with_access(self):
         self._create_test_document_stub()
 
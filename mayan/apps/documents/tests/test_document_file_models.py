@@ -1,7 +1,12 @@
 from pathlib import Path
 
+from ..models.document_file_models import DocumentFile
+
 from .base import GenericDocumentTestCase
-from .literals import TEST_DOCUMENT_SMALL_CHECKSUM
+from .literals import (
+    TEST_DOCUMENT_SMALL_CHECKSUM, TEST_DOCUMENT_SMALL_SIZE,
+    TEST_FILE_MULTI_PAGE_TIFF_FILENAME
+)
 from .mixins.document_file_mixins import DocumentFileTestMixin
 
 
@@ -19,6 +24,21 @@ class DocumentFileTestCase(DocumentFileTestMixin, GenericDocumentTestCase):
             TEST_DOCUMENT_SMALL_CHECKSUM
         )
 
+    def test_file_create_size(self):
+        self._upload_test_document_file()
+
+        self.assertEqual(
+            self._test_document.file_latest.size, TEST_DOCUMENT_SMALL_SIZE
+        )
+
+    def test_file_create_latest_file(self):
+        self._upload_test_document_file()
+
+        self._test_document.refresh_from_db()
+        self.assertEqual(
+            self._test_document.latest_file, self._test_document_files[1]
+        )
+
     def test_document_file_delete(self):
         document_file_count = self._test_document.files.count()
 
@@ -28,6 +48,33 @@ class DocumentFileTestCase(DocumentFileTestMixin, GenericDocumentTestCase):
             self._test_document.files.count(), document_file_count - 1
         )
 
+    def test_document_file_delete_latest_file(self):
+        self._upload_test_document_file()
+
+        self._test_document_files[1].delete()
+
+        self._test_document.refresh_from_db()
+        self.assertEqual(
+            self._test_document.latest_file, self._test_document_files[0]
+        )
+
+    def test_document_file_delete_latest_file_version_pages(self):
+        self._upload_test_document_file()
+
+        self._test_document_files[1].delete()
+
+        self._test_document.refresh_from_db()
+        version_active = self._test_document.version_active
+        self.assertEqual(
+            version_active.pages.count(),
+            self._test_document_files[0].pages.count()
+        )
+        for version_page in version_active.pages.all():
+            self.assertEqual(
+                version_page.content_object.document_file,
+                self._test_document_files[0]
+            )
+
     def test_document_file_filename_extraction(self):
         """
         Ensure only the filename is stored and not the entire path of the
@@ -49,3 +96,100 @@ class DocumentFileTestCase(DocumentFileTestMixin, GenericDocumentTestCase):
 
     def test_method_get_absolute_url(self):
         self.assertTrue(self._test_document.file_latest.get_absolute_url())
+
+
+class DocumentFileMultiPageTestCase(GenericDocumentTestCase):
+    _test_document_filename = TEST_FILE_MULTI_PAGE_TIFF_FILENAME
+
+    def test_file_create_pages(self):
+        self.assertEqual(
+            list(
+                self._test_document_file.file_pages.order_by(
+                    'page_number'
+                ).values_list('page_number', flat=True)
+            ), [1, 2]
+        )
+
+    def test_method_page_count_update(self):
+        self.assertEqual(self._test_document_file.page_count_update(), 2)
+        self.assertEqual(self._test_document_file.file_pages.count(), 2)
+
+
+class DocumentFileStorageDeduplicationTestCase(
+    DocumentFileTestMixin, GenericDocumentTestCase
+):
+    _test_document_filename = TEST_FILE_MULTI_PAGE_TIFF_FILENAME
+
+    def test_file_create_duplicate(self):
+        self._upload_test_document_file()
+
+        self.assertEqual(
+            self._test_document_files[0].file.name,
+            self._test_document_files[1].file.name
+        )
+        self.assertEqual(
+            self._test_document_files[1].mimetype,
+            self._test_document_files[0].mimetype
+        )
+        self.assertEqual(self._test_document_files[1].file_pages.count(), 2)
+
+    def test_file_delete_duplicate(self):
+        self._upload_test_document_file()
+
+        self._test_document_files[0].delete()
+
+        self.assertTrue(self._test_document_files[1].exists())
+
+    def test_file_delete_duplicate_last(self):
+        self._upload_test_document_file()
+
+        self._test_document_files[0].delete()
+        self._test_document_files[1].delete()
+
+        self.assertFalse(self._test_document_files[1].exists())
+
+    def test_method_deduplicate_storage(self):
+        with self.override_setting(
+            global_name='DOCUMENTS_FILE_STORAGE_DEDUPLICATION', value=False
+        ):
+            self._upload_test_document_file()
+
+        name = self._test_document_files[1].file.name
+
+        self.assertNotEqual(self._test_document_files[0].file.name, name)
+
+        self.assertEqual(DocumentFile.objects.deduplicate_storage(), 1)
+
+        self._test_document_files[1].refresh_from_db()
+
+        self.assertEqual(
+            self._test_document_files[0].file.name,
+            self._test_document_files[1].file.name
+        )
+        self.assertTrue(self._test_document_files[1].exists())
+        self.assertFalse(
+            self._test_document_files[1].file.storage.exists(name=name)
+        )
+
+
+class DocumentFilePageImageCacheTestCase(GenericDocumentTestCase):
+    _test_document_filename = TEST_FILE_MULTI_PAGE_TIFF_FILENAME
+
+    def test_method_page_image_cache_warm_up(self):
+        for page in self._test_document_file.file_pages.all():
+            page.cache_partition.purge()
+
+        self.assertEqual(
+            self._test_document_file.page_image_cache_warm_up(), 2
+        )
+
+        for page in self._test_document_file.file_pages.all():
+            self.assertTrue(
+                page.cache_partition.files.filter(
+                    filename='base_image'
+                ).exists()
+            )
+
+        self.assertEqual(
+            self._test_document_file.page_image_cache_warm_up(), 0
+        )
@@ -1,3 +1,5 @@
+from django.db.models import Sum
+
 from rest_framework import status
 
 from mayan.apps.rest_api.tests.base import BaseAPITestCase
@@ -72,6 +74,55 @@ class DocumentFilePageAPIViewTestCase(
         events = self._get_test_events()
         self.assertEqual(events.count(), 0)
 
+    def test_document_file_page_image_api_view_etag_with_access(self):
+        self.grant_access(
+            obj=self._test_document, permission=permission_document_file_view
+        )
+
+        response = self._request_test_document_file_page_image_api_view()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+
+        self._clear_events()
+
+        response = self._request_test_document_file_page_image_api_view(
+            headers={'HTTP_IF_NONE_MATCH': etag}
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+        events = self._get_test_events()
+        self.assertEqual(events.count(), 0)
+
+    def test_document_file_page_image_api_view_etag_cache_access(self):
+        self.grant_access(
+            obj=self._test_document, permission=permission_document_file_view
+        )
+
+        response = self._request_test_document_file_page_image_api_view()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+
+        cache_file_hits = self._test_document_file_page.cache_partition.files.aggregate(
+            hits=Sum('hits')
+        )['hits']
+
+        self._clear_events()
+
+        response = self._request_test_document_file_page_image_api_view(
+            headers={'HTTP_IF_NONE_MATCH': etag}
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.assertEqual(
+            self._test_document_file_page.cache_partition.files.aggregate(
+                hits=Sum('hits')
+            )['hits'], cache_file_hits + 1
+        )
+
+        events = self._get_test_events()
+        self.assertEqual(events.count(), 0)
+
     def test_trashed_document_file_page_image_api_view_with_access(self):
         self.grant_access(
             obj=self._test_document, permission=permission_document_file_view
@@ -88,6 +88,31 @@ class DocumentVersionTestCase(
             test_document_version_expected_page_content_objects
         )
 
+    def test_version_new_file_active_version(self):
+        self._upload_test_document_file(
+            action=DocumentFileActionUseNewPages.backend_id
+        )
+
+        self._test_document.refresh_from_db()
+        self.assertEqual(
+            self._test_document.active_version,
+            self._test_document.versions.last()
+        )
+
+    def test_method_active_set_active_version(self):
+        test_document_version = self._test_document_version
+
+        self._upload_test_document_file(
+            action=DocumentFileActionUseNewPages.backend_id
+        )
+
+        test_document_version.active_set()
+
+        self._test_document.refresh_from_db()
+        self.assertEqual(
+            self._test_document.active_version, test_document_version
+        )
+
     def test_method_get_absolute_url(self):
         self.assertTrue(self._test_document.version_active.get_absolute_url())
 
@@ -6,6 +6,7 @@ Dynamic Search and Document Indexing systems.
 """
 from unittest.mock import patch, MagicMock
 
+from mayan.apps.lock_manager.exceptions import LockError
 from mayan.apps.testing.tests.base import BaseTestCase
 
 from ..indexing_coordinator import DocumentIndexCoordinator
@@ -152,9 +153,124 @@ class DocumentIndexCoordinatorTestCase(GenericDocumentTestCase):
                 chunk_size=1000
             )
             
-            # Should process in chunks without recursion
-            self.assertEqual(result['total'], 2500)
-            self.assertEqual(result['success_count'], 2500)
+            # Duplicate IDs are indexed and counted once.
+            self.assertEqual(result['total'], 1)
+            self.assertEqual(result['success_count'], 1)
+            self.assertEqual(mock_chain.apply_async.call_count, 1)
+
+    def test_index_document_batch_multiple_chunks(self):
+        """Test that each chunk of a batch is scheduled as its own chain."""
+        self._upload_test_document()
+        self._upload_test_document()
+
+        mock_chain_result = MagicMock()
+        mock_chain_result.id = 'test-chain-id'
+
+        with patch('celery.chain') as mock_chain_class:
+            mock_chain_class.return_value.apply_async.return_value = mock_chain_result
+
+            result = DocumentIndexCoordinator.index_document_batch(
+                document_ids=[
+                    document.pk for document in self._test_documents
+                ], chunk_size=2
+            )
+
+            self.assertEqual(mock_chain_class.call_count, 2)
+            self.assertEqual(result['total'], 3)
+            self.assertEqual(result['success_count'], 3)
+            self.assertEqual(len(result['chain_task_ids']), 2)
+
+    def test_index_document_batch_chunk_locked(self):
+        """Test that a chunk whose lock is held is skipped."""
+        with patch.object(
+            DocumentIndexCoordinator, '_acquire_chunk_lock',
+            side_effect=LockError
+        ), patch('celery.chain') as mock_chain_class:
+            result = DocumentIndexCoordinator.index_document_batch(
+                document_ids=[self._test_document.pk]
+            )
+
+            mock_chain_class.assert_not_called()
+            self.assertEqual(result['total'], 1)
+            self.assertEqual(result['skipped_count'], 1)
+            self.assertIn('locked', result['error_types'])
+    
+    def test_index_document_batch_skips_invalid_documents(self):
+        """Test that batch validation skips trashed and missing documents."""
+        self._upload_test_document()
+        document_2 = self._create_test_document()
+        document_2.delete()
+        
+        mock_chain_result = MagicMock()
+        mock_chain_result.id = 'test-chain-id'
+        
+        with patch('celery.chain') as mock_chain_class:
+            mock_chain_class.return_value.apply_async.return_value = mock_chain_result
+            
+            result = DocumentIndexCoordinator.index_document_batch(
+                document_ids=[self._test_document.pk, document_2.pk, 99999]
+            )
+            
+            self.assertEqual(result['total'], 3)
+            self.assertEqual(result['success_count'], 1)
+            self.assertEqual(result['skipped_count'], 2)
+            self.assertIn('trashed', result['error_types'])
+            self.assertIn('not_found', result['error_types'])
+    
+    def test_index_document_batch_one_chain_per_chunk(self):
+        """Test that each chunk is scheduled as one chain of batch tasks."""
+        self._upload_test_document()
+        document_2 = self._create_test_document()
+        
+        mock_chain_result = MagicMock()
+        mock_chain_result.id = 'test-chain-id'
+        
+        with patch('celery.chain') as mock_chain_class:
+            mock_chain_class.return_value.apply_async.return_value = mock_chain_result
+            
+            result = DocumentIndexCoordinator.index_document_batch(
+                document_ids=[self._test_document.pk, document_2.pk],
+                chunk_size=1
+            )
+            
+            self.assertEqual(result['success_count'], 2)
+            self.assertEqual(mock_chain_class.call_count, 2)
+            
+            signatures = mock_chain_class.call_args[0]
+            search_model_count = len(
+                DocumentIndexCoordinator._get_search_models()
+            )
+            # One search task per search model plus one hierarchy task.
+            self.assertEqual(len(signatures), search_model_count + 1)
+            self.assertEqual(
+                signatures[-1].task,
+                'mayan.apps.document_indexing.tasks.task_index_instance_document_add_many'
+            )
+            self.assertEqual(
+                signatures[-1].kwargs['document_id_list'], [document_2.pk]
+            )
+    
+    def test_index_document_chunk_lock_name(self):
+        """Test that chunks sharing bounds and length use different locks."""
+        lock_names = []
+
+        with patch(
+            'mayan.apps.lock_manager.backends.base.LockingBackend.get_backend'
+        ) as mock_get_backend:
+            mock_get_backend.return_value.acquire_lock.side_effect = lambda name, timeout: lock_names.append(name)
+
+            DocumentIndexCoordinator._acquire_chunk_lock(
+                document_ids=[1, 2, 5]
+            )
+            DocumentIndexCoordinator._acquire_chunk_lock(
+                document_ids=[1, 4, 5]
+            )
+            DocumentIndexCoordinator._acquire_chunk_lock(
+                document_ids=[5, 1, 4]
+            )
+
+        self.assertNotEqual(lock_names[0], lock_names[1])
+        self.assertEqual(lock_names[1], lock_names[2])
     
     def test_index_document_permission_check(self):
         """Test that coordinator checks permissions when user is provided."""
@@ -0,0 +1,47 @@
+from io import StringIO
+
+from django.core import management
+
+from ..models.document_models import Document
+
+from .base import GenericDocumentTestCase
+
+
+class DocumentPointersUpdateManagementCommandTestCase(
+    GenericDocumentTestCase
+):
+    def _call_command(self, **kwargs):
+        management.call_command(
+            command_name='documents_pointers_update', stdout=StringIO(),
+            **kwargs
+        )
+
+    def _clear_test_document_pointers(self):
+        Document.objects.filter(pk=self._test_document.pk).update(
+            active_version=None, latest_file=None
+        )
+
+    def test_pointers_update(self):
+        self._clear_test_document_pointers()
+
+        self._call_command()
+
+        self._test_document.refresh_from_db()
+        self.assertEqual(
+            self._test_document.active_version, self._test_document_version
+        )
+        self.assertEqual(
+            self._test_document.latest_file, self._test_document_file
+        )
+
+    def test_pointers_verify(self):
+        self._call_command(verify=True)
+
+    def test_pointers_verify_mismatch(self):
+        self._clear_test_document_pointers()
+
+        with self.assertRaises(expected_exception=management.CommandError):
+            self._call_command(verify=True)
+
+        self._test_document.refresh_from_db()
+        self.assertEqual(self._test_document.latest_file, None)
@@ -122,7 +122,10 @@ class DocumentFileDownloadView(SingleObjectDownloadView):
                 channel='dam_interface',
                 metadata={
                     'document_file_id': instance.pk,
-                }
+                },
+                # Written immediately, the search session linking below
+                # needs its primary key.
+                immediate=True
             )
 
             # Track delivered bandwidth (best-effort) for internal downloads.
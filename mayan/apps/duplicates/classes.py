@@ -5,11 +5,65 @@ from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.common.class_mixins import AppsModuleLoaderMixin
 
+from .utils import get_hamming_distance
 
-__all__ = ('DuplicateBackend',)
+__all__ = ('BKTree', 'DuplicateBackend')
 logger = logging.getLogger(name=__name__)
 
 
+class BKTree:
+    """
+    Burkhard-Keller tree of integer hashes under the Hamming distance.
+    Each node is a list of the hash value, the items sharing that value
+    and a dictionary of children keyed by their distance to the node.
+    """
+    def __init__(self):
+        self.root = None
+
+    def add(self, item, value):
+        if self.root is None:
+            self.root = [value, [item], {}]
+            return
+
+        node = self.root
+        while True:
+            distance = get_hamming_distance(value_1=value, value_2=node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+
+            try:
+                node = node[2][distance]
+            except KeyError:
+                node[2][distance] = [value, [item], {}]
+                return
+
+    def search(self, distance, value):
+        """
+        Return the items whose value is within `distance` of `value`.
+        """
+        result = []
+
+        if self.root is None:
+            return result
+
+        node_list = [self.root]
+        while node_list:
+            node = node_list.pop()
+            node_distance = get_hamming_distance(value_1=value, value_2=node[0])
+
+            if node_distance <= distance:
+                result.extend(node[1])
+
+            # Triangle inequality, only the children in this range can
+            # contain matches.
+            for child_distance, child in node[2].items():
+                if node_distance - distance <= child_distance <= node_distance + distance:
+                    node_list.append(child)
+
+        return result
+
+
 class DuplicateBackendMetaclass(type):
     _registry = {}
 
@@ -54,6 +108,22 @@ class DuplicateBackend(
             if klass is cls:
                 return path
 
+    @staticmethod
+    def get_duplicate_dictionary(group_list):
+        """
+        Convert groups of document IDs that are duplicates of each other
+        into the dictionary format returned by `process_all`.
+        """
+        result = {}
+
+        for group in group_list:
+            if len(group) > 1:
+                group = set(group)
+                for document_id in group:
+                    result[document_id] = group - {document_id}
+
+        return result
+
     @classmethod
     def verify(cls, document):
         """
@@ -79,6 +149,27 @@ class DuplicateBackend(
 
         return self._process(document=document)
 
+    def process_all(self, queryset):
+        """
+        Find the duplicates of all the documents of the queryset. Returns a
+        dictionary of document IDs to sets of duplicated document IDs.
+        Backends should override this with a single pass implementation,
+        the default calls `process` for each document.
+        """
+        result = {}
+
+        for document in queryset.iterator():
+            if self.verify(document=document):
+                duplicate_id_set = set(
+                    self.process(document=document).values_list(
+                        'pk', flat=True
+                    )
+                )
+                if duplicate_id_set:
+                    result[document.pk] = duplicate_id_set
+
+        return result
+
     def _process(self, document):
         raise NotImplementedError(
             'Your %s class has not defined the required '
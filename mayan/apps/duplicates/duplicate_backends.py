@@ -1,8 +1,15 @@
+import logging
+
 from django.apps import apps
-from django.db.models import F, Max
 from django.utils.translation import ugettext_lazy as _
 
-from .classes import DuplicateBackend
+from .classes import BKTree, DuplicateBackend
+from .literals import (
+    DEFAULT_PERCEPTUAL_HASH_DISTANCE, PERCEPTUAL_HASH_SEGMENT_COUNT
+)
+from .utils import hash_to_unsigned
+
+logger = logging.getLogger(name=__name__)
 
 
 class DuplicateBackendFileChecksum(DuplicateBackend):
@@ -20,13 +27,21 @@ class DuplicateBackendFileChecksum(DuplicateBackend):
         # Get the documents whose latest file matches the checksum
         # of the current document and exclude the current document
 
-        return Document.objects.annotate(
-            max_timestamp=Max('files__timestamp')
-        ).filter(
-            files__timestamp=F('max_timestamp'),
-            files__checksum=document.file_latest.checksum
+        return Document.objects.filter(
+            latest_file__checksum=document.file_latest.checksum
         ).exclude(pk=document.pk)
 
+    def process_all(self, queryset):
+        groups = {}
+
+        queryset = queryset.values_list('pk', 'latest_file__checksum')
+
+        for document_id, checksum in queryset.iterator():
+            if checksum:
+                groups.setdefault(checksum, []).append(document_id)
+
+        return self.get_duplicate_dictionary(group_list=groups.values())
+
 
 class DuplicateBackendLabel(DuplicateBackend):
     label = _('Exact document label')
@@ -38,3 +53,98 @@ class DuplicateBackendLabel(DuplicateBackend):
         return Document.objects.filter(
             label=document.label
         ).exclude(pk=document.pk)
+
+    def process_all(self, queryset):
+        groups = {}
+
+        for document_id, label in queryset.values_list('pk', 'label').iterator():
+            groups.setdefault(label, []).append(document_id)
+
+        return self.get_duplicate_dictionary(group_list=groups.values())
+
+
+class DuplicateBackendPerceptualHash(DuplicateBackend):
+    """
+    Near duplicate detection using the difference hash of the cached image
+    of the first page of the latest document file. The `distance` backend
+    argument is the maximum number of different hash bits. It is capped
+    below the number of hash segments so that the indexed segment lookup
+    finds every match.
+    """
+    label = _('Similar first page image')
+
+    @classmethod
+    def verify(cls, document):
+        return document.file_latest
+
+    def get_distance(self):
+        return min(
+            int(self.kwargs.get('distance', DEFAULT_PERCEPTUAL_HASH_DISTANCE)),
+            PERCEPTUAL_HASH_SEGMENT_COUNT - 1
+        )
+
+    def process(self, document):
+        Document = apps.get_model(
+            app_label='documents', model_name='Document'
+        )
+        DocumentFilePerceptualHash = apps.get_model(
+            app_label='duplicates', model_name='DocumentFilePerceptualHash'
+        )
+
+        value = DocumentFilePerceptualHash.objects.get_value(
+            document_file=document.file_latest
+        )
+
+        if value is None:
+            return Document.objects.none()
+
+        document_file_id_list = DocumentFilePerceptualHash.objects.get_near(
+            distance=self.get_distance(), value=value
+        )
+
+        # Only the hash of the latest file of each document counts.
+        return Document.objects.filter(
+            latest_file_id__in=document_file_id_list
+        ).exclude(pk=document.pk)
+
+    def process_all(self, queryset):
+        DocumentFile = apps.get_model(
+            app_label='documents', model_name='DocumentFile'
+        )
+        DocumentFilePerceptualHash = apps.get_model(
+            app_label='duplicates', model_name='DocumentFilePerceptualHash'
+        )
+
+        distance = self.get_distance()
+        bk_tree = BKTree()
+        result = {}
+
+        queryset = queryset.values_list(
+            'pk', 'latest_file_id', 'latest_file__perceptual_hash__value'
+        )
+
+        # Each document is compared only to the documents before it, the
+        # matches are recorded in both directions.
+        for document_id, document_file_id, value in queryset.iterator():
+            if not document_file_id:
+                continue
+
+            if value is None:
+                value = DocumentFilePerceptualHash.objects.get_value(
+                    document_file=DocumentFile.objects.get(
+                        pk=document_file_id
+                    )
+                )
+
+                if value is None:
+                    continue
+            else:
+                value = hash_to_unsigned(value=value)
+
+            for duplicate_id in bk_tree.search(distance=distance, value=value):
+                result.setdefault(document_id, set()).add(duplicate_id)
+                result.setdefault(duplicate_id, set()).add(document_id)
+
+            bk_tree.add(item=document_id, value=value)
+
+        return result
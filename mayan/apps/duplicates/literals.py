@@ -0,0 +1,4 @@
+DEFAULT_PERCEPTUAL_HASH_DISTANCE = 3
+
+PERCEPTUAL_HASH_SEGMENT_BITS = 16
+PERCEPTUAL_HASH_SEGMENT_COUNT = 4
@@ -1,7 +1,7 @@
 import logging
 
 from django.apps import apps
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Q, Value
 
 from mayan.apps.acls.models import AccessControlList
@@ -9,11 +9,92 @@ from mayan.apps.lock_manager.backends.base import LockingBackend
 from mayan.apps.lock_manager.exceptions import LockError
 
 from .classes import DuplicateBackend
+from .utils import (
+    get_difference_hash, get_hamming_distance, get_hash_segments,
+    hash_to_signed, hash_to_unsigned
+)
 
 logger = logging.getLogger(name=__name__)
 
 
+class DocumentFilePerceptualHashManager(models.Manager):
+    def calculate(self, document_file):
+        """
+        Calculate and store the hash of the first page image of a document
+        file. The page image cache is used when available. Returns the
+        unsigned hash or None if the file has no usable page image.
+        """
+        document_file_page = document_file.pages.first()
+
+        if not document_file_page:
+            return None
+
+        try:
+            value = get_difference_hash(
+                file_object=document_file_page.get_image()
+            )
+        except Exception as exception:
+            logger.warning(
+                'Unable to calculate the perceptual hash of document '
+                'file: %s; %s', document_file, exception
+            )
+            return None
+
+        defaults = {'value': hash_to_signed(value=value)}
+        for index, segment in enumerate(get_hash_segments(value=value)):
+            defaults['segment_{}'.format(index)] = segment
+
+        self.update_or_create(defaults=defaults, document_file=document_file)
+
+        return value
+
+    def get_near(self, distance, value):
+        """
+        Return the IDs of the document files whose hash is within `distance`
+        bits of `value`. Candidates are found using the indexed hash
+        segments and then checked with the full hash.
+        """
+        query = Q()
+        for index, segment in enumerate(get_hash_segments(value=value)):
+            query |= Q(**{'segment_{}'.format(index): segment})
+
+        result = []
+        for document_file_id, candidate in self.filter(query).values_list('document_file_id', 'value'):
+            if get_hamming_distance(value_1=value, value_2=hash_to_unsigned(value=candidate)) <= distance:
+                result.append(document_file_id)
+
+        return result
+
+    def get_value(self, document_file):
+        try:
+            return hash_to_unsigned(
+                value=self.get(document_file=document_file).value
+            )
+        except self.model.DoesNotExist:
+            return self.calculate(document_file=document_file)
+
+
 class StoredDuplicateBackendManager(models.Manager):
+    def scan_all(self):
+        """
+        Scan all the valid documents for duplicates in a single pass per
+        backend and replace the stored results.
+        """
+        Document = apps.get_model(
+            app_label='documents', model_name='Document'
+        )
+
+        for backend_path, backend_class in DuplicateBackend.get_all():
+            stored_backend, created = self.get_or_create(
+                backend_path=backend_path
+            )
+            duplicate_dictionary = stored_backend.get_backend_instance().process_all(
+                queryset=Document.valid.order_by('pk')
+            )
+            stored_backend.duplicate_entries.replace(
+                duplicate_dictionary=duplicate_dictionary
+            )
+
     def scan_document(self, document):
         """
         Find duplicates of document based on each registered backend's logic.
@@ -122,6 +203,48 @@ class DuplicateBackendEntryManager(models.Manager):
     def clean_empty_duplicate_lists(self):
         self.filter(documents=None).delete()
 
+    def replace(self, duplicate_dictionary, batch_size=1000):
+        """
+        Replace the entries of the related stored backend with the
+        dictionary of document IDs to duplicated document IDs returned by
+        the backend `process_all` method.
+        """
+        DocumentThrough = self.model.documents.through
+
+        with transaction.atomic():
+            self.all().delete()
+
+            self.bulk_create(
+                batch_size=batch_size, objs=[
+                    self.model(
+                        document_id=document_id,
+                        stored_backend=self.instance
+                    ) for document_id in duplicate_dictionary
+                ]
+            )
+
+            entry_id_dictionary = dict(
+                self.values_list('document_id', 'pk')
+            )
+
+            through_list = []
+            for document_id, duplicate_id_set in duplicate_dictionary.items():
+                for duplicate_id in duplicate_id_set:
+                    through_list.append(
+                        DocumentThrough(
+                            document_id=duplicate_id,
+                            duplicatebackendentry_id=entry_id_dictionary[document_id]
+                        )
+                    )
+
+                if len(through_list) >= batch_size:
+                    DocumentThrough.objects.bulk_create(objs=through_list)
+                    through_list = []
+
+            DocumentThrough.objects.bulk_create(
+                batch_size=batch_size, objs=through_list
+            )
+
     def get_duplicated_documents(self, permission=None, user=None):
         DuplicateSourceDocument = apps.get_model(
             app_label='duplicates', model_name='DuplicateSourceDocument'
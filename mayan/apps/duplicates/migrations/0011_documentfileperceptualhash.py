@@ -0,0 +1,64 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('documents', '0084_document_fulltext_search'),
+        ('duplicates', '0010_auto_20210419_0709')
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentFilePerceptualHash',
+            fields=[
+                (
+                    'id', models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False,
+                        verbose_name='ID'
+                    )
+                ),
+                (
+                    'value', models.BigIntegerField(
+                        editable=False, verbose_name='Value'
+                    )
+                ),
+                (
+                    'segment_0', models.IntegerField(
+                        db_index=True, editable=False,
+                        verbose_name='Segment 0'
+                    )
+                ),
+                (
+                    'segment_1', models.IntegerField(
+                        db_index=True, editable=False,
+                        verbose_name='Segment 1'
+                    )
+                ),
+                (
+                    'segment_2', models.IntegerField(
+                        db_index=True, editable=False,
+                        verbose_name='Segment 2'
+                    )
+                ),
+                (
+                    'segment_3', models.IntegerField(
+                        db_index=True, editable=False,
+                        verbose_name='Segment 3'
+                    )
+                ),
+                (
+                    'document_file', models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='perceptual_hash',
+                        to='documents.documentfile',
+                        verbose_name='Document file'
+                    )
+                ),
+            ],
+            options={
+                'verbose_name': 'Document file perceptual hash',
+                'verbose_name_plural': 'Document file perceptual hashes',
+            },
+        ),
+    ]
@@ -4,11 +4,13 @@ from django.db import models
 from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.databases.model_mixins import BackendModelMixin
+from mayan.apps.documents.models.document_file_models import DocumentFile
 from mayan.apps.documents.models.document_models import Document
 
 from .classes import NullBackend
 from .managers import (
-    DuplicateBackendEntryManager, StoredDuplicateBackendManager
+    DocumentFilePerceptualHashManager, DuplicateBackendEntryManager,
+    StoredDuplicateBackendManager
 )
 
 logger = logging.getLogger(name=__name__)
@@ -50,6 +52,40 @@ class DuplicateBackendEntry(models.Model):
         verbose_name_plural = _('Duplicated backend entries')
 
 
+class DocumentFilePerceptualHash(models.Model):
+    """
+    Difference hash of the first page image of a document file. The 64 bit
+    hash is stored as a signed value and split into four indexed 16 bit
+    segments to find near matches without a full table scan.
+    """
+    document_file = models.OneToOneField(
+        on_delete=models.CASCADE, related_name='perceptual_hash',
+        to=DocumentFile, verbose_name=_('Document file')
+    )
+    value = models.BigIntegerField(editable=False, verbose_name=_('Value'))
+    segment_0 = models.IntegerField(
+        db_index=True, editable=False, verbose_name=_('Segment 0')
+    )
+    segment_1 = models.IntegerField(
+        db_index=True, editable=False, verbose_name=_('Segment 1')
+    )
+    segment_2 = models.IntegerField(
+        db_index=True, editable=False, verbose_name=_('Segment 2')
+    )
+    segment_3 = models.IntegerField(
+        db_index=True, editable=False, verbose_name=_('Segment 3')
+    )
+
+    objects = DocumentFilePerceptualHashManager()
+
+    class Meta:
+        verbose_name = _('Document file perceptual hash')
+        verbose_name_plural = _('Document file perceptual hashes')
+
+    def __str__(self):
+        return str(self.document_file)
+
+
 class DuplicateSourceDocument(Document):
     class Meta:
         proxy = True
@@ -0,0 +1,3 @@
+TEST_PERCEPTUAL_HASH_VALUE = 0x0123456789abcdef
+TEST_PERCEPTUAL_HASH_VALUE_DIFFERENT = 0xfedcba9876543210
+TEST_PERCEPTUAL_HASH_VALUE_NEAR = 0x0123456789abcdee
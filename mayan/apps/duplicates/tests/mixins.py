@@ -1,4 +1,13 @@
+from mayan.apps.documents.tests.literals import TEST_FILE_PDF_PATH
+
+from ..models import DocumentFilePerceptualHash
 from ..tasks import task_duplicates_scan_all, task_duplicates_scan_for
+from ..utils import get_hash_segments, hash_to_signed
+
+from .literals import (
+    TEST_PERCEPTUAL_HASH_VALUE, TEST_PERCEPTUAL_HASH_VALUE_DIFFERENT,
+    TEST_PERCEPTUAL_HASH_VALUE_NEAR
+)
 
 
 class DuplicatedDocumentAPIViewTestMixin:
@@ -13,6 +22,38 @@ class DuplicatedDocumentAPIViewTestMixin:
         )
 
 
+class DuplicateBackendTestMixin:
+    def _set_test_document_perceptual_hash(self, document, value):
+        defaults = {'value': hash_to_signed(value=value)}
+        for index, segment in enumerate(get_hash_segments(value=value)):
+            defaults['segment_{}'.format(index)] = segment
+
+        DocumentFilePerceptualHash.objects.update_or_create(
+            defaults=defaults, document_file=document.file_latest
+        )
+
+    def _upload_test_documents_near_duplicate(self):
+        """
+        Upload two copies of the same file with near perceptual hashes and
+        a different file with a distant perceptual hash.
+        """
+        self._upload_test_document()
+        self._upload_test_document()
+
+        self._test_document_path = TEST_FILE_PDF_PATH
+        self._upload_test_document()
+
+        for document, value in zip(
+            self._test_documents, (
+                TEST_PERCEPTUAL_HASH_VALUE, TEST_PERCEPTUAL_HASH_VALUE_NEAR,
+                TEST_PERCEPTUAL_HASH_VALUE_DIFFERENT
+            )
+        ):
+            self._set_test_document_perceptual_hash(
+                document=document, value=value
+            )
+
+
 class DuplicatedDocumentTaskTestMixin:
     def _execute_task_duplicates_scan_all(self):
         task_duplicates_scan_all.apply_async().get()
@@ -0,0 +1,59 @@
+from mayan.apps.testing.tests.base import BaseTestCase
+
+from ..classes import BKTree
+from ..utils import (
+    get_hamming_distance, get_hash_segments, hash_to_signed,
+    hash_to_unsigned
+)
+
+
+class BKTreeTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self._test_bk_tree = BKTree()
+        self._test_bk_tree.add(item=1, value=0b0000)
+        self._test_bk_tree.add(item=2, value=0b0001)
+        self._test_bk_tree.add(item=3, value=0b0111)
+        self._test_bk_tree.add(item=4, value=0b1111)
+        self._test_bk_tree.add(item=5, value=0b0000)
+
+    def test_search_exact(self):
+        self.assertEqual(
+            sorted(self._test_bk_tree.search(distance=0, value=0b0000)),
+            [1, 5]
+        )
+
+    def test_search_near(self):
+        self.assertEqual(
+            sorted(self._test_bk_tree.search(distance=1, value=0b0000)),
+            [1, 2, 5]
+        )
+        self.assertEqual(
+            sorted(self._test_bk_tree.search(distance=1, value=0b1111)),
+            [3, 4]
+        )
+
+    def test_search_empty(self):
+        self.assertEqual(
+            BKTree().search(distance=3, value=0b0000), []
+        )
+
+
+class PerceptualHashUtilsTestCase(BaseTestCase):
+    def test_hamming_distance(self):
+        self.assertEqual(
+            get_hamming_distance(value_1=0b1010, value_2=0b0110), 2
+        )
+
+    def test_hash_segments(self):
+        self.assertEqual(
+            get_hash_segments(value=0x0001000200030004), [1, 2, 3, 4]
+        )
+
+    def test_hash_signed_round_trip(self):
+        value = 0xffffffffffffffff
+
+        self.assertEqual(hash_to_signed(value=value), -1)
+        self.assertEqual(
+            hash_to_unsigned(value=hash_to_signed(value=value)), value
+        )
@@ -0,0 +1,67 @@
+from mayan.apps.documents.models.document_models import Document
+from mayan.apps.documents.tests.base import GenericDocumentTestCase
+
+from ..duplicate_backends import (
+    DuplicateBackendFileChecksum, DuplicateBackendPerceptualHash
+)
+
+from .mixins import DuplicateBackendTestMixin
+
+
+class DuplicateBackendTestCase(
+    DuplicateBackendTestMixin, GenericDocumentTestCase
+):
+    auto_upload_test_document = False
+
+    def setUp(self):
+        super().setUp()
+        self._upload_test_documents_near_duplicate()
+
+    def _do_test_process_all_matches_process(self, backend):
+        result = backend.process_all(
+            queryset=Document.valid.order_by('pk')
+        )
+
+        for document in self._test_documents:
+            self.assertEqual(
+                set(
+                    backend.process(
+                        document=document
+                    ).values_list('pk', flat=True)
+                ), result.get(document.pk, set())
+            )
+
+        return result
+
+    def test_file_checksum_process_all(self):
+        result = self._do_test_process_all_matches_process(
+            backend=DuplicateBackendFileChecksum(model_instance_id=None)
+        )
+
+        self.assertEqual(
+            result, {
+                self._test_documents[0].pk: {self._test_documents[1].pk},
+                self._test_documents[1].pk: {self._test_documents[0].pk}
+            }
+        )
+
+    def test_perceptual_hash_process_all(self):
+        result = self._do_test_process_all_matches_process(
+            backend=DuplicateBackendPerceptualHash(model_instance_id=None)
+        )
+
+        self.assertEqual(
+            result, {
+                self._test_documents[0].pk: {self._test_documents[1].pk},
+                self._test_documents[1].pk: {self._test_documents[0].pk}
+            }
+        )
+
+    def test_perceptual_hash_process_all_exact_distance(self):
+        backend = DuplicateBackendPerceptualHash(
+            distance=0, model_instance_id=None
+        )
+
+        self.assertEqual(
+            backend.process_all(queryset=Document.valid.order_by('pk')), {}
+        )
@@ -1,8 +1,9 @@
 from mayan.apps.documents.tests.base import GenericDocumentTestCase
 
+from ..duplicate_backends import DuplicateBackendPerceptualHash
 from ..models import DuplicateBackendEntry, StoredDuplicateBackend
 
-from .mixins import DuplicatedDocumentTestMixin
+from .mixins import DuplicateBackendTestMixin, DuplicatedDocumentTestMixin
 
 
 class DuplicatedDocumentModelTestCase(
@@ -50,3 +51,64 @@ class DuplicatedDocumentModelTestCase(
         StoredDuplicateBackend.objects.scan_document(
             document=self._test_documents[0]
         )
+
+
+class StoredDuplicateBackendScanAllTestCase(
+    DuplicateBackendTestMixin, GenericDocumentTestCase
+):
+    auto_upload_test_document = False
+
+    def setUp(self):
+        super().setUp()
+        self._upload_test_documents_near_duplicate()
+
+        self._test_stored_backend, created = StoredDuplicateBackend.objects.get_or_create(
+            backend_path='{}.{}'.format(
+                DuplicateBackendPerceptualHash.__module__,
+                DuplicateBackendPerceptualHash.__name__
+            )
+        )
+
+    def _get_test_duplicates(self, document):
+        try:
+            entry = self._test_stored_backend.duplicate_entries.get(
+                document=document
+            )
+        except DuplicateBackendEntry.DoesNotExist:
+            return set()
+        else:
+            return set(entry.documents.all())
+
+    def test_scan_all(self):
+        StoredDuplicateBackend.objects.scan_all()
+
+        self.assertEqual(
+            self._get_test_duplicates(document=self._test_documents[0]),
+            {self._test_documents[1]}
+        )
+        self.assertEqual(
+            self._get_test_duplicates(document=self._test_documents[1]),
+            {self._test_documents[0]}
+        )
+        self.assertEqual(
+            self._get_test_duplicates(document=self._test_documents[2]),
+            set()
+        )
+
+    def test_scan_all_replaces_stale_entries(self):
+        self._test_stored_backend.duplicate_entries.replace(
+            duplicate_dictionary={
+                self._test_documents[2].pk: {self._test_documents[0].pk}
+            }
+        )
+
+        StoredDuplicateBackend.objects.scan_all()
+
+        self.assertEqual(
+            self._get_test_duplicates(document=self._test_documents[2]),
+            set()
+        )
+        self.assertEqual(
+            self._get_test_duplicates(document=self._test_documents[0]),
+            {self._test_documents[1]}
+        )
@@ -0,0 +1,62 @@
+from PIL import Image
+
+from .literals import PERCEPTUAL_HASH_SEGMENT_BITS, PERCEPTUAL_HASH_SEGMENT_COUNT
+
+
+def get_difference_hash(file_object):
+    """
+    Calculate the 64 bit difference hash (dHash) of an image. The image is
+    reduced to a 9x8 grayscale thumbnail and each bit records if a pixel
+    is brighter than its right neighbour.
+    """
+    with Image.open(fp=file_object) as image:
+        pixels = list(
+            image.convert(mode='L').resize(
+                resample=Image.LANCZOS, size=(9, 8)
+            ).getdata()
+        )
+
+    value = 0
+    for row in range(8):
+        for column in range(8):
+            offset = row * 9 + column
+            value = (value << 1) | (pixels[offset] > pixels[offset + 1])
+
+    return value
+
+
+def get_hamming_distance(value_1, value_2):
+    return bin(value_1 ^ value_2).count('1')
+
+
+def get_hash_segments(value):
+    """
+    Split a hash in equal bit segments, most significant first. Two hashes
+    within a Hamming distance smaller than the number of segments share at
+    least one identical segment.
+    """
+    mask = (1 << PERCEPTUAL_HASH_SEGMENT_BITS) - 1
+
+    return [
+        (
+            value >> (PERCEPTUAL_HASH_SEGMENT_BITS * index)
+        ) & mask for index in reversed(range(PERCEPTUAL_HASH_SEGMENT_COUNT))
+    ]
+
+
+def hash_to_signed(value):
+    """
+    Map an unsigned 64 bit hash to the range of a signed 64 bit database
+    integer.
+    """
+    if value >= 1 << 63:
+        return value - (1 << 64)
+    else:
+        return value
+
+
+def hash_to_unsigned(value):
+    if value < 0:
+        return value + (1 << 64)
+    else:
+        return value
@@ -208,10 +208,9 @@ class ElasticSearchBackend(SearchBackend):
 
             queryset = queryset.filter(pk__in=id_list)
 
-            for instance in queryset:
-                kwargs = search_model.populate(
-                    backend=self, instance=instance
-                )
+            for instance, kwargs in search_model.populate_many(
+                backend=self, instances=queryset
+            ):
                 kwargs['_id'] = kwargs['id']
 
                 yield kwargs
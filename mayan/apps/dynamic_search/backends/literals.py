@@ -10,6 +10,8 @@ DEFAULT_ELASTICSEARCH_CLIENT_SNIFF_ON_CONNECTION_FAIL = False
 DEFAULT_ELASTICSEARCH_CLIENT_SNIFFER_TIMEOUT = None
 DEFAULT_ELASTICSEARCH_HOST = 'http://127.0.0.1:9200'
 DEFAULT_ELASTICSEARCH_INDICES_NAMESPACE = 'mayan'
+DEFAULT_WHOOSH_GROUP_COMMIT = True
+DEFAULT_WHOOSH_GROUP_COMMIT_LIMIT = 500
 
 QUERY_OPERATION_AND = 1
 QUERY_OPERATION_OR = 2
@@ -22,6 +24,8 @@ TERM_SPACE_CHARACTER = ' '
 
 TEXT_LOCK_INSTANCE_DEINDEX = 'dynamic_search_deindex_instance'
 TEXT_LOCK_INSTANCE_INDEX = 'dynamic_search_index_instance'
+TEXT_QUEUE_ACTION_DEINDEX = 'deindex'
+TEXT_QUEUE_ACTION_INDEX = 'index'
 
 # Elastic search specific.
 DJANGO_TO_ELASTICSEARCH_FIELD_MAP = {
@@ -65,3 +69,5 @@ DJANGO_TO_WHOOSH_FIELD_MAP = {
 }
 
 WHOOSH_INDEX_DIRECTORY_NAME = 'whoosh'
+WHOOSH_MERGE_PENDING_FILENAME = '{}.merge'
+WHOOSH_QUEUE_DIRECTORY_NAME = 'queue'
@@ -1,5 +1,9 @@
+import json
 import logging
+import os
 from pathlib import Path
+import time
+import uuid
 
 import whoosh
 from whoosh import qparser
@@ -19,8 +23,11 @@ from ..exceptions import DynamicSearchRetry
 from ..settings import setting_results_limit
 
 from .literals import (
+    DEFAULT_WHOOSH_GROUP_COMMIT, DEFAULT_WHOOSH_GROUP_COMMIT_LIMIT,
     DJANGO_TO_WHOOSH_FIELD_MAP, TEXT_LOCK_INSTANCE_DEINDEX,
-    TEXT_LOCK_INSTANCE_INDEX, WHOOSH_INDEX_DIRECTORY_NAME,
+    TEXT_LOCK_INSTANCE_INDEX, TEXT_QUEUE_ACTION_DEINDEX,
+    TEXT_QUEUE_ACTION_INDEX, WHOOSH_INDEX_DIRECTORY_NAME,
+    WHOOSH_MERGE_PENDING_FILENAME, WHOOSH_QUEUE_DIRECTORY_NAME
 )
 logger = logging.getLogger(name=__name__)
 
@@ -29,6 +36,10 @@ class WhooshSearchBackend(SearchBackend):
     field_map = DJANGO_TO_WHOOSH_FIELD_MAP
 
     def __init__(self, **kwargs):
+        group_commit = kwargs.pop('group_commit', DEFAULT_WHOOSH_GROUP_COMMIT)
+        group_commit_limit = kwargs.pop(
+            'group_commit_limit', DEFAULT_WHOOSH_GROUP_COMMIT_LIMIT
+        )
         index_path = kwargs.pop('index_path', None)
         writer_limitmb = kwargs.pop('writer_limitmb', 128)
         writer_multisegment = kwargs.pop('writer_multisegment', False)
@@ -54,6 +65,10 @@ class WhooshSearchBackend(SearchBackend):
             'procs': writer_procs
         }
 
+        self.group_commit = any_to_bool(value=group_commit)
+        self.group_commit_limit = int(group_commit_limit)
+        self.queue_path = Path(self.index_path, WHOOSH_QUEUE_DIRECTORY_NAME)
+
     def _get_status(self):
         result = []
 
@@ -73,9 +88,122 @@ class WhooshSearchBackend(SearchBackend):
 
         return '\n'.join(result)
 
+    def _flush_queue(self):
+        """
+        Apply the pending queue entries in batches of up to
+        `group_commit_limit` operations, one commit per batch and search
+        model. Must be called with the index lock held. Entries are removed
+        only after their batch is committed; replaying an entry is
+        harmless as both operations are idempotent. Search models that
+        received unmerged segments are marked for the next merge.
+        """
+        while True:
+            entry_paths = self._get_queue_entry_paths()[:self.group_commit_limit]
+            if not entry_paths:
+                break
+
+            entries = {}
+            for entry_path in entry_paths:
+                try:
+                    with entry_path.open(mode='r') as file_object:
+                        entry = json.load(fp=file_object)
+                except (OSError, ValueError) as exception:
+                    logger.error(
+                        'Unable to read search index queue entry `%s`; %s',
+                        entry_path, exception
+                    )
+                    entry_path.unlink(missing_ok=True)
+                else:
+                    entries.setdefault(entry['search_model'], []).append(entry)
+
+            for search_model_full_name, search_model_entries in entries.items():
+                search_model = SearchModel.get(name=search_model_full_name)
+                index = self.get_or_create_index(search_model=search_model)
+
+                writer = BufferedWriter(
+                    commitargs={'merge': False}, index=index,
+                    limit=self.group_commit_limit, period=None,
+                    writerargs=self.writer_kwargs
+                )
+                try:
+                    for entry in search_model_entries:
+                        if entry['action'] == TEXT_QUEUE_ACTION_INDEX:
+                            writer.update_document(**entry['document'])
+                        else:
+                            writer.delete_by_term('id', entry['id'])
+                finally:
+                    writer.close()
+
+                self._get_merge_pending_path(
+                    search_model=search_model
+                ).touch()
+
+            for entry_path in entry_paths:
+                entry_path.unlink(missing_ok=True)
+
+    def _get_merge_pending_path(self, search_model):
+        return Path(
+            self.queue_path, WHOOSH_MERGE_PENDING_FILENAME.format(
+                search_model.get_full_name()
+            )
+        )
+
+    def _get_queue_entry_paths(self):
+        try:
+            return sorted(self.queue_path.glob('*.json'))
+        except OSError:
+            return []
+
     def _initialize(self):
         if not settings.COMMON_DISABLE_LOCAL_STORAGE:
             self.index_path.mkdir(exist_ok=True)
+            self.queue_path.mkdir(exist_ok=True)
+
+    def _queue_append(self, action, instance, document=None):
+        """
+        Write an index operation to the durable queue. The entry file is
+        written under a temporary name and renamed, so the flusher never
+        reads a partial entry. Names sort in arrival order.
+        """
+        self.queue_path.mkdir(exist_ok=True, parents=True)
+
+        search_model = SearchModel.get_for_model(instance=instance)
+        entry = {
+            'action': action, 'document': document, 'id': str(instance.pk),
+            'search_model': search_model.get_full_name()
+        }
+
+        name = '{:020d}-{}'.format(time.time_ns(), uuid.uuid4().hex)
+        temporary_path = Path(self.queue_path, '{}.tmp'.format(name))
+
+        with temporary_path.open(mode='w') as file_object:
+            json.dump(default=str, fp=file_object, obj=entry)
+            file_object.flush()
+            os.fsync(file_object.fileno())
+
+        os.replace(
+            src=temporary_path, dst=Path(self.queue_path, '{}.json'.format(name))
+        )
+
+    def _queue_flush_attempt(self):
+        """
+        Group commit. Only one process writes to the index. If another
+        process holds the index lock, it will pick up the entry just queued
+        before releasing it, otherwise the periodic flush task will.
+        """
+        try:
+            lock = LockingBackend.get_backend().acquire_lock(
+                name=TEXT_LOCK_INSTANCE_INDEX
+            )
+        except LockError:
+            logger.debug('Index writer busy, leaving entry in the queue.')
+        else:
+            try:
+                self._flush_queue()
+            except whoosh.index.LockError:
+                logger.debug('Whoosh index locked, leaving entry in the queue.')
+            finally:
+                lock.release()
 
     def _search(
         self, query, search_model, user, global_and_search=False,
@@ -131,6 +259,15 @@ class WhooshSearchBackend(SearchBackend):
             )
 
     def deindex_instance(self, instance):
+        if self.group_commit:
+            if not settings.COMMON_DISABLE_LOCAL_STORAGE:
+                self._queue_append(
+                    action=TEXT_QUEUE_ACTION_DEINDEX, instance=instance
+                )
+                self._queue_flush_attempt()
+
+            return
+
         try:
             lock = LockingBackend.get_backend().acquire_lock(
                 name=TEXT_LOCK_INSTANCE_DEINDEX
@@ -148,6 +285,42 @@ class WhooshSearchBackend(SearchBackend):
             finally:
                 lock.release()
 
+    def flush(self, merge=False):
+        if not settings.COMMON_DISABLE_LOCAL_STORAGE:
+            try:
+                lock = LockingBackend.get_backend().acquire_lock(
+                    name=TEXT_LOCK_INSTANCE_INDEX
+                )
+            except LockError:
+                raise
+            else:
+                try:
+                    self._flush_queue()
+
+                    if merge:
+                        # Inline flushes commit without merging to keep
+                        # them short. Merge the small segments they leave
+                        # behind here, using the default merge policy.
+                        # Indexes without new segments are left untouched.
+                        for search_model in SearchModel.all():
+                            merge_pending_path = self._get_merge_pending_path(
+                                search_model=search_model
+                            )
+                            if not merge_pending_path.exists():
+                                continue
+
+                            index = self.get_or_create_index(
+                                search_model=search_model
+                            )
+                            index.writer(**self.writer_kwargs).commit(
+                                merge=True
+                            )
+                            merge_pending_path.unlink(missing_ok=True)
+                except whoosh.index.LockError:
+                    raise DynamicSearchRetry
+                finally:
+                    lock.release()
+
     def get_or_create_index(self, search_model):
         storage = self.get_storage()
         schema = self.get_search_model_schema(search_model=search_model)
@@ -175,6 +348,23 @@ class WhooshSearchBackend(SearchBackend):
         return FileStorage(path=self.index_path)
 
     def index_instance(self, instance, exclude_model=None, exclude_kwargs=None):
+        if self.group_commit:
+            if not settings.COMMON_DISABLE_LOCAL_STORAGE:
+                # Populate outside of the index lock, in parallel across
+                # workers. Only the write to the index is serialized.
+                search_model = SearchModel.get_for_model(instance=instance)
+                kwargs = search_model.populate(
+                    backend=self, instance=instance,
+                    exclude_model=exclude_model, exclude_kwargs=exclude_kwargs
+                )
+                self._queue_append(
+                    action=TEXT_QUEUE_ACTION_INDEX, document=kwargs,
+                    instance=instance
+                )
+                self._queue_flush_attempt()
+
+            return
+
         try:
             lock = LockingBackend.get_backend().acquire_lock(
                 name=TEXT_LOCK_INSTANCE_INDEX
@@ -233,13 +423,16 @@ class WhooshSearchBackend(SearchBackend):
         else:
             try:
                 if not settings.COMMON_DISABLE_LOCAL_STORAGE:
+                    # Apply older queued operations first so they do not
+                    # overwrite the fresher values written below.
+                    self._flush_queue()
+
                     index = self.get_or_create_index(search_model=search_model)
 
                     writer = BufferedWriter(index=index)
-                    for instance in queryset:
-                        kwargs = search_model.populate(
-                            backend=self, instance=instance
-                        )
+                    for instance, kwargs in search_model.populate_many(
+                        backend=self, instances=queryset
+                    ):
                         try:
                             writer.update_document(**kwargs)
                         except Exception as exception:
@@ -363,6 +363,13 @@ class SearchBackend:
         Optional method to remove an model instance from the search index.
         """
 
+    def flush(self, merge=False):
+        """
+        Optional method to write pending index operations to the search
+        index. Backends that buffer operations must also apply the merge
+        or optimization pass when `merge` is True.
+        """
+
     def get_resolved_field_map(self, search_model):
         result = {}
         for search_field in self.get_search_model_fields(search_model=search_model):
@@ -850,55 +857,86 @@ class SearchModel(AppsModuleLoaderMixin):
     def populate(
         self, backend, instance, exclude_model=None, exclude_kwargs=None
     ):
-        result = {}
-        search_model = SearchModel.get_for_model(instance=instance)
-
-        for direct_field in search_model.fields_direct:
-            field_name = direct_field.field
-
-            # Fetch the fields that produce a finite number of results.
-            value = getattr(instance, field_name)
-
-            result[field_name] = backend.get_search_field_transformation(
-                search_field=direct_field
-            )(value)
-
-        for related_field in search_model.fields_related:
-            # Fetch the fields that produce an undetermined number of
-            # results.
-            # This implementation is a balance between memory usage and
-            # performance.
-            # Attempting to fetch all of these fields at the same time using
-            # joins creates a single query that kills the database and
-            # causes the OOM to kill this method's process due to run away
-            # memory usage.
-            # This implementation is not infinitely scalable but has been
-            # tested up to 500 pages per document version + 500 pages per
-            # document file with an indexing chunk size of 25 for a total
-            # of 25,000 page results per super call.
-            field_name = related_field.field
-            last_field = field_name.split('__')[-1]
-
-            sub_queryset = related_field.related_model._meta.default_manager.filter(
-                **{
-                    '{}'.format(related_field.reverse_path): instance.pk
-                }
-            ).values_list(last_field, flat=True)
+        for _instance, result in self.populate_many(
+            backend=backend, exclude_kwargs=exclude_kwargs,
+            exclude_model=exclude_model, instances=(instance,)
+        ):
+            return result
+
+    def populate_many(
+        self, backend, instances, exclude_model=None, exclude_kwargs=None
+    ):
+        """
+        Yield an `(instance, result)` tuple for each instance. The instances
+        are processed in groups of `SEARCH_INDEXING_CHUNK_SIZE` and each
+        related field is fetched with a single query per group instead of
+        one query per instance.
+        """
+        # Fetch the fields that produce an undetermined number of results
+        # as one grouped query per field, streaming the rows instead of
+        # caching the queryset.
+        # Attempting to fetch all of these fields at the same time using
+        # joins creates a single query that kills the database and
+        # causes the OOM to kill this method's process due to run away
+        # memory usage.
+        # The group size caps the memory used: only the values of one
+        # group are held at a time and each group is yielded before the
+        # next one is fetched. The default size has been tested up to 500
+        # pages per document version + 500 pages per document file with
+        # an indexing chunk size of 25 for a total of 25,000 page results
+        # per query.
+        iterator = iter(instances)
+        while True:
+            group = tuple(
+                itertools.islice(iterator, setting_indexing_chunk_size.value)
+            )
+            if not group:
+                break
 
-            if exclude_model and related_field.related_model == exclude_model:
-                sub_queryset = sub_queryset.exclude(**exclude_kwargs)
+            search_model = SearchModel.get_for_model(instance=group[0])
 
-            final_value = []
-            for value in sub_queryset.distinct():
-                final_value.append(
-                    backend.get_search_field_transformation(
-                        search_field=related_field
-                    )(value) or ''
+            results = {instance.pk: {} for instance in group}
+
+            for direct_field in search_model.fields_direct:
+                field_name = direct_field.field
+                transformation = backend.get_search_field_transformation(
+                    search_field=direct_field
                 )
 
-            result[field_name] = ' '.join(final_value)
+                # Fetch the fields that produce a finite number of results.
+                for instance in group:
+                    results[instance.pk][field_name] = transformation(
+                        getattr(instance, field_name)
+                    )
 
-        return result
+            for related_field in search_model.fields_related:
+                field_name = related_field.field
+                last_field = field_name.split('__')[-1]
+                reverse_path = related_field.reverse_path
+                transformation = backend.get_search_field_transformation(
+                    search_field=related_field
+                )
+
+                sub_queryset = related_field.related_model._meta.default_manager.filter(
+                    **{
+                        '{}__in'.format(reverse_path): list(results)
+                    }
+                )
+
+                if exclude_model and related_field.related_model == exclude_model:
+                    sub_queryset = sub_queryset.exclude(**exclude_kwargs)
+
+                values = {pk: [] for pk in results}
+                for pk, value in sub_queryset.values_list(
+                    reverse_path, last_field
+                ).distinct().iterator():
+                    values[pk].append(transformation(value) or '')
+
+                for pk, final_value in values.items():
+                    results[pk][field_name] = ' '.join(final_value)
+
+            for instance in group:
+                yield instance, results[instance.pk]
 
     @property
     def proxies(self):
@@ -43,5 +43,7 @@ TASK_INDEX_INSTANCE_RETRY_BACKOFF_MAX = 60
 TASK_INDEX_INSTANCES_MAX_RETRIES = 40
 TASK_INDEX_INSTANCES_RETRY_BACKOFF_MAX = 60
 
+TASK_FLUSH_BACKEND_INTERVAL = 30
+
 TASK_INDEX_RELATED_INSTANCE_M2M_MAX_RETRIES = 40
 TASK_INDEX_RELATED_INSTANCE_M2M_RETRY_BACKOFF_MAX = 60
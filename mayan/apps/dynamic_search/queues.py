@@ -1,8 +1,12 @@
+import datetime
+
 from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.task_manager.classes import CeleryQueue
 from mayan.apps.task_manager.workers import worker_b
 
+from .literals import TASK_FLUSH_BACKEND_INTERVAL
+
 queue_search = CeleryQueue(
     label=_('Search'), name='search', worker=worker_b
 )
@@ -15,6 +19,13 @@ queue_search.add_task_type(
     label=_('Remove a model instance from the search engine.'),
     name='task_deindex_instance',
 )
+queue_search.add_task_type(
+    dotted_path='mayan.apps.dynamic_search.tasks.task_flush_backend',
+    label=_('Write pending operations to the search engine.'),
+    name='task_flush_backend', schedule=datetime.timedelta(
+        seconds=TASK_FLUSH_BACKEND_INTERVAL
+    )
+)
 queue_search.add_task_type(
     dotted_path='mayan.apps.dynamic_search.tasks.task_index_instance',
     label=_('Index a model instance to the search engine.'),
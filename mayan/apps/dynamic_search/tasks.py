@@ -38,6 +38,20 @@ def task_deindex_instance(self, app_label, model_name, object_id):
     logger.info('Finished')
 
 
+@app.task(ignore_result=True)
+def task_flush_backend():
+    logger.info('Executing')
+
+    try:
+        SearchBackend.get_instance().flush(merge=True)
+    except (DynamicSearchRetry, LockError):
+        # Another process is writing to the index and will apply the
+        # pending operations.
+        logger.debug('Search backend busy, skipping flush.')
+
+    logger.info('Finished')
+
+
 @app.task(
     bind=True, ignore_result=True,
     max_retries=TASK_INDEX_INSTANCE_MAX_RETRIES, retry_backoff=True,
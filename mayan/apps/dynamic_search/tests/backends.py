@@ -66,6 +66,9 @@ class TestSearchBackend(SearchBackend):
         if self._test_class:
             return self._backend.deindex_instance(*args, **kwargs)
 
+    def flush(self, *args, **kwargs):
+        return self._backend.flush(*args, **kwargs)
+
     def get_status(self, *args, **kwargs):
         return self._backend.get_status(*args, **kwargs)
 
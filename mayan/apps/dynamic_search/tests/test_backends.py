@@ -7,6 +7,7 @@ from mayan.apps.documents.search import search_model_document
 from mayan.apps.documents.tests.mixins.document_mixins import DocumentTestMixin
 from mayan.apps.testing.tests.base import BaseTestCase
 
+from ..backends.literals import TEXT_QUEUE_ACTION_DEINDEX
 from ..classes import SearchModel
 from ..literals import QUERY_PARAMETER_ANY_FIELD
 
@@ -739,6 +740,61 @@ class WhooshSearchBackendDocumentSearchTestCase(
     _test_search_backend_path = 'mayan.apps.dynamic_search.backends.whoosh.WhooshSearchBackend'
     auto_upload_test_document = False
 
+    def test_group_commit_inline_flush(self):
+        self._upload_test_document(label='first_doc')
+
+        self.assertEqual(
+            self.search_backend._backend._get_queue_entry_paths(), []
+        )
+        self.assertTrue(
+            self.search_backend._backend._get_merge_pending_path(
+                search_model=search_model_document
+            ).exists()
+        )
+
+    def test_group_commit_merge_idle(self):
+        self.search_backend.flush(merge=True)
+
+        index = self.search_backend._backend.get_or_create_index(
+            search_model=search_model_document
+        )
+        generation = index.latest_generation()
+
+        self.search_backend.flush(merge=True)
+
+        self.assertEqual(index.latest_generation(), generation)
+
+    def test_group_commit_queued_entry_flush(self):
+        self._upload_test_document(label='first_doc')
+        self.grant_access(
+            obj=self._test_document, permission=permission_document_view
+        )
+
+        # Queue an entry without flushing, as when the writer is busy.
+        self.search_backend._backend._queue_append(
+            action=TEXT_QUEUE_ACTION_DEINDEX, instance=self._test_document
+        )
+        self.assertEqual(
+            len(self.search_backend._backend._get_queue_entry_paths()), 1
+        )
+
+        self.search_backend.flush(merge=True)
+
+        self.assertEqual(
+            self.search_backend._backend._get_queue_entry_paths(), []
+        )
+        self.assertFalse(
+            self.search_backend._backend._get_merge_pending_path(
+                search_model=search_model_document
+            ).exists()
+        )
+
+        queryset = self.search_backend._search(
+            search_model=search_model_document,
+            query={'label': 'first*'}, user=self._test_case_user
+        )
+        self.assertEqual(queryset.count(), 0)
+
     def test_simple_search(self):
         self._upload_test_document(label='first_doc')
 
@@ -45,6 +45,64 @@ class SearchModelTestCase(SearchTestMixin, BaseTestCase):
         )
 
 
+class SearchModelPopulateTestCase(
+    DocumentTestMixin, SearchTestMixin, TagTestMixin, BaseTestCase
+):
+    auto_upload_test_document = False
+
+    def setUp(self):
+        super().setUp()
+
+        self._create_test_document_stub()
+        self._create_test_document_stub()
+        self._create_test_tag()
+        self._create_test_tag()
+
+        self._test_tags[0].documents.add(self._test_documents[0])
+        self._test_tags[0].documents.add(self._test_documents[1])
+        self._test_tags[1].documents.add(self._test_documents[1])
+
+    def test_populate_many(self):
+        backend = self.search_backend._backend
+
+        results = dict(
+            search_model_document.populate_many(
+                backend=backend, instances=self._test_documents
+            )
+        )
+
+        self.assertEqual(len(results), 2)
+
+        for test_document in self._test_documents:
+            self.assertEqual(
+                results[test_document], search_model_document.populate(
+                    backend=backend, instance=test_document
+                )
+            )
+
+        self.assertEqual(
+            set(results[self._test_documents[1]]['tags__label'].split(' ')),
+            {self._test_tags[0].label, self._test_tags[1].label}
+        )
+
+    def test_populate_many_exclude(self):
+        backend = self.search_backend._backend
+
+        results = dict(
+            search_model_document.populate_many(
+                backend=backend, exclude_kwargs={'pk': self._test_tags[0].pk},
+                exclude_model=self._test_tags[0]._meta.model,
+                instances=self._test_documents
+            )
+        )
+
+        self.assertEqual(results[self._test_documents[0]]['tags__label'], '')
+        self.assertEqual(
+            results[self._test_documents[1]]['tags__label'],
+            self._test_tags[1].label
+        )
+
+
 class QueryStringDecodeTestCase(SearchTestMixin, BaseTestCase):
     def test_decode_default_scope(self):
         query = {
@@ -1,6 +1,7 @@
 from django.apps import apps
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models.signals import post_delete, post_save
 from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.acls.classes import ModelPermission
@@ -12,6 +13,7 @@ from mayan.apps.navigation.classes import SourceColumn
 from mayan.apps.views.html_widgets import ObjectLinkWidget, TwoStateWidget
 
 from .classes import EventTypeNamespace
+from .handlers import handler_event_subscription_index_invalidate
 from .html_widgets import widget_event_actor_link, widget_event_type_link
 from .links import (
     link_event_type_subscription_list, link_object_event_list_clear,
@@ -34,6 +36,7 @@ class EventsApp(MayanAppConfig):
         super().ready()
 
         Action = apps.get_model(app_label='actstream', model_name='Action')
+        EventSubscription = self.get_model(model_name='EventSubscription')
         Notification = self.get_model(model_name='Notification')
         ObjectEventSubscription = self.get_model(
             model_name='ObjectEventSubscription'
@@ -212,3 +215,14 @@ class EventsApp(MayanAppConfig):
             links=(link_notification_list,), position=30
         )
         menu_tools.bind_links(links=(link_event_list,))
+
+        post_delete.connect(
+            dispatch_uid='events_handler_event_subscription_index_invalidate_delete',
+            receiver=handler_event_subscription_index_invalidate,
+            sender=EventSubscription
+        )
+        post_save.connect(
+            dispatch_uid='events_handler_event_subscription_index_invalidate_save',
+            receiver=handler_event_subscription_index_invalidate,
+            sender=EventSubscription
+        )
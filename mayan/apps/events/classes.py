@@ -1,10 +1,14 @@
 import csv
 import logging
+import threading
 
 from furl import furl
 
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
 from django.urls import reverse
 from django.utils.encoding import force_text
 from django.utils.translation import ugettext_lazy as _
@@ -27,6 +31,9 @@ from .links import (
 from .permissions import (
     permission_events_clear, permission_events_export, permission_events_view
 )
+from .settings import (
+    setting_fan_out_asynchronous, setting_subscription_index_cache_timeout
+)
 
 logger = logging.getLogger(name=__name__)
 
@@ -320,6 +327,224 @@ class EventTypeNamespace(AppsModuleLoaderMixin):
         return EventType.sort(event_type_list=self.event_types)
 
 
+class EventFanOut:
+    """
+    Create the notifications of committed actions. The actions committed
+    inside a transaction are collected and dispatched as a single batch
+    when the transaction commits.
+    """
+    _local = threading.local()
+
+    @classmethod
+    def defer(cls, action):
+        if not setting_fan_out_asynchronous.value:
+            cls.process(action_id_list=(action.pk,))
+            return
+
+        connection = transaction.get_connection()
+
+        if not connection.in_atomic_block:
+            cls.dispatch(action_id_list=(action.pk,))
+            return
+
+        batch = getattr(cls._local, 'batch', None)
+        pending_callbacks = [entry[1] for entry in connection.run_on_commit]
+
+        # The batch of a rolled back transaction is discarded along with
+        # its on commit callback.
+        if batch is None or batch.dispatch_batch not in pending_callbacks:
+            batch = cls()
+            cls._local.batch = batch
+            transaction.on_commit(func=batch.dispatch_batch)
+
+        batch.action_id_list.append(action.pk)
+
+    @classmethod
+    def process(cls, action_id_list):
+        """
+        Resolve the subscribers of the actions and create their
+        notifications in bulk.
+        """
+        Action = apps.get_model(app_label='actstream', model_name='Action')
+        ObjectEventSubscription = apps.get_model(
+            app_label='events', model_name='ObjectEventSubscription'
+        )
+
+        action_list = [
+            action for action in Action.objects.filter(pk__in=action_id_list).order_by('pk')
+            if action.action_object_object_id or action.target_object_id
+        ]
+
+        if not action_list:
+            return ()
+
+        object_keys = set()
+        for action in action_list:
+            if action.target_object_id:
+                object_keys.add(
+                    (
+                        action.target_content_type_id,
+                        action.target_object_id, action.verb
+                    )
+                )
+            if action.action_object_object_id:
+                object_keys.add(
+                    (
+                        action.action_object_content_type_id,
+                        action.action_object_object_id, action.verb
+                    )
+                )
+
+        query = Q()
+        for content_type_id, object_id, verb in object_keys:
+            query |= Q(
+                content_type_id=content_type_id, object_id=object_id,
+                stored_event_type__name=verb
+            )
+
+        object_subscriber_ids = {}
+        queryset = ObjectEventSubscription.objects.filter(query).values_list(
+            'content_type_id', 'object_id', 'stored_event_type__name',
+            'user_id'
+        )
+        for content_type_id, object_id, verb, user_id in queryset:
+            object_subscriber_ids.setdefault(
+                (content_type_id, force_text(s=object_id), verb), set()
+            ).add(user_id)
+
+        action_user_ids = []
+        for action in action_list:
+            user_ids = set(
+                EventSubscriptionIndex.get_user_ids(verb=action.verb)
+            )
+            user_ids.update(
+                object_subscriber_ids.get(
+                    (
+                        action.target_content_type_id,
+                        force_text(s=action.target_object_id), action.verb
+                    ), ()
+                )
+            )
+            user_ids.update(
+                object_subscriber_ids.get(
+                    (
+                        action.action_object_content_type_id,
+                        force_text(s=action.action_object_object_id),
+                        action.verb
+                    ), ()
+                )
+            )
+
+            action_user_ids.append((action, user_ids))
+
+        # The cached index can reference users deleted in the meantime.
+        existing_user_ids = set(
+            get_user_model().objects.filter(
+                pk__in=set().union(
+                    *(user_ids for action, user_ids in action_user_ids)
+                )
+            ).values_list('pk', flat=True)
+        )
+
+        action_user_id_list = [
+            (action, user_id) for action, user_ids in action_user_ids
+            for user_id in sorted(user_ids & existing_user_ids)
+        ]
+
+        from mayan.apps.notifications.utils import (
+            create_enhanced_notifications
+        )
+
+        return create_enhanced_notifications(
+            action_user_id_list=action_user_id_list
+        )
+
+    @classmethod
+    def dispatch(cls, action_id_list):
+        from .tasks import task_event_fan_out
+
+        try:
+            task_event_fan_out.apply_async(
+                kwargs={'action_id_list': list(action_id_list)}
+            )
+        except Exception as exception:
+            # Do not lose the notifications if the broker is unavailable.
+            logger.error(
+                'Unable to queue the event fan out task; %s. Creating the '
+                'notifications synchronously.', exception, exc_info=True
+            )
+            cls.process(action_id_list=action_id_list)
+
+    def __init__(self):
+        self.action_id_list = []
+
+    def dispatch_batch(self):
+        self.__class__.dispatch(action_id_list=self.action_id_list)
+
+
+class EventSubscriptionIndex:
+    """
+    Cached mapping of event type names to the IDs of the users subscribed
+    to them globally. The cache is cleared when a subscription changes.
+    """
+    cache_key = 'events:event_subscription_index'
+
+    @classmethod
+    def _build(cls):
+        EventSubscription = apps.get_model(
+            app_label='events', model_name='EventSubscription'
+        )
+
+        index = {}
+        queryset = EventSubscription.objects.values_list(
+            'stored_event_type__name', 'user_id'
+        )
+        for name, user_id in queryset:
+            index.setdefault(name, []).append(user_id)
+
+        return index
+
+    @classmethod
+    def get_index(cls):
+        try:
+            index = cache.get(key=cls.cache_key)
+        except Exception as exception:
+            logger.warning(
+                'Unable to read the event subscription index from the '
+                'cache; %s', exception
+            )
+            return cls._build()
+
+        if index is None:
+            index = cls._build()
+            try:
+                cache.set(
+                    key=cls.cache_key, value=index,
+                    timeout=setting_subscription_index_cache_timeout.value
+                )
+            except Exception as exception:
+                logger.warning(
+                    'Unable to store the event subscription index in the '
+                    'cache; %s', exception
+                )
+
+        return index
+
+    @classmethod
+    def get_user_ids(cls, verb):
+        return cls.get_index().get(verb, ())
+
+    @classmethod
+    def invalidate(cls):
+        try:
+            cache.delete(key=cls.cache_key)
+        except Exception as exception:
+            logger.warning(
+                'Unable to clear the event subscription index cache; %s',
+                exception
+            )
+
+
 class EventType:
     _registry = {}
 
@@ -357,51 +582,6 @@ class EventType:
         return '{}: {}'.format(self.namespace.label, self.label)
 
     def commit(self, actor=None, action_object=None, target=None):
-        # #region agent log
-        import json as json_module
-        import time as time_module
-        try:
-            with open('c:\\DAM\\Prime-EDMS\\.cursor\\debug.log', 'a', encoding='utf-8') as f:
-                f.write(json_module.dumps({
-                    'sessionId': 'debug-session',
-                    'runId': 'run1',
-                    'hypothesisId': 'A',
-                    'location': 'events/classes.py:350',
-                    'message': 'EventType.commit() called',
-                    'data': {'event_type': self.name, 'actor_id': actor.pk if actor else None, 'action_object_id': action_object.pk if action_object else None, 'target_id': target.pk if target else None},
-                    'timestamp': int(time_module.time() * 1000)
-                }) + '\n')
-                f.flush()
-        except Exception:
-            pass
-        # #endregion
-        try:
-            with open('c:\\DAM\\Prime-EDMS\\.cursor\\debug.log', 'a', encoding='utf-8') as f:
-                f.write(json_module.dumps({
-                    'sessionId': 'debug-session',
-                    'runId': 'run1',
-                    'hypothesisId': 'A',
-                    'location': 'events/classes.py:359',
-                    'message': 'EventType.commit called',
-                    'data': {'event_id': self.id, 'actor_id': actor.pk if actor else None, 'actor_username': actor.username if actor else None, 'target_id': target.pk if target else None, 'action_object_id': action_object.pk if action_object else None},
-                    'timestamp': int(time_module.time() * 1000)
-                }) + '\n')
-        except Exception:
-            pass
-        # Also log via Django logger (works in Celery)
-        logger.info('DEBUG: EventType.commit called: event_id=%s, actor_id=%s, target_id=%s', self.id, actor.pk if actor else None, target.pk if target else None)
-        # #endregion
-        EventSubscription = apps.get_model(
-            app_label='events', model_name='EventSubscription'
-        )
-        Notification = apps.get_model(
-            app_label='events', model_name='Notification'
-        )
-        ObjectEventSubscription = apps.get_model(
-            app_label='events', model_name='ObjectEventSubscription'
-        )
-        User = get_user_model()
-
         if actor is None and target is None:
             # If the actor and the target are None there is no way to
             # create a new event.
@@ -418,298 +598,9 @@ class EventType:
         # The [0][1] means: get the first and only action from the list
         # and ignore the handler.
 
-        # Create notifications for the actions created by the event committed.
-
-        # Gather the users subscribed globally to the event.
-        global_subscriptions = EventSubscription.objects.filter(
-            stored_event_type__name=result.verb
-        )
-        # #region agent log
-        try:
-            with open('c:\\DAM\\Prime-EDMS\\.cursor\\debug.log', 'a', encoding='utf-8') as f:
-                f.write(json_module.dumps({
-                    'sessionId': 'debug-session',
-                    'runId': 'run1',
-                    'hypothesisId': 'F',
-                    'location': 'events/classes.py:391',
-                    'message': 'EventType.commit: checking global subscriptions',
-                    'data': {'event_verb': result.verb, 'global_subscriptions_count': global_subscriptions.count(), 'subscribed_user_ids': list(global_subscriptions.values_list('user_id', flat=True))},
-                    'timestamp': int(time_module.time() * 1000)
-                }) + '\n')
-        except Exception:
-            pass
-        # #endregion
-        user_queryset = User.objects.filter(
-            id__in=global_subscriptions.values('user')
-        )
-
-        # Gather the users subscribed to the target object event.
-        if result.target:
-            target_subscriptions = ObjectEventSubscription.objects.filter(
-                content_type=result.target_content_type,
-                object_id=result.target.pk,
-                stored_event_type__name=result.verb
-            )
-            # #region agent log
-            try:
-                with open('c:\\DAM\\Prime-EDMS\\.cursor\\debug.log', 'a', encoding='utf-8') as f:
-                    f.write(json_module.dumps({
-                        'sessionId': 'debug-session',
-                        'runId': 'run1',
-                        'hypothesisId': 'F',
-                        'location': 'events/classes.py:399',
-                        'message': 'EventType.commit: checking target subscriptions',
-                        'data': {'event_verb': result.verb, 'target_id': result.target.pk, 'target_type': str(result.target_content_type), 'target_subscriptions_count': target_subscriptions.count(), 'subscribed_user_ids': list(target_subscriptions.values_list('user_id', flat=True))},
-                        'timestamp': int(time_module.time() * 1000)
-                    }) + '\n')
-            except Exception:
-                pass
-            # #endregion
-            user_queryset = user_queryset | User.objects.filter(
-                id__in=target_subscriptions.values('user')
-            )
-
-        # Gather the users subscribed to the action object event.
-        if result.action_object:
-            action_object_subscriptions = ObjectEventSubscription.objects.filter(
-                content_type=result.action_object_content_type,
-                object_id=result.action_object.pk,
-                stored_event_type__name=result.verb
-            )
-            # #region agent log
-            try:
-                with open('c:\\DAM\\Prime-EDMS\\.cursor\\debug.log', 'a', encoding='utf-8') as f:
-                    f.write(json_module.dumps({
-                        'sessionId': 'debug-session',
-                        'runId': 'run1',
-                        'hypothesisId': 'F',
-                        'location': 'events/classes.py:409',
-                        'message': 'EventType.commit: checking action_object subscriptions',
-                        'data': {'event_verb': result.verb, 'action_object_id': result.action_object.pk, 'action_object_type': str(result.action_object_content_type), 'action_object_subscriptions_count': action_object_subscriptions.count(), 'subscribed_user_ids': list(action_object_subscriptions.values_list('user_id', flat=True))},
-                        'timestamp': int(time_module.time() * 1000)
-                    }) + '\n')
-            except Exception:
-                pass
-            # #endregion
-            user_queryset = user_queryset | User.objects.filter(
-                id__in=action_object_subscriptions.values('user')
-            )
-
-        # #region agent log
-        try:
-            with open('c:\\DAM\\Prime-EDMS\\.cursor\\debug.log', 'a', encoding='utf-8') as f:
-                f.write(json_module.dumps({
-                    'sessionId': 'debug-session',
-                    'runId': 'run1',
-                    'hypothesisId': 'F',
-                    'location': 'events/classes.py:415',
-                    'message': 'EventType.commit: final user_queryset',
-                    'data': {'event_verb': result.verb, 'user_queryset_count': user_queryset.count(), 'user_ids': list(user_queryset.values_list('id', flat=True))},
-                    'timestamp': int(time_module.time() * 1000)
-                }) + '\n')
-        except Exception:
-            pass
-        # #endregion
-
-        for user in user_queryset:
-            # #region agent log
-            try:
-                with open('c:\\DAM\\Prime-EDMS\\.cursor\\debug.log', 'a', encoding='utf-8') as f:
-                    f.write(json_module.dumps({
-                        'sessionId': 'debug-session',
-                        'runId': 'run1',
-                        'hypothesisId': 'E',
-                        'location': 'events/classes.py:416',
-                        'message': 'EventType.commit: processing user',
-                        'data': {'user_id': user.id, 'username': user.username, 'event_verb': result.verb, 'has_action_object': bool(result.action_object), 'has_target': bool(result.target)},
-                        'timestamp': int(time_module.time() * 1000)
-                    }) + '\n')
-            except Exception:
-                pass
-            # #endregion
-            
-            # Check NotificationPreference BEFORE creating notification record.
-            # If user disabled notifications, skip creating DB record (optimization).
-            try:
-                from mayan.apps.notifications.models import NotificationPreference
-                preference = NotificationPreference.objects.filter(user=user).first()
-                # #region agent log
-                try:
-                    with open('c:\\DAM\\Prime-EDMS\\.cursor\\debug.log', 'a', encoding='utf-8') as f:
-                        f.write(json_module.dumps({
-                            'sessionId': 'debug-session',
-                            'runId': 'run1',
-                            'hypothesisId': 'E',
-                            'location': 'events/classes.py:422',
-                            'message': 'NotificationPreference check',
-                            'data': {'user_id': user.id, 'preference_exists': preference is not None, 'notifications_enabled': getattr(preference, 'notifications_enabled', None) if preference else None},
-                            'timestamp': int(time_module.time() * 1000)
-                        }) + '\n')
-                except Exception:
-                    pass
-                # #endregion
-                if preference and not preference.notifications_enabled:
-                    # User disabled notifications - skip creating record
-                    logger.debug('Skipping notification for user=%s (notifications disabled)', user.id)
-                    continue
-            except Exception:
-                # If notifications app is not installed, continue normally
-                logger.debug('NotificationPreference check failed, continuing', exc_info=True)
-                pass
-
-            if result.action_object:
-                base_notification = Notification.objects.create(action=result, user=user)
-                # #region agent log
-                try:
-                    with open('c:\\DAM\\Prime-EDMS\\.cursor\\debug.log', 'a', encoding='utf-8') as f:
-                        f.write(json_module.dumps({
-                            'sessionId': 'debug-session',
-                            'runId': 'run1',
-                            'hypothesisId': 'A',
-                            'location': 'events/classes.py:432',
-                            'message': 'Base notification created (action_object)',
-                            'data': {'notification_id': base_notification.pk, 'user_id': user.id, 'action_id': result.id, 'event_verb': result.verb},
-                            'timestamp': int(time_module.time() * 1000)
-                        }) + '\n')
-                except Exception:
-                    pass
-                # #endregion
-                # Direct call to enhance notification immediately after creation
-                try:
-                    from mayan.apps.notifications.utils import create_enhanced_notification
-                    # #region agent log
-                    try:
-                        with open('c:\\DAM\\Prime-EDMS\\.cursor\\debug.log', 'a', encoding='utf-8') as f:
-                            f.write(json_module.dumps({
-                                'sessionId': 'debug-session',
-                                'runId': 'run1',
-                                'hypothesisId': 'A',
-                                'location': 'events/classes.py:436',
-                                'message': 'Calling create_enhanced_notification (action_object)',
-                                'data': {'user_id': user.id, 'action_id': result.id, 'event_verb': result.verb},
-                                'timestamp': int(time_module.time() * 1000)
-                            }) + '\n')
-                    except Exception:
-                        pass
-                    # #endregion
-                    enhanced = create_enhanced_notification(
-                        user=user,
-                        action=result,
-                        event_type=result.verb,
-                        template=None
-                    )
-                    # #region agent log
-                    try:
-                        with open('c:\\DAM\\Prime-EDMS\\.cursor\\debug.log', 'a', encoding='utf-8') as f:
-                            f.write(json_module.dumps({
-                                'sessionId': 'debug-session',
-                                'runId': 'run1',
-                                'hypothesisId': 'A',
-                                'location': 'events/classes.py:441',
-                                'message': 'create_enhanced_notification returned',
-                                'data': {'user_id': user.id, 'action_id': result.id, 'enhanced_id': enhanced.pk if enhanced else None, 'enhanced_title': getattr(enhanced, 'title', None) if enhanced else None},
-                                'timestamp': int(time_module.time() * 1000)
-                            }) + '\n')
-                    except Exception:
-                        pass
-                    # #endregion
-                except Exception:
-                    logger.exception('Failed to enhance notification for user=%s, event=%s', user.id, result.verb)
-                    # #region agent log
-                    try:
-                        with open('c:\\DAM\\Prime-EDMS\\.cursor\\debug.log', 'a', encoding='utf-8') as f:
-                            f.write(json_module.dumps({
-                                'sessionId': 'debug-session',
-                                'runId': 'run1',
-                                'hypothesisId': 'A',
-                                'location': 'events/classes.py:443',
-                                'message': 'Exception in create_enhanced_notification (action_object)',
-                                'data': {'user_id': user.id, 'action_id': result.id, 'event_verb': result.verb},
-                                'timestamp': int(time_module.time() * 1000)
-                            }) + '\n')
-                    except Exception:
-                        pass
-                    # #endregion
-                # Don't check or add any other notification for the
-                # same user-event-object.
-                continue
-
-            if result.target:
-                base_notification = Notification.objects.create(action=result, user=user)
-                # #region agent log
-                try:
-                    with open('c:\\DAM\\Prime-EDMS\\.cursor\\debug.log', 'a', encoding='utf-8') as f:
-                        f.write(json_module.dumps({
-                            'sessionId': 'debug-session',
-                            'runId': 'run1',
-                            'hypothesisId': 'A',
-                            'location': 'events/classes.py:449',
-                            'message': 'Base notification created (target)',
-                            'data': {'notification_id': base_notification.pk, 'user_id': user.id, 'action_id': result.id, 'event_verb': result.verb},
-                            'timestamp': int(time_module.time() * 1000)
-                        }) + '\n')
-                except Exception:
-                    pass
-                # #endregion
-                # Direct call to enhance notification immediately after creation
-                try:
-                    from mayan.apps.notifications.utils import create_enhanced_notification
-                    # #region agent log
-                    try:
-                        with open('c:\\DAM\\Prime-EDMS\\.cursor\\debug.log', 'a', encoding='utf-8') as f:
-                            f.write(json_module.dumps({
-                                'sessionId': 'debug-session',
-                                'runId': 'run1',
-                                'hypothesisId': 'A',
-                                'location': 'events/classes.py:453',
-                                'message': 'Calling create_enhanced_notification (target)',
-                                'data': {'user_id': user.id, 'action_id': result.id, 'event_verb': result.verb},
-                                'timestamp': int(time_module.time() * 1000)
-                            }) + '\n')
-                    except Exception:
-                        pass
-                    # #endregion
-                    enhanced = create_enhanced_notification(
-                        user=user,
-                        action=result,
-                        event_type=result.verb,
-                        template=None
-                    )
-                    # #region agent log
-                    try:
-                        with open('c:\\DAM\\Prime-EDMS\\.cursor\\debug.log', 'a', encoding='utf-8') as f:
-                            f.write(json_module.dumps({
-                                'sessionId': 'debug-session',
-                                'runId': 'run1',
-                                'hypothesisId': 'A',
-                                'location': 'events/classes.py:458',
-                                'message': 'create_enhanced_notification returned',
-                                'data': {'user_id': user.id, 'action_id': result.id, 'enhanced_id': enhanced.pk if enhanced else None, 'enhanced_title': getattr(enhanced, 'title', None) if enhanced else None},
-                                'timestamp': int(time_module.time() * 1000)
-                            }) + '\n')
-                    except Exception:
-                        pass
-                    # #endregion
-                except Exception:
-                    logger.exception('Failed to enhance notification for user=%s, event=%s', user.id, result.verb)
-                    # #region agent log
-                    try:
-                        with open('c:\\DAM\\Prime-EDMS\\.cursor\\debug.log', 'a', encoding='utf-8') as f:
-                            f.write(json_module.dumps({
-                                'sessionId': 'debug-session',
-                                'runId': 'run1',
-                                'hypothesisId': 'A',
-                                'location': 'events/classes.py:460',
-                                'message': 'Exception in create_enhanced_notification (target)',
-                                'data': {'user_id': user.id, 'action_id': result.id, 'event_verb': result.verb},
-                                'timestamp': int(time_module.time() * 1000)
-                            }) + '\n')
-                    except Exception:
-                        pass
-                    # #endregion
-                # Don't check or add any other notification for the
-                # same user-event-object.
-                continue
+        # Notifications for the subscribers are created outside of the
+        # caller.
+        EventFanOut.defer(action=result)
 
         return result
 
@@ -0,0 +1,5 @@
+from .classes import EventSubscriptionIndex
+
+
+def handler_event_subscription_index_invalidate(sender, **kwargs):
+    EventSubscriptionIndex.invalidate()
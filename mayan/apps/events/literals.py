@@ -1,6 +1,8 @@
 from django.utils.translation import ugettext_lazy as _
 
 DEFAULT_EVENT_LIST_EXPORT_FILENAME = 'events_list.csv'
+DEFAULT_EVENTS_FAN_OUT_ASYNCHRONOUS = True
+DEFAULT_EVENTS_SUBSCRIPTION_INDEX_CACHE_TIMEOUT = 60 * 60  # 1 hour
 
 EVENT_MANAGER_ORDER_AFTER = 1
 EVENT_MANAGER_ORDER_BEFORE = 2
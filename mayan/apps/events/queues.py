@@ -16,3 +16,7 @@ queue_events.add_task_type(
     dotted_path='mayan.apps.events.tasks.task_event_queryset_export',
     label=_('Export event querysets'), name='task_event_queryset_export',
 )
+queue_events.add_task_type(
+    dotted_path='mayan.apps.events.tasks.task_event_fan_out',
+    label=_('Create event notifications'), name='task_event_fan_out',
+)
@@ -0,0 +1,27 @@
+from django.utils.translation import ugettext_lazy as _
+
+from mayan.apps.smart_settings.classes import SettingNamespace
+
+from .literals import (
+    DEFAULT_EVENTS_FAN_OUT_ASYNCHRONOUS,
+    DEFAULT_EVENTS_SUBSCRIPTION_INDEX_CACHE_TIMEOUT
+)
+
+namespace = SettingNamespace(label=_('Events'), name='events')
+
+setting_fan_out_asynchronous = namespace.add_setting(
+    default=DEFAULT_EVENTS_FAN_OUT_ASYNCHRONOUS,
+    global_name='EVENTS_FAN_OUT_ASYNCHRONOUS', help_text=_(
+        'Create the notifications of the subscribers of an event in a '
+        'background task instead of during the request that committed the '
+        'event.'
+    )
+)
+setting_subscription_index_cache_timeout = namespace.add_setting(
+    default=DEFAULT_EVENTS_SUBSCRIPTION_INDEX_CACHE_TIMEOUT,
+    global_name='EVENTS_SUBSCRIPTION_INDEX_CACHE_TIMEOUT', help_text=_(
+        'Time in seconds the index of the users subscribed to each event '
+        'type is kept in the cache. The index is also cleared every time a '
+        'subscription changes.'
+    )
+)
@@ -5,7 +5,7 @@ from django.contrib.contenttypes.models import ContentType
 from mayan.apps.databases.classes import QuerysetParametersSerializer
 from mayan.celery import app
 
-from .classes import ActionExporter
+from .classes import ActionExporter, EventFanOut
 from .events import event_events_cleared
 from .permissions import permission_events_clear
 
@@ -69,3 +69,8 @@ def task_event_queryset_export(decomposed_queryset, user_id=None):
         user = None
 
     ActionExporter(queryset=queryset).export_to_download_file(user=user)
+
+
+@app.task(ignore_result=True)
+def task_event_fan_out(action_id_list):
+    EventFanOut.process(action_id_list=action_id_list)
@@ -1,3 +1,5 @@
+from django.db import transaction
+
 from mayan.apps.testing.tests.base import BaseTestCase
 
 from ..models import EventSubscription, ObjectEventSubscription
@@ -32,6 +34,40 @@ class EventTypeNotificationModelTestCase(
             test_notification_count + 1
         )
 
+    def test_event_type_notification_deferred_creation(self):
+        test_notification_count = self._test_case_user.notifications.count()
+
+        with self.override_setting(
+            global_name='EVENTS_FAN_OUT_ASYNCHRONOUS', value=True
+        ):
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                with transaction.atomic():
+                    self._create_test_event(target=self._test_object)
+                    self._create_test_event(target=self._test_object)
+
+                    self.assertEqual(
+                        self._test_case_user.notifications.count(),
+                        test_notification_count
+                    )
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(
+            self._test_case_user.notifications.count(),
+            test_notification_count + 2
+        )
+
+    def test_event_type_notification_after_unsubscription(self):
+        test_notification_count = self._test_case_user.notifications.count()
+
+        self._create_test_event(target=self._test_object)
+        EventSubscription.objects.filter(user=self._test_case_user).delete()
+        self._create_test_event(target=self._test_object)
+
+        self.assertEqual(
+            self._test_case_user.notifications.count(),
+            test_notification_count + 1
+        )
+
 
 class ObjectEventNotificationModelTestCase(
     EventObjectTestMixin, EventTestMixin, EventTypeTestMixin,
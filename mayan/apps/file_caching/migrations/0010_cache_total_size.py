@@ -0,0 +1,63 @@
+from django.db import migrations, models
+from django.db.models import F, Sum
+import django.utils.timezone
+
+
+def code_cache_partition_file_accessed_initialize(apps, schema_editor):
+    CachePartitionFile = apps.get_model(
+        app_label='file_caching', model_name='CachePartitionFile'
+    )
+
+    CachePartitionFile.objects.using(
+        alias=schema_editor.connection.alias
+    ).update(accessed=F('datetime'))
+
+
+def code_cache_total_size_initialize(apps, schema_editor):
+    Cache = apps.get_model(
+        app_label='file_caching', model_name='Cache'
+    )
+    CachePartitionFile = apps.get_model(
+        app_label='file_caching', model_name='CachePartitionFile'
+    )
+
+    for cache in Cache.objects.using(alias=schema_editor.connection.alias).all():
+        cache.total_size = CachePartitionFile.objects.using(
+            alias=schema_editor.connection.alias
+        ).filter(partition__cache=cache).aggregate(
+            file_size__sum=Sum('file_size')
+        )['file_size__sum'] or 0
+        cache.save(update_fields=('total_size',))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('file_caching', '0009_alter_cache_options')
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cache', name='total_size',
+            field=models.BigIntegerField(
+                default=0, editable=False, help_text='Running total of the '
+                'size of all the cache files in bytes.',
+                verbose_name='Total size'
+            )
+        ),
+        migrations.AddField(
+            model_name='cachepartitionfile', name='accessed',
+            field=models.DateTimeField(
+                db_index=True, default=django.utils.timezone.now,
+                help_text='Date and time of the last access to the cache '
+                'partition file.', verbose_name='Accessed'
+            )
+        ),
+        migrations.RunPython(
+            code=code_cache_partition_file_accessed_initialize,
+            reverse_code=migrations.RunPython.noop
+        ),
+        migrations.RunPython(
+            code=code_cache_total_size_initialize,
+            reverse_code=migrations.RunPython.noop
+        )
+    ]
@@ -7,6 +7,7 @@ from django.db import models
 from django.db.models import F, Sum
 from django.template.defaultfilters import filesizeformat
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.encoding import force_text
 from django.utils.functional import cached_property
 from django.utils.text import format_lazy
@@ -29,7 +30,7 @@ from .events import (
 from .exceptions import FileCachingException
 from .settings import (
     setting_maximum_failed_prune_attempts,
-    setting_maximum_normal_prune_attempts
+    setting_maximum_normal_prune_attempts, setting_prune_batch_size
 )
 
 logger = logging.getLogger(name=__name__)
@@ -46,6 +47,11 @@ class Cache(ValueChangeModelMixin, models.Model):
             validators.MinValueValidator(limit_value=1)
         ], verbose_name=_('Maximum size')
     )
+    total_size = models.BigIntegerField(
+        default=0, editable=False, help_text=_(
+            'Running total of the size of all the cache files in bytes.'
+        ), verbose_name=_('Total size')
+    )
 
     class Meta:
         ordering = ('id',)
@@ -62,6 +68,56 @@ class Cache(ValueChangeModelMixin, models.Model):
             }
         )
 
+    def _get_prune_victims(self):
+        """
+        Generator of the files to delete, in eviction order, following a
+        segmented LRU policy. Files that were never read after being
+        created (probationary segment) are evicted first, followed by the
+        files that were read at least once (protected segment). Each
+        segment is evicted least recently accessed first.
+        """
+        batch_size = setting_prune_batch_size.value
+
+        for queryset in (
+            self.get_files().filter(hits=0),
+            self.get_files().filter(hits__gt=0)
+        ):
+            yield from queryset.order_by('accessed', 'pk').values_list(
+                'pk', 'partition_id', 'partition__name', 'filename',
+                'file_size'
+            ).iterator(chunk_size=batch_size)
+
+    def _prune_batch(self, victims):
+        """
+        Delete a batch of locked victims using a single query and update the
+        running total size once for the whole batch.
+        """
+        try:
+            queryset = CachePartitionFile.objects.filter(
+                pk__in=[victim[0] for victim in victims]
+            )
+            # Only account for the entries that were not deleted by
+            # another process before their lock was acquired.
+            freed_size = queryset.aggregate(
+                file_size__sum=Sum('file_size')
+            )['file_size__sum'] or 0
+
+            for pk, full_filename, file_size, lock in victims:
+                self.storage.delete(name=full_filename)
+
+            queryset.delete()
+            self._total_size_update(delta=-freed_size)
+        finally:
+            for pk, full_filename, file_size, lock in victims:
+                lock.release()
+
+        return freed_size
+
+    def _total_size_update(self, delta):
+        Cache.objects.filter(pk=self.pk).update(
+            total_size=F('total_size') + delta
+        )
+
     def get_files(self):
         return CachePartitionFile.objects.filter(partition__cache__id=self.pk)
 
@@ -83,11 +139,11 @@ class Cache(ValueChangeModelMixin, models.Model):
 
     def get_total_size(self):
         """
-        Return the actual usage of the cache.
+        Return the actual usage of the cache from the running total.
         """
-        return self.get_files().aggregate(
-            file_size__sum=Sum('file_size')
-        )['file_size__sum'] or 0
+        return Cache.objects.filter(pk=self.pk).values_list(
+            'total_size', flat=True
+        ).first() or 0
 
     def get_total_size_display(self):
         return format_lazy(
@@ -105,51 +161,75 @@ class Cache(ValueChangeModelMixin, models.Model):
     def prune(self):
         """
         Deletes files until the total size of the cache is below the allowed
-        maximum size of the cache.
+        maximum size of the cache. The files to delete are selected in a
+        single pass over the eviction order and deleted in batches. Files
+        locked by other processes are skipped.
         """
+        lock_backend = LockingBackend.get_backend()
+        batch_size = setting_prune_batch_size.value
         failed_attempts = 0
-        normal_attempts = 0
-        file_index = 0
 
-        while self.get_total_size() >= self.maximum_size:
-            cache_partition_file_queryset = self.get_files().order_by(
-                'hits', 'datetime'
-            )
+        for attempt in range(setting_maximum_normal_prune_attempts.value):
+            size_to_free = self.get_total_size() - self.maximum_size + 1
+            if size_to_free <= 0:
+                return
 
-            try:
-                cache_partition_file = cache_partition_file_queryset[file_index]
-            except IndexError:
-                # Attempted to get a file beyond what the queryset provided.
-                file_index = 0
-            else:
+            freed_size = 0
+            pending_size = 0
+            victims = []
+
+            for pk, partition_id, partition_name, filename, file_size in self._get_prune_victims():
+                if freed_size + pending_size >= size_to_free:
+                    break
+
+                lock_name = CachePartition.get_combined_lock_name(
+                    cache_id=self.pk, partition_id=partition_id,
+                    filename=filename
+                )
                 try:
-                    cache_partition_file.delete()
-                except CachePartitionFile.DoesNotExist:
-                    # The file selected from deletion was deleted by another
-                    # process before the lock was acquired.
-                    file_index += 1
+                    lock = lock_backend.acquire_lock(name=lock_name)
                 except LockError:
                     logger.debug(
                         'Lock error trying to delete file "%s" for prune. '
-                        'Skipping and attempting next file.',
-                        cache_partition_file
+                        'Skipping and attempting next file.', lock_name
                     )
                     failed_attempts += 1
-                    file_index += 1
 
                     if failed_attempts > setting_maximum_failed_prune_attempts.value:
+                        if victims:
+                            self._prune_batch(victims=victims)
+
                         raise FileCachingException(
                             'Too many cache prune attempts failed.'
                         )
                 else:
-                    file_index = 0
-                    normal_attempts += 1
-
-                    if normal_attempts > setting_maximum_normal_prune_attempts.value:
-                        raise FileCachingException(
-                            'Too many cache prunes trying to create a '
-                            'single new file.'
+                    victims.append(
+                        (
+                            pk, CachePartition.get_combined_filename(
+                                parent=partition_name, filename=filename
+                            ), file_size, lock
                         )
+                    )
+                    pending_size += file_size
+
+                    if len(victims) >= batch_size:
+                        freed_size += self._prune_batch(victims=victims)
+                        pending_size = 0
+                        victims = []
+
+            if victims:
+                freed_size += self._prune_batch(victims=victims)
+
+            if freed_size < size_to_free:
+                # Nothing left to evict. The running total could have
+                # drifted from the files that actually exist, resynchronize
+                # it before the next attempt.
+                self.total_size_recalculate()
+
+        if self.get_total_size() >= self.maximum_size:
+            raise FileCachingException(
+                'Too many cache prunes trying to create a single new file.'
+            )
 
     @method_event(
         event=event_cache_purged,
@@ -200,6 +280,15 @@ class Cache(ValueChangeModelMixin, models.Model):
     def storage(self):
         return self.get_defined_storage().get_storage_instance()
 
+    def total_size_recalculate(self):
+        """
+        Update the running total size from the size of the cache files.
+        """
+        self.total_size = self.get_files().aggregate(
+            file_size__sum=Sum('file_size')
+        )['file_size__sum'] or 0
+        Cache.objects.filter(pk=self.pk).update(total_size=self.total_size)
+
 
 class CachePartition(models.Model):
     cache = models.ForeignKey(
@@ -219,6 +308,12 @@ class CachePartition(models.Model):
     def get_combined_filename(parent, filename):
         return '{}-{}'.format(parent, filename)
 
+    @staticmethod
+    def get_combined_lock_name(cache_id, partition_id, filename):
+        return 'cache_partition-file-{}-{}-{}'.format(
+            cache_id, partition_id, filename
+        )
+
     def _lock_manager_get_lock_name(self, filename):
         return self.get_file_lock_name(filename=filename)
 
@@ -311,14 +406,14 @@ class CachePartition(models.Model):
                 self.pk, filename, partition_file.full_filename
             )
             # Delete the stale DB row so subsequent calls regenerate cache.
-            CachePartitionFile.objects.filter(pk=partition_file.pk).delete()
+            partition_file._delete_database_entry()
             raise CachePartitionFile.DoesNotExist
 
         return partition_file
 
     def get_file_lock_name(self, filename):
-        return 'cache_partition-file-{}-{}-{}'.format(
-            self.cache.pk, self.pk, filename
+        return CachePartition.get_combined_lock_name(
+            cache_id=self.cache_id, partition_id=self.pk, filename=filename
         )
 
     def get_full_filename(self, filename):
@@ -362,6 +457,11 @@ class CachePartitionFile(models.Model):
     datetime = models.DateTimeField(
         auto_now_add=True, db_index=True, verbose_name=_('Date time')
     )
+    accessed = models.DateTimeField(
+        db_index=True, default=timezone.now, help_text=_(
+            'Date and time of the last access to the cache partition file.'
+        ), verbose_name=_('Accessed')
+    )
     filename = models.CharField(max_length=255, verbose_name=_('Filename'))
     file_size = models.PositiveIntegerField(
         default=0, verbose_name=_('File size')
@@ -378,6 +478,17 @@ class CachePartitionFile(models.Model):
         verbose_name = _('Cache partition file')
         verbose_name_plural = _('Cache partition files')
 
+    def _delete_database_entry(self):
+        """
+        Delete only the database entry, used when the storage file is
+        already missing.
+        """
+        deleted_count, deleted = CachePartitionFile.objects.filter(
+            pk=self.pk
+        ).delete()
+        if deleted_count:
+            self.partition.cache._total_size_update(delta=-self.file_size)
+
     def _lock_manager_get_lock_name(self, *args, **kwargs):
         return self.partition.get_file_lock_name(filename=self.filename)
 
@@ -404,16 +515,29 @@ class CachePartitionFile(models.Model):
         """
         Called after creation and initial write only.
         """
+        old_file_size = self.file_size
         self.file_size = self.partition.cache.storage.size(
             name=self.full_filename
         )
         self.save(update_fields=('file_size',))
+        self.partition.cache._total_size_update(
+            delta=self.file_size - old_file_size
+        )
         if self.file_size > self.partition.cache.maximum_size:
             raise FileCachingException(
                 'Cache partition file %s is bigger than the maximum cache '
                 'size.'
             )
 
+    def access_update(self):
+        """
+        Record an access to the file. Used by the cache eviction to keep
+        the most used files.
+        """
+        CachePartitionFile.objects.filter(pk=self.pk).update(
+            accessed=timezone.now(), hits=F('hits') + 1
+        )
+
     @release_lock_class_method
     def close(self):
         if self._storage_object is not None:
@@ -423,7 +547,9 @@ class CachePartitionFile(models.Model):
     @locked_class_method
     def delete(self, *args, **kwargs):
         self.partition.cache.storage.delete(name=self.full_filename)
-        return super().delete(*args, **kwargs)
+        result = super().delete(*args, **kwargs)
+        self.partition.cache._total_size_update(delta=-self.file_size)
+        return result
 
     @cached_property
     def full_filename(self):
@@ -432,15 +558,17 @@ class CachePartitionFile(models.Model):
         )
 
     @contextmanager
-    def open(self):
+    def open(self, update_access=True):
         """
-        Open the file for reading only.
+        Open the file for reading only. Callers that record the access
+        themselves pass `update_access=False`.
         """
         lock_name = self._lock_manager_get_lock_name()
         try:
             logger.debug('trying to acquire lock: %s', lock_name)
             self._lock = LockingBackend.get_backend().acquire_lock(name=lock_name)
-            CachePartitionFile.objects.filter(pk=self.pk).update(hits=F('hits') + 1)
+            if update_access:
+                self.access_update()
             logger.debug('acquired lock: %s', lock_name)
             self._storage_object = None
             try:
@@ -455,7 +583,7 @@ class CachePartitionFile(models.Model):
                     'cache_partition_file_id=%s full_filename=%s',
                     self.pk, self.full_filename
                 )
-                CachePartitionFile.objects.filter(pk=self.pk).delete()
+                self._delete_database_entry()
                 raise CachePartitionFile.DoesNotExist
             except Exception as exception:
                 logger.error(
@@ -4,7 +4,7 @@ from mayan.apps.smart_settings.classes import SettingNamespace
 
 from .literals import (
     DEFAULT_MAXIMUM_FAILED_PRUNE_ATTEMPTS,
-    DEFAULT_MAXIMUM_NORMAL_PRUNE_ATTEMPTS
+    DEFAULT_MAXIMUM_NORMAL_PRUNE_ATTEMPTS, DEFAULT_PRUNE_BATCH_SIZE
 )
 
 namespace = SettingNamespace(label=_('File caching'), name='file_caching')
@@ -24,3 +24,10 @@ setting_maximum_normal_prune_attempts = namespace.add_setting(
         'space for new a file being requested, before giving up.'
     )
 )
+setting_prune_batch_size = namespace.add_setting(
+    default=DEFAULT_PRUNE_BATCH_SIZE,
+    global_name='FILE_CACHING_PRUNE_BATCH_SIZE', help_text=_(
+        'Number of cache files deleted together, using a single database '
+        'query, when pruning a cache.'
+    )
+)
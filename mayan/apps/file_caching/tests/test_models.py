@@ -198,3 +198,39 @@ class CacheModelTestCase(CacheTestMixin, BaseTestCase):
         self.assertTrue(
             self._test_cache_partition_files[2] in CachePartitionFile.objects.all()
         )
+
+    def test_cache_total_size_tracking(self):
+        self._create_test_cache()
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file(file_size=1)
+        self._create_test_cache_partition_file(file_size=2)
+
+        self.assertEqual(self._test_cache.get_total_size(), 3)
+
+        self._test_cache_partition_files[0].delete()
+
+        self.assertEqual(self._test_cache.get_total_size(), 2)
+
+    def test_cache_prune_multiple_files(self):
+        self._create_test_cache(
+            extra_data={
+                'maximum_size': 4
+            }
+        )
+
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file(file_size=1)
+        self._create_test_cache_partition_file(file_size=1)
+        self._create_test_cache_partition_file(file_size=1)
+
+        with self._test_cache_partition_files[0].open():
+            """Move file #0 to the protected segment."""
+
+        self._test_cache.maximum_size = 2
+        self._test_cache.save()
+
+        self.assertEqual(
+            list(CachePartitionFile.objects.all()),
+            [self._test_cache_partition_files[0]]
+        )
+        self.assertEqual(self._test_cache.get_total_size(), 1)
@@ -25,14 +25,16 @@ class FileMetadataDriver:
     _registry = {}
 
     @classmethod
-    def process_document_file(cls, document_file, user=None):
+    def get_driver_classes(cls, mimetype):
         # Get list of drivers for the document's MIME type
-        driver_classes = cls._registry.get(document_file.mimetype, ())
+        driver_classes = cls._registry.get(mimetype, ())
         # Add wilcard drivers, drivers meant to be executed for all MIME
         # types.
-        driver_classes = driver_classes + tuple(cls._registry.get('*', ()))
+        return tuple(driver_classes) + tuple(cls._registry.get('*', ()))
 
-        for driver_class in driver_classes:
+    @classmethod
+    def process_document_file(cls, document_file, user=None):
+        for driver_class in cls.get_driver_classes(mimetype=document_file.mimetype):
             try:
                 driver = driver_class()
 
@@ -52,6 +54,39 @@ class FileMetadataDriver:
                 # others in the list for this mimetype.
                 return
 
+    @classmethod
+    def process_document_files(cls, document_files, user=None):
+        """
+        Batch version of `process_document_file`. Document files are
+        grouped by their list of drivers and each driver processes its
+        group with a single call to `process_batch`.
+        """
+        document_file_groups = {}
+        for document_file in document_files:
+            document_file_groups.setdefault(
+                cls.get_driver_classes(mimetype=document_file.mimetype), []
+            ).append(document_file)
+
+        for driver_classes, document_file_list in document_file_groups.items():
+            for driver_class in driver_classes:
+                try:
+                    driver = driver_class()
+
+                    driver.initialize()
+
+                    driver.process_batch(document_file_list=document_file_list)
+
+                    for document_file in document_file_list:
+                        event_file_metadata_document_file_finished.commit(
+                            action_object=document_file.document, actor=user,
+                            target=document_file
+                        )
+
+                except FileMetadataDriverError:
+                    """If driver raises error, try next in the list."""
+                else:
+                    break
+
     @classmethod
     def register(cls, mimetypes):
         for mimetype in mimetypes:
@@ -93,6 +128,88 @@ class FileMetadataDriver:
                 key=key, value=value
             )
 
+    def process_batch(self, document_file_list):
+        FileMetadataEntry = apps.get_model(
+            app_label='file_metadata', model_name='FileMetadataEntry'
+        )
+
+        logger.info(
+            'Starting processing %d document files', len(document_file_list)
+        )
+
+        results = self._process_batch(document_file_list=document_file_list)
+
+        self.driver_model.driver_entries.filter(
+            document_file__in=document_file_list
+        ).delete()
+
+        entries = []
+        for document_file in document_file_list:
+            document_file_driver_entry = self.driver_model.driver_entries.create(
+                document_file=document_file
+            )
+
+            for key, value in (results.get(document_file.pk) or {}).items():
+                entries.append(
+                    FileMetadataEntry(
+                        document_file_driver_entry=document_file_driver_entry,
+                        key=key, value=value
+                    )
+                )
+
+        FileMetadataEntry.objects.bulk_create(objs=entries)
+
+        # Bulk writes do not trigger the search indexing signals, index
+        # the document files and the objects related to them with a task
+        # instead.
+        from mayan.apps.documents.search import (
+            search_model_document, search_model_document_file,
+            search_model_document_file_page
+        )
+        from mayan.apps.dynamic_search.tasks import task_index_instances
+
+        DocumentFilePage = apps.get_model(
+            app_label='documents', model_name='DocumentFilePage'
+        )
+
+        document_file_id_list = [
+            document_file.pk for document_file in document_file_list
+        ]
+        document_file_page_id_list = list(
+            DocumentFilePage.objects.filter(
+                document_file_id__in=document_file_id_list
+            ).values_list('pk', flat=True)
+        )
+        document_id_list = list(
+            {
+                document_file.document_id for document_file in document_file_list
+            }
+        )
+
+        for search_model, id_list in (
+            (search_model_document_file_page, document_file_page_id_list),
+            (search_model_document_file, document_file_id_list),
+            (search_model_document, document_id_list)
+        ):
+            if id_list:
+                task_index_instances.apply_async(
+                    kwargs={
+                        'id_list': id_list,
+                        'search_model_full_name': search_model.get_full_name()
+                    }
+                )
+
+    def _process_batch(self, document_file_list):
+        """
+        Return a dictionary of results keyed by document file ID. Drivers
+        able to process several files per call should override this
+        method; the default calls `_process` for each file.
+        """
+        return {
+            document_file.pk: self._process(document_file=document_file)
+            for document_file in document_file_list
+        }
+
     def _process(self, document_file):
         raise NotImplementedError(
             'Your %s class has not defined the required '
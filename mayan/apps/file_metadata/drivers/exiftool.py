@@ -1,20 +1,241 @@
+import atexit
+from contextlib import contextmanager
+import io
 import json
 import logging
+import os
 from pathlib import Path
+import queue
+import select
+import subprocess
+import threading
+import time
 
 import sh
 
+from django.core.files.base import File
 from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.storage.utils import TemporaryDirectory
 
-from ..literals import DEFAULT_EXIF_PATH
+from ..literals import (
+    DEFAULT_EXIF_BATCH_SIZE, DEFAULT_EXIF_PATH, DEFAULT_EXIF_PROCESS_COUNT,
+    DEFAULT_EXIF_STAY_OPEN, DEFAULT_EXIF_TIMEOUT,
+    EXIF_PROCESS_POOL_WAIT_INTERVAL
+)
 from ..classes import FileMetadataDriver
+from ..exceptions import FileMetadataDriverError
 from ..settings import setting_drivers_arguments
 
 logger = logging.getLogger(name=__name__)
 
 
+def get_file_object_path(file_object):
+    """
+    Return the filesystem path of a file object if its content can be read
+    directly from that path. Files wrapped by storage processors
+    (compression, encryption) or by pre open hooks (signatures) return
+    None and need to be copied.
+    """
+    if type(file_object) is File:
+        file_object = file_object.file
+
+    if isinstance(file_object, io.BufferedReader) and isinstance(file_object.name, str):
+        if os.path.isfile(file_object.name):
+            return os.path.abspath(file_object.name)
+
+
+class EXIFToolProcess:
+    """
+    An exiftool process running in `-stay_open` mode. Each call to
+    `execute` sends an argument list terminated by a numbered `-execute`
+    and reads the JSON output up to the matching `{ready}` marker.
+    """
+    def __init__(self, exiftool_path, timeout):
+        self.execute_number = 0
+        self.timeout = timeout
+        self.process = subprocess.Popen(
+            args=(
+                exiftool_path, '-stay_open', 'True', '-@', '-',
+                '-common_args', '-json', '-charset', 'filename=utf8'
+            ), close_fds=True, stderr=subprocess.DEVNULL,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+
+    def _read_until(self, marker):
+        output = bytearray()
+        deadline = time.monotonic() + self.timeout
+        file_descriptor = self.process.stdout.fileno()
+
+        while not output.rstrip().endswith(marker):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise FileMetadataDriverError(
+                    'Timeout waiting for exiftool output.'
+                )
+
+            readable, writable, exceptional = select.select(
+                (file_descriptor,), (), (), remaining
+            )
+            if readable:
+                data = os.read(file_descriptor, 65536)
+                if not data:
+                    raise FileMetadataDriverError(
+                        'exiftool process exited unexpectedly.'
+                    )
+                output.extend(data)
+
+        return bytes(output.rstrip()[:-len(marker)])
+
+    def close(self):
+        try:
+            self.process.stdin.write(b'-stay_open\nFalse\n')
+            self.process.stdin.flush()
+            self.process.wait(timeout=5)
+        except Exception:
+            self.process.kill()
+            self.process.wait()
+
+    def execute(self, path_list):
+        """
+        Return the exiftool results of a list of paths as a list of
+        dictionaries in the same order. Files exiftool could not open have
+        no entry in its output and are returned as None.
+        """
+        self.execute_number += 1
+
+        arguments = list(path_list)
+        arguments.append('-execute{}'.format(self.execute_number))
+
+        self.process.stdin.write(
+            '{}\n'.format('\n'.join(arguments)).encode('utf-8')
+        )
+        self.process.stdin.flush()
+
+        output = self._read_until(
+            marker='{{ready{}}}'.format(self.execute_number).encode('utf-8')
+        ).strip()
+
+        results = {}
+        if output:
+            for result in json.loads(s=output):
+                results[result.get('SourceFile')] = result
+
+        return [results.get(path) for path in path_list]
+
+    def is_alive(self):
+        return self.process.poll() is None
+
+
+class EXIFToolProcessPool:
+    """
+    Per worker process pool of `-stay_open` exiftool processes. Processes
+    are started on demand up to `size` and reused for the life of the
+    worker process.
+    """
+    _instances = {}
+    _instances_lock = threading.Lock()
+    _instances_pid = None
+
+    @classmethod
+    def close_all(cls):
+        with cls._instances_lock:
+            if cls._instances_pid == os.getpid():
+                for pool in cls._instances.values():
+                    pool.close()
+
+            cls._instances = {}
+
+    @classmethod
+    def get(cls, exiftool_path, size, timeout):
+        with cls._instances_lock:
+            if cls._instances_pid != os.getpid():
+                # Processes started by the parent belong to the parent.
+                cls._instances = {}
+                cls._instances_pid = os.getpid()
+
+            key = (exiftool_path, size, timeout)
+            if key not in cls._instances:
+                cls._instances[key] = cls(
+                    exiftool_path=exiftool_path, size=size, timeout=timeout
+                )
+
+            return cls._instances[key]
+
+    def __init__(self, exiftool_path, size, timeout):
+        self.exiftool_path = exiftool_path
+        self.size = size
+        self.timeout = timeout
+
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._process_count = 0
+
+    def _acquire(self):
+        """
+        Return an idle process or start a new one if the pool is not full.
+        Waiters poll to notice slots freed by discarded processes, which
+        are not returned to the idle queue.
+        """
+        while True:
+            with self._lock:
+                if self._idle.empty() and self._process_count < self.size:
+                    self._process_count += 1
+                    try:
+                        return EXIFToolProcess(
+                            exiftool_path=self.exiftool_path,
+                            timeout=self.timeout
+                        )
+                    except Exception:
+                        self._process_count -= 1
+                        raise
+
+            try:
+                exiftool_process = self._idle.get(
+                    timeout=EXIF_PROCESS_POOL_WAIT_INTERVAL
+                )
+            except queue.Empty:
+                continue
+
+            if exiftool_process.is_alive():
+                return exiftool_process
+            else:
+                with self._lock:
+                    self._process_count -= 1
+
+    def close(self):
+        while True:
+            try:
+                process = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            else:
+                process.close()
+
+    @contextmanager
+    def process(self):
+        exiftool_process = self._acquire()
+
+        try:
+            yield exiftool_process
+        except Exception:
+            # The state of the process is unknown, discard it.
+            exiftool_process.process.kill()
+            exiftool_process.process.wait()
+            with self._lock:
+                self._process_count -= 1
+            raise
+        else:
+            if exiftool_process.is_alive():
+                self._idle.put(exiftool_process)
+            else:
+                with self._lock:
+                    self._process_count -= 1
+
+
+atexit.register(EXIFToolProcessPool.close_all)
+
+
 class EXIFToolDriver(FileMetadataDriver):
     label = _('EXIF Tool')
     internal_name = 'exiftool'
@@ -32,42 +253,138 @@ class EXIFToolDriver(FileMetadataDriver):
             else:
                 self.command_exiftool = self.command_exiftool.bake('-j')
 
+    def _materialize(self, document_file, temporary_folder):
+        """
+        Make the document file available under its original filename.
+        Files stored as is are linked in place, everything else is copied.
+        """
+        filename = Path(document_file.filename).name
+        filename = filename.replace('\n', '_').replace('\r', '_') or 'file'
+
+        path_folder = Path(temporary_folder, str(document_file.pk))
+        path_folder.mkdir()
+        path_temporary_file = path_folder / filename
+
+        with document_file.open() as file_object:
+            path_source = get_file_object_path(file_object=file_object)
+
+            if path_source:
+                path_temporary_file.symlink_to(path_source)
+            else:
+                with path_temporary_file.open(mode='xb') as temporary_fileobject:
+                    for chunk in iter(lambda: file_object.read(65536), b''):
+                        temporary_fileobject.write(chunk)
+
+        return str(path_temporary_file)
+
     def _process(self, document_file):
-        if self.command_exiftool:
+        if not self.command_exiftool:
+            logger.warning(
+                'EXIFTool binary not found, not processing document '
+                'file: %s', document_file
+            )
+        elif self.stay_open:
+            return self._process_batch(
+                document_file_list=(document_file,)
+            ).get(document_file.pk)
+        else:
             with TemporaryDirectory() as temporary_folder:
-                path_temporary_file = Path(
-                    temporary_folder, Path(document_file.filename).name
-                )
-
                 try:
-                    with path_temporary_file.open(mode='xb') as temporary_fileobject:
-                        document_file.save_to_file(file_object=temporary_fileobject)
-                        temporary_fileobject.seek(0)
-                        try:
-                            result = self.command_exiftool(temporary_fileobject.name)
-                        except sh.ErrorReturnCode_1 as exception:
-                            result = json.loads(s=exception.stdout)[0]
-                            if result.get('Error', '') == 'Unknown file type':
-                                # Not a fatal error.
-                                return result
-                        else:
-                            return json.loads(s=result.stdout)[0]
+                    path_temporary_file = self._materialize(
+                        document_file=document_file,
+                        temporary_folder=temporary_folder
+                    )
+                    try:
+                        result = self.command_exiftool(path_temporary_file)
+                    except sh.ErrorReturnCode_1 as exception:
+                        result = json.loads(s=exception.stdout)[0]
+                        if result.get('Error', '') == 'Unknown file type':
+                            # Not a fatal error.
+                            return result
+                    else:
+                        return json.loads(s=result.stdout)[0]
                 except Exception as exception:
                     logger.error(
                         'Error processing document file: %s; %s',
                         document_file, exception, exc_info=True
                     )
                     raise
-        else:
-            logger.warning(
-                'EXIFTool binary not found, not processing document '
-                'file: %s', document_file
+
+    def _process_batch(self, document_file_list):
+        if not self.command_exiftool or not self.stay_open:
+            return super()._process_batch(
+                document_file_list=document_file_list
             )
 
+        pool = EXIFToolProcessPool.get(
+            exiftool_path=self.exiftool_path, size=self.process_count,
+            timeout=self.timeout
+        )
+
+        results = {}
+        for index in range(0, len(document_file_list), self.batch_size):
+            document_file_batch = document_file_list[index:index + self.batch_size]
+
+            with TemporaryDirectory() as temporary_folder:
+                try:
+                    path_list = [
+                        self._materialize(
+                            document_file=document_file,
+                            temporary_folder=temporary_folder
+                        ) for document_file in document_file_batch
+                    ]
+
+                    with pool.process() as exiftool_process:
+                        result_list = exiftool_process.execute(
+                            path_list=path_list
+                        )
+                except Exception as exception:
+                    logger.error(
+                        'Error processing document files: %s; %s',
+                        ', '.join(
+                            str(document_file.pk) for document_file in document_file_batch
+                        ), exception, exc_info=True
+                    )
+                    raise
+
+            for document_file, result in zip(document_file_batch, result_list):
+                if result is None:
+                    logger.error(
+                        'exiftool returned no result for document file: %s',
+                        document_file
+                    )
+                elif result.get('Error'):
+                    logger.warning(
+                        'exiftool error for document file: %s; %s',
+                        document_file, result['Error']
+                    )
+
+                results[document_file.pk] = result
+
+        return results
+
     def read_settings(self):
-        self.exiftool_path = setting_drivers_arguments.value.get(
+        driver_arguments = setting_drivers_arguments.value.get(
             'exif_driver', {}
-        ).get('exiftool_path', DEFAULT_EXIF_PATH)
+        )
+
+        self.batch_size = max(
+            1, int(driver_arguments.get('batch_size', DEFAULT_EXIF_BATCH_SIZE))
+        )
+        self.exiftool_path = driver_arguments.get(
+            'exiftool_path', DEFAULT_EXIF_PATH
+        )
+        self.process_count = max(
+            1, int(
+                driver_arguments.get(
+                    'process_count', DEFAULT_EXIF_PROCESS_COUNT
+                )
+            )
+        )
+        self.stay_open = driver_arguments.get(
+            'stay_open', DEFAULT_EXIF_STAY_OPEN
+        )
+        self.timeout = driver_arguments.get('timeout', DEFAULT_EXIF_TIMEOUT)
 
 
 EXIFToolDriver.register(mimetypes=('*',))
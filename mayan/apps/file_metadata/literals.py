@@ -5,6 +5,15 @@ if platform.system() in ('FreeBSD', 'OpenBSD', 'Darwin'):
 else:
     DEFAULT_EXIF_PATH = '/usr/bin/exiftool'
 
+DEFAULT_EXIF_BATCH_SIZE = 100
+DEFAULT_EXIF_PROCESS_COUNT = 1
+DEFAULT_EXIF_STAY_OPEN = True
+DEFAULT_EXIF_TIMEOUT = 600  # 600 seconds, 10 minutes
+
+EXIF_PROCESS_POOL_WAIT_INTERVAL = 1
+
+FILE_METADATA_SUBMIT_BATCH_SIZE = 100
+
 LOCK_EXPIRE = 60 * 10  # Adjust to worst case scenario
 
 DEFAULT_FILE_METADATA_AUTO_PROCESS = True
@@ -11,3 +11,7 @@ queue_file_metadata.add_task_type(
     label=_('Process document file'),
     dotted_path='mayan.apps.file_metadata.tasks.task_process_document_file'
 )
+queue_file_metadata.add_task_type(
+    label=_('Process document file list'),
+    dotted_path='mayan.apps.file_metadata.tasks.task_process_document_file_list'
+)
@@ -46,3 +46,43 @@ def task_process_document_file(document_file_id, user_id=None):
             )
         finally:
             lock.release()
+
+
+@app.task(ignore_result=True)
+def task_process_document_file_list(document_file_id_list, user_id=None):
+    DocumentFile = apps.get_model(
+        app_label='documents', model_name='DocumentFile'
+    )
+    User = get_user_model()
+
+    if user_id:
+        user = User.objects.get(pk=user_id)
+    else:
+        user = None
+
+    lock_list = []
+    try:
+        # Skip the document files already being processed by another
+        # task.
+        document_file_id_locked_list = []
+        for document_file_id in document_file_id_list:
+            lock_id = 'task_process_document_file-%d' % document_file_id
+            try:
+                lock_list.append(
+                    LockingBackend.get_backend().acquire_lock(
+                        name=lock_id, timeout=LOCK_EXPIRE
+                    )
+                )
+            except LockError:
+                logger.debug('unable to obtain lock: %s' % lock_id)
+            else:
+                document_file_id_locked_list.append(document_file_id)
+
+        FileMetadataDriver.process_document_files(
+            document_files=DocumentFile.objects.select_related(
+                'document'
+            ).filter(pk__in=document_file_id_locked_list), user=user
+        )
+    finally:
+        for lock in lock_list:
+            lock.release()
@@ -1,5 +1,12 @@
+import threading
+from unittest import mock
+
 from mayan.apps.documents.tests.base import GenericDocumentTestCase
 from mayan.apps.documents.tests.literals import TEST_FILE_PDF_FILENAME
+from mayan.apps.testing.tests.base import BaseTestCase
+
+from ..classes import FileMetadataDriver
+from ..drivers.exiftool import EXIFToolDriver, EXIFToolProcessPool
 
 from .literals import (
     TEST_PDF_FILE_METADATA_DOTTED_NAME, TEST_PDF_FILE_METADATA_VALUE
@@ -15,3 +22,89 @@ class EXIFToolDriverTestCase(GenericDocumentTestCase):
             dotted_name=TEST_PDF_FILE_METADATA_DOTTED_NAME
         )
         self.assertEqual(value, TEST_PDF_FILE_METADATA_VALUE)
+
+    def test_driver_process_batch(self):
+        self._upload_test_document()
+
+        FileMetadataDriver.process_document_files(
+            document_files=[
+                document.file_latest for document in self._test_documents
+            ]
+        )
+
+        for document in self._test_documents:
+            self.assertEqual(
+                document.get_file_metadata(
+                    dotted_name=TEST_PDF_FILE_METADATA_DOTTED_NAME
+                ), TEST_PDF_FILE_METADATA_VALUE
+            )
+
+    def test_driver_stay_open_matches_single_run(self):
+        driver = EXIFToolDriver()
+        document_file = self._test_document.file_latest
+
+        driver.stay_open = False
+        result = driver._process(document_file=document_file)
+
+        driver.stay_open = True
+        result_stay_open = driver._process(document_file=document_file)
+
+        self.assertEqual(result['FileName'], result_stay_open['FileName'])
+        self.assertEqual(result['FileSize'], result_stay_open['FileSize'])
+
+
+@mock.patch(
+    'mayan.apps.file_metadata.drivers.exiftool.EXIFToolProcess',
+    side_effect=lambda **kwargs: mock.MagicMock()
+)
+class EXIFToolProcessPoolTestCase(BaseTestCase):
+    def _create_test_pool(self):
+        return EXIFToolProcessPool(
+            exiftool_path='exiftool', size=1, timeout=1
+        )
+
+    def test_dead_idle_process_replaced(self, mock_exiftool_process):
+        pool = self._create_test_pool()
+
+        with pool.process() as exiftool_process:
+            """Return the process to the idle queue."""
+
+        exiftool_process.is_alive.return_value = False
+
+        with pool.process() as exiftool_process_new:
+            self.assertIsNot(exiftool_process_new, exiftool_process)
+
+        self.assertEqual(pool._process_count, 1)
+
+    def test_waiter_after_discarded_process(self, mock_exiftool_process):
+        pool = self._create_test_pool()
+
+        event_acquired = threading.Event()
+        event_release = threading.Event()
+
+        def worker():
+            try:
+                with pool.process():
+                    event_acquired.set()
+                    event_release.wait()
+                    raise ValueError
+            except ValueError:
+                """Discard the process."""
+
+        thread_worker = threading.Thread(target=worker)
+        thread_worker.start()
+        event_acquired.wait()
+
+        result = []
+        thread_waiter = threading.Thread(
+            target=lambda: result.append(pool._acquire())
+        )
+        thread_waiter.start()
+
+        event_release.set()
+        thread_worker.join()
+        thread_waiter.join(timeout=10)
+
+        self.assertFalse(thread_waiter.is_alive())
+        self.assertEqual(len(result), 1)
+        self.assertEqual(pool._process_count, 1)
@@ -0,0 +1,85 @@
+from mayan.apps.documents.permissions import (
+    permission_document_file_view, permission_document_view
+)
+from mayan.apps.documents.search import (
+    search_model_document, search_model_document_file,
+    search_model_document_file_page
+)
+from mayan.apps.documents.tests.base import GenericDocumentViewTestCase
+from mayan.apps.documents.tests.literals import TEST_FILE_PDF_FILENAME
+from mayan.apps.dynamic_search.tests.mixins import SearchTestMixin
+
+from ..classes import FileMetadataDriver
+
+from .literals import TEST_PDF_FILE_METADATA_VALUE
+
+
+class FileMetadataBatchSearchTestCase(
+    SearchTestMixin, GenericDocumentViewTestCase
+):
+    _test_document_filename = TEST_FILE_PDF_FILENAME
+    auto_upload_test_document = False
+
+    def setUp(self):
+        super().setUp()
+        self._test_document_type.file_metadata_settings.auto_process = False
+        self._test_document_type.file_metadata_settings.save()
+
+        self._upload_test_document()
+
+        FileMetadataDriver.process_document_files(
+            document_files=[self._test_document_file]
+        )
+
+    def test_search_model_document_batch_with_access(self):
+        self.grant_access(
+            obj=self._test_document, permission=permission_document_view
+        )
+
+        self._clear_events()
+
+        queryset = self.search_backend.search(
+            search_model=search_model_document, query={
+                'files__file_metadata_drivers__entries__value': TEST_PDF_FILE_METADATA_VALUE
+            }, user=self._test_case_user
+        )
+        self.assertTrue(self._test_document in queryset)
+
+        events = self._get_test_events()
+        self.assertEqual(events.count(), 0)
+
+    def test_search_model_document_file_batch_with_access(self):
+        self.grant_access(
+            obj=self._test_document,
+            permission=permission_document_file_view
+        )
+
+        self._clear_events()
+
+        queryset = self.search_backend.search(
+            search_model=search_model_document_file, query={
+                'file_metadata_drivers__entries__value': TEST_PDF_FILE_METADATA_VALUE
+            }, user=self._test_case_user
+        )
+        self.assertTrue(self._test_document_file in queryset)
+
+        events = self._get_test_events()
+        self.assertEqual(events.count(), 0)
+
+    def test_search_model_document_file_page_batch_with_access(self):
+        self.grant_access(
+            obj=self._test_document,
+            permission=permission_document_file_view
+        )
+
+        self._clear_events()
+
+        queryset = self.search_backend.search(
+            search_model=search_model_document_file_page, query={
+                'document_file__file_metadata_drivers__entries__value': TEST_PDF_FILE_METADATA_VALUE
+            }, user=self._test_case_user
+        )
+        self.assertTrue(self._test_document_file_page in queryset)
+
+        events = self._get_test_events()
+        self.assertEqual(events.count(), 0)
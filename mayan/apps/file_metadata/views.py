@@ -21,12 +21,15 @@ from .icons import (
     icon_document_type_file_metadata_submit, icon_file_metadata,
     icon_file_metadata_driver_list, icon_file_metadata_driver_attribute_list
 )
+from .events import event_file_metadata_document_file_submitted
 from .links import link_document_file_metadata_single_submit
+from .literals import FILE_METADATA_SUBMIT_BATCH_SIZE
 from .models import DocumentFileDriverEntry
 from .permissions import (
     permission_document_type_file_metadata_setup,
     permission_file_metadata_submit, permission_file_metadata_view
 )
+from .tasks import task_process_document_file_list
 
 
 class DocumentFileDriverListView(
@@ -190,13 +193,30 @@ class DocumentTypeFileMetadataSubmitView(FormView):
         document_queryset = Document.valid.all()
 
         count = 0
+        document_file_id_list = []
         for document_type in form.cleaned_data['document_type']:
-            for document in document_type.documents.filter(pk__in=document_queryset.values('pk')):
-                document.submit_for_file_metadata_processing(
-                    _user=self.request.user
-                )
+            for document in document_type.documents.filter(pk__in=document_queryset.values('pk')).select_related('latest_file'):
+                latest_file = document.file_latest
+                # Don't error out if document has no file.
+                if latest_file:
+                    event_file_metadata_document_file_submitted.commit(
+                        action_object=document, actor=self.request.user,
+                        target=latest_file
+                    )
+                    document_file_id_list.append(latest_file.pk)
                 count += 1
 
+        # Submit the files in batches to process each batch with a single
+        # call of the drivers.
+        for index in range(0, len(document_file_id_list), FILE_METADATA_SUBMIT_BATCH_SIZE):
+            task_process_document_file_list.apply_async(
+                kwargs={
+                    'document_file_id_list': document_file_id_list[
+                        index:index + FILE_METADATA_SUBMIT_BATCH_SIZE
+                    ], 'user_id': self.request.user.pk
+                }
+            )
+
         messages.success(
             message=_(
                 '%(count)d documents added to the file metadata processing '
@@ -47,7 +47,9 @@ class HeadlessMyUploadsView(generics.ListAPIView):
             target_id_int=Cast('target_object_id', IntegerField())
         ).values_list('target_id_int', flat=True).distinct()
 
-        queryset = Document.valid.filter(pk__in=doc_ids)
+        queryset = Document.valid.filter(pk__in=doc_ids).select_related(
+            'active_version', 'document_type', 'latest_file'
+        ).prefetch_related('active_version__version_pages', 'tags')
 
         queryset = AccessControlList.objects.restrict_queryset(
             permission=permission_document_view,
@@ -199,7 +199,7 @@ class MetadataApp(MayanAppConfig):
 
         model_query_fields_document = ModelQueryFields(model=Document)
         model_query_fields_document.add_prefetch_related_field(
-            field_name='metadata'
+            field_name='metadata__metadata_type'
         )
 
         # Columns
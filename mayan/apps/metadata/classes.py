@@ -13,6 +13,15 @@ class DocumentMetadataHelper(PropertyHelper):
         return DocumentMetadataHelper(*args, **kwargs)
 
     def get_result(self, name):
+        # Use the prefetched entries when available, as when indexing
+        # documents in bulk.
+        if 'metadata' in getattr(self.instance, '_prefetched_objects_cache', {}):
+            for document_metadata in self.instance.metadata.all():
+                if document_metadata.metadata_type.name == name:
+                    return document_metadata.value
+
+            raise self.instance.metadata.model.DoesNotExist
+
         return self.instance.metadata.get(metadata_type__name=name).value
 
 
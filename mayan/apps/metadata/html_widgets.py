@@ -1,6 +1,6 @@
-from django.apps import apps
 from django.core.exceptions import PermissionDenied
 
+from mayan.apps.navigation.classes import PermissionResolver
 from mayan.apps.navigation.html_widgets import SourceColumnWidget
 
 from .permissions import permission_document_metadata_view
@@ -13,15 +13,11 @@ class DocumentMetadataWidget(SourceColumnWidget):
     template_name = 'metadata/document_metadata_widget.html'
 
     def get_extra_context(self):
-        AccessControlList = apps.get_model(
-            app_label='acls', model_name='AccessControlList'
-        )
-
         try:
-            AccessControlList.objects.check_access(
-                obj=self.value,
-                permissions=(permission_document_metadata_view,),
-                user=self.request.user
+            PermissionResolver.get_for_request(
+                request=self.request
+            ).check_access(
+                obj=self.value, permissions=(permission_document_metadata_view,)
             )
         except PermissionDenied:
             queryset = self.value.metadata.none()
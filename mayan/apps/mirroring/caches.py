@@ -4,7 +4,8 @@ from django.core.cache import caches
 from django.utils.encoding import force_bytes
 
 from .settings import (
-    setting_document_lookup_cache_timeout, setting_node_lookup_cache_timeout
+    setting_attribute_cache_timeout, setting_document_lookup_cache_timeout,
+    setting_node_lookup_cache_timeout
 )
 
 
@@ -13,16 +14,30 @@ class MirrorFilesystemCache:
     def get_key_hash(key):
         return hashlib.sha256(force_bytes(s=key)).hexdigest()
 
+    @staticmethod
+    def get_attributes_key(path):
+        return MirrorFilesystemCache.get_key_hash(
+            key='attributes_{}'.format(path)
+        )
+
     @staticmethod
     def get_document_key(document):
+        return MirrorFilesystemCache.get_document_pk_key(pk=document.pk)
+
+    @staticmethod
+    def get_document_pk_key(pk):
         return MirrorFilesystemCache.get_key_hash(
-            key='document_pk_{}'.format(document.pk)
+            key='document_pk_{}'.format(pk)
         )
 
     @staticmethod
     def get_node_key(node):
+        return MirrorFilesystemCache.get_node_pk_key(pk=node.pk)
+
+    @staticmethod
+    def get_node_pk_key(pk):
         return MirrorFilesystemCache.get_key_hash(
-            key='node_pk_{}'.format(node.pk)
+            key='node_pk_{}'.format(pk)
         )
 
     @staticmethod
@@ -34,32 +49,46 @@ class MirrorFilesystemCache:
     def __init__(self, name='default'):
         self.cache = caches[name]
 
-    def clear_all(self):
-        self.cache.clear()
-
-    def clear_node(self, node):
-        node_key = MirrorFilesystemCache.get_node_key(node=node)
-        path_cache = self.cache.get(key=node_key)
+    def _clear_key(self, key):
+        path_cache = self.cache.get(key=key)
         if path_cache:
             path = path_cache.get('path')
             if path:
                 self.clean_path(path=path)
 
-        self.cache.delete(key=node_key)
+            self.cache.delete_many(
+                keys=[
+                    MirrorFilesystemCache.get_attributes_key(path=path) for path in path_cache.get('attribute_paths', ())
+                ]
+            )
+
+        self.cache.delete(key=key)
+
+    def clear_all(self):
+        self.cache.clear()
+
+    def clear_node(self, node):
+        self._clear_key(key=MirrorFilesystemCache.get_node_key(node=node))
 
     def clear_document(self, document):
-        document_key = MirrorFilesystemCache.get_document_key(document=document)
-        path_cache = self.cache.get(key=document_key)
-        if path_cache:
-            path = path_cache.get('path')
-            if path:
-                self.clean_path(path=path)
+        self.clear_document_pk(pk=document.pk)
 
-        self.cache.delete(key=document_key)
+    def clear_document_pk(self, pk):
+        self._clear_key(
+            key=MirrorFilesystemCache.get_document_pk_key(pk=pk)
+        )
 
     def clean_path(self, path):
-        self.cache.delete(
-            key=MirrorFilesystemCache.get_path_key(path=path)
+        self.cache.delete_many(
+            keys=(
+                MirrorFilesystemCache.get_attributes_key(path=path),
+                MirrorFilesystemCache.get_path_key(path=path)
+            )
+        )
+
+    def get_attributes(self, path):
+        return self.cache.get(
+            key=MirrorFilesystemCache.get_attributes_key(path=path)
         )
 
     def get_path(self, path):
@@ -67,28 +96,80 @@ class MirrorFilesystemCache:
             key=MirrorFilesystemCache.get_path_key(path=path)
         )
 
+    def set_attributes_many(self, attributes_dictionary):
+        """
+        Cache the attributes of several paths at once. Each attributes
+        dictionary must include a `document_pk` or a `node_pk`. The paths
+        are recorded in the entry of their document or node so that they
+        are invalidated when the document or node changes.
+        """
+        timeout = setting_attribute_cache_timeout.value
+
+        owner_paths = {}
+        for path, attributes in attributes_dictionary.items():
+            if 'document_pk' in attributes:
+                owner_key = MirrorFilesystemCache.get_document_pk_key(
+                    pk=attributes['document_pk']
+                )
+            else:
+                owner_key = MirrorFilesystemCache.get_node_pk_key(
+                    pk=attributes['node_pk']
+                )
+
+            owner_paths.setdefault(owner_key, []).append(path)
+
+        owner_values = self.cache.get_many(keys=owner_paths.keys())
+        for owner_key, path_list in owner_paths.items():
+            value = owner_values.get(owner_key, {})
+            value['attribute_paths'] = sorted(
+                set(value.get('attribute_paths', ())).union(path_list)
+            )
+            owner_values[owner_key] = value
+
+        self.cache.set_many(
+            data={
+                MirrorFilesystemCache.get_attributes_key(
+                    path=path
+                ): attributes for path, attributes in attributes_dictionary.items()
+            }, timeout=timeout
+        )
+        self.cache.set_many(
+            data=owner_values, timeout=max(
+                timeout, setting_document_lookup_cache_timeout.value,
+                setting_node_lookup_cache_timeout.value
+            )
+        )
+
     def set_path(self, path, document=None, node=None):
         # Must provide a document_pk or a node_pk
         # not both.
         if document:
+            document_key = MirrorFilesystemCache.get_document_key(
+                document=document
+            )
+            value = self.cache.get(key=document_key, default={})
+            value['path'] = path
+
             self.cache.set(
                 key=MirrorFilesystemCache.get_path_key(path=path),
                 value={'document_pk': document.pk},
                 timeout=setting_document_lookup_cache_timeout.value
             )
             self.cache.set(
-                key=MirrorFilesystemCache.get_document_key(document=document),
-                value={'path': path},
+                key=document_key, value=value,
                 timeout=setting_document_lookup_cache_timeout.value
             )
         elif node:
+            node_key = MirrorFilesystemCache.get_node_key(node=node)
+            value = self.cache.get(key=node_key, default={})
+            value['path'] = path
+
             self.cache.set(
                 key=MirrorFilesystemCache.get_path_key(path=path),
                 value={'node_pk': node.pk},
                 timeout=setting_node_lookup_cache_timeout.value
             )
             self.cache.set(
-                key=MirrorFilesystemCache.get_node_key(node=node),
-                value={'path': path},
+                key=node_key, value=value,
                 timeout=setting_node_lookup_cache_timeout.value
             )
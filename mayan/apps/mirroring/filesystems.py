@@ -12,10 +12,11 @@ from django.db.models import (
 )
 from django.db.models.functions import Concat
 
-from mayan.apps.documents.models import Document
+from mayan.apps.documents.models import Document, DocumentFile
 
 from .literals import (
-    MAX_FILE_DESCRIPTOR, MIN_FILE_DESCRIPTOR, FILE_MODE, DIRECTORY_MODE
+    MAX_FILE_DESCRIPTOR, MIN_FILE_DESCRIPTOR, FILE_MODE, DIRECTORY_MODE,
+    READ_AHEAD_SIZE
 )
 from .runtime import cache
 
@@ -27,6 +28,53 @@ class Trim(Transform):
     lookup_name = 'trim'
 
 
+class MirrorFilesystemFile:
+    """
+    Read ahead wrapper of an open document file. Reads are served from an
+    in memory buffer that is refilled with at least `read_ahead_size`
+    bytes. The storage file is only seeked on non sequential access.
+    """
+    def __init__(self, file_object, read_ahead_size=READ_AHEAD_SIZE):
+        self.buffer = b''
+        self.buffer_offset = 0
+        self.file_object = file_object
+        self.file_position = 0
+        self.read_ahead_size = read_ahead_size
+
+    def close(self):
+        self.buffer = b''
+        self.file_object.close()
+
+    def read(self, offset, size):
+        buffer_end = self.buffer_offset + len(self.buffer)
+
+        if self.buffer_offset <= offset and offset + size <= buffer_end:
+            start = offset - self.buffer_offset
+            return self.buffer[start:start + size]
+
+        # Keep the part of the buffer that was requested and read only
+        # what is missing.
+        if self.buffer_offset <= offset < buffer_end:
+            prefix = self.buffer[offset - self.buffer_offset:]
+            read_offset = buffer_end
+        else:
+            prefix = b''
+            read_offset = offset
+
+        if read_offset != self.file_position:
+            self.file_object.seek(read_offset)
+
+        data = self.file_object.read(
+            max(size - len(prefix), self.read_ahead_size)
+        )
+        self.file_position = read_offset + len(data)
+
+        self.buffer = prefix + data
+        self.buffer_offset = offset
+
+        return self.buffer[:size]
+
+
 class MirrorFilesystem(LoggingMixIn, Operations):
     @staticmethod
     def _clean_queryset(queryset, source_field_name, destination_field_name):
@@ -115,6 +163,36 @@ class MirrorFilesystem(LoggingMixIn, Operations):
             }
         )
 
+    @staticmethod
+    def _get_child_path(path, name):
+        return '{}/{}'.format(path.rstrip('/'), name)
+
+    @staticmethod
+    def _get_document_attributes(
+        document_pk, datetime_created, file_latest_pk, file_latest_size,
+        file_latest_timestamp
+    ):
+        st_ctime = MirrorFilesystem._get_timestamp(value=datetime_created)
+
+        if file_latest_timestamp:
+            st_mtime = MirrorFilesystem._get_timestamp(
+                value=file_latest_timestamp
+            )
+        else:
+            st_mtime = st_ctime
+
+        return {
+            'document_pk': document_pk, 'file_latest_pk': file_latest_pk,
+            'st_ctime': st_ctime, 'st_mtime': st_mtime,
+            'st_size': file_latest_size or 0
+        }
+
+    @staticmethod
+    def _get_timestamp(value):
+        return (
+            value.replace(tzinfo=None) - value.utcoffset() - datetime.datetime(1970, 1, 1)
+        ).total_seconds()
+
     def _get_next_file_descriptor(self):
         while(True):
             self.file_descriptor_count += 1
@@ -217,25 +295,46 @@ class MirrorFilesystem(LoggingMixIn, Operations):
         logger.debug('path: %s, fh: %s', path, fh)
 
         now = time()
-        result = self._path_to_node(path=path, directory_only=False)
 
-        if not result:
-            raise FuseOSError(ENOENT)
+        # Attributes of the paths listed by `readdir` are cached to avoid
+        # resolving each path again.
+        attributes = cache.get_attributes(path=path)
+
+        if not attributes:
+            result = self._path_to_node(path=path, directory_only=False)
+
+            if not result:
+                raise FuseOSError(ENOENT)
+
+            if isinstance(result, Document):
+                file_latest = result.file_latest
+
+                attributes = MirrorFilesystem._get_document_attributes(
+                    datetime_created=result.datetime_created,
+                    document_pk=result.pk, file_latest_pk=getattr(
+                        file_latest, 'pk', None
+                    ), file_latest_size=getattr(file_latest, 'size', None),
+                    file_latest_timestamp=getattr(
+                        file_latest, 'timestamp', None
+                    )
+                )
+            else:
+                attributes = {'node_pk': result.pk}
+
+            cache.set_attributes_many(
+                attributes_dictionary={path: attributes}
+            )
 
         # st_nlink tracks the number of hard links to a file.
         # Must be 2 for directories and at least 1 for files
         # https://www.gnu.org/software/libc/manual/html_node/Attribute-Meanings.html
-        if isinstance(result, Document):
+        if 'document_pk' in attributes:
             function_result = {
                 'st_mode': (S_IFREG | FILE_MODE),
-                'st_ctime': (
-                    result.datetime_created.replace(tzinfo=None) - result.datetime_created.utcoffset() - datetime.datetime(1970, 1, 1)
-                ).total_seconds(),
-                'st_mtime': (
-                    result.file_latest.timestamp.replace(tzinfo=None) - result.file_latest.timestamp.utcoffset() - datetime.datetime(1970, 1, 1)
-                ).total_seconds(),
+                'st_ctime': attributes['st_ctime'],
+                'st_mtime': attributes['st_mtime'],
                 'st_atime': now,
-                'st_size': result.file_latest.size or 0,
+                'st_size': attributes['st_size'],
                 'st_nlink': 1
             }
         else:
@@ -248,18 +347,31 @@ class MirrorFilesystem(LoggingMixIn, Operations):
         return function_result
 
     def open(self, path, flags):
-        result = self._path_to_node(path=path, directory_only=False)
+        document_file = None
+
+        attributes = cache.get_attributes(path=path)
+        if attributes and attributes.get('file_latest_pk'):
+            document_file = DocumentFile.objects.filter(
+                pk=attributes['file_latest_pk']
+            ).first()
+
+        if not document_file:
+            result = self._path_to_node(path=path, directory_only=False)
+
+            if isinstance(result, Document):
+                document_file = result.file_latest
 
-        if isinstance(result, Document):
+        if document_file:
             next_file_descriptor = self._get_next_file_descriptor()
-            self.file_descriptors[next_file_descriptor] = result.file_latest.open()
+            self.file_descriptors[next_file_descriptor] = MirrorFilesystemFile(
+                file_object=document_file.open()
+            )
             return next_file_descriptor
         else:
             raise FuseOSError(ENOENT)
 
     def read(self, path, size, offset, fh):
-        self.file_descriptors[fh].seek(offset)
-        return self.file_descriptors[fh].read(size)
+        return self.file_descriptors[fh].read(offset=offset, size=size)
 
     def readdir(self, path, fh):
         logger.debug('path: %s', path)
@@ -272,6 +384,10 @@ class MirrorFilesystem(LoggingMixIn, Operations):
         yield '.'
         yield '..'
 
+        # The attributes of the children are fetched with the listing and
+        # cached for the `getattr` calls that usually follow.
+        attributes_dictionary = {}
+
         # Serve nodes as directories.
         queryset = MirrorFilesystem._clean_queryset(
             queryset=node.get_children(),
@@ -279,8 +395,12 @@ class MirrorFilesystem(LoggingMixIn, Operations):
             destination_field_name='value_clean'
         )
 
-        for value in queryset.values_list('value_clean', flat=True):
-            yield value
+        node_value_list = []
+        for pk, value in queryset.values_list('pk', 'value_clean'):
+            attributes_dictionary[
+                MirrorFilesystem._get_child_path(path=path, name=value)
+            ] = {'node_pk': pk}
+            node_value_list.append(value)
 
         # Then serve nodes documents as files.
         queryset = MirrorFilesystem._clean_queryset(
@@ -288,9 +408,30 @@ class MirrorFilesystem(LoggingMixIn, Operations):
             destination_field_name='label_clean'
         )
 
-        for value in queryset.values_list('label_clean', flat=True):
+        document_value_list = []
+        for pk, value, datetime_created, file_latest_pk, file_latest_size, file_latest_timestamp in queryset.values_list('pk', 'label_clean', 'datetime_created', 'latest_file_id', 'latest_file__size', 'latest_file__timestamp'):
+            attributes_dictionary[
+                MirrorFilesystem._get_child_path(path=path, name=value)
+            ] = MirrorFilesystem._get_document_attributes(
+                datetime_created=datetime_created, document_pk=pk,
+                file_latest_pk=file_latest_pk,
+                file_latest_size=file_latest_size,
+                file_latest_timestamp=file_latest_timestamp
+            )
+            document_value_list.append(value)
+
+        if attributes_dictionary:
+            cache.set_attributes_many(
+                attributes_dictionary=attributes_dictionary
+            )
+
+        for value in node_value_list:
+            yield value
+
+        for value in document_value_list:
             yield value
 
     def release(self, path, fh):
+        self.file_descriptors[fh].close()
         self.file_descriptors[fh] = None
         del(self.file_descriptors[fh])
@@ -5,5 +5,17 @@ def handler_document_cache_delete(sender, **kwargs):
     cache.clear_document(document=kwargs['instance'])
 
 
+def handler_document_file_cache_delete(sender, **kwargs):
+    cache.clear_document_pk(pk=kwargs['instance'].document_id)
+
+
 def handler_node_cache_delete(sender, **kwargs):
     cache.clear_node(node=kwargs['instance'])
+
+
+def handler_node_documents_cache_delete(sender, **kwargs):
+    if kwargs['action'] in ('post_add', 'post_clear', 'post_remove'):
+        if kwargs['reverse']:
+            cache.clear_document(document=kwargs['instance'])
+        else:
+            cache.clear_node(node=kwargs['instance'])
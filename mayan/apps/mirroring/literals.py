@@ -1,3 +1,4 @@
+DEFAULT_MIRRORING_ATTRIBUTE_CACHE_TIMEOUT = 10
 DEFAULT_MIRRORING_DOCUMENT_CACHE_LOOKUP_TIMEOUT = 10
 DEFAULT_MIRRORING_NODE_CACHE_LOOKUP_TIMEOUT = 10
 
@@ -5,3 +6,6 @@ FILE_MODE = DIRECTORY_MODE = 0o555
 
 MAX_FILE_DESCRIPTOR = 65535
 MIN_FILE_DESCRIPTOR = 0
+
+# Minimum amount of bytes read from the storage file on each buffer miss.
+READ_AHEAD_SIZE = 1048576
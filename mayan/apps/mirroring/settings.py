@@ -3,12 +3,21 @@ from django.utils.translation import ugettext_lazy as _
 from mayan.apps.smart_settings.classes import SettingNamespace
 
 from .literals import (
+    DEFAULT_MIRRORING_ATTRIBUTE_CACHE_TIMEOUT,
     DEFAULT_MIRRORING_DOCUMENT_CACHE_LOOKUP_TIMEOUT,
     DEFAULT_MIRRORING_NODE_CACHE_LOOKUP_TIMEOUT
 )
 
 namespace = SettingNamespace(label=_('Mirroring'), name='mirroring')
 
+setting_attribute_cache_timeout = namespace.add_setting(
+    default=DEFAULT_MIRRORING_ATTRIBUTE_CACHE_TIMEOUT,
+    global_name='MIRRORING_ATTRIBUTE_CACHE_TIMEOUT',
+    help_text=_(
+        'Time in seconds to cache the attributes of the documents and '
+        'index nodes listed in a directory.'
+    )
+)
 setting_document_lookup_cache_timeout = namespace.add_setting(
     default=DEFAULT_MIRRORING_DOCUMENT_CACHE_LOOKUP_TIMEOUT,
     global_name='MIRRORING_DOCUMENT_CACHE_LOOKUP_TIMEOUT',
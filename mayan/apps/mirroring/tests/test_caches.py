@@ -38,6 +38,29 @@ class MirrorFilesystemCacheTestCase(BaseTestCase):
 
         self.assertEqual(None, self.cache.get_path(path=TEST_PATH))
 
+    def test_set_attributes_document_clear_document(self):
+        self.cache.set_attributes_many(
+            attributes_dictionary={
+                TEST_PATH: {'document_pk': TEST_DOCUMENT_PK}
+            }
+        )
+        self.assertEqual(
+            {'document_pk': TEST_DOCUMENT_PK},
+            self.cache.get_attributes(path=TEST_PATH)
+        )
+
+        self.cache.clear_document(document=self._test_document)
+
+        self.assertEqual(None, self.cache.get_attributes(path=TEST_PATH))
+
+    def test_set_attributes_node_clear_node(self):
+        self.cache.set_attributes_many(
+            attributes_dictionary={TEST_PATH: {'node_pk': TEST_NODE_PK}}
+        )
+        self.cache.clear_node(node=self.node)
+
+        self.assertEqual(None, self.cache.get_attributes(path=TEST_PATH))
+
     def test_set_path_node(self):
         self.cache.set_path(path=TEST_PATH, node=self.node)
         self.assertEqual(
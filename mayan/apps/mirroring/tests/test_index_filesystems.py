@@ -140,6 +140,59 @@ class IndexInstanceNodeMirroringTestCase(
             self._test_document.file_latest.checksum
         )
 
+    def test_document_read_sequential(self):
+        self._create_test_index_template_node(
+            expression=TEST_NODE_EXPRESSION
+        )
+
+        self._upload_test_document()
+
+        test_filesystem = self._get_test_filesystem()
+
+        file_handle = test_filesystem.open(
+            path='/{}/{}'.format(
+                TEST_NODE_EXPRESSION, self._test_document.label
+            ), flags='rb'
+        )
+
+        content = b''
+        while True:
+            data = test_filesystem.read(
+                fh=file_handle, offset=len(content), path=None, size=100
+            )
+            if not data:
+                break
+            content += data
+
+        test_filesystem.release(fh=file_handle, path=None)
+
+        self.assertEqual(
+            hashlib.sha256(content).hexdigest(),
+            self._test_document.file_latest.checksum
+        )
+
+    def test_readdir_attribute_cache(self):
+        self._create_test_index_template_node(
+            expression=TEST_NODE_EXPRESSION
+        )
+
+        self._upload_test_document()
+
+        test_filesystem = self._get_test_filesystem()
+
+        list(test_filesystem.readdir('/{}'.format(TEST_NODE_EXPRESSION), ''))
+
+        with self.assertNumQueries(0):
+            result = test_filesystem.getattr(
+                path='/{}/{}'.format(
+                    TEST_NODE_EXPRESSION, self._test_document.label
+                )
+            )
+
+        self.assertEqual(
+            result['st_size'], self._test_document.file_latest.size
+        )
+
     def test_multiline_indexes(self):
         self._create_test_index_template_node(
             expression=TEST_NODE_EXPRESSION_MULTILINE
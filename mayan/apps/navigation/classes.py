@@ -9,12 +9,13 @@ from django.contrib.admin.utils import (
 from django.core.exceptions import (
     FieldDoesNotExist, ImproperlyConfigured, PermissionDenied
 )
+from django.db.models import QuerySet
 from django.db.models.constants import LOOKUP_SEP
 from django.template import RequestContext, Variable, VariableDoesNotExist
 from django.template.defaulttags import URLNode
 from django.urls import resolve, reverse
 from django.utils.encoding import force_str, force_text
-from django.utils.translation import ugettext_lazy as _
+from django.utils.translation import ugettext, ugettext_lazy as _
 
 from mayan.apps.common.settings import setting_home_view
 from mayan.apps.common.utils import get_related_field, resolve_attribute
@@ -79,10 +80,6 @@ class Link(TemplateObjectMixin):
             self.__class__._registry[name] = self
 
     def resolve(self, context=None, request=None, resolved_object=None):
-        AccessControlList = apps.get_model(
-            app_label='acls', model_name='AccessControlList'
-        )
-
         if not context and not request:
             raise ImproperlyConfigured(
                 'Must provide a context or a request in order to resolve the '
@@ -108,18 +105,25 @@ class Link(TemplateObjectMixin):
         # If this link has a required permission check that the user has it
         # too.
         if self.permissions:
+            permission_resolver = PermissionResolver.get_for_request(
+                request=request
+            )
+
             if resolved_object:
+                permission_resolver.add_object_list(
+                    object_list=context.get('object_list')
+                )
+
                 try:
-                    AccessControlList.objects.check_access(
-                        obj=resolved_object, permissions=self.permissions,
-                        user=request.user
+                    permission_resolver.check_access(
+                        obj=resolved_object, permissions=self.permissions
                     )
                 except PermissionDenied:
                     return None
             else:
                 try:
-                    Permission.check_user_permissions(
-                        permissions=self.permissions, user=request.user
+                    permission_resolver.check_user_permissions(
+                        permissions=self.permissions
                     )
                 except PermissionDenied:
                     return None
@@ -597,6 +601,132 @@ class Menu(TemplateObjectMixin):
             )
 
 
+class PermissionResolver:
+    """
+    Request scoped cache of access checks. Objects of the lists being
+    rendered are registered as candidates and the first check for a model
+    and permission answers it for all the candidates of that model with a
+    single query. Results are kept for the rest of the request.
+    """
+    @classmethod
+    def get_for_request(cls, request):
+        try:
+            return request._permission_resolver
+        except AttributeError:
+            request._permission_resolver = cls(user=request.user)
+            return request._permission_resolver
+
+    def __init__(self, user):
+        self.user = user
+        self._access_cache = {}
+        self._candidates = {}
+        self._object_list_ids = set()
+        self._user_permission_cache = {}
+
+    def _resolve_access(self, model, obj, permission):
+        AccessControlList = apps.get_model(
+            app_label='acls', model_name='AccessControlList'
+        )
+
+        pk_set = {
+            pk for pk in self._candidates.get(model, ())
+            if (model, permission, pk) not in self._access_cache
+        }
+        pk_set.add(obj.pk)
+
+        if self.has_user_permission(permission=permission):
+            # Global access through a role, no need to check the ACLs.
+            allowed_pk_set = pk_set
+        else:
+            allowed_pk_set = AccessControlList.objects.get_allowed_pk_set(
+                model=model, permission=permission, pk_list=pk_set,
+                user=self.user
+            )
+
+        for pk in pk_set:
+            self._access_cache[(model, permission, pk)] = pk in allowed_pk_set
+
+    def add_object_list(self, object_list):
+        """
+        Register the objects of a list as candidates for the batched
+        access checks. Querysets are only used if already evaluated.
+        """
+        if object_list is None or id(object_list) in self._object_list_ids:
+            return
+
+        self._object_list_ids.add(id(object_list))
+
+        if isinstance(object_list, QuerySet):
+            object_list = object_list._result_cache
+
+            if object_list is None:
+                return
+
+        try:
+            iterator = iter(object_list)
+        except TypeError:
+            return
+
+        for obj in iterator:
+            meta = getattr(obj, '_meta', None)
+            if meta and obj.pk is not None:
+                self._candidates.setdefault(meta.model, set()).add(obj.pk)
+
+    def check_access(self, obj, permissions):
+        """
+        Same contract as `AccessControlList.objects.check_access`.
+        """
+        meta = getattr(obj, '_meta', None)
+
+        if not meta:
+            return True
+
+        if self.user.is_authenticated:
+            for permission in permissions:
+                key = (meta.model, permission, obj.pk)
+
+                if key not in self._access_cache:
+                    self._resolve_access(
+                        model=meta.model, obj=obj, permission=permission
+                    )
+
+                # Default relationship betweens permissions is OR.
+                if self._access_cache[key]:
+                    return True
+
+        raise PermissionDenied(
+            ugettext(message='Insufficient access for: %s') % force_text(
+                s=obj
+            )
+        )
+
+    def check_user_permissions(self, permissions):
+        """
+        Same contract as `Permission.check_user_permissions`.
+        """
+        for permission in permissions:
+            if self.has_user_permission(permission=permission):
+                return True
+
+        raise PermissionDenied(_('Insufficient permissions.'))
+
+    def has_user_permission(self, permission):
+        try:
+            return self._user_permission_cache[permission]
+        except KeyError:
+            try:
+                Permission.check_user_permissions(
+                    permissions=(permission,), user=self.user
+                )
+            except PermissionDenied:
+                result = False
+            else:
+                result = True
+
+            self._user_permission_cache[permission] = result
+            return result
+
+
 class ResolvedLink:
     def __init__(self, link, current_view_name, html_extra_attributes=None):
         self.context = None
@@ -947,6 +1077,10 @@ class SourceColumn(TemplateObjectMixin):
                 Don't attempt to render and return the value if any.
                 """
             else:
+                PermissionResolver.get_for_request(
+                    request=request
+                ).add_object_list(object_list=context.get('object_list'))
+
                 widget_instance = self.widget(
                     column=self, request=request
                 )
@@ -1,3 +1,4 @@
+from django.core.exceptions import PermissionDenied
 from django.template import Context
 from django.urls import reverse
 
@@ -7,7 +8,7 @@ from mayan.apps.acls.classes import ModelPermission
 from mayan.apps.permissions import Permission, PermissionNamespace
 from mayan.apps.testing.tests.base import GenericViewTestCase
 
-from ..classes import Link, Menu, SourceColumn
+from ..classes import Link, Menu, PermissionResolver, SourceColumn
 
 from .literals import (
     TEST_PERMISSION_NAMESPACE_NAME, TEST_PERMISSION_NAMESPACE_TEXT,
@@ -149,6 +150,67 @@ class LinkClassTestCase(GenericViewTestCase):
         )
 
 
+class PermissionResolverTestCase(GenericViewTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self._test_object = self._test_case_group
+
+        self.add_test_view(test_object=self._test_object)
+
+        self.namespace = PermissionNamespace(
+            label=TEST_PERMISSION_NAMESPACE_TEXT,
+            name=TEST_PERMISSION_NAMESPACE_NAME
+        )
+
+        self._test_permission = self.namespace.add_permission(
+            name=TEST_PERMISSION_NAME, label=TEST_PERMISSION_LABEL
+        )
+
+        ModelPermission.register(
+            model=self._test_object._meta.model,
+            permissions=(self._test_permission,)
+        )
+        Permission.invalidate_cache()
+
+    def _get_test_permission_resolver(self):
+        response = self.get(viewname=self._test_view_name)
+
+        return PermissionResolver.get_for_request(
+            request=response.wsgi_request
+        )
+
+    def test_check_access_no_permission(self):
+        permission_resolver = self._get_test_permission_resolver()
+
+        with self.assertRaises(expected_exception=PermissionDenied):
+            permission_resolver.check_access(
+                obj=self._test_object, permissions=(self._test_permission,)
+            )
+
+    def test_check_access_with_acl(self):
+        self.grant_access(
+            obj=self._test_object, permission=self._test_permission
+        )
+
+        permission_resolver = self._get_test_permission_resolver()
+        permission_resolver.add_object_list(object_list=[self._test_object])
+
+        self.assertTrue(
+            permission_resolver.check_access(
+                obj=self._test_object, permissions=(self._test_permission,)
+            )
+        )
+
+        with self.assertNumQueries(num=0):
+            self.assertTrue(
+                permission_resolver.check_access(
+                    obj=self._test_object,
+                    permissions=(self._test_permission,)
+                )
+            )
+
+
 class MenuClassTestCase(GenericViewTestCase):
     def setUp(self):
         super().setUp()
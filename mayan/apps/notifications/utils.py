@@ -1,5 +1,8 @@
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
 
 from mayan.apps.events.models import Notification as EventNotification
 
@@ -42,115 +45,43 @@ def _build_action_context(action) -> Dict[str, Any]:
     return context
 
 
-def create_enhanced_notification(user, action, event_type: str, template: Optional[NotificationTemplate] = None):
-    """Create or enrich a Mayan `events.Notification` instance.
-
-    This function updates existing base notifications with extra fields:
-    title/message/priority/state/icon/actions/event_data timestamps.
+def _enqueue_notification_delivery(notification) -> None:
+    """Queue the delivery of a notification.
 
-    Notes:
-    - We do NOT create a new notification table; we enrich `events_notification`.
-    - If the schema is not migrated yet, this function becomes a no-op.
-    - NotificationPreference.notifications_enabled is checked BEFORE calling this function
-      in EventType.commit() for DB optimization. If notification was created, user is
-      subscribed and notifications are enabled.
-    - Enterprise reliability: if Celery is unavailable when enqueueing delivery tasks,
-      we fall back to synchronously marking the notification as SENT so the user can
-      still see it in the UI.
+    Enterprise reliability: if Celery is unavailable, the notification is
+    marked as SENT synchronously so the user can still see it in the UI.
     """
-    # #region agent log
-    import json
     try:
-        with open('c:\\DAM\\Prime-EDMS\\.cursor\\debug.log', 'a', encoding='utf-8') as f:
-            f.write(json.dumps({
-                'sessionId': 'debug-session',
-                'runId': 'run1',
-                'hypothesisId': 'A',
-                'location': 'notifications/utils.py:23',
-                'message': 'create_enhanced_notification entry',
-                'data': {'user_id': user.id, 'action_id': action.id, 'event_type': event_type},
-                'timestamp': int(__import__('time').time() * 1000)
-            }) + '\n')
+        from .tasks import send_notification_async
+        send_notification_async.apply_async(args=(notification.pk,), queue='notifications')
     except Exception:
-        pass
-    # #endregion
-
-    # Schema may not be migrated yet. Keep runtime safe.
-    if not hasattr(EventNotification, 'title'):
-        # #region agent log
+        logger.exception('Failed to enqueue send_notification_async for notification=%s', notification.pk)
         try:
-            with open('c:\\DAM\\Prime-EDMS\\.cursor\\debug.log', 'a', encoding='utf-8') as f:
-                f.write(json.dumps({
-                    'sessionId': 'debug-session',
-                    'runId': 'run1',
-                    'hypothesisId': 'C',
-                    'location': 'notifications/utils.py:41',
-                    'message': 'Schema not migrated - returning None',
-                    'data': {'user_id': user.id, 'action_id': action.id},
-                    'timestamp': int(__import__('time').time() * 1000)
-                }) + '\n')
-        except Exception:
-            pass
-        # #endregion
-        return None
-
-    # NOTE: NotificationPreference.notifications_enabled check is removed.
-    # It is now performed in EventType.commit() BEFORE creating the base notification
-    # to optimize DB size (no record created if user disabled notifications).
+            from django.utils import timezone
 
-    # Find "the" base notification for (user, action). Handle duplicates gracefully.
-    notification = EventNotification.objects.filter(user=user, action=action).order_by('-pk').first()
-    # #region agent log
-    try:
-        with open('c:\\DAM\\Prime-EDMS\\.cursor\\debug.log', 'a', encoding='utf-8') as f:
-            f.write(json.dumps({
-                'sessionId': 'debug-session',
-                'runId': 'run1',
-                'hypothesisId': 'B',
-                'location': 'notifications/utils.py:49',
-                'message': 'Base notification lookup',
-                'data': {'user_id': user.id, 'action_id': action.id, 'notification_found': notification is not None, 'notification_id': notification.pk if notification else None},
-                'timestamp': int(__import__('time').time() * 1000)
-            }) + '\n')
-    except Exception:
-        pass
-    # #endregion
-    if not notification:
-        logger.warning('Base notification not found for user=%s, action=%s', user.id, action.id)
-        return None
+            notification.sent_at = timezone.now()
+            notification.state = 'SENT'
+            notification.save(update_fields=('sent_at', 'state'))
+            logger.warning(
+                'Notification id=%s marked as SENT synchronously (Celery unavailable)',
+                notification.pk
+            )
+        except Exception:
+            logger.exception('Failed to mark notification as SENT synchronously for notification=%s', notification.pk)
 
-    # Do not overwrite already enhanced notifications.
-    existing_title = getattr(notification, 'title', None)
-    # #region agent log
-    try:
-        with open('c:\\DAM\\Prime-EDMS\\.cursor\\debug.log', 'a', encoding='utf-8') as f:
-            f.write(json.dumps({
-                'sessionId': 'debug-session',
-                'runId': 'run1',
-                'hypothesisId': 'C',
-                'location': 'notifications/utils.py:55',
-                'message': 'Check if already enhanced',
-                'data': {'notification_id': notification.pk, 'existing_title': existing_title, 'already_enhanced': bool(existing_title)},
-                'timestamp': int(__import__('time').time() * 1000)
-            }) + '\n')
-    except Exception:
-        pass
-    # #endregion
-    if existing_title:
-        return notification
 
-    if template is None:
-        template = NotificationTemplate.objects.filter(event_type=event_type, is_active=True).first()
+def _get_notification_field_values(action, event_type: str, template: Optional[NotificationTemplate]) -> Dict[str, Any]:
+    """Return the enhanced field values of a notification for an action.
 
+    The values only depend on the action, so they are computed once per
+    action and shared by all its recipients.
+    """
     context = _build_action_context(action=action)
 
-    title = None
-    message = ''
     priority = 'NORMAL'
     icon_type = 'info'
     icon_url = ''
     actions_payload = []
-    event_data = {}
 
     if template:
         try:
@@ -204,141 +135,155 @@ def create_enhanced_notification(user, action, event_type: str, template: Option
                 except Exception:
                     pass
         formatted_actions.append(new_item)
-    actions_payload = formatted_actions
-
-    # Update fields (only those available in the current schema).
-    notification.title = title
-    notification.message = message
-    notification.event_type = event_type
-    notification.event_data = event_data
-    notification.priority = priority
-    notification.state = 'CREATED'
-    notification.icon_type = icon_type
-    notification.icon_url = icon_url
-    notification.actions = actions_payload
-    notification.sent_at = None
-    notification.read_at = None
-    notification.archived_at = None
-    notification.deleted_at = None
-    notification.expires_at = None
-    notification.is_mutable = True
-    notification.is_removable = True
-    notification.metadata = {}
+
+    field_values = {
+        'title': title,
+        'message': message,
+        'event_type': event_type,
+        'event_data': event_data,
+        'priority': priority,
+        'state': 'CREATED',
+        'icon_type': icon_type,
+        'icon_url': icon_url,
+        'actions': formatted_actions,
+        'sent_at': None,
+        'read_at': None,
+        'archived_at': None,
+        'deleted_at': None,
+        'expires_at': None,
+        'is_mutable': True,
+        'is_removable': True,
+        'metadata': {},
+    }
 
     # Best-effort: set content_object for document-related notifications to enable
     # consistent object-level filtering and front-end navigation.
     try:
         document_id = context.get('document_id')
         if document_id:
-            from django.contrib.contenttypes.models import ContentType
             from mayan.apps.documents.models import Document
 
-            notification.content_type = ContentType.objects.get_for_model(Document)
-            notification.object_id = int(document_id)
+            field_values['content_type'] = ContentType.objects.get_for_model(Document)
+            field_values['object_id'] = int(document_id)
     except Exception:
         # Do not fail notification creation due to enrichment issues.
         pass
+
+    return field_values
+
+
+def create_enhanced_notification(user, action, event_type: str, template: Optional[NotificationTemplate] = None):
+    """Enrich an existing Mayan `events.Notification` instance.
+
+    This function updates existing base notifications with extra fields:
+    title/message/priority/state/icon/actions/event_data timestamps.
+
+    Notes:
+    - We do NOT create a new notification table; we enrich `events_notification`.
+    - Users with NotificationPreference.notifications_enabled disabled are skipped.
+    - Event fan-out uses `create_enhanced_notifications`, which creates the
+      notifications already enriched, in bulk.
+    """
+    preference = NotificationPreference.objects.filter(user=user).first()
+    if preference and not preference.notifications_enabled:
+        return None
+
+    # Find "the" base notification for (user, action). Handle duplicates gracefully.
+    notification = EventNotification.objects.filter(user=user, action=action).order_by('-pk').first()
+    if not notification:
+        logger.warning('Base notification not found for user=%s, action=%s', user.id, action.id)
+        return None
+
+    # Do not overwrite already enhanced notifications.
+    if notification.title:
+        return notification
+
+    if template is None:
+        template = NotificationTemplate.objects.filter(event_type=event_type, is_active=True).first()
+
+    for field_name, value in _get_notification_field_values(
+        action=action, event_type=event_type, template=template
+    ).items():
+        setattr(notification, field_name, value)
+
     notification.save()
-    # #region agent log
-    try:
-        with open('c:\\DAM\\Prime-EDMS\\.cursor\\debug.log', 'a', encoding='utf-8') as f:
-            f.write(json.dumps({
-                'sessionId': 'debug-session',
-                'runId': 'run1',
-                'hypothesisId': 'C',
-                'location': 'notifications/utils.py:109',
-                'message': 'Notification saved with enhanced fields',
-                'data': {'notification_id': notification.pk, 'title': title, 'state': 'CREATED', 'event_type': event_type},
-                'timestamp': int(__import__('time').time() * 1000)
-            }) + '\n')
-    except Exception:
-        pass
-    # #endregion
 
     logger.info(
         'Enhanced notification id=%s for user=%s, event_type=%s',
         notification.pk, user.id, event_type
     )
 
-    # Trigger async delivery (Phase 3).
-    try:
-        from .tasks import send_notification_async
-        # #region agent log
-        try:
-            with open('c:\\DAM\\Prime-EDMS\\.cursor\\debug.log', 'a', encoding='utf-8') as f:
-                f.write(json.dumps({
-                    'sessionId': 'debug-session',
-                    'runId': 'run1',
-                    'hypothesisId': 'A',
-                    'location': 'notifications/utils.py:119',
-                    'message': 'Enqueueing Celery task',
-                    'data': {'notification_id': notification.pk},
-                    'timestamp': int(__import__('time').time() * 1000)
-                }) + '\n')
-        except Exception:
-            pass
-        # #endregion
-        send_notification_async.apply_async(args=(notification.pk,), queue='notifications')
-        # #region agent log
-        try:
-            with open('c:\\DAM\\Prime-EDMS\\.cursor\\debug.log', 'a', encoding='utf-8') as f:
-                f.write(json.dumps({
-                    'sessionId': 'debug-session',
-                    'runId': 'run1',
-                    'hypothesisId': 'A',
-                    'location': 'notifications/utils.py:120',
-                    'message': 'Celery task enqueued successfully',
-                    'data': {'notification_id': notification.pk},
-                    'timestamp': int(__import__('time').time() * 1000)
-                }) + '\n')
-        except Exception:
-            pass
-        # #endregion
-    except Exception:
-        logger.exception('Failed to enqueue send_notification_async for notification=%s', notification.pk)
-        # #region agent log
-        try:
-            with open('c:\\DAM\\Prime-EDMS\\.cursor\\debug.log', 'a', encoding='utf-8') as f:
-                f.write(json.dumps({
-                    'sessionId': 'debug-session',
-                    'runId': 'run1',
-                    'hypothesisId': 'A',
-                    'location': 'notifications/utils.py:122',
-                    'message': 'Celery task failed - using fallback',
-                    'data': {'notification_id': notification.pk},
-                    'timestamp': int(__import__('time').time() * 1000)
-                }) + '\n')
-        except Exception:
-            pass
-        # #endregion
-        # Fallback for Enterprise: if Celery is unavailable, mark as SENT synchronously.
-        # This ensures notifications are visible to users even if async queue is down.
-        try:
-            from django.utils import timezone
+    _enqueue_notification_delivery(notification=notification)
 
-            notification.sent_at = timezone.now()
-            notification.state = 'SENT'
-            notification.save(update_fields=('sent_at', 'state'))
-            # #region agent log
-            try:
-                with open('c:\\DAM\\Prime-EDMS\\.cursor\\debug.log', 'a', encoding='utf-8') as f:
-                    f.write(json.dumps({
-                        'sessionId': 'debug-session',
-                        'runId': 'run1',
-                        'hypothesisId': 'A',
-                        'location': 'notifications/utils.py:130',
-                        'message': 'Fallback: marked as SENT synchronously',
-                        'data': {'notification_id': notification.pk, 'state': 'SENT'},
-                        'timestamp': int(__import__('time').time() * 1000)
-                    }) + '\n')
-            except Exception:
-                pass
-            # #endregion
-            logger.warning(
-                'Notification id=%s marked as SENT synchronously (Celery unavailable)',
-                notification.pk
+    return notification
+
+
+def create_enhanced_notifications(action_user_id_list: Iterable[Tuple[Any, int]]) -> List[EventNotification]:
+    """Create enriched notifications for many (action, user ID) pairs.
+
+    Preferences and templates are fetched with one query each, the
+    enhanced fields are computed once per action and all notifications are
+    written with a single `bulk_create`. Users that disabled notifications
+    are skipped.
+
+    Args:
+        action_user_id_list: Pairs of actstream action and recipient user ID.
+
+    Returns:
+        The created notifications.
+    """
+    action_user_id_list = list(action_user_id_list)
+    if not action_user_id_list:
+        return []
+
+    disabled_user_ids = set(
+        NotificationPreference.objects.filter(
+            notifications_enabled=False,
+            user_id__in={user_id for action, user_id in action_user_id_list}
+        ).values_list('user_id', flat=True)
+    )
+
+    templates = {
+        template.event_type: template for template in NotificationTemplate.objects.filter(
+            event_type__in={action.verb for action, user_id in action_user_id_list},
+            is_active=True
+        )
+    }
+
+    field_values_cache = {}
+    notifications = []
+    for action, user_id in action_user_id_list:
+        if user_id in disabled_user_ids:
+            logger.debug('Skipping notification for user=%s (notifications disabled)', user_id)
+            continue
+
+        if action.pk not in field_values_cache:
+            field_values_cache[action.pk] = _get_notification_field_values(
+                action=action, event_type=action.verb,
+                template=templates.get(action.verb)
             )
-        except Exception:
-            logger.exception('Failed to mark notification as SENT synchronously for notification=%s', notification.pk)
 
-    return notification
+        notifications.append(
+            EventNotification(
+                action=action, user_id=user_id,
+                **field_values_cache[action.pk]
+            )
+        )
+
+    with transaction.atomic():
+        EventNotification.objects.bulk_create(objs=notifications)
+
+    # Not every database returns the primary keys of bulk inserted rows,
+    # fetch them using the unique UUIDs.
+    notifications = list(
+        EventNotification.objects.filter(
+            uuid__in=[notification.uuid for notification in notifications]
+        )
+    )
+
+    logger.info('Created %d enhanced notifications', len(notifications))
+
+    for notification in notifications:
+        _enqueue_notification_delivery(notification=notification)
+
+    return notifications
@@ -1,3 +1,4 @@
+import os
 import platform
 
 if platform.system() in ('FreeBSD', 'OpenBSD', 'Darwin'):
@@ -6,3 +7,6 @@ else:
     DEFAULT_TESSERACT_BINARY_PATH = '/usr/bin/tesseract'
 
 DEFAULT_TESSERACT_TIMEOUT = 600  # 600 seconds, 10 minutes
+DEFAULT_TESSERACT_WORKER_COUNT = min(4, os.cpu_count() or 1)
+
+TESSERACT_PAGE_SEPARATOR = '\x0c'
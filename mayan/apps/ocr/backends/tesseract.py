@@ -1,23 +1,91 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 import logging
 import os
 import shutil
+import threading
 
 import sh
 
 from django.utils.encoding import force_text
 from django.utils.translation import ugettext_lazy as _
 
-from mayan.apps.storage.utils import TemporaryFile
+from mayan.apps.storage.utils import NamedTemporaryFile, TemporaryFile
 
 from ..classes import OCRBackendBase
 from ..exceptions import OCRError
 
-from .literals import DEFAULT_TESSERACT_BINARY_PATH, DEFAULT_TESSERACT_TIMEOUT
+from .literals import (
+    DEFAULT_TESSERACT_BINARY_PATH, DEFAULT_TESSERACT_TIMEOUT,
+    DEFAULT_TESSERACT_WORKER_COUNT, TESSERACT_PAGE_SEPARATOR
+)
 
 logger = logging.getLogger(name=__name__)
 
 
 class Tesseract(OCRBackendBase):
+    # The version and language probes are executed once per binary and
+    # worker process instead of once per page.
+    _capabilities = {}
+    _capabilities_lock = threading.Lock()
+    _executor = None
+    _executor_lock = threading.Lock()
+    _executor_pid = None
+    _executor_worker_count = None
+
+    @classmethod
+    def get_capabilities(cls, command_tesseract, tesseract_binary_path):
+        with cls._capabilities_lock:
+            if tesseract_binary_path not in cls._capabilities:
+                # Get version.
+                result = command_tesseract(v=True)
+                logger.debug('Tesseract version: %s', result.stdout)
+
+                # Get languages.
+                result = command_tesseract(list_langs=True)
+                # Sample output format.
+                # List of available languages (3):
+                # deu
+                # eng
+                # osd
+                # <- empty line
+
+                # Extaction: strip last line, split by newline, discard the
+                # first line.
+                languages = force_text(s=result.stdout).strip().split('\n')[1:]
+
+                logger.debug('Available languages: %s', ', '.join(languages))
+
+                cls._capabilities[tesseract_binary_path] = {
+                    'languages': languages
+                }
+
+            return cls._capabilities[tesseract_binary_path]
+
+    @classmethod
+    def get_executor(cls, worker_count):
+        """
+        Return the process wide pool of threads driving the Tesseract
+        processes. The pool is recreated after a fork or when the worker
+        count changes.
+        """
+        with cls._executor_lock:
+            pid = os.getpid()
+            is_stale = cls._executor_pid != pid or cls._executor_worker_count != worker_count
+
+            if cls._executor is None or is_stale:
+                if cls._executor and cls._executor_pid == pid:
+                    cls._executor.shutdown(wait=False)
+
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=worker_count,
+                    thread_name_prefix='tesseract'
+                )
+                cls._executor_pid = pid
+                cls._executor_worker_count = worker_count
+
+            return cls._executor
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.read_settings()
@@ -25,6 +93,77 @@ class Tesseract(OCRBackendBase):
         if kwargs.get('auto_initialize', True):
             self.initialize()
 
+    def _execute_command(self, arguments, keyword_arguments, timeout):
+        keyword_arguments['_timeout'] = timeout
+
+        if self.language:
+            keyword_arguments['l'] = self.language
+
+        environment = os.environ.copy()
+        environment.update(self.environment)
+        keyword_arguments['_env'] = environment
+
+        try:
+            result = self.command_tesseract(
+                *arguments, **keyword_arguments
+            )
+        except Exception as exception:
+            error_message = (
+                'Exception calling Tesseract with language option: {}; {}'
+            ).format(self.language, exception)
+
+            if self.language not in self.languages:
+                error_message = (
+                    '{}\nThe requested OCR language "{}" is not '
+                    'available and needs to be installed.\n'
+                ).format(
+                    error_message, self.language
+                )
+
+            logger.error(error_message, exc_info=True)
+            raise OCRError(error_message)
+        else:
+            return force_text(s=result.stdout)
+
+    def _execute_image_filename_list(self, image_filename_list):
+        """
+        Recognize several images with a single Tesseract process using a
+        list file as the input. The language data is loaded once and the
+        text of every image is followed by the page separator.
+        """
+        with NamedTemporaryFile(mode='w', suffix='.txt') as list_file_object:
+            list_file_object.write('\n'.join(image_filename_list))
+            list_file_object.write('\n')
+            list_file_object.flush()
+
+            output = self._execute_command(
+                arguments=[list_file_object.name, '-'], keyword_arguments={},
+                timeout=self.command_timeout * len(image_filename_list)
+            )
+
+        result = output.split(TESSERACT_PAGE_SEPARATOR)
+        if result and result[-1].strip() == '':
+            result.pop()
+
+        if len(result) != len(image_filename_list):
+            logger.warning(
+                'Tesseract returned %d pages for a batch of %d images; '
+                'processing the images individually.', len(result),
+                len(image_filename_list)
+            )
+            result = []
+            for image_filename in image_filename_list:
+                with open(file=image_filename, mode='rb') as file_object:
+                    result.append(
+                        self._execute_command(
+                            arguments=['-', '-'],
+                            keyword_arguments={'_in': file_object},
+                            timeout=self.command_timeout
+                        )
+                    )
+
+        return result
+
     def execute(self, *args, **kwargs):
         """
         Execute the command line binary of tesseract.
@@ -38,42 +177,58 @@ class Tesseract(OCRBackendBase):
                 shutil.copyfileobj(fsrc=image, fdst=temporary_image_file)
                 temporary_image_file.seek(0)
 
-                arguments = ['-', '-']
+                return self._execute_command(
+                    arguments=['-', '-'],
+                    keyword_arguments={'_in': temporary_image_file},
+                    timeout=self.command_timeout
+                )
 
-                keyword_arguments = {
-                    '_in': temporary_image_file,
-                    '_timeout': self.command_timeout
-                }
+    def execute_batch(self, file_object_list, language=None, transformations=None):
+        """
+        Split the pages in one chunk per worker and recognize each chunk
+        with a single Tesseract process. The chunks are processed
+        concurrently by the process wide worker pool.
+        """
+        if not self.command_tesseract or not file_object_list:
+            return super().execute_batch(
+                file_object_list=file_object_list, language=language,
+                transformations=transformations
+            )
 
-                if self.language:
-                    keyword_arguments['l'] = self.language
+        self.language = language
 
-                environment = os.environ.copy()
-                environment.update(self.environment)
-                keyword_arguments['_env'] = environment
+        with ExitStack() as stack:
+            image_filename_list = []
+            for file_object in file_object_list:
+                image = self.get_converter(
+                    file_object=file_object, transformations=transformations
+                ).get_page()
 
-                try:
-                    result = self.command_tesseract(
-                        *arguments, **keyword_arguments
-                    )
-                    return force_text(s=result.stdout)
-                except Exception as exception:
-                    error_message = (
-                        'Exception calling Tesseract with language option: {}; {}'
-                    ).format(self.language, exception)
-
-                    if self.language not in self.languages:
-                        error_message = (
-                            '{}\nThe requested OCR language "{}" is not '
-                            'available and needs to be installed.\n'
-                        ).format(
-                            error_message, self.language
-                        )
+                temporary_image_file = stack.enter_context(
+                    NamedTemporaryFile()
+                )
+                shutil.copyfileobj(fsrc=image, fdst=temporary_image_file)
+                temporary_image_file.flush()
+                image_filename_list.append(temporary_image_file.name)
+
+            chunk_count = min(self.worker_count, len(image_filename_list))
+            chunk_size, remainder = divmod(len(image_filename_list), chunk_count)
+
+            chunk_list = []
+            start = 0
+            for index in range(chunk_count):
+                end = start + chunk_size + (1 if index < remainder else 0)
+                chunk_list.append(image_filename_list[start:end])
+                start = end
 
-                    logger.error(error_message, exc_info=True)
-                    raise OCRError(error_message)
-                else:
-                    return result
+            result = []
+            executor = self.get_executor(worker_count=self.worker_count)
+            for chunk_result in executor.map(
+                self._execute_image_filename_list, chunk_list
+            ):
+                result.extend(chunk_result)
+
+        return result
 
     def initialize(self):
         self.languages = ()
@@ -86,24 +241,10 @@ class Tesseract(OCRBackendBase):
                 _('Tesseract OCR not found.')
             )
         else:
-            # Get version.
-            result = self.command_tesseract(v=True)
-            logger.debug('Tesseract version: %s', result.stdout)
-
-            # Get languages.
-            result = self.command_tesseract(list_langs=True)
-            # Sample output format.
-            # List of available languages (3):
-            # deu
-            # eng
-            # osd
-            # <- empty line
-
-            # Extaction: strip last line, split by newline, discard the first
-            # line.
-            self.languages = force_text(s=result.stdout).strip().split('\n')[1:]
-
-            logger.debug('Available languages: %s', ', '.join(self.languages))
+            self.languages = self.get_capabilities(
+                command_tesseract=self.command_tesseract,
+                tesseract_binary_path=self.tesseract_binary_path
+            )['languages']
 
     def read_settings(self):
         self.command_timeout = self.kwargs.get(
@@ -113,3 +254,10 @@ class Tesseract(OCRBackendBase):
         self.tesseract_binary_path = self.kwargs.get(
             'tesseract_path', DEFAULT_TESSERACT_BINARY_PATH
         )
+        self.worker_count = max(
+            1, int(
+                self.kwargs.get(
+                    'worker_count', DEFAULT_TESSERACT_WORKER_COUNT
+                )
+            )
+        )
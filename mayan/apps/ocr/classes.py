@@ -18,13 +18,30 @@ class OCRBackendBase:
 
     def execute(self, file_object, language=None, transformations=None):
         self.language = language
+        self.converter = self.get_converter(
+            file_object=file_object, transformations=transformations
+        )
 
-        if not transformations:
-            transformations = []
-
-        self.converter = ConverterBase.get_converter_class()(
+    def execute_batch(self, file_object_list, language=None, transformations=None):
+        """
+        OCR several page images of the same document version. Return a list
+        with the content of each page, in the order of `file_object_list`.
+        Backends able to process several pages per engine invocation should
+        override this method; the default calls `execute` for each page.
+        """
+        return [
+            self.execute(
+                file_object=file_object, language=language,
+                transformations=transformations
+            ) for file_object in file_object_list
+        ]
+
+    def get_converter(self, file_object, transformations=None):
+        converter = ConverterBase.get_converter_class()(
             file_object=file_object
         )
 
-        for transformation in transformations:
-            self.converter.transform(transformation=transformation)
+        for transformation in transformations or ():
+            converter.transform(transformation=transformation)
+
+        return converter
@@ -1,7 +1,8 @@
+from contextlib import ExitStack
 import logging
 
 from django.apps import apps
-from django.db import models
+from django.db import models, transaction
 
 from mayan.apps.converter.settings import setting_image_generation_timeout
 from mayan.apps.lock_manager.backends.base import LockingBackend
@@ -13,6 +14,82 @@ logger = logging.getLogger(name=__name__)
 
 
 class DocumentVersionPageOCRContentManager(models.Manager):
+    def bulk_update_or_create(self, document_version_page_content_dictionary):
+        """
+        Store the OCR content of several document version pages using one
+        query to find the existing rows, one bulk update and one bulk
+        insert.
+        """
+        if not document_version_page_content_dictionary:
+            return
+
+        with transaction.atomic():
+            existing_entries = {
+                entry.document_version_page_id: entry for entry in self.filter(
+                    document_version_page__in=document_version_page_content_dictionary.keys()
+                )
+            }
+
+            entries_create = []
+            entries_update = []
+
+            for document_version_page, content in document_version_page_content_dictionary.items():
+                entry = existing_entries.get(document_version_page.pk)
+                if entry:
+                    entry.content = content
+                    entries_update.append(entry)
+                else:
+                    entries_create.append(
+                        self.model(
+                            content=content,
+                            document_version_page=document_version_page
+                        )
+                    )
+
+            if entries_update:
+                self.bulk_update(objs=entries_update, fields=('content',))
+
+            if entries_create:
+                self.bulk_create(objs=entries_create)
+
+        # Bulk writes do not trigger the search indexing signals, index
+        # the pages and the objects containing them with a task instead.
+        from mayan.apps.documents.search import (
+            search_model_document, search_model_document_version,
+            search_model_document_version_page
+        )
+        from mayan.apps.dynamic_search.tasks import task_index_instances
+
+        document_version_page_list = list(
+            document_version_page_content_dictionary.keys()
+        )
+        document_version_id_list = list(
+            {
+                document_version_page.document_version_id for document_version_page in document_version_page_list
+            }
+        )
+        document_id_list = list(
+            {
+                document_version_page.document_version.document_id for document_version_page in document_version_page_list
+            }
+        )
+
+        for search_model, id_list in (
+            (
+                search_model_document_version_page, [
+                    document_version_page.pk for document_version_page in document_version_page_list
+                ]
+            ),
+            (search_model_document_version, document_version_id_list),
+            (search_model_document, document_id_list)
+        ):
+            task_index_instances.apply_async(
+                kwargs={
+                    'id_list': id_list,
+                    'search_model_full_name': search_model.get_full_name()
+                }
+            )
+
     def delete_content_for(self, document_version, user=None):
         self.filter(document_version_page__document_version=document_version).delete()
 
@@ -74,6 +151,71 @@ class DocumentVersionPageOCRContentManager(models.Manager):
             finally:
                 document_version_page_lock.release()
 
+    def process_document_version_page_list(
+        self, document_version_page_list, user=None
+    ):
+        """
+        OCR several pages of the same document version as a single batch
+        of the OCR backend and store the results in bulk.
+        """
+        if not document_version_page_list:
+            return
+
+        document_version = document_version_page_list[0].document_version
+
+        logger.info(
+            'Processing pages: %s of document version: %s',
+            ', '.join(
+                str(document_version_page.page_number) for document_version_page in document_version_page_list
+            ), document_version
+        )
+
+        with ExitStack() as stack:
+            for document_version_page in document_version_page_list:
+                document_version_page_lock = LockingBackend.get_backend().acquire_lock(
+                    name=document_version_page.get_lock_name(user=user),
+                    timeout=setting_image_generation_timeout.value * 2
+                )
+                stack.callback(document_version_page_lock.release)
+
+            try:
+                file_object_list = []
+                for document_version_page in document_version_page_list:
+                    cache_filename = document_version_page.generate_image(
+                        _acquire_lock=False, user=user
+                    )
+                    file_object_list.append(
+                        stack.enter_context(
+                            document_version_page.cache_partition.get_file(
+                                filename=cache_filename
+                            ).open()
+                        )
+                    )
+
+                ocr_content_list = OCRBackendBase.get_instance().execute_batch(
+                    file_object_list=file_object_list,
+                    language=document_version.document.language
+                )
+
+                self.bulk_update_or_create(
+                    document_version_page_content_dictionary=dict(
+                        zip(document_version_page_list, ocr_content_list)
+                    )
+                )
+            except Exception as exception:
+                logger.error(
+                    'OCR error for document version pages: %s; %s',
+                    ', '.join(
+                        str(document_version_page.pk) for document_version_page in document_version_page_list
+                    ), exception, exc_info=True
+                )
+                raise
+            else:
+                logger.info(
+                    'Finished processing %d pages of document version: %s',
+                    len(document_version_page_list), document_version
+                )
+
 
 class DocumentTypeSettingsManager(models.Manager):
     def get_by_natural_key(self, document_type_natural_key):
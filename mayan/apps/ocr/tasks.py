@@ -10,6 +10,7 @@ from mayan.apps.lock_manager.exceptions import LockError
 from mayan.celery import app
 
 from .events import event_ocr_document_version_finished
+from .settings import setting_ocr_page_batch_size
 
 logger = logging.getLogger(name=__name__)
 
@@ -28,12 +29,18 @@ def task_document_version_ocr_process(self, document_version_id, user_id=None):
     )
 
     try:
+        document_version_page_id_list = list(
+            document_version.pages.values_list('pk', flat=True)
+        )
+        batch_size = max(1, setting_ocr_page_batch_size.value)
+
         document_version_page_tasks = []
-        for document_version_page in document_version.pages.all():
+        for index in range(0, len(document_version_page_id_list), batch_size):
             document_version_page_tasks.append(
-                task_document_version_page_ocr_process.s(
-                    document_version_page_id=document_version_page.pk,
-                    user_id=user_id
+                task_document_version_page_list_ocr_process.s(
+                    document_version_page_id_list=document_version_page_id_list[
+                        index:index + batch_size
+                    ], user_id=user_id
                 )
             )
         chord(document_version_page_tasks)(
@@ -89,6 +96,49 @@ def task_document_version_page_ocr_process(
         raise self.retry(exc=exception)
 
 
+@app.task(bind=True, retry_backoff=True)
+def task_document_version_page_list_ocr_process(
+    self, document_version_page_id_list, user_id=None
+):
+    CachePartitionFile = apps.get_model(
+        app_label='file_caching', model_name='CachePartitionFile'
+    )
+    DocumentVersionPageOCRContent = apps.get_model(
+        app_label='ocr', model_name='DocumentVersionPageOCRContent'
+    )
+    DocumentVersionPage = apps.get_model(
+        app_label='documents', model_name='DocumentVersionPage'
+    )
+    document_version_page_list = list(
+        DocumentVersionPage.objects.select_related(
+            'document_version__document'
+        ).filter(pk__in=document_version_page_id_list).order_by('page_number')
+    )
+
+    User = get_user_model()
+
+    if user_id:
+        user = User.objects.get(pk=user_id)
+    else:
+        user = None
+
+    try:
+        DocumentVersionPageOCRContent.objects.process_document_version_page_list(
+            document_version_page_list=document_version_page_list,
+            user=user
+        )
+    except CachePartitionFile.DoesNotExist as exception:
+        logger.info(
+            'Document version page image not found. Possible cause '
+            'overloaded system or cache size too small. Retrying task.',
+        )
+        raise self.retry(exc=exception)
+    except LockError as exception:
+        raise self.retry(exc=exception)
+    except OperationalError as exception:
+        raise self.retry(exc=exception)
+
+
 @app.task(bind=True, ignore_result=True)
 def task_document_version_ocr_finished(
     self, results, document_version_id, user_id=None
@@ -3,6 +3,9 @@ from django.test import override_settings
 from mayan.apps.documents.tests.base import GenericDocumentTestCase
 from mayan.apps.documents.tests.literals import TEST_FILE_GERMAN_PATH
 
+from ..classes import OCRBackendBase
+from ..models import DocumentVersionPageOCRContent
+
 from .literals import (
     TEST_DOCUMENT_VERSION_OCR_CONTENT, TEST_DOCUMENT_VERSION_OCR_CONTENT_DEU_1,
     TEST_DOCUMENT_VERSION_OCR_CONTENT_DEU_2
@@ -15,6 +18,28 @@ class DocumentOCRTestCase(GenericDocumentTestCase):
         content = self._test_document_version.pages.first().ocr_content.content
         self.assertTrue(TEST_DOCUMENT_VERSION_OCR_CONTENT in content)
 
+    def test_ocr_backend_capabilities_probed_once(self):
+        ocr_backend_1 = OCRBackendBase.get_instance()
+        ocr_backend_2 = OCRBackendBase.get_instance()
+
+        self.assertIs(ocr_backend_1.languages, ocr_backend_2.languages)
+
+    def test_ocr_document_version_page_list(self):
+        DocumentVersionPageOCRContent.objects.all().delete()
+
+        DocumentVersionPageOCRContent.objects.process_document_version_page_list(
+            document_version_page_list=list(
+                self._test_document_version.pages.all()
+            )
+        )
+
+        self.assertEqual(
+            DocumentVersionPageOCRContent.objects.count(),
+            self._test_document_version.pages.count()
+        )
+        content = self._test_document_version.pages.first().ocr_content.content
+        self.assertTrue(TEST_DOCUMENT_VERSION_OCR_CONTENT in content)
+
 
 @override_settings(OCR_AUTO_OCR=True)
 class GermanOCRSupportTestCase(GenericDocumentTestCase):
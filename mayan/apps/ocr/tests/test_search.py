@@ -8,6 +8,9 @@ from mayan.apps.documents.search import (
 )
 from mayan.apps.dynamic_search.tests.mixins import SearchTestMixin
 
+from ..models import DocumentVersionPageOCRContent
+
+from .literals import TEST_DOCUMENT_VERSION_PAGE_OCR_CONTENT_UPDATED
 from .mixins import DocumentVersionOCRTestMixin
 
 
@@ -148,6 +151,30 @@ class DocumentVersionPageOCRSearchTestCase(
         events = self._get_test_events()
         self.assertEqual(events.count(), 0)
 
+    def test_search_model_document_version_page_bulk_update_with_access(self):
+        self.grant_access(
+            obj=self._test_document,
+            permission=permission_document_version_view
+        )
+
+        DocumentVersionPageOCRContent.objects.bulk_update_or_create(
+            document_version_page_content_dictionary={
+                self._test_document_version_page: TEST_DOCUMENT_VERSION_PAGE_OCR_CONTENT_UPDATED
+            }
+        )
+
+        self._clear_events()
+
+        queryset = self.search_backend.search(
+            search_model=search_model_document_version_page, query={
+                'ocr_content__content': TEST_DOCUMENT_VERSION_PAGE_OCR_CONTENT_UPDATED
+            }, user=self._test_case_user
+        )
+        self.assertTrue(self._test_document_version_page in queryset)
+
+        events = self._get_test_events()
+        self.assertEqual(events.count(), 0)
+
     def test_trashed_search_model_document_version_with_access(self):
         self.grant_access(
             obj=self._test_document,
@@ -10,8 +10,10 @@ from mayan.apps.databases.utils import check_queryset
 from mayan.apps.views.mixins import ExternalObjectBaseMixin
 
 from .literals import (
-    QUERY_FIELD_EXCLUDE_PARAMETER, QUERY_FIELD_ONLY_PARAMETER
+    DEFAULT_CURSOR_QUERY_PARAMETER, QUERY_FIELD_EXCLUDE_PARAMETER,
+    QUERY_FIELD_ONLY_PARAMETER
 )
+from .pagination import MayanCursorPagination
 
 
 class AsymmetricSerializerAPIViewMixin:
@@ -80,6 +82,28 @@ class ContentTypeAPIViewMixin:
         )
 
 
+class CursorPaginationAPIViewMixin:
+    """
+    Switch the view to keyset pagination when the cursor query parameter
+    is present. An empty cursor requests the first page. Page number
+    pagination remains the default.
+    """
+    cursor_pagination_class = MayanCursorPagination
+
+    def is_cursor_pagination(self):
+        return DEFAULT_CURSOR_QUERY_PARAMETER in self.request.query_params
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if self.is_cursor_pagination():
+                self._paginator = self.cursor_pagination_class()
+            else:
+                return super().paginator
+
+        return self._paginator
+
+
 class DynamicFieldListAPIViewMixin:
     def get_serializer_extra_context(self):
         context = super().get_serializer_extra_context()
@@ -1,9 +1,231 @@
+import base64
+from collections import OrderedDict
+from functools import reduce
+import json
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from django.db.models import Q
+from django.utils.translation import ugettext_lazy as _
+
 from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
-from .literals import DEFAULT_PAGE_SIZE_QUERY_PARAMETER
+from .literals import (
+    DEFAULT_CURSOR_QUERY_PARAMETER, DEFAULT_PAGE_SIZE_QUERY_PARAMETER,
+    QUERY_COUNT_APPROXIMATE_PARAMETER
+)
 from .settings import setting_maximum_page_size, setting_page_size
 
 
+class MayanCursorPagination(pagination.BasePagination):
+    """
+    Keyset pagination over the first ordering field of the queryset and
+    the primary key as the tie breaker. Pages are selected with a range
+    condition on the values of the last row of the previous page instead
+    of an offset and the rows are not counted, so the cost of a page does
+    not depend on its depth. Only forward navigation is supported.
+    Orderings that are not on a concrete value field use the primary key
+    only.
+
+    The cursor is opaque to the client. An approximate total is returned
+    when requested with the `_count_approximate` query parameter.
+    """
+    count_approximate_query_param = QUERY_COUNT_APPROXIMATE_PARAMETER
+    cursor_query_param = DEFAULT_CURSOR_QUERY_PARAMETER
+    invalid_cursor_message = _('Invalid cursor.')
+    max_page_size = setting_maximum_page_size.value
+    page_size = setting_page_size.value
+    page_size_query_param = DEFAULT_PAGE_SIZE_QUERY_PARAMETER
+
+    @staticmethod
+    def _encode_value(value):
+        # Keep the full precision of date and time values.
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        else:
+            return str(value)
+
+    @staticmethod
+    def get_field(model, field_path):
+        for name in field_path.split('__'):
+            field = model._meta.get_field(field_name=name)
+            model = field.related_model
+
+        return field
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            data = json.loads(
+                s=base64.urlsafe_b64decode(
+                    s=encoded.encode('ascii')
+                ).decode('utf-8')
+            )
+            ordering, value, pk = data['o'], data['v'], int(data['pk'])
+        except (KeyError, TypeError, ValueError):
+            raise NotFound(detail=self.invalid_cursor_message)
+
+        if ordering != self.ordering:
+            raise NotFound(detail=self.invalid_cursor_message)
+
+        if self.field_path:
+            try:
+                value = self.field.to_python(value)
+            except Exception:
+                raise NotFound(detail=self.invalid_cursor_message)
+
+        return value, pk
+
+    def encode_cursor(self, instance):
+        if self.field_path:
+            value = reduce(getattr, self.field_path.split('__'), instance)
+        else:
+            value = None
+
+        data = json.dumps(
+            default=self._encode_value, obj={
+                'o': self.ordering, 'v': value, 'pk': instance.pk
+            }
+        )
+
+        return base64.urlsafe_b64encode(
+            s=data.encode('utf-8')
+        ).decode('ascii')
+
+    def get_count_approximate(self, queryset):
+        """
+        Return the row estimate of the query planner on PostgreSQL. Other
+        databases do not provide an estimate and the rows are counted.
+        """
+        queryset = queryset.order_by()
+        connection = connections[queryset.db]
+
+        if connection.vendor == 'postgresql':
+            sql, params = queryset.values('pk').query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'EXPLAIN (FORMAT JSON) {}'.format(sql), params
+                )
+                plan = cursor.fetchone()[0]
+
+            if isinstance(plan, str):
+                plan = json.loads(s=plan)
+
+            return int(plan[0]['Plan']['Plan Rows'])
+        else:
+            return queryset.count()
+
+    def get_ordering(self, queryset):
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+
+        if ordering and isinstance(ordering[0], str):
+            return ordering[0]
+        else:
+            return '-pk'
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(
+                request.query_params[self.page_size_query_param]
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+        if page_size > 0:
+            return min(page_size, self.max_page_size)
+        else:
+            return self.page_size
+
+    def get_paginated_response(self, data):
+        result = OrderedDict(
+            (
+                ('next', self.get_next_link()),
+                ('next_cursor', self.next_cursor)
+            )
+        )
+
+        if self.count_approximate is not None:
+            result['count_approximate'] = self.count_approximate
+
+        result['results'] = data
+
+        return Response(data=result)
+
+    def get_next_link(self):
+        if self.next_cursor:
+            return replace_query_param(
+                url=self.request.build_absolute_uri(),
+                key=self.cursor_query_param, val=self.next_cursor
+            )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = self.get_ordering(queryset=queryset)
+
+        descending = self.ordering.startswith('-')
+        self.field_path = self.ordering.lstrip('-')
+        if self.field_path in ('id', 'pk'):
+            self.field_path = None
+        else:
+            try:
+                self.field = self.get_field(
+                    field_path=self.field_path, model=queryset.model
+                )
+            except FieldDoesNotExist:
+                self.field_path = None
+            else:
+                if self.field.is_relation:
+                    # Relations are ordered by the ordering of the
+                    # related model, not by their values.
+                    self.field_path = None
+
+        if descending:
+            lookup = 'lt'
+            order_by = ('-pk',)
+        else:
+            lookup = 'gt'
+            order_by = ('pk',)
+
+        if self.field_path:
+            order_by = (self.ordering,) + order_by
+
+        self.count_approximate = None
+        if request.query_params.get(self.count_approximate_query_param):
+            self.count_approximate = self.get_count_approximate(
+                queryset=queryset
+            )
+
+        queryset = queryset.order_by(*order_by)
+
+        cursor = self.decode_cursor(request=request)
+        if cursor:
+            value, pk = cursor
+            condition = Q(**{'pk__{}'.format(lookup): pk})
+            if self.field_path:
+                condition = Q(
+                    **{'{}__{}'.format(self.field_path, lookup): value}
+                ) | (Q(**{self.field_path: value}) & condition)
+
+            queryset = queryset.filter(condition)
+
+        page_size = self.get_page_size(request=request)
+        results = list(queryset[:page_size + 1])
+
+        if len(results) > page_size:
+            results = results[:page_size]
+            self.next_cursor = self.encode_cursor(instance=results[-1])
+        else:
+            self.next_cursor = None
+
+        return results
+
+
 class MayanPageNumberPagination(pagination.PageNumberPagination):
     max_page_size = setting_maximum_page_size.value
     page_size = setting_page_size.value
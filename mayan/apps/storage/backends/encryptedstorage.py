@@ -1,21 +1,41 @@
+import os
+import shutil
+import struct
+
 from Crypto.Cipher import AES
 from Crypto.Hash import SHA256
-from Crypto.Protocol.KDF import PBKDF2
+from Crypto.Protocol.KDF import HKDF, PBKDF2
+from Crypto.Random import get_random_bytes
 from Crypto.Util.Padding import pad, unpad
 
 from django.conf import settings
-from django.core.files.base import ContentFile
+from django.core.files.base import ContentFile, File
 from django.utils.encoding import force_text
 
 from ..classes import BufferedFile, PassthroughStorage
+from ..exceptions import EncryptedFileError
+from ..utils import TemporaryFile
 
 from .literals import (
-    ENCRYPTION_FILE_CHUNK_SIZE, ENCRYPTION_KEY_DERIVATION_ITERATIONS,
-    ENCRYPTION_KEY_SIZE
+    ENCRYPTION_CHUNKED_FORMAT_MAGIC, ENCRYPTION_CHUNKED_FORMAT_SALT_SIZE,
+    ENCRYPTION_CHUNKED_FORMAT_TAG_SIZE, ENCRYPTION_FILE_CHUNK_SIZE,
+    ENCRYPTION_KEY_DERIVATION_ITERATIONS, ENCRYPTION_KEY_SIZE,
+    ENCRYPTION_UPGRADE_TEMPORARY_SUFFIX
+)
+
+CHUNKED_FORMAT_HEADER_STRUCT = struct.Struct(
+    '>{}sI{}s'.format(
+        len(ENCRYPTION_CHUNKED_FORMAT_MAGIC),
+        ENCRYPTION_CHUNKED_FORMAT_SALT_SIZE
+    )
 )
 
 
 class BufferedEncryptedFile(BufferedFile):
+    """
+    Reader and writer of the legacy format: a single AES-CBC stream. Kept
+    to read files stored before the chunked format was introduced.
+    """
     def __init__(self, *args, **kwargs):
         self.key = kwargs.pop('key')
 
@@ -83,6 +103,221 @@ class BufferedEncryptedFile(BufferedFile):
         return count
 
 
+class ChunkedEncryptedFile(File):
+    """
+    Seekable encrypted file format. The content is split in chunks of a
+    fixed size and every chunk is encrypted and authenticated
+    independently using AES-GCM with a per file key. Any position can be
+    reached by decrypting only the chunk that contains it.
+
+    Layout: header (magic, chunk size, salt) followed by the chunks, each
+    one being the ciphertext followed by its authentication tag. The
+    nonce of a chunk is its index and the header and a last chunk flag
+    are authenticated as associated data to detect reordering and
+    truncation.
+    """
+    @staticmethod
+    def get_plaintext_size(chunk_size, raw_size):
+        payload_size = raw_size - CHUNKED_FORMAT_HEADER_STRUCT.size
+        record_size = chunk_size + ENCRYPTION_CHUNKED_FORMAT_TAG_SIZE
+        chunk_count = max(1, -(-payload_size // record_size))
+        return payload_size - chunk_count * ENCRYPTION_CHUNKED_FORMAT_TAG_SIZE
+
+    @staticmethod
+    def is_chunked_format(file_object):
+        file_object.seek(0)
+        magic = file_object.read(len(ENCRYPTION_CHUNKED_FORMAT_MAGIC))
+        file_object.seek(0)
+        return magic == ENCRYPTION_CHUNKED_FORMAT_MAGIC
+
+    def __init__(
+        self, file_object, key, mode, chunk_size=ENCRYPTION_FILE_CHUNK_SIZE,
+        name=None
+    ):
+        self.file_object = file_object
+        self.master_key = key
+        self.mode = mode
+        self.name = name
+        self.binary_mode = 'b' in self.mode
+        self.position = 0
+        self._chunk_cache = (None, None)
+
+        if 'w' in self.mode:
+            self.chunk_size = chunk_size
+            self.salt = get_random_bytes(ENCRYPTION_CHUNKED_FORMAT_SALT_SIZE)
+            self.header = CHUNKED_FORMAT_HEADER_STRUCT.pack(
+                ENCRYPTION_CHUNKED_FORMAT_MAGIC, self.chunk_size, self.salt
+            )
+            self._chunk_index = 0
+            self._write_buffer = bytearray()
+            self.file_object.write(self.header)
+            self.plaintext_size = 0
+        else:
+            self._write_buffer = None
+            self.file_object.seek(0)
+            self.header = self.file_object.read(
+                CHUNKED_FORMAT_HEADER_STRUCT.size
+            )
+            try:
+                magic, self.chunk_size, self.salt = CHUNKED_FORMAT_HEADER_STRUCT.unpack(
+                    self.header
+                )
+            except struct.error:
+                raise EncryptedFileError('Encrypted file header is truncated.')
+
+            if magic != ENCRYPTION_CHUNKED_FORMAT_MAGIC:
+                raise EncryptedFileError('Unknown encrypted file format.')
+
+            self.file_object.seek(0, 2)
+            self.plaintext_size = ChunkedEncryptedFile.get_plaintext_size(
+                chunk_size=self.chunk_size, raw_size=self.file_object.tell()
+            )
+            if self.plaintext_size < 0:
+                raise EncryptedFileError('Encrypted file is truncated.')
+
+        self.key = HKDF(
+            context=ENCRYPTION_CHUNKED_FORMAT_MAGIC, hashmod=SHA256,
+            key_len=ENCRYPTION_KEY_SIZE, master=self.master_key,
+            salt=self.salt
+        )
+        self.record_size = self.chunk_size + ENCRYPTION_CHUNKED_FORMAT_TAG_SIZE
+
+    def _get_cipher(self, chunk_index, last):
+        cipher = AES.new(
+            key=self.key, mode=AES.MODE_GCM,
+            nonce=chunk_index.to_bytes(length=12, byteorder='big')
+        )
+        cipher.update(self.header + (b'\x01' if last else b'\x00'))
+        return cipher
+
+    def _get_chunk(self, chunk_index):
+        cached_chunk_index, data = self._chunk_cache
+        if cached_chunk_index == chunk_index:
+            return data
+
+        last_chunk_index = max(0, -(-self.plaintext_size // self.chunk_size) - 1)
+
+        self.file_object.seek(
+            CHUNKED_FORMAT_HEADER_STRUCT.size + chunk_index * self.record_size
+        )
+        record = self.file_object.read(self.record_size)
+        ciphertext = record[:-ENCRYPTION_CHUNKED_FORMAT_TAG_SIZE]
+        tag = record[-ENCRYPTION_CHUNKED_FORMAT_TAG_SIZE:]
+
+        try:
+            data = self._get_cipher(
+                chunk_index=chunk_index,
+                last=chunk_index == last_chunk_index
+            ).decrypt_and_verify(ciphertext=ciphertext, received_mac_tag=tag)
+        except ValueError:
+            raise EncryptedFileError(
+                'Encrypted file chunk #{} failed authentication.'.format(
+                    chunk_index
+                )
+            )
+
+        self._chunk_cache = (chunk_index, data)
+        return data
+
+    def _write_chunk(self, data, last):
+        ciphertext, tag = self._get_cipher(
+            chunk_index=self._chunk_index, last=last
+        ).encrypt_and_digest(plaintext=bytes(data))
+        self.file_object.write(ciphertext)
+        self.file_object.write(tag)
+        self._chunk_index += 1
+
+    def close(self):
+        if self._write_buffer is not None:
+            # The last chunk is only known when the file is closed. Files
+            # always end with a last chunk, even if it is empty.
+            self._write_chunk(data=self._write_buffer, last=True)
+            self._write_buffer = None
+
+            try:
+                self.file_object.truncate()
+            except (AttributeError, OSError):
+                """Storage file does not support truncation."""
+
+        self.file_object.close()
+
+    @property
+    def closed(self):
+        return self.file_object.closed
+
+    def flush(self):
+        return self.file_object.flush()
+
+    def read(self, size=None):
+        if size is None or size < 0:
+            size = self.plaintext_size - self.position
+
+        result = []
+        while size > 0 and self.position < self.plaintext_size:
+            chunk_index, offset = divmod(self.position, self.chunk_size)
+            data = self._get_chunk(chunk_index=chunk_index)[offset:offset + size]
+            result.append(data)
+            self.position += len(data)
+            size -= len(data)
+
+        data = b''.join(result)
+
+        if self.binary_mode:
+            return data
+        else:
+            return force_text(s=data)
+
+    def readable(self):
+        return self._write_buffer is None
+
+    def seek(self, pos, whence=0):
+        if whence == 0:
+            position = pos
+        elif whence == 1:
+            position = self.position + pos
+        elif whence == 2:
+            position = self.plaintext_size + pos
+
+        if position < 0:
+            raise ValueError('Negative seek position {}.'.format(position))
+
+        self.position = position
+        return self.position
+
+    def seekable(self):
+        return self._write_buffer is None
+
+    @property
+    def size(self):
+        return self.plaintext_size
+
+    def tell(self):
+        return self.position
+
+    def writable(self):
+        return self._write_buffer is not None
+
+    def write(self, data):
+        try:
+            data = data.encode('utf-8')
+        except AttributeError:
+            """Already a byte string"""
+
+        self._write_buffer.extend(data)
+
+        # Keep at least one byte buffered, the last chunk must be written
+        # with the last chunk flag when the file is closed.
+        while len(self._write_buffer) > self.chunk_size:
+            self._write_chunk(
+                data=self._write_buffer[:self.chunk_size], last=False
+            )
+            del self._write_buffer[:self.chunk_size]
+
+        self.position += len(data)
+        self.plaintext_size += len(data)
+        return len(data)
+
+
 class EncryptedPassthroughStorage(PassthroughStorage):
     def __init__(self, *args, **kwargs):
         password = kwargs.pop('password')
@@ -96,6 +331,56 @@ class EncryptedPassthroughStorage(PassthroughStorage):
         )
         self.position = 0
 
+    def _get_seekable_file_object(self, file_object):
+        """
+        The chunked format requires random access. File objects of some
+        next storages, like compressed storages, are streams and are
+        spooled to a local temporary file.
+        """
+        try:
+            file_object.seek(0)
+        except (AttributeError, OSError):
+            temporary_file_object = TemporaryFile()
+            shutil.copyfileobj(
+                fsrc=file_object, fdst=temporary_file_object,
+                length=ENCRYPTION_FILE_CHUNK_SIZE
+            )
+            file_object.close()
+            temporary_file_object.seek(0)
+            return temporary_file_object
+        else:
+            return file_object
+
+    def _replace(self, name, source_name):
+        """
+        Replace a stored file with another stored file. Renamed atomically
+        when the next storage has local paths, otherwise the content is
+        copied and the source is deleted only after the copy completes.
+        """
+        try:
+            path_source = self.next_storage_backend.path(name=source_name)
+            path_destination = self.next_storage_backend.path(name=name)
+        except NotImplementedError:
+            source_file_object = self._call_backend_method(
+                method_name='open', kwargs={
+                    'name': source_name, 'mode': 'rb'
+                }
+            )
+            destination_file_object = self._call_backend_method(
+                method_name='open', kwargs={'name': name, 'mode': 'wb'}
+            )
+            with source_file_object, destination_file_object:
+                shutil.copyfileobj(
+                    fsrc=source_file_object, fdst=destination_file_object,
+                    length=ENCRYPTION_FILE_CHUNK_SIZE
+                )
+
+            self._call_backend_method(
+                method_name='delete', kwargs={'name': source_name}
+            )
+        else:
+            os.replace(src=path_source, dst=path_destination)
+
     def open(self, name, mode='rb', _direct=False):
         next_kwargs = {'name': name}
         if _direct:
@@ -108,14 +393,28 @@ class EncryptedPassthroughStorage(PassthroughStorage):
                 method_name='open', kwargs=next_kwargs
             )
         else:
-            # Mode is always 'rb' when reading the encrypted file
+            # Mode is always 'rb+' when opening the encrypted file.
             next_kwargs['mode'] = 'rb+'
             storage_file = self._call_backend_method(
                 method_name='open', kwargs=next_kwargs
             )
-            return BufferedEncryptedFile(
-                file_object=storage_file, key=self.key, mode=mode,
+
+            if 'w' in mode:
+                return ChunkedEncryptedFile(
+                    file_object=storage_file, key=self.key, mode=mode
+                )
+
+            storage_file = self._get_seekable_file_object(
+                file_object=storage_file
             )
+            if ChunkedEncryptedFile.is_chunked_format(file_object=storage_file):
+                return ChunkedEncryptedFile(
+                    file_object=storage_file, key=self.key, mode=mode
+                )
+            else:
+                return BufferedEncryptedFile(
+                    file_object=storage_file, key=self.key, mode=mode
+                )
 
     def save(self, name, content, max_length=None, _direct=False):
         next_kwargs = {'max_length': max_length, 'name': name}
@@ -129,7 +428,6 @@ class EncryptedPassthroughStorage(PassthroughStorage):
                 method_name='save', kwargs=next_kwargs
             )
         else:
-            cipher = AES.new(key=self.key, mode=AES.MODE_CBC)
             if not self._call_backend_method(
                 method_name='exists', kwargs={'name': name}
             ):
@@ -139,28 +437,66 @@ class EncryptedPassthroughStorage(PassthroughStorage):
                     }
                 )
 
-            with self._call_backend_method(
+            storage_file = self._call_backend_method(
                 method_name='open', kwargs={
                     'name': name, 'mode': 'wb'
                 }
-            ) as file_object:
-                file_object.write(cipher.iv)
+            )
+            with ChunkedEncryptedFile(file_object=storage_file, key=self.key, mode='wb') as file_object:
+                shutil.copyfileobj(
+                    fsrc=content, fdst=file_object,
+                    length=ENCRYPTION_FILE_CHUNK_SIZE
+                )
 
-                while True:
-                    chunk = content.read(ENCRYPTION_FILE_CHUNK_SIZE)
+            return name
 
-                    try:
-                        chunk = chunk.encode('utf-8')
-                    except AttributeError:
-                        """Already a byte string"""
+    def size(self, name):
+        """
+        Return the size of the decrypted content. Only the header of files
+        using the chunked format is read.
+        """
+        file_object = self._get_seekable_file_object(
+            file_object=self._call_backend_method(
+                method_name='open', kwargs={'name': name, 'mode': 'rb'}
+            )
+        )
+        with file_object:
+            if ChunkedEncryptedFile.is_chunked_format(file_object=file_object):
+                return ChunkedEncryptedFile(
+                    file_object=file_object, key=self.key, mode='rb'
+                ).size
+
+        return self.next_storage_backend.size(name=name)
+
+    def upgrade(self, name):
+        """
+        Convert a file stored using the legacy format to the chunked
+        format. Returns False if the file was already using the chunked
+        format. The converted file is written under a temporary name and
+        the legacy file is only replaced once the conversion completes.
+        """
+        file_object = self._get_seekable_file_object(
+            file_object=self._call_backend_method(
+                method_name='open', kwargs={'name': name, 'mode': 'rb'}
+            )
+        )
+        with file_object:
+            if ChunkedEncryptedFile.is_chunked_format(file_object=file_object):
+                return False
+
+        with TemporaryFile() as temporary_file_object:
+            with self.open(name=name, mode='rb') as file_object:
+                shutil.copyfileobj(
+                    fsrc=file_object, fdst=temporary_file_object,
+                    length=ENCRYPTION_FILE_CHUNK_SIZE
+                )
 
-                    if chunk:
-                        chunk = pad(
-                            data_to_pad=chunk, block_size=AES.block_size
-                        )
-                    else:
-                        break
+            temporary_file_object.seek(0)
+            temporary_name = self.save(
+                name='{}{}'.format(name, ENCRYPTION_UPGRADE_TEMPORARY_SUFFIX),
+                content=temporary_file_object
+            )
 
-                    file_object.write(cipher.encrypt(chunk))
+        self._replace(name=name, source_name=temporary_name)
 
-            return name
+        return True
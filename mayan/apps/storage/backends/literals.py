@@ -1,6 +1,10 @@
+ENCRYPTION_CHUNKED_FORMAT_MAGIC = b'\x93MAYENC\x01'
+ENCRYPTION_CHUNKED_FORMAT_SALT_SIZE = 16
+ENCRYPTION_CHUNKED_FORMAT_TAG_SIZE = 16
 ENCRYPTION_FILE_CHUNK_SIZE = 64 * 1024  # 64K
 ENCRYPTION_KEY_DERIVATION_ITERATIONS = 100000
 ENCRYPTION_KEY_SIZE = 32
+ENCRYPTION_UPGRADE_TEMPORARY_SUFFIX = '.upgrade'
 
 ZIP_CHUNK_SIZE = 64 * 1024  # 64K
 ZIP_MEMBER_FILENAME = 'mayan_file'
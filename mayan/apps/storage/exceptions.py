@@ -8,3 +8,9 @@ class NoMIMETypeMatch(CompressionFileError):
     """
     There is no decompressor registered for the specified MIME type
     """
+
+
+class EncryptedFileError(Exception):
+    """
+    An encrypted file is malformed or failed authentication.
+    """
@@ -2,6 +2,7 @@ from datetime import timedelta
 
 from django.utils.translation import ugettext_lazy as _
 
+from mayan.apps.common.queues import queue_tools
 from mayan.apps.task_manager.classes import CeleryQueue
 from mayan.apps.task_manager.workers import worker_d
 
@@ -14,6 +15,11 @@ queue_storage_periodic = CeleryQueue(
     worker=worker_d
 )
 
+queue_tools.add_task_type(
+    dotted_path='mayan.apps.storage.tasks.task_encrypted_storage_upgrade',
+    label=_('Upgrade encrypted storage files to the chunked format')
+)
+
 queue_storage_periodic.add_task_type(
     dotted_path='mayan.apps.storage.tasks.task_shared_upload_stale_delete',
     label=_('Delete stale uploads'), name='task_shared_upload_stale_delete',
@@ -4,6 +4,8 @@ from django.apps import apps
 
 from mayan.celery import app
 
+from .literals import ENCRYPTED_STORAGE_UPGRADE_BATCH_SIZE
+
 logger = logging.getLogger(name=__name__)
 
 
@@ -25,6 +27,68 @@ def task_download_files_stale_delete():
     logger.debug('Finished')
 
 
+@app.task(bind=True, ignore_result=True)
+def task_encrypted_storage_upgrade(
+    self, app_label, defined_storage_name, model_name,
+    file_attribute='file', pk_last=0
+):
+    """
+    Convert the files of a model stored in an encrypted storage from the
+    legacy format to the seekable chunked format. Processes a batch of
+    instances and queues itself to continue with the next batch.
+    """
+    from .backends.encryptedstorage import EncryptedPassthroughStorage
+    from .classes import DefinedStorage, PassthroughStorage
+
+    model = apps.get_model(app_label=app_label, model_name=model_name)
+
+    storage_instance = DefinedStorage.get(
+        name=defined_storage_name
+    ).get_storage_instance()
+
+    while not isinstance(storage_instance, EncryptedPassthroughStorage):
+        if isinstance(storage_instance, PassthroughStorage):
+            storage_instance = storage_instance.next_storage_backend
+        else:
+            logger.warning(
+                'Storage "%s" does not use encryption.', defined_storage_name
+            )
+            return
+
+    queryset = model.objects.filter(pk__gt=pk_last).order_by('pk')[
+        :ENCRYPTED_STORAGE_UPGRADE_BATCH_SIZE
+    ]
+
+    upgrade_count = 0
+    for instance in queryset:
+        pk_last = instance.pk
+        file_name = getattr(instance, file_attribute).name
+
+        try:
+            if storage_instance.upgrade(name=file_name):
+                upgrade_count += 1
+        except FileNotFoundError:
+            logger.warning(
+                'File "%s" of %s ID %s is missing; skipping.', file_name,
+                model_name, instance.pk
+            )
+
+    logger.info(
+        'Upgraded %d files of model %s.%s up to ID %s.', upgrade_count,
+        app_label, model_name, pk_last
+    )
+
+    if model.objects.filter(pk__gt=pk_last).exists():
+        self.apply_async(
+            kwargs={
+                'app_label': app_label,
+                'defined_storage_name': defined_storage_name,
+                'file_attribute': file_attribute,
+                'model_name': model_name, 'pk_last': pk_last
+            }
+        )
+
+
 @app.task(ignore_result=True)
 def task_shared_upload_stale_delete():
     logger.debug('Executing')
@@ -1,5 +1,9 @@
+import os
 from pathlib import Path
-from unittest import skip
+from unittest import mock, skip
+
+from Crypto.Cipher import AES
+from Crypto.Util.Padding import pad
 
 from django.core.files.base import ContentFile
 from django.utils.encoding import force_bytes
@@ -9,7 +13,11 @@ from mayan.apps.storage.utils import fs_cleanup, mkdtemp
 from mayan.apps.testing.tests.base import BaseTestCase
 
 from ..backends.compressedstorage import ZipCompressedPassthroughStorage
-from ..backends.encryptedstorage import EncryptedPassthroughStorage
+from ..backends.encryptedstorage import (
+    ChunkedEncryptedFile, EncryptedPassthroughStorage
+)
+from ..backends.literals import ENCRYPTION_FILE_CHUNK_SIZE
+from ..exceptions import EncryptedFileError
 
 from .literals import TEST_CONTENT, TEST_FILE_NAME
 
@@ -54,6 +62,95 @@ class EncryptedPassthroughStorageTestCase(MIMETypeBackendMixin, BaseTestCase):
         with storage.open(name=TEST_FILE_NAME, mode='r') as file_object:
             self.assertEqual(file_object.read(999), TEST_CONTENT)
 
+    def _get_test_storage(self):
+        return EncryptedPassthroughStorage(
+            password='testpassword',
+            next_storage_backend_arguments={
+                'location': self.temporary_directory,
+            }
+        )
+
+    def test_file_seek_and_size(self):
+        storage = self._get_test_storage()
+        test_content = os.urandom(ENCRYPTION_FILE_CHUNK_SIZE * 2 + 10)
+
+        storage.save(
+            name=TEST_FILE_NAME, content=ContentFile(content=test_content)
+        )
+
+        self.assertEqual(storage.size(name=TEST_FILE_NAME), len(test_content))
+
+        with storage.open(name=TEST_FILE_NAME, mode='rb') as file_object:
+            file_object.seek(ENCRYPTION_FILE_CHUNK_SIZE + 5)
+            self.assertEqual(
+                file_object.read(10),
+                test_content[ENCRYPTION_FILE_CHUNK_SIZE + 5:ENCRYPTION_FILE_CHUNK_SIZE + 15]
+            )
+
+            file_object.seek(-5, 2)
+            self.assertEqual(file_object.read(), test_content[-5:])
+
+    def test_file_tampering(self):
+        storage = self._get_test_storage()
+
+        storage.save(
+            name=TEST_FILE_NAME, content=ContentFile(
+                content=force_bytes(s=TEST_CONTENT)
+            )
+        )
+
+        path_file = Path(self.temporary_directory) / TEST_FILE_NAME
+        data = bytearray(path_file.read_bytes())
+        data[-1] ^= 1
+        path_file.write_bytes(data)
+
+        with storage.open(name=TEST_FILE_NAME, mode='rb') as file_object:
+            with self.assertRaises(expected_exception=EncryptedFileError):
+                file_object.read()
+
+    def test_legacy_file_upgrade(self):
+        storage = self._get_test_storage()
+
+        cipher = AES.new(key=storage.key, mode=AES.MODE_CBC)
+        path_file = Path(self.temporary_directory) / TEST_FILE_NAME
+        path_file.write_bytes(
+            cipher.iv + cipher.encrypt(
+                pad(data_to_pad=force_bytes(s=TEST_CONTENT), block_size=AES.block_size)
+            )
+        )
+
+        with storage.open(name=TEST_FILE_NAME, mode='r') as file_object:
+            self.assertEqual(file_object.read(), TEST_CONTENT)
+
+        self.assertTrue(storage.upgrade(name=TEST_FILE_NAME))
+        self.assertFalse(storage.upgrade(name=TEST_FILE_NAME))
+
+        with storage.open(name=TEST_FILE_NAME, mode='r') as file_object:
+            self.assertEqual(file_object.read(), TEST_CONTENT)
+
+        self.assertEqual(
+            os.listdir(path=self.temporary_directory), [TEST_FILE_NAME]
+        )
+
+    def test_legacy_file_upgrade_error(self):
+        storage = self._get_test_storage()
+
+        cipher = AES.new(key=storage.key, mode=AES.MODE_CBC)
+        path_file = Path(self.temporary_directory) / TEST_FILE_NAME
+        legacy_data = cipher.iv + cipher.encrypt(
+            pad(data_to_pad=force_bytes(s=TEST_CONTENT), block_size=AES.block_size)
+        )
+        path_file.write_bytes(legacy_data)
+
+        with mock.patch.object(ChunkedEncryptedFile, attribute='write', side_effect=OSError):
+            with self.assertRaises(expected_exception=OSError):
+                storage.upgrade(name=TEST_FILE_NAME)
+
+        self.assertEqual(path_file.read_bytes(), legacy_data)
+
+        with storage.open(name=TEST_FILE_NAME, mode='r') as file_object:
+            self.assertEqual(file_object.read(), TEST_CONTENT)
+
 
 class ZipCompressedPassthroughStorageTestCase(
     MIMETypeBackendMixin, BaseTestCase
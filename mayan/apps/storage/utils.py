@@ -77,7 +77,16 @@ class PassthroughStorageProcessor:
                         name=file_name, content=content,
                         _direct=self.reverse
                     )
-                    self._update_entry(key=key)
+
+                    # Instances can share a stored file. Mark all of
+                    # them to avoid processing the file more than once.
+                    queryset = model.objects.filter(
+                        **{self.file_attribute: file_name}
+                    )
+                    for pk in queryset.values_list('pk', flat=True):
+                        self._update_entry(
+                            key='{}.{}'.format(content_type.name, pk)
+                        )
 
             self.database.close
 
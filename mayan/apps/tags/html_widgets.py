@@ -1,7 +1,7 @@
-from django.apps import apps
 from django.core.exceptions import PermissionDenied
 from django.template.loader import render_to_string
 
+from mayan.apps.navigation.classes import PermissionResolver
 from mayan.apps.navigation.html_widgets import SourceColumnWidget
 
 from .permissions import permission_tag_view
@@ -14,15 +14,11 @@ class DocumentTagWidget(SourceColumnWidget):
     template_name = 'tags/document_tags_widget.html'
 
     def get_extra_context(self):
-        AccessControlList = apps.get_model(
-            app_label='acls', model_name='AccessControlList'
-        )
-
         try:
-            AccessControlList.objects.check_access(
-                obj=self.value,
-                permissions=(permission_tag_view,),
-                user=self.request.user
+            PermissionResolver.get_for_request(
+                request=self.request
+            ).check_access(
+                obj=self.value, permissions=(permission_tag_view,)
             )
         except PermissionDenied:
             queryset = self.value.tags.none()
@@ -1,5 +1,7 @@
 from .. import *  # NOQA
 
+ANALYTICS_EVENT_BUFFER_ENABLED = False
+
 AUTHENTICATION_BACKEND = 'mayan.apps.authentication.authentication_backends.AuthenticationBackendModelDjangoDefault'
 
 CELERY_BROKER_URL = 'memory://'
@@ -10,6 +12,8 @@ COMMON_HOME_VIEW_DASHBOARD_NAME = None
 
 DOCUMENT_PARSING_AUTO_PARSING = False
 
+EVENTS_FAN_OUT_ASYNCHRONOUS = False
+
 FILE_METADATA_AUTO_PROCESS = False
 
 INSTALLED_APPS = [
@@ -57,3 +61,5 @@ TEMPLATES[0]['OPTIONS']['loaders'] = (  # NOQA: F405
 )
 
 TESTING = True  # Silence the error logger for non critical HTTP404 and PermissionDenied
+
+WORKFLOWS_TRIGGER_DEFERRED = False